@@ -0,0 +1,155 @@
+# benchmarks/bench_animate.py
+
+"""
+Animación en streaming (processing animate) vs. armarla con PIL en memoria.
+
+Genera N cuadros PNG RGBA sintéticos (disco con transparencia alrededor,
+como los *_wgs84_*.png) y mide tiempo y pico de RSS de:
+
+- animate() en streaming con N y 4N cuadros (--jobs hilos preparando
+  cuadros, a lo sumo 2 x jobs en vuelo);
+- el armado "a mano": cargar todos los cuadros y Image.save(save_all=True).
+
+Sale con código 1 si el pico del streaming crece con la cantidad de cuadros
+(4N más de 1.25x + 64 MB sobre N) o si el APNG no reproduce los cuadros
+exactos.
+
+    python benchmarks/bench_animate.py --frames 24 --width 1800 --format gif
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+
+from goes_processor.processing.logic_animate.animate import FrameSource, animate  # noqa: E402
+from goes_processor.processing.logic_how.registry import get_processor  # noqa: E402
+from goes_processor.processing.logic_parallel.profile import PeakMemory  # noqa: E402
+from goes_processor.telemetry import current_rss_mb  # noqa: E402
+
+
+def make_frames(folder: Path, count: int, width: int):
+    """Cuadros RGBA de width x width/2 con un campo que se desplaza y ruido (comprime como los reales)."""
+    from PIL import Image
+
+    height = width // 2
+    yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+    disk = (xx - width / 2) ** 2 / (width / 2) ** 2 + (yy - height / 2) ** 2 / (height / 2) ** 2 <= 1
+    rng = np.random.default_rng(0)
+    start = datetime(2026, 1, 3)
+    sources = []
+    for i in range(count):
+        phase = 2 * np.pi * i / max(1, count)
+        rgba = np.zeros((height, width, 4), np.uint8)
+        for c in range(3):
+            field = np.sin(xx / 97 + phase + c) * np.cos(yy / 61 - phase) * 100 + 128
+            rgba[..., c] = np.clip(field + rng.normal(0, 6, field.shape), 0, 255)
+        rgba[..., 3] = np.where(disk, 255, 0)
+        path = folder / f"frame_{i:04d}.png"
+        Image.fromarray(rgba, "RGBA").save(path, compress_level=1)
+        sources.append(FrameSource(path.with_suffix(".nc"), start + timedelta(minutes=10 * i), path))
+    return sources
+
+
+def streaming(sources, output: Path, fmt: str, jobs: int) -> dict:
+    gc.collect()
+    base = current_rss_mb()
+    with PeakMemory() as mem:
+        summary = animate(sources, output, fmt, get_processor("lst"), "color", fps=10, label=None, jobs=jobs)
+    return {"seconds": summary["seconds"], "frames": summary["frames"], "bytes": summary["bytes"],
+            "peak_delta_mb": mem.peak_mb - base}
+
+
+def in_memory(sources, output: Path, fmt: str) -> dict:
+    """Referencia: todos los cuadros cargados y un único save_all de PIL."""
+    from PIL import Image
+
+    gc.collect()
+    base = current_rss_mb()
+    t0 = time.perf_counter()
+    with PeakMemory() as mem:
+        frames = [Image.open(s.png).convert("RGBA" if fmt == "apng" else "RGB") for s in sources]
+        frames[0].save(output, format="GIF" if fmt == "gif" else "PNG", save_all=True, append_images=frames[1:],
+                       duration=100, loop=0)
+        del frames
+    return {"seconds": time.perf_counter() - t0, "frames": len(sources), "bytes": output.stat().st_size,
+            "peak_delta_mb": mem.peak_mb - base}
+
+
+def report(label: str, r: dict):
+    print(f"   - {label:<28} {r['frames']:>4} cuadros {r['seconds']:>7.2f} s "
+          f"({r['frames'] / max(r['seconds'], 1e-9):>5.1f} cuadros/s)  pico +{r['peak_delta_mb']:>7.0f} MB  "
+          f"{r['bytes'] / 1024**2:>6.1f} MB")
+
+
+def same_apng(path: Path, sources) -> bool:
+    from PIL import Image
+
+    with Image.open(path) as anim:
+        if anim.n_frames != len(sources):
+            return False
+        for i, s in enumerate(sources):
+            anim.seek(i)
+            with Image.open(s.png) as ref:
+                if not np.array_equal(np.asarray(anim.convert("RGBA")), np.asarray(ref.convert("RGBA"))):
+                    return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=24, help="N (también se mide 4N en streaming)")
+    parser.add_argument("--width", type=int, default=1800, help="Ancho de los cuadros (alto = ancho / 2)")
+    parser.add_argument("--format", default="gif", choices=["gif", "apng"])
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--json", type=Path, default=None)
+    args = parser.parse_args()
+
+    ext = "gif" if args.format == "gif" else "png"
+    with tempfile.TemporaryDirectory(prefix="bench_animate_") as work:
+        work = Path(work)
+        print(f"[*] Generando {4 * args.frames} cuadros RGBA de {args.width}x{args.width // 2}...")
+        sources = make_frames(work, 4 * args.frames, args.width)
+        small = sources[:args.frames]
+
+        results = {
+            "stream_n_1": streaming(small, work / f"a.{ext}", args.format, 1),
+            "stream_n": streaming(small, work / f"b.{ext}", args.format, args.jobs),
+            "stream_4n": streaming(sources, work / f"c.{ext}", args.format, args.jobs),
+            "in_memory_n": in_memory(small, work / f"d.{ext}", args.format),
+        }
+        ok = True
+        if args.format == "apng":
+            ok = same_apng(work / f"c.{ext}", sources)
+
+    print(f"[*] {args.format}:")
+    report("streaming, 1 hilo", results["stream_n_1"])
+    report(f"streaming, {args.jobs} hilos", results["stream_n"])
+    report(f"streaming, {args.jobs} hilos (4N)", results["stream_4n"])
+    report("PIL save_all en memoria", results["in_memory_n"])
+
+    n, n4 = results["stream_n"]["peak_delta_mb"], results["stream_4n"]["peak_delta_mb"]
+    bounded = n4 <= 1.25 * max(n, 0) + 64
+    if not bounded:
+        print(f"[!] El pico del streaming crece con los cuadros: +{n:.0f} MB con N, +{n4:.0f} MB con 4N")
+    if not ok:
+        print("[!] El APNG no reproduce los cuadros de entrada")
+    if bounded and ok:
+        print(f"[*] OK (pico acotado: +{n:.0f} MB con N, +{n4:.0f} MB con 4N; "
+              f"en memoria +{results['in_memory_n']['peak_delta_mb']:.0f} MB con N)")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    sys.exit(0 if bounded and ok else 1)
+
+
+if __name__ == "__main__":
+    main()
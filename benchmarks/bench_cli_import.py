@@ -0,0 +1,88 @@
+# benchmarks/bench_cli_import.py
+
+"""
+Chequeo de regresión del tiempo de arranque del CLI (python -X importtime).
+
+Corre los comandos livianos en subprocesos nuevos y falla (exit 1) si alguno
+importa satpy/pyresample/dask o si el import acumulado supera el presupuesto.
+
+    python benchmarks/bench_cli_import.py --budget-ms 400
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# Comandos que nunca deberían tocar satpy
+LIGHT_COMMANDS = [
+    ["--help"],
+    ["download", "goes-files", "--help"],
+    ["processing", "bulk", "--help"],
+    ["ingest", "run", "--help"],
+]
+FORBIDDEN = ("satpy", "pyresample", "dask", "xarray")
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_profile(args, python_args=("-m", "goes_processor.main")):
+    env = {"PYTHONPATH": str(SRC_DIR)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *python_args, *args],
+        capture_output=True, text=True, env={**os.environ, **env}, check=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def parse_importtime(stderr: str):
+    """(µs acumulados de los imports de primer nivel, {módulo: µs acumulados})."""
+    modules = {}
+    total_us = 0
+    for line in stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        cumulative, depth, name = int(m[2]), len(m[3]) // 2, m[4]
+        modules[name] = cumulative
+        if depth == 0:
+            total_us += cumulative
+    return total_us, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=400.0, help="Máximo de import acumulado por comando")
+    parser.add_argument("--json", type=Path, default=None, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    failed = False
+    results = {}
+    for cmd in LIGHT_COMMANDS:
+        total_us, modules = import_profile(cmd)
+        heavy = sorted(m for m in modules if m.split(".")[0] in FORBIDDEN)
+        label = " ".join(cmd)
+        top = sorted(((v, k) for k, v in modules.items() if "." not in k), reverse=True)[:3]
+        status = "OK"
+        if heavy:
+            status = f"FALLA: importa {', '.join(sorted({h.split('.')[0] for h in heavy}))}"
+            failed = True
+        elif total_us / 1000 > args.budget_ms:
+            status = f"FALLA: supera {args.budget_ms:.0f} ms"
+            failed = True
+        print(f"  - {label:28s} {total_us / 1000:8.1f} ms  [{status}]  "
+              f"top: {', '.join(f'{k} {v / 1000:.0f} ms' for v, k in top)}")
+        results[label] = {"import_ms": total_us / 1000, "status": status}
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# benchmarks/bench_gridding.py
+
+"""
+Throughput del grillado de puntos GLM/FDC frente al ritmo real de llegada.
+
+Genera un archivo GLM LCFA sintético cada 20 s (15 min por defecto) y
+algunos FDCF full disk, y mide por archivo:
+
+- grillado: lectura + bin_points + actualización de las ventanas 1/5/15 min
+- punta a punta: process_file con escritura de GeoTIFF/PNG por ventana
+
+y lo expresa como múltiplo del tiempo real (GLM: 20 s por archivo; FDC
+full disk: 600 s). Como contraste, un bucle de Python por punto sobre un
+solo archivo GLM. Sale con código 1 si el punta a punta no supera
+--min-realtime veces el tiempo real.
+
+    python benchmarks/bench_gridding.py --glm-files 45 --fdc-files 2
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+from synthetic_abi import make_archive, make_glm_archive  # noqa: E402
+
+REALTIME_SECONDS = {"glm": 20.0, "fdc": 600.0}
+
+
+def python_loop_bins(lon, lat, area) -> dict:
+    """Referencia ingenua: un dict de celdas llenado punto por punto."""
+    x0, y0, x1, y1 = area.area_extent
+    height, width = area.shape
+    cells = {}
+    for x, y in zip(lon.tolist(), lat.tolist()):
+        col = int((x - x0) / (x1 - x0) * width)
+        row = int((y1 - y) / (y1 - y0) * height)
+        if 0 <= col < width and 0 <= row < height:
+            cells[row * width + col] = cells.get(row * width + col, 0) + 1
+    return cells
+
+
+def bench_grid_only(name: str, files, area) -> dict:
+    from goes_processor.processing.logic_gridding import pipeline
+    from goes_processor.processing.logic_gridding.binning import RollingGrid
+    from goes_processor.processing.logic_how.registry import get_processor
+
+    product = get_processor(name).impl.PRODUCT
+    ring = RollingGrid(area.shape, product.fields)
+    t0 = time.perf_counter()
+    for f in files:
+        ring.push(f.name, pipeline.scan_time(f), pipeline.file_bins(product, f, area))
+    return {"files": len(files), "seconds": time.perf_counter() - t0}
+
+
+def bench_end_to_end(name: str, files, base: Path, out: Path, format: str) -> dict:
+    from goes_processor.processing.logic_how.registry import get_processor
+
+    proc = get_processor(name)
+    t0 = time.perf_counter()
+    for f in files:
+        proc.process_file(f, base, out, format, True)
+    return {"files": len(files), "seconds": time.perf_counter() - t0}
+
+
+def report(label: str, name: str, result: dict) -> float:
+    per_file = result["seconds"] / max(result["files"], 1)
+    factor = REALTIME_SECONDS[name] / per_file if per_file else float("inf")
+    result.update(per_file_ms=1000 * per_file, realtime_factor=factor)
+    print(f"  - {label:22s}: {result['files']:3d} archivos  {1000 * per_file:9.1f} ms/archivo  "
+          f"{factor:9.1f}x tiempo real")
+    return factor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--glm-files", type=int, default=45, help="Archivos GLM (uno cada 20 s)")
+    parser.add_argument("--flashes", type=int, default=2000, help="Flashes por archivo GLM")
+    parser.add_argument("--fdc-files", type=int, default=2)
+    parser.add_argument("--fdc-size", type=int, default=5424, help="Lado del FDCF sintético")
+    parser.add_argument("--format", default="both", choices=["png", "tiff", "both", "cog"])
+    parser.add_argument("--min-realtime", type=float, default=2.0,
+                        help="Múltiplo mínimo del tiempo real exigido al punta a punta")
+    parser.add_argument("--json", type=Path, default=None, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    from goes_processor.processing.logic_gridding.binning import bin_points
+    from goes_processor.processing.logic_gridding.pipeline import global_grid
+    from goes_processor.processing.logic_gridding.readers import read_glm_points
+
+    area = global_grid()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="goes_grid_") as work:
+        raw, out = Path(work) / "raw", Path(work) / "out"
+        print(f"[*] Generando {args.glm_files} GLM y {args.fdc_files} FDCF sintéticos...")
+        inputs = {"glm": make_glm_archive(raw, args.glm_files, flashes=args.flashes)}
+        if args.fdc_files:
+            inputs["fdc"] = make_archive(raw, "FDCF", args.fdc_size, args.fdc_files)
+
+        lon, lat, _ = read_glm_points(inputs["glm"][0])["event_count"]
+        t0 = time.perf_counter()
+        python_loop_bins(lon, lat, area)
+        loop = {"files": 1, "seconds": time.perf_counter() - t0}
+        t0 = time.perf_counter()
+        bin_points(lon, lat, area)
+        vectorized = {"files": 1, "seconds": time.perf_counter() - t0}
+        print(f"[*] Solo eventos de un archivo ({lon.size}):")
+        report("bucle Python", "glm", loop)
+        report("bin_points", "glm", vectorized)
+        results["python_loop"], results["bin_points"] = loop, vectorized
+
+        failed = False
+        for name, files in inputs.items():
+            print(f"[*] {name.upper()}:")
+            grid = bench_grid_only(name, files, area)
+            report("grillado + ventanas", name, grid)
+            e2e = bench_end_to_end(name, files, raw, out, args.format)
+            failed |= report(f"punta a punta ({args.format})", name, e2e) < args.min_realtime
+            results[name] = {"grid": grid, "end_to_end": e2e}
+
+    print("[!] Por debajo del ritmo exigido" if failed else "[*] OK")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# benchmarks/bench_listing.py
+
+"""
+Listado de S3: `find` recursivo del día (anterior) frente a ListingCache.
+
+Usa un bucket falso en memoria con la cantidad real de claves por hora
+(GLM LCFA: 180; RadF: 16 canales x 6; MCMIPF: 6; LSTF: 1), paginado de a
+1000 claves como ListObjectsV2, con StartAfter y una latencia fija por
+pedido más un costo por clave devuelta. Escenarios:
+
+- día completo en frío: find del día vs. 24 prefijos de hora en paralelo;
+- re-corrida del mismo día: las horas cerradas salen del cache (0 pedidos);
+- polling de la hora en curso: find de la hora en cada poll vs. re-listado
+  incremental con StartAfter (solo las claves nuevas).
+
+Informa pedidos, claves transferidas y tiempo. Sale con código 1 si algún
+listado del cache no coincide con el de referencia.
+
+    python benchmarks/bench_listing.py --products GLM-L2-LCFA ABI-L1b-RadF
+"""
+
+import argparse
+import bisect
+import json
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+
+from goes_processor.download.listing import ListingCache  # noqa: E402
+
+# (segundos entre archivos, canales) por producto
+CADENCE = {
+    "GLM-L2-LCFA": (20, [None]),
+    "ABI-L1b-RadF": (600, [f"{c:02d}" for c in range(1, 17)]),
+    "ABI-L2-MCMIPF": (600, [None]),
+    "ABI-L2-LSTF": (3600, [None]),
+}
+PAGE = 1000
+
+
+def _stamp(t: datetime) -> str:
+    return t.strftime("%Y%j%H%M%S") + str(t.microsecond // 100000)
+
+
+def object_name(product: str, start: datetime, channel, satellite: str = "19") -> str:
+    step = CADENCE[product][0]
+    end = start + timedelta(seconds=min(step, 600) - 1)
+    created = end + timedelta(seconds=20)
+    series = product if product.startswith("GLM") else f"{product}-M6" + (f"C{channel}" if channel else "")
+    return f"OR_{series}_G{satellite}_s{_stamp(start)}_e{_stamp(end)}_c{_stamp(created)}.nc"
+
+
+class Clock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+class FakeBucket:
+    """
+    Bucket S3 en memoria. Una clave es visible desde su sello de creación.
+    `call_s3` imita ListObjectsV2 y `find` el listado recursivo de s3fs
+    (páginas secuenciales sin delimitador).
+    """
+
+    def __init__(self, products, day: datetime, clock: Clock, latency_ms: float, per_key_us: float,
+                 satellite: str = "19"):
+        self.clock = clock
+        self.latency = latency_ms / 1000
+        self.per_key = per_key_us / 1e6
+        self.keys, self.created = [], {}
+        bucket = f"noaa-goes{satellite}"
+        for product in products:
+            step, channels = CADENCE[product]
+            t = day
+            while t < day + timedelta(days=1):
+                for ch in channels:
+                    name = object_name(product, t, ch, satellite)
+                    key = f"{bucket}/{product}/{t:%Y}/{t:%j}/{t:%H}/{name}"
+                    self.keys.append(key)
+                    self.created[key] = datetime.strptime(name.rsplit("_c", 1)[1][:13], "%Y%j%H%M%S")
+                t += timedelta(seconds=step)
+        self.keys.sort()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.transferred = 0
+
+    def _page(self, prefix: str, after: str):
+        now = self.clock()
+        i = bisect.bisect_right(self.keys, after) if after > prefix else bisect.bisect_left(self.keys, prefix)
+        page = []
+        while i < len(self.keys) and self.keys[i].startswith(prefix) and len(page) < PAGE:
+            if self.created[self.keys[i]] <= now:
+                page.append(self.keys[i])
+            i += 1
+        truncated = i < len(self.keys) and self.keys[i].startswith(prefix)
+        with self._lock:
+            self.requests += 1
+            self.transferred += len(page)
+        time.sleep(self.latency + self.per_key * len(page))
+        return page, truncated
+
+    def call_s3(self, method: str, Bucket: str, Prefix: str, StartAfter: str = "", ContinuationToken: str = ""):
+        assert method == "list_objects_v2"
+        after = f"{Bucket}/{ContinuationToken or StartAfter}" if (ContinuationToken or StartAfter) else ""
+        page, truncated = self._page(f"{Bucket}/{Prefix}", after)
+        resp = {"Contents": [{"Key": k.split("/", 1)[1], "Size": 1024, "ETag": '"x"'} for k in page],
+                "IsTruncated": truncated}
+        if truncated:
+            resp["NextContinuationToken"] = page[-1].split("/", 1)[1] if page else Prefix
+        return resp
+
+    def find(self, path: str, detail: bool = True):
+        prefix, after, out = path.rstrip("/") + "/", "", {}
+        while True:
+            page, truncated = self._page(prefix, after)
+            out.update({k: {"name": k, "size": 1024, "ETag": '"x"', "type": "file"} for k in page})
+            if not truncated:
+                return out
+            after = page[-1] if page else prefix + "￿"
+
+
+def old_list(fs, prefix: str) -> dict:
+    """Listado anterior (download.list_remote): find recursivo del prefijo."""
+    listing = fs.find(prefix, detail=True)
+    return {k: info for k, info in sorted(listing.items()) if k.endswith(".nc")}
+
+
+def measure(fs, fn) -> dict:
+    fs.reset()
+    t0 = time.perf_counter()
+    keys = fn()
+    return {"seconds": time.perf_counter() - t0, "requests": fs.requests, "transferred": fs.transferred,
+            "objects": len(keys), "keys": set(keys)}
+
+
+def report(label: str, r: dict):
+    print(f"   - {label:<28} {r['requests']:>5} pedidos {r['transferred']:>7} claves "
+          f"{r['seconds'] * 1000:>8.1f} ms  ({r['objects']} objetos)")
+
+
+def bench_product(product: str, args, db_dir: Path) -> dict:
+    day = datetime(2026, 1, 3)
+    year, jday = f"{day:%Y}", f"{day:%j}"
+    clock = Clock(day + timedelta(days=1, hours=2))
+    fs = FakeBucket([product], day, clock, args.latency_ms, args.per_key_us)
+    day_prefix = f"noaa-goes19/{product}/{year}/{jday}"
+    ok = True
+    out = {}
+
+    print(f"[*] {product}: {len(fs.keys)} claves en el día")
+    cache = ListingCache(db_dir / f"{product}.sqlite", ttl_seconds=args.ttl, clock=clock, workers=args.workers)
+    old = measure(fs, lambda: old_list(fs, day_prefix))
+    cold = measure(fs, lambda: cache.list(fs, "19", product, year, jday, "all"))
+    warm = measure(fs, lambda: cache.list(fs, "19", product, year, jday, "all"))
+    cache.close()
+    report("find del día", old)
+    report("cache, frío (24 horas)", cold)
+    report("cache, re-corrida", warm)
+    ok &= old["keys"] == cold["keys"] == warm["keys"]
+    out["day"] = {"find": old, "cold": cold, "warm": warm}
+
+    # Minuto puntual: el filtro sobre el inicio parseado debe coincidir con el substring anterior
+    hour, minute = "12", "20"
+    match = f"s{year}{jday}{hour}{minute}"
+    expected = {k for k in old["keys"] if f"/{hour}/" in k and match in k}
+    with ListingCache(clock=clock) as c:
+        ok &= set(c.list(fs, "19", product, year, jday, hour, minute)) == expected
+
+    # Polling de la hora en curso
+    step = CADENCE[product][0]
+    interval = args.poll_seconds or min(step, 60)
+    polls = args.polls or int(3600 // interval)
+    clock.now = day + timedelta(hours=12)
+    live_hour = f"{clock.now:%H}"
+    hour_prefix = f"{day_prefix}/{live_hour}"
+    live = ListingCache(ttl_seconds=0, clock=clock, workers=args.workers)
+    totals = {"find": dict(seconds=0.0, requests=0, transferred=0), "cache": dict(seconds=0.0, requests=0, transferred=0)}
+    for _ in range(polls):
+        clock.now += timedelta(seconds=interval)
+        a = measure(fs, lambda: old_list(fs, hour_prefix))
+        b = measure(fs, lambda: live.list(fs, "19", product, year, jday, live_hour))
+        ok &= a["keys"] == b["keys"]
+        for name, r in (("find", a), ("cache", b)):
+            for k in ("seconds", "requests", "transferred"):
+                totals[name][k] += r[k]
+    live.close()
+    print(f"[*] {product}: {polls} polls de la hora en curso cada {interval} s")
+    for name, label in (("find", "find de la hora"), ("cache", "cache, incremental")):
+        report(label, dict(totals[name], objects=b["objects"]))
+    out["poll"] = totals
+    if not ok:
+        print(f"[!] {product}: el listado del cache no coincide con el de referencia")
+    for r in (old, cold, warm):
+        r.pop("keys")
+    return out, ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", nargs="+", default=["GLM-L2-LCFA", "ABI-L1b-RadF", "ABI-L2-LSTF"],
+                        choices=sorted(CADENCE))
+    parser.add_argument("--latency-ms", type=float, default=30.0, help="Latencia por pedido LIST")
+    parser.add_argument("--per-key-us", type=float, default=20.0, help="Costo por clave devuelta")
+    parser.add_argument("--workers", type=int, default=16, help="Prefijos de hora listados en paralelo")
+    parser.add_argument("--ttl", type=float, default=30.0)
+    parser.add_argument("--polls", type=int, default=None, help="Polls de la hora en curso (por defecto, una hora)")
+    parser.add_argument("--poll-seconds", type=float, default=None,
+                        help="Intervalo de polling (por defecto la cadencia del producto, máx. 60 s)")
+    parser.add_argument("--json", type=Path, default=None)
+    args = parser.parse_args()
+
+    results, ok = {}, True
+    with tempfile.TemporaryDirectory(prefix="bench_listing_") as work:
+        for product in args.products:
+            results[product], good = bench_product(product, args, Path(work))
+            ok &= good
+
+    print("[*] OK" if ok else "[!] Diferencias en los listados")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_lst_single_pass.py
+
+"""
+Benchmark: LST en una sola pasada vs. camino anterior (una evaluación por salida).
+
+Cada modo corre en un subproceso nuevo para medir tiempo y pico de RSS sin
+contaminación entre corridas. Ejemplo:
+
+    python benchmarks/bench_lst_single_pass.py --input data/raw/noaa-goes19/ABI-L2-LSTF/.../OR_ABI-L2-LSTF-...nc
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+_CHILD = r"""
+import json, resource, sys, time
+sys.path.insert(0, {src!r})
+from goes_processor.processing.logic_how.lst import process_file
+from goes_processor.processing.logic_resample.lut import preload_luts
+preload_luts()
+t0 = time.perf_counter()
+process_file({input!r}, {base!r}, {out!r}, single_pass={single!r})
+elapsed = time.perf_counter() - t0
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print("BENCH_RESULT " + json.dumps({{"seconds": elapsed, "peak_rss_mb": peak_kb / 1024}}))
+"""
+
+
+def run_mode(input_file: Path, single: bool) -> dict:
+    with tempfile.TemporaryDirectory() as out:
+        code = _CHILD.format(src=str(SRC_DIR), input=str(input_file), base=str(input_file.parent),
+                             out=out, single=single)
+        proc = subprocess.run([sys.executable, "-W", "ignore", "-c", code],
+                              capture_output=True, text=True, check=True)
+    line = next(l for l in proc.stdout.splitlines() if l.startswith("BENCH_RESULT "))
+    return json.loads(line.split(" ", 1)[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--input", required=True, type=Path, help="Archivo ABI-L2-LSTF")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    # Corrida de calentamiento: construye la LUT en disco si no existe
+    run_mode(args.input.resolve(), True)
+
+    for label, single in (("anterior (6 evaluaciones)", False), ("una sola pasada", True)):
+        runs = [run_mode(args.input.resolve(), single) for _ in range(args.repeat)]
+        best = min(runs, key=lambda r: r["seconds"])
+        print(f"  - {label:28s}: {best['seconds']:7.2f} s   pico RSS {best['peak_rss_mb']:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/bench_memory_lean.py
+
+"""
+Chequeo de regresión del pico de memoria: LST por defecto vs. --memory-lean.
+
+Cada modo corre en un subproceso nuevo (pico de RSS = ru_maxrss, sin
+contaminación entre corridas) sobre el mismo LSTF, sintético full disk por
+defecto. Sale con código 1 si el modo lean no baja el pico al menos
+--min-saving-mb, o si sus estadísticas difieren de las del modo por defecto.
+
+    python benchmarks/bench_memory_lean.py --size 5424 --format both
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCH_DIR.parent / "src"
+
+_CHILD = r"""
+import json, resource, sys, time
+from pathlib import Path
+sys.path.insert(0, {src!r})
+from goes_processor.processing.logic_how.lst import process_file
+from goes_processor.processing.logic_resample.lut import preload_luts
+preload_luts()
+t0 = time.perf_counter()
+out_dir = process_file({input!r}, {base!r}, {out!r}, format={format!r}, overwrite=True, memory_lean={lean!r})
+elapsed = time.perf_counter() - t0
+meta = next(Path(out_dir).glob("*_metadata.json"))
+stats = json.loads(meta.read_text())["stats"]
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print("BENCH_RESULT " + json.dumps({{"seconds": elapsed, "peak_rss_mb": peak_kb / 1024, "stats": stats}}))
+"""
+
+
+def run_mode(input_file: Path, format: str, lean: bool, env) -> dict:
+    with tempfile.TemporaryDirectory() as out:
+        code = _CHILD.format(src=str(SRC_DIR), input=str(input_file), base=str(input_file.parent), out=out,
+                             format=format, lean=lean)
+        proc = subprocess.run([sys.executable, "-W", "ignore", "-c", code],
+                              capture_output=True, text=True, check=True, env=env)
+    line = next(l for l in proc.stdout.splitlines() if l.startswith("BENCH_RESULT "))
+    return json.loads(line.split(" ", 1)[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--input", type=Path, default=None, help="Archivo ABI-L2-LSTF (por defecto, sintético)")
+    parser.add_argument("--size", type=int, default=5424, help="Lado del LSTF sintético")
+    parser.add_argument("--format", default="both", choices=["png", "tiff", "both", "cog"])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--min-saving-mb", type=float, default=50.0,
+                        help="Reducción mínima de pico exigida al modo lean")
+    parser.add_argument("--json", type=Path, default=None, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="goes_lean_") as work:
+        env = dict(os.environ)
+        env.setdefault("SATPY_CACHE_DIR", str(Path(work) / "cache"))
+        if args.input is None:
+            sys.path.insert(0, str(BENCH_DIR))
+            from synthetic_abi import make_archive
+            input_file = make_archive(Path(work) / "raw", "LSTF", args.size, 1)[0]
+        else:
+            input_file = args.input.resolve()
+
+        run_mode(input_file, args.format, True, env)  # calentamiento: LUT en disco
+        results = {}
+        for label, lean in (("default", False), ("memory_lean", True)):
+            runs = [run_mode(input_file, args.format, lean, env) for _ in range(args.repeat)]
+            results[label] = min(runs, key=lambda r: r["peak_rss_mb"])
+            best = results[label]
+            print(f"  - {label:12s}: {best['seconds']:7.2f} s   pico RSS {best['peak_rss_mb']:8.1f} MB")
+
+    saving = results["default"]["peak_rss_mb"] - results["memory_lean"]["peak_rss_mb"]
+    same_stats = all(abs(results["default"]["stats"][k] - results["memory_lean"]["stats"][k]) < 1e-3
+                     for k in ("min", "max", "mean"))
+    failed = saving < args.min_saving_mb or not same_stats
+    print(f"[*] Ahorro de pico: {saving:.1f} MB (mínimo exigido {args.min_saving_mb:.0f} MB)")
+    if not same_stats:
+        print("[!] Las estadísticas difieren entre modos")
+    print("[!] Regresión de memoria" if failed else "[*] OK")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# benchmarks/bench_partial_read.py
+
+"""
+Lectura parcial de MCMIPF por chunks vs. descarga completa.
+
+Genera MCMIPF sintéticos (16 bandas, chunks 226x226 con deflate+shuffle como
+los de NOAA) y los sirve a través de un filesystem fsspec de prueba que
+cuenta pedidos GET por rango y bytes, y modela el tiempo de S3 con una
+latencia por pedido, un ancho de banda y pedidos concurrentes en cat_ranges
+(como s3fs). Compara download_files:
+
+- completo (rangos de 8 MB, como hoy);
+- --variables truecolor (C01-C03 + DQF): índice de chunks + chunks de 6 variables;
+- --variables truecolor --region argentina, con el índice ya cacheado.
+
+El índice es lo que más pesa en latencia: h5py lee una cabecera de objeto
+por variable, y en estos sintéticos (escritos variable por variable) las
+cabeceras quedan intercaladas con los datos, un pedido por cada una.
+
+Verifica que las variables del NetCDF reducido sean idénticas a las del
+original (dentro de la ventana, con región) y sale con código 1 si no, o si
+la reducción de bytes de truecolor no llega a --min-reduction.
+
+    python benchmarks/bench_partial_read.py --size 2712 --files 2
+"""
+
+import argparse
+import json
+import math
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from fsspec.spec import AbstractBufferedFile, AbstractFileSystem
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+from synthetic_abi import make_archive  # noqa: E402
+
+from goes_processor.download.download import download_files  # noqa: E402
+from goes_processor.download.references import build_references, make_subset, region_window  # noqa: E402
+
+
+class _RangeFile(AbstractBufferedFile):
+    def _fetch_range(self, start, end):
+        return self.fs.cat_file(self.path, start, end)
+
+
+class RangeServer(AbstractFileSystem):
+    """
+    Stand-in de S3 sobre una carpeta local. Cada cat_file es un GET por rango
+    (latencia + bytes); cat_ranges manda hasta `concurrency` pedidos a la vez.
+    """
+    cachable = False
+
+    def __init__(self, root, latency_ms: float = 40.0, bandwidth_mb: float = 100.0, concurrency: int = 10):
+        super().__init__()
+        self.root = Path(root)
+        self.latency = latency_ms / 1000
+        self.bandwidth = bandwidth_mb * 1024**2
+        self.concurrency = concurrency
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.bytes = 0
+        self.rounds = 0          # rondas de latencia (pedidos secuenciales o lotes concurrentes)
+
+    def _local(self, path) -> Path:
+        return self.root / str(path).lstrip("/")
+
+    def ls(self, path, detail=True, **kwargs):
+        folder = self._local(path)
+        if not folder.is_dir():
+            raise FileNotFoundError(path)
+        with self._lock:
+            self.requests += 1
+            self.rounds += 1
+        out = [{"name": f"{str(path).strip('/')}/{p.name}", "size": p.stat().st_size,
+                "type": "directory" if p.is_dir() else "file"} for p in sorted(folder.iterdir())]
+        return out if detail else [o["name"] for o in out]
+
+    def info(self, path, **kwargs):
+        local = self._local(path)
+        if not local.exists():
+            raise FileNotFoundError(path)
+        return {"name": str(path), "size": local.stat().st_size, "type": "file"}
+
+    def _read(self, path, start, end) -> bytes:
+        with open(self._local(path), "rb") as f:
+            f.seek(start or 0)
+            data = f.read(None if end is None else end - (start or 0))
+        with self._lock:
+            self.requests += 1
+            self.bytes += len(data)
+        return data
+
+    def cat_file(self, path, start=None, end=None, **kwargs):
+        with self._lock:
+            self.rounds += 1
+        return self._read(path, start, end)
+
+    def cat_ranges(self, paths, starts, ends, max_gap=None, on_error="return", **kwargs):
+        with self._lock:
+            self.rounds += math.ceil(len(paths) / self.concurrency)
+        return [self._read(p, s, e) for p, s, e in zip(paths, starts, ends)]
+
+    def _open(self, path, mode="rb", block_size=None, autocommit=True, cache_options=None, **kwargs):
+        return _RangeFile(self, path, mode, block_size or 5 * 1024**2,
+                          cache_type=kwargs.get("cache_type", "readahead"), size=self.info(path)["size"])
+
+    def modeled_seconds(self) -> float:
+        return self.rounds * self.latency + self.bytes / self.bandwidth
+
+
+def run(fs: RangeServer, out: Path, subset) -> dict:
+    fs.reset()
+    t0 = time.perf_counter()
+    paths = download_files("ABI-L2-MCMIPF", "2026", "003", "12", output_dir=str(out), fs=fs, subset=subset,
+                           listing_cache=False, workers=1)
+    return {"seconds": time.perf_counter() - t0, "requests": fs.requests, "bytes": fs.bytes,
+            "modeled_s3_seconds": fs.modeled_seconds(), "files": len(paths),
+            "local_bytes": sum(p.stat().st_size for p in paths), "paths": paths}
+
+
+def report(label: str, r: dict, base: dict = None):
+    ratio = f"  x{base['bytes'] / max(1, r['bytes']):.1f} menos bytes" if base else ""
+    print(f"   - {label:<34} {r['bytes'] / 1024**2:>8.1f} MB bajados {r['requests']:>5} pedidos "
+          f"S3 ~{r['modeled_s3_seconds']:>6.2f} s  local {r['local_bytes'] / 1024**2:>7.1f} MB"
+          f"  ({r['seconds']:.2f} s reales){ratio}")
+
+
+def same_values(full: Path, slim: Path, names, window=None) -> bool:
+    import netCDF4
+    with netCDF4.Dataset(full) as a, netCDF4.Dataset(slim) as b:
+        for name in names:
+            a[name].set_auto_maskandscale(False)
+            b[name].set_auto_maskandscale(False)
+            ya, yb = a[name][...], b[name][...]
+            if window is not None and ya.ndim == 2:
+                r0, r1, c0, c1 = window
+                ya, yb = ya[r0:r1, c0:c1], yb[r0:r1, c0:c1]
+            if not np.array_equal(ya, yb):
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=2712, help="Lado de la grilla (5424 = 2 km full disk)")
+    parser.add_argument("--files", type=int, default=1)
+    parser.add_argument("--region", default="argentina")
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--bandwidth-mb", type=float, default=100.0, help="MB/s")
+    parser.add_argument("--concurrency", type=int, default=10, help="Pedidos simultáneos en cat_ranges")
+    parser.add_argument("--min-reduction", type=float, default=3.0)
+    parser.add_argument("--json", type=Path, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_partial_") as work:
+        bucket, work = Path(work) / "bucket", Path(work)
+        print(f"[*] Generando {args.files} MCMIPF sintéticos de {args.size}x{args.size}...")
+        sources = make_archive(bucket, "MCMIPF", args.size, args.files)
+        fs = RangeServer(bucket, args.latency_ms, args.bandwidth_mb, args.concurrency)
+
+        key = str(sources[0].relative_to(bucket))
+        fs.reset()
+        t0 = time.perf_counter()
+        refs = build_references(fs, key, variables=make_subset("truecolor").variables)
+        index = {"seconds": time.perf_counter() - t0, "requests": fs.requests, "bytes": fs.bytes,
+                 "modeled_s3_seconds": fs.modeled_seconds(), "local_bytes": 0}
+
+        tc, tc_region = make_subset("truecolor"), make_subset("truecolor", args.region)
+        results = {"index": index}
+        results["full"] = run(fs, work / "full", None)
+        results["truecolor"] = run(fs, work / "partial", tc)
+        results["truecolor_region"] = run(fs, work / "partial", tc_region)   # índice ya cacheado
+
+        print(f"[*] Por archivo MCMIPF ({sources[0].stat().st_size / 1024**2:.1f} MB, "
+              f"{len(refs['variables'])} variables):")
+        report("índice (cabeceras + chunks de truecolor)", index)
+        print(f"[*] {args.files} archivo(s):")
+        report("completo", results["full"])
+        report("truecolor", results["truecolor"], results["full"])
+        report(f"truecolor + {args.region}", results["truecolor_region"], results["full"])
+
+        window = region_window(refs, tc_region.bbox)
+        names = tc.variables + ("x", "y")
+        full_paths = {p.name: p for p in results["full"]["paths"]}
+        partial = {p.name: p for p in results["truecolor_region"]["paths"]}
+        ok = all(same_values(full_paths[n], partial[n], names, window) for n in partial)
+        # El full disk de truecolor quedó pisado por el recorte: se rehace en otra carpeta
+        results["truecolor_check"] = run(fs, work / "partial_fd", tc)
+        ok &= all(same_values(full_paths[p.name], p, names) for p in results["truecolor_check"]["paths"])
+
+        reduction = results["full"]["bytes"] / max(1, results["truecolor"]["bytes"])
+        failed = not ok or reduction < args.min_reduction
+        if not ok:
+            print("[!] El NetCDF reducido no coincide con el original")
+        print(f"[!] Reducción x{reduction:.1f} < {args.min_reduction}" if reduction < args.min_reduction
+              else f"[*] OK (truecolor baja x{reduction:.1f} menos bytes)")
+        for r in results.values():
+            r.pop("paths", None)
+        shutil.rmtree(work / "full", ignore_errors=True)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_region.py
+
+"""
+Benchmark: full disk vs. región (--region) en el pipeline LST.
+
+Cada corrida es un subproceso nuevo (tiempo y pico de RSS sin contaminación);
+antes se hace una pasada de calentamiento por modo para que las LUTs ya estén
+en disco. Sin --input se genera un LSTF sintético:
+
+    python benchmarks/bench_region.py --size 5424 --region south_america
+    python benchmarks/bench_region.py --input data/raw/.../OR_ABI-L2-LSTF-...nc --region argentina
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCH_DIR.parent / "src"
+
+_CHILD = r"""
+import json, resource, sys, time
+sys.path.insert(0, {src!r})
+from goes_processor.processing.logic_how.lst import process_file
+from goes_processor.processing.logic_resample.lut import preload_luts
+preload_luts()
+t0 = time.perf_counter()
+process_file({input!r}, {base!r}, {out!r}, format="both", region={region!r})
+elapsed = time.perf_counter() - t0
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print("BENCH_RESULT " + json.dumps({{"seconds": elapsed, "peak_rss_mb": peak_kb / 1024}}))
+"""
+
+
+def run_mode(input_file: Path, region, env) -> dict:
+    with tempfile.TemporaryDirectory() as out:
+        code = _CHILD.format(src=str(SRC_DIR), input=str(input_file), base=str(input_file.parent),
+                             out=out, region=region)
+        proc = subprocess.run([sys.executable, "-W", "ignore", "-c", code],
+                              capture_output=True, text=True, check=True, env=env)
+    line = next(l for l in proc.stdout.splitlines() if l.startswith("BENCH_RESULT "))
+    return json.loads(line.split(" ", 1)[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--input", type=Path, default=None, help="Archivo ABI-L2-LSTF (por defecto, sintético)")
+    parser.add_argument("--size", type=int, default=2712, help="Lado del LSTF sintético")
+    parser.add_argument("--region", default="south_america", help="Preset, bbox o areas.yaml:nombre")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json", type=Path, default=None, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="goes_region_") as work:
+        env = dict(os.environ)
+        env.setdefault("SATPY_CACHE_DIR", str(Path(work) / "cache"))
+        if args.input is None:
+            sys.path.insert(0, str(BENCH_DIR))
+            from synthetic_abi import make_archive
+            input_file = make_archive(Path(work) / "raw", "LSTF", args.size, 1)[0]
+        else:
+            input_file = args.input.resolve()
+
+        results = {}
+        for label, region in (("full disk", None), (args.region, args.region)):
+            run_mode(input_file, region, env)  # calentamiento: LUT en disco
+            runs = [run_mode(input_file, region, env) for _ in range(args.repeat)]
+            results[label] = min(runs, key=lambda r: r["seconds"])
+            best = results[label]
+            print(f"  - {label:20s}: {best['seconds']:7.2f} s   pico RSS {best['peak_rss_mb']:8.1f} MB")
+
+    full, reg = results["full disk"], results[args.region]
+    print(f"[*] Aceleración {args.region}: x{full['seconds'] / reg['seconds']:.2f} en tiempo, "
+          f"x{full['peak_rss_mb'] / reg['peak_rss_mb']:.2f} en memoria")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
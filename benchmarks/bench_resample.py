@@ -0,0 +1,87 @@
+# benchmarks/bench_resample.py
+
+"""
+Benchmark: scn.resample() de satpy vs. LUT cacheada (logic_resample.lut).
+
+Usa una grilla full-disk GOES-East sintética (sin archivos) y la grilla
+global WGS84 3600x1800 de lst.py. Ejemplo:
+
+    python benchmarks/bench_resample.py --size 5424 --resampler kd_tree --repeat 3
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import dask.array as da
+import numpy as np
+import xarray as xr
+from pyresample.geometry import AreaDefinition
+from satpy import Scene
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+from goes_processor.processing.logic_resample.lut import _LOADED, resample_scene  # noqa: E402
+
+FULL_DISK_HALF_EXTENT = 5434894.885056
+
+
+def goes_east_area(size: int) -> AreaDefinition:
+    proj = {"proj": "geos", "lon_0": -75.0, "h": 35786023.0, "a": 6378137.0,
+            "b": 6356752.31414, "units": "m", "sweep": "x"}
+    e = FULL_DISK_HALF_EXTENT
+    return AreaDefinition("goes_east", "GOES-East full disk", "abi_fixed_grid",
+                          proj, size, size, (-e, -e, e, e))
+
+
+def wgs84_area() -> AreaDefinition:
+    return AreaDefinition("global_wgs84", "Global WGS84", "epsg4326", "EPSG:4326",
+                          3600, 1800, [-180.0, -90.0, 180.0, 90.0])
+
+
+def make_scene(size: int) -> Scene:
+    src = goes_east_area(size)
+    yy, xx = np.mgrid[0:size, 0:size].astype(np.float32) / size
+    data = (250 + 60 * np.cos(yy * 6) * np.cos(xx * 3)).astype(np.float32)
+    scn = Scene()
+    scn["LST"] = xr.DataArray(da.from_array(data, chunks=2048), dims=("y", "x"),
+                              attrs={"name": "LST", "area": src, "units": "K"})
+    return scn
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=5424, help="Píxeles por lado del full disk")
+    parser.add_argument("--resampler", default="kd_tree", choices=["kd_tree", "bilinear"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-satpy", action="store_true", help="No medir scn.resample (lento/pesado)")
+    args = parser.parse_args()
+
+    scn = make_scene(args.size)
+    target = wgs84_area()
+    satpy_name = "nearest" if args.resampler == "kd_tree" else args.resampler
+
+    print(f"[*] Full disk {args.size}x{args.size} → WGS84 3600x1800 ({args.resampler})")
+
+    if not args.skip_satpy:
+        t = timed(lambda: scn.resample(target, resampler=satpy_name)["LST"].values, args.repeat)
+        print(f"  - satpy scn.resample : {min(t):8.3f} s (mín de {args.repeat})")
+
+    _LOADED.clear()
+    t_first = timed(lambda: resample_scene(scn, target, args.resampler)["LST"].values, 1)[0]
+    print(f"  - LUT primera vez    : {t_first:8.3f} s (construye o lee del disco)")
+    t = timed(lambda: resample_scene(scn, target, args.resampler)["LST"].values, args.repeat)
+    print(f"  - LUT en caliente    : {min(t) * 1000:8.1f} ms (mín de {args.repeat}, incluye carga de la fuente)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# benchmarks/bench_telemetry.py
+
+"""
+Costo de la instrumentación por etapas (goes_processor.telemetry).
+
+1. Micro: ns por span() con la sesión apagada (contexto nulo) y encendida.
+2. Pipeline: el mismo LSTF procesado con y sin --metrics-jsonl, en
+   subprocesos nuevos (LUT ya en disco tras una pasada de calentamiento).
+
+    python benchmarks/bench_telemetry.py --size 2712 --repeat 3
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCH_DIR.parent / "src"
+
+_CHILD = r"""
+import json, sys, time
+sys.path.insert(0, {src!r})
+from goes_processor import telemetry
+from goes_processor.processing.logic_how.lst import process_file
+from goes_processor.processing.logic_resample.lut import preload_luts
+preload_luts()
+if {jsonl!r}:
+    telemetry.configure({jsonl!r})
+t0 = time.perf_counter()
+process_file({input!r}, {base!r}, {out!r}, format="both", overwrite=True)
+elapsed = time.perf_counter() - t0
+telemetry.shutdown()
+print("BENCH_RESULT " + json.dumps({{"seconds": elapsed}}))
+"""
+
+
+def micro(n: int) -> dict:
+    sys.path.insert(0, str(SRC_DIR))
+    from goes_processor import telemetry
+
+    def loop():
+        t0 = time.perf_counter()
+        for _ in range(n):
+            with telemetry.span("process.load", file="x") as sp:
+                sp.add_bytes(1)
+        return (time.perf_counter() - t0) / n * 1e9
+
+    def baseline():
+        t0 = time.perf_counter()
+        for _ in range(n):
+            pass
+        return (time.perf_counter() - t0) / n * 1e9
+
+    telemetry.shutdown()
+    off = loop() - baseline()
+    with tempfile.TemporaryDirectory() as tmp:
+        with telemetry.session(str(Path(tmp) / "spans.jsonl")):
+            on = loop() - baseline()
+    return {"disabled_ns_per_span": off, "enabled_ns_per_span": on}
+
+
+def run_pipeline(input_file: Path, jsonl, env) -> float:
+    with tempfile.TemporaryDirectory() as out:
+        code = _CHILD.format(src=str(SRC_DIR), input=str(input_file), base=str(input_file.parent), out=out,
+                             jsonl=str(jsonl) if jsonl else None)
+        proc = subprocess.run([sys.executable, "-W", "ignore", "-c", code],
+                              capture_output=True, text=True, check=True, env=env)
+    line = next(l for l in proc.stdout.splitlines() if l.startswith("BENCH_RESULT "))
+    return json.loads(line.split(" ", 1)[1])["seconds"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--input", type=Path, default=None, help="Archivo ABI-L2-LSTF (por defecto, sintético)")
+    parser.add_argument("--size", type=int, default=2712, help="Lado del LSTF sintético")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--spans", type=int, default=200_000, help="Iteraciones del micro-benchmark")
+    parser.add_argument("--skip-pipeline", action="store_true")
+    parser.add_argument("--json", type=Path, default=None, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    results = micro(args.spans)
+    print(f"  - span() apagado : {results['disabled_ns_per_span']:8.0f} ns/span")
+    print(f"  - span() encendido: {results['enabled_ns_per_span']:8.0f} ns/span")
+
+    if not args.skip_pipeline:
+        with tempfile.TemporaryDirectory(prefix="goes_telemetry_") as work:
+            env = dict(os.environ)
+            env.setdefault("SATPY_CACHE_DIR", str(Path(work) / "cache"))
+            if args.input is None:
+                sys.path.insert(0, str(BENCH_DIR))
+                from synthetic_abi import make_archive
+                input_file = make_archive(Path(work) / "raw", "LSTF", args.size, 1)[0]
+            else:
+                input_file = args.input.resolve()
+
+            jsonl = Path(work) / "spans.jsonl"
+            run_pipeline(input_file, None, env)  # calentamiento: LUT en disco
+            for label, target in (("sin instrumentación", None), ("con --metrics-jsonl", jsonl)):
+                best = min(run_pipeline(input_file, target, env) for _ in range(args.repeat))
+                results[label] = best
+                print(f"  - LST {label:20s}: {best:7.2f} s")
+            off, on = results["sin instrumentación"], results["con --metrics-jsonl"]
+            print(f"[*] Sobrecosto en el pipeline: {100 * (on - off) / off:+.1f} %")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
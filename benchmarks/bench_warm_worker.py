@@ -0,0 +1,135 @@
+# benchmarks/bench_warm_worker.py
+
+"""
+Latencia por archivo: CLI en frío vs. servicio residente con workers calientes.
+
+Con N LSTF sintéticos (LUT ya en disco tras una pasada de calentamiento):
+
+- frío: un `processing bulk` por archivo en un proceso nuevo (import de
+  satpy, YAML de satpy_configs y LUT en cada corrida, como scheduler.py
+  antes y cualquier script que invoque el CLI);
+- caliente, CLI: `processing bulk --via-daemon` por archivo (proceso nuevo
+  liviano que solo envía el trabajo);
+- caliente, cliente: ServiceClient.run() desde un proceso ya abierto (la
+  ingesta).
+
+Informa también el arranque del servicio (se paga una vez) y a partir de
+cuántos archivos se amortiza. Sale con código 1 si el camino caliente por
+CLI no es más rápido que el frío.
+
+    python benchmarks/bench_warm_worker.py --size 1356 --files 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCH_DIR.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+from goes_processor.processing.logic_queue.work_queue import file_job  # noqa: E402
+from goes_processor.processing.logic_service.client import ServiceClient  # noqa: E402
+from synthetic_abi import make_archive  # noqa: E402
+
+
+def cli(args, env) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-W", "ignore", "-m", "goes_processor.main", *args], env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - t0
+
+
+def bulk_args(path: Path, raw: Path, out: Path, *extra) -> list:
+    # _sYYYYJJJHHMM... → filtros del crawler que seleccionan solo este archivo
+    stamp = path.name.split("_s", 1)[1]
+    return ["processing", "bulk", "--satellite", "19", "--product", "ABI-L2-LSTF", "--year", stamp[:4],
+            "--day", stamp[4:7], "--hour", stamp[7:9], "--minute", stamp[9:11], "--input-dir", str(raw),
+            "--output-dir", str(out), "--format", "png", "--overwrite", "yes", *extra]
+
+
+def start_service(address: str, env, log: Path):
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-W", "ignore", "-m", "goes_processor.main", "processing", "service",
+                             "run", "--address", address], env=env, stdout=log.open("w"), stderr=subprocess.STDOUT)
+    client = ServiceClient(address)
+    while not client.available():
+        if proc.poll() is not None:
+            raise RuntimeError(f"El servicio terminó al arrancar:\n{log.read_text()}")
+        time.sleep(0.1)
+    return proc, client, time.perf_counter() - t0
+
+
+def summary(times) -> dict:
+    return {"median": statistics.median(times), "mean": statistics.fmean(times), "min": min(times),
+            "max": max(times), "files": len(times)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1356, help="Lado del LSTF sintético")
+    parser.add_argument("--files", type=int, default=5, help="Archivos (uno por corrida)")
+    parser.add_argument("--json", type=Path, default=None, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_warm_") as work:
+        work = Path(work)
+        env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+        env.setdefault("SATPY_CACHE_DIR", str(work / "cache"))
+        raw, out = work / "raw", work / "out"
+        print(f"[*] Generando {args.files} LSTF sintéticos de {args.size}x{args.size}...")
+        files = make_archive(raw, "LSTF", args.size, args.files)
+
+        cli(bulk_args(files[0], raw, out), env)   # calentamiento: LUT en disco para ambos caminos
+        cold = [cli(bulk_args(f, raw, out), env) for f in files]
+
+        address = f"unix:{work / 'service.sock'}"
+        proc, client, startup = start_service(address, env, work / "service.log")
+        try:
+            via_cli = [cli(bulk_args(f, raw, out, "--via-daemon", "--daemon-address", address), env) for f in files]
+            params = {"input_base": str(raw), "output_base": str(out), "format": "png", "overwrite": True}
+            via_client, processing = [], []
+            for f in files:
+                t0 = time.perf_counter()
+                res = client.run(file_job("lst", f, params, out))
+                via_client.append(time.perf_counter() - t0)
+                if not res["ok"]:
+                    raise RuntimeError(res["error"])
+                processing.append(res["seconds"])
+            client.shutdown()
+            proc.wait(60)
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+
+    results = {"cold_cli": summary(cold), "warm_cli": summary(via_cli), "warm_client": summary(via_client),
+               "warm_processing": summary(processing), "service_startup_seconds": startup}
+    print(f"[*] Latencia por archivo (mediana / min / max), {args.files} archivos de {args.size}x{args.size}:")
+    for key, label in (("cold_cli", "CLI en frío (bulk)"), ("warm_cli", "servicio, bulk --via-daemon"),
+                       ("warm_client", "servicio, cliente en proceso"),
+                       ("warm_processing", "  de eso, proceso en el worker")):
+        r = results[key]
+        print(f"   - {label:<32} {r['median']:6.2f} s  {r['min']:6.2f} s  {r['max']:6.2f} s")
+
+    saved = results["cold_cli"]["median"] - results["warm_cli"]["median"]
+    print(f"   - arranque del servicio (una vez): {startup:.2f} s")
+    if saved > 0:
+        speedup = results["cold_cli"]["median"] / results["warm_cli"]["median"]
+        print(f"[*] OK: {saved:.2f} s menos por archivo ({speedup:.1f}x); "
+              f"el arranque se amortiza desde {max(1, -(-startup // saved)):.0f} archivo(s)")
+    else:
+        print("[!] El servicio no mejora la latencia por archivo frente al CLI en frío")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    sys.exit(0 if saved > 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+# benchmarks/run_benchmarks.py
+
+"""
+Suite de benchmarks con fixtures ABI L2 sintéticos (ver synthetic_abi.py).
+
+Por pipeline (lst, truecolor) mide tiempo, pico de RSS y bytes escritos de
+cada etapa (load, compute, resample, encode, write) y de la corrida completa
+de process_file; además mide el crawler (find_files) sobre árboles de 10k-100k
+archivos. Cada pipeline corre en un proceso nuevo para que el pico de RSS no
+se contamine entre mediciones. Los resultados se guardan en JSON para
+comparar entre commits:
+
+    python benchmarks/run_benchmarks.py --size 1356 --json bench_new.json
+    python benchmarks/run_benchmarks.py --compare bench_old.json bench_new.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+from synthetic_abi import make_archive, make_empty_tree  # noqa: E402
+
+STAGES = ("load", "compute", "resample", "encode", "write")
+PIPELINE_PRODUCTS = {"lst": "LSTF", "truecolor": "MCMIPF"}
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+# ---------------------------------------------------------------------------
+# Medición
+# ---------------------------------------------------------------------------
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE
+    except OSError:
+        # Sin /proc: ru_maxrss (KB en Linux) como aproximación monótona
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _written_bytes() -> int:
+    """Bytes pasados a write() por el proceso (incluye hilos de dask)."""
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+class StageMeter:
+    """Muestrea el RSS en un hilo y registra cada etapa con `with meter.stage(...)`."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stages = {}
+        self._peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self._peak = max(self._peak, _rss_bytes())
+            time.sleep(self.interval)
+
+    @contextmanager
+    def stage(self, name: str):
+        self._peak = rss0 = _rss_bytes()
+        w0 = _written_bytes()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - t0
+            self._peak = max(self._peak, _rss_bytes())
+            self.stages[name] = {
+                "seconds": round(seconds, 4),
+                "peak_rss_mb": round(self._peak / 1024**2, 1),
+                "rss_delta_mb": round((self._peak - rss0) / 1024**2, 1),
+                "bytes_written": _written_bytes() - w0,
+            }
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def _dir_bytes(path: Path) -> int:
+    return sum(p.stat().st_size for p in Path(path).rglob("*") if p.is_file())
+
+
+def _encode_png(data_arr) -> bytes:
+    from satpy.writers import get_enhanced_image
+    buf = io.BytesIO()
+    get_enhanced_image(data_arr).pil_image().save(buf, format="PNG")
+    return buf.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# Etapas por pipeline (en un proceso hijo)
+# ---------------------------------------------------------------------------
+def _stages_lst(meter: StageMeter, input_file: Path, out_dir: Path):
+    """Mismos pasos que lst.process_file, materializando entre etapas."""
+    import dask.array as da
+    import numpy as np
+    from satpy import Scene
+    from goes_processor.processing.logic_how.lst import (
+        KELVIN_UNITS, PROD_COLOR, PROD_GRAY, _global_area)
+    from goes_processor.processing.logic_resample.lut import resample_scene
+
+    with meter.stage("load"):
+        scn = Scene(filenames=[str(input_file)], reader="abi_l2_nc")
+        scn.load([PROD_GRAY, PROD_COLOR])
+        for p in (PROD_GRAY, PROD_COLOR):
+            scn[p] = scn[p].persist()
+
+    with meter.stage("compute"):
+        for p in (PROD_GRAY, PROD_COLOR):
+            if scn[p].attrs.get("units") in KELVIN_UNITS:
+                attrs = dict(scn[p].attrs, units="Celsius")
+                scn[p] = (scn[p] - 273.15).persist()
+                scn[p].attrs = attrs
+        data = scn[PROD_GRAY].data
+        da.compute(da.nanmin(data), da.nanmax(data), da.nanmean(data))
+
+    with meter.stage("resample"):
+        scn_res = resample_scene(scn, _global_area(), resampler="kd_tree")
+        for p in (PROD_GRAY, PROD_COLOR):
+            scn_res[p] = scn_res[p].persist()
+
+    with meter.stage("encode"):
+        pngs = {
+            "native_gray.png": _encode_png(scn[PROD_GRAY]),
+            "native_color.png": _encode_png(scn[PROD_COLOR]),
+            "wgs84_gray.png": _encode_png(scn_res[PROD_GRAY]),
+            "wgs84_color.png": _encode_png(scn_res[PROD_COLOR]),
+        }
+
+    # Los GeoTIFF codifican y escriben en la misma llamada del writer
+    with meter.stage("write"):
+        for name, payload in pngs.items():
+            (out_dir / name).write_bytes(payload)
+        scn_res.save_dataset(PROD_GRAY, filename=str(out_dir / "wgs84_gray.tif"),
+                             writer="geotiff", dtype=np.float32)
+        scn_res.save_dataset(PROD_COLOR, filename=str(out_dir / "wgs84_color.tif"), writer="geotiff")
+
+
+def _stages_truecolor(meter: StageMeter, input_file: Path, out_dir: Path, composite: str = "true_color"):
+    """Mismos pasos que truecolor.process_file, materializando entre etapas."""
+    from satpy import Scene
+    from goes_processor.processing.logic_resample.lut import resample_scene
+    from pyresample.geometry import AreaDefinition
+
+    with meter.stage("load"):
+        scn = Scene(filenames=[str(input_file)], reader="abi_l2_nc")
+        scn.load([composite])
+
+    # El compositor (corrección rayleigh, sharpening) se evalúa aquí
+    with meter.stage("compute"):
+        scn[composite] = scn[composite].persist()
+
+    with meter.stage("resample"):
+        area_def = AreaDefinition(
+            "global_wgs84", "Lat-Lon Global Plate Carree", "wgs84",
+            {"proj": "eqc", "lat_ts": 0, "lat_0": 0, "lon_0": 0, "x_0": 0, "y_0": 0,
+             "ellps": "WGS84", "units": "m"},
+            3600, 1800, (-20037508.34, -10018754.17, 20037508.34, 10018754.17))
+        scn_res = resample_scene(scn, area_def, resampler="bilinear", datasets=[composite])
+        scn_res[composite] = scn_res[composite].persist()
+
+    with meter.stage("encode"):
+        pngs = {
+            "original_goes.png": _encode_png(scn[composite]),
+            "wgs84.png": _encode_png(scn_res[composite]),
+        }
+
+    with meter.stage("write"):
+        for name, payload in pngs.items():
+            (out_dir / name).write_bytes(payload)
+        scn_res.save_dataset(composite, filename=str(out_dir / "wgs84.tif"), writer="geotiff")
+
+
+def _child_stages(pipeline: str, input_file: str, out_dir: str, options: dict) -> dict:
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    meter = StageMeter()
+    result = {"ok": True}
+    try:
+        if pipeline == "lst":
+            _stages_lst(meter, Path(input_file), out)
+        else:
+            _stages_truecolor(meter, Path(input_file), out, options.get("composite", "true_color"))
+    except Exception as e:
+        result.update(ok=False, error=f"{type(e).__name__}: {e}")
+    finally:
+        meter.close()
+    result["stages"] = meter.stages
+    result["output_bytes"] = _dir_bytes(out)
+    return result
+
+
+def _child_end_to_end(pipeline: str, input_file: str, input_base: str, out_dir: str, profile_name: str) -> dict:
+    from goes_processor.processing.logic_parallel.profile import resolve_profile
+    profile = resolve_profile(profile_name)
+    w0 = _written_bytes()
+    t0 = time.perf_counter()
+    try:
+        if pipeline == "lst":
+            from goes_processor.processing.logic_how.lst import process_file
+            process_file(Path(input_file), Path(input_base), Path(out_dir), profile=profile)
+        else:
+            from goes_processor.processing.logic_how.truecolor import process_file
+            process_file([Path(input_file)], Path(input_base), Path(out_dir), profile=profile)
+        result = {"ok": True}
+    except Exception as e:
+        result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    result.update(
+        seconds=round(time.perf_counter() - t0, 4),
+        peak_rss_mb=round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        bytes_written=_written_bytes() - w0,
+        output_bytes=_dir_bytes(Path(out_dir)),
+    )
+    return result
+
+
+def _in_fresh_process(fn, *args):
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as ex:
+        return ex.submit(fn, *args).result()
+
+
+def bench_pipeline(pipeline: str, fixtures: Path, work: Path, size: int, repeat: int, options: dict) -> dict:
+    product = PIPELINE_PRODUCTS[pipeline]
+    found = sorted(fixtures.glob(f"noaa-goes19/ABI-L2-{product}/**/*.nc"))
+    if found:
+        input_file = found[0]
+    else:
+        print(f"[*] Generando fixture {product} {size}x{size}...")
+        input_file = make_archive(fixtures, product, size, 1)[0]
+    print(f"[*] {pipeline}: {input_file.name} ({input_file.stat().st_size / 1024**2:.1f} MB)")
+
+    runs = []
+    for i in range(repeat):
+        # La primera corrida construye la LUT (caché fría); las siguientes la reutilizan
+        stages = _in_fresh_process(_child_stages, pipeline, str(input_file), str(work / f"{pipeline}_stages_{i}"), options)
+        e2e = _in_fresh_process(_child_end_to_end, pipeline, str(input_file), str(fixtures),
+                                str(work / f"{pipeline}_e2e_{i}"), options.get("profile", "default"))
+        runs.append({"stages": stages, "end_to_end": e2e})
+        for name in STAGES:
+            s = stages["stages"].get(name)
+            if s:
+                print(f"   - [{i}] {name:9s} {s['seconds']:7.2f} s  pico {s['peak_rss_mb']:7.1f} MB  "
+                      f"escrito {s['bytes_written'] / 1024**2:7.1f} MB")
+        if not stages["ok"]:
+            print(f"   [!] etapas: {stages['error']}")
+        status = "OK" if e2e["ok"] else f"ERROR {e2e['error']}"
+        print(f"   - [{i}] process_file {e2e['seconds']:.2f} s  pico {e2e['peak_rss_mb']:.1f} MB  [{status}]")
+
+    return {"input": input_file.name, "input_bytes": input_file.stat().st_size, "size": size, "runs": runs}
+
+
+# ---------------------------------------------------------------------------
+# Crawler
+# ---------------------------------------------------------------------------
+def bench_crawler(n_files: int, work: Path) -> dict:
+    from goes_processor.processing.logic_crawler.crawler import find_files
+
+    base = work / f"tree_{n_files}"
+    t0 = time.perf_counter()
+    make_empty_tree(base, n_files)
+    build = time.perf_counter() - t0
+    print(f"[*] Crawler: árbol de {n_files} archivos ({build:.1f} s para crearlo)")
+
+    query = ("19", "ABI-L2-LSTF", "2026", "002", "12", "all")
+    cases = [
+        ("glob_hour", dict(use_index=False), query),
+        ("index_cold_hour", dict(use_index=True), query),
+        ("index_warm_hour", dict(use_index=True), query),
+        ("glob_year", dict(use_index=False), query[:2] + ("2026", "all", "all", "all")),
+        ("index_warm_year", dict(use_index=True), query[:2] + ("2026", "all", "all", "all")),
+    ]
+    meter = StageMeter()
+    found = {}
+    try:
+        for name, kwargs, q in cases:
+            with meter.stage(name):
+                found[name] = len(find_files(base, *q, **kwargs))
+    finally:
+        meter.close()
+
+    for name, _, _ in cases:
+        s = meter.stages[name]
+        s["matches"] = found.get(name)
+        print(f"   - {name:16s} {s['seconds'] * 1000:9.1f} ms  ({s['matches']} coincidencias)")
+    shutil.rmtree(base, ignore_errors=True)
+    return {"files": n_files, "tree_build_seconds": round(build, 2), "cases": meter.stages}
+
+
+# ---------------------------------------------------------------------------
+# Comparación y main
+# ---------------------------------------------------------------------------
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+def _flatten(results: dict) -> dict:
+    flat = {}
+    for pipeline, data in results.get("pipelines", {}).items():
+        for i, run in enumerate(data["runs"]):
+            for stage, s in run["stages"]["stages"].items():
+                flat[f"{pipeline}[{i}].{stage}"] = s
+            flat[f"{pipeline}[{i}].process_file"] = run["end_to_end"]
+    for n, data in results.get("crawler", {}).items():
+        for case, s in data["cases"].items():
+            flat[f"crawler{n}.{case}"] = s
+    return flat
+
+
+def compare(old_path: Path, new_path: Path):
+    old = _flatten(json.loads(old_path.read_text(encoding="utf-8")))
+    new = _flatten(json.loads(new_path.read_text(encoding="utf-8")))
+    print(f"{'medición':38s} {'antes s':>9s} {'después s':>9s} {'x':>6s} {'pico MB antes/después':>24s}")
+    for key in sorted(set(old) & set(new)):
+        a, b = old[key], new[key]
+        ratio = a["seconds"] / b["seconds"] if b["seconds"] else float("inf")
+        print(f"{key:38s} {a['seconds']:9.3f} {b['seconds']:9.3f} {ratio:6.2f} "
+              f"{a['peak_rss_mb']:11.1f} / {b['peak_rss_mb']:<10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1356, help="Píxeles por lado de los fixtures (5424 = full disk)")
+    parser.add_argument("--pipelines", default="lst,truecolor", help="Lista separada por comas (vacío = ninguno)")
+    parser.add_argument("--crawler", default="10000,100000", help="Tamaños de árbol para el crawler (vacío = omitir)")
+    parser.add_argument("--repeat", type=int, default=1, help="Corridas por pipeline (la primera con LUT fría)")
+    parser.add_argument("--composite", default="true_color", help="Composite RGB para el pipeline truecolor")
+    parser.add_argument("--processing-profile", default="default", help="Perfil para process_file (auto, lean, fast...)")
+    parser.add_argument("--fixtures", type=Path, default=None, help="Directorio de fixtures a reutilizar")
+    parser.add_argument("--workdir", type=Path, default=None, help="Directorio de trabajo (por defecto temporal)")
+    parser.add_argument("--json", type=Path, default=None, help="Guardar resultados en JSON")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("ANTES", "DESPUES"), help="Comparar dos JSON")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    work = args.workdir or Path(tempfile.mkdtemp(prefix="goes_bench_"))
+    work.mkdir(parents=True, exist_ok=True)
+    fixtures = args.fixtures or work / "fixtures"
+    # Caché de LUT propia: la primera corrida siempre mide el caso frío
+    os.environ.setdefault("SATPY_CACHE_DIR", str(work / "cache"))
+
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "size": args.size,
+            "processing_profile": args.processing_profile,
+        },
+        "pipelines": {},
+        "crawler": {},
+    }
+    try:
+        for pipeline in filter(None, args.pipelines.split(",")):
+            results["pipelines"][pipeline] = bench_pipeline(
+                pipeline, fixtures, work, args.size, args.repeat, {"composite": args.composite, "profile": args.processing_profile})
+        for n in filter(None, args.crawler.split(",")):
+            results["crawler"][n] = bench_crawler(int(n), work)
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(work, ignore_errors=True)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"[*] Resultados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+# benchmarks/synthetic_abi.py
+
+"""
+Generador de NetCDF ABI L2 sintéticos (LSTF, MCMIPF y FDCF) que el lector
+`abi_l2_nc` de satpy acepta: proyección fija geoestacionaria, x/y escalados,
+variables empaquetadas en int16 con scale_factor/add_offset/_FillValue y
+atributos globales CF/GOES-R. También GLM L2 LCFA (flashes/grupos/eventos
+cada 20 s) para los procesadores de puntos.
+
+    python benchmarks/synthetic_abi.py --product LSTF --size 5424 --out data/synthetic
+    python benchmarks/synthetic_abi.py --product MCMIPF --size 1356 --count 6 --out data/synthetic
+    python benchmarks/synthetic_abi.py --product GLM --count 45 --out data/synthetic
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import xarray as xr
+
+# Ángulo de escaneo del borde del full disk (rad) y del limbo terrestre
+FULL_DISK_HALF_ANGLE = 0.151844
+EARTH_LIMB_ANGLE = 0.1512
+
+GOES_PROJECTION = dict(
+    semi_major_axis=6378137.0,
+    semi_minor_axis=6356752.31414,
+    inverse_flattening=298.2572221,
+    perspective_point_height=35786023.0,
+    longitude_of_projection_origin=-75.0,
+    latitude_of_projection_origin=0.0,
+    sweep_angle_axis="x",
+    grid_mapping_name="geostationary",
+)
+
+# Canales reflectivos (1-6) en factor de reflectancia, emisivos (7-16) en K
+REFLECTIVE_CHANNELS = range(1, 7)
+
+# FDC: categorías de fuego de la máscara y código de píxel de tierra sin fuego
+FDC_FIRE_CODES = (10, 11, 12, 13, 14, 15, 30, 31, 32, 33, 34, 35)
+FDC_CLEAR_LAND = 100
+
+
+def abi_filename(product: str, start: datetime, satellite: str = "19", mode: str = "M6") -> str:
+    end = start + timedelta(minutes=9, seconds=20)
+    created = end + timedelta(seconds=40)
+    fmt = lambda t: t.strftime("%Y%j%H%M%S") + str(t.microsecond // 100000)  # noqa: E731
+    return f"OR_ABI-L2-{product}-{mode}_G{satellite}_s{fmt(start)}_e{fmt(end)}_c{fmt(created)}.nc"
+
+
+def _scan_angles(size: int):
+    step = 2 * FULL_DISK_HALF_ANGLE / (size - 1)
+    idx = np.arange(size, dtype=np.int16)
+    x = xr.DataArray(idx, dims="x", attrs=dict(
+        scale_factor=np.float32(step), add_offset=np.float32(-FULL_DISK_HALF_ANGLE),
+        units="rad", axis="X", long_name="GOES fixed grid projection x-coordinate",
+        standard_name="projection_x_coordinate"))
+    y = xr.DataArray(idx, dims="y", attrs=dict(
+        scale_factor=np.float32(-step), add_offset=np.float32(FULL_DISK_HALF_ANGLE),
+        units="rad", axis="Y", long_name="GOES fixed grid projection y-coordinate",
+        standard_name="projection_y_coordinate"))
+    angles = -FULL_DISK_HALF_ANGLE + np.arange(size) * step
+    return x, y, angles
+
+
+def _packed(values, disk, scale, offset, units, **attrs):
+    raw = np.round((values - offset) / scale)
+    raw = np.clip(raw, 0, 65534).astype(np.uint16)
+    raw[~disk] = 65535
+    return xr.DataArray(raw.view(np.int16), dims=("y", "x"), attrs=dict(
+        scale_factor=np.float32(scale), add_offset=np.float32(offset),
+        _FillValue=np.int16(-1), _Unsigned="true", units=units,
+        grid_mapping="goes_imager_projection", coordinates="t y x", **attrs))
+
+
+def make_abi_l2(path, product: str = "LSTF", size: int = 5424, start: datetime = None,
+                seed: int = 0, compress: bool = True) -> Path:
+    """Escribe un archivo ABI L2 sintético y devuelve su ruta."""
+    path = Path(path)
+    start = start or datetime(2026, 1, 3, 12, 0, 21)
+    rng = np.random.default_rng(seed)
+    x, y, angles = _scan_angles(size)
+
+    ds = xr.Dataset(coords={"x": x, "y": y})
+    ds["goes_imager_projection"] = xr.DataArray(np.int32(-2147483647), attrs=GOES_PROJECTION)
+
+    # Campos suaves + ruido; fuera del disco terrestre queda _FillValue
+    X = angles[None, :].astype(np.float32)
+    Y = angles[:, None].astype(np.float32)
+    disk = np.hypot(X, Y) < EARTH_LIMB_ANGLE
+    noise = rng.normal(0, 0.5, size=(size, size)).astype(np.float32)
+
+    if product == "LSTF":
+        lst = 250 + 60 * np.cos(Y * 10) * np.cos(X * 5) + noise
+        ds["LST"] = _packed(lst, disk, 0.0025, 150.0, "K", long_name="ABI L2+ Land Surface Temperature",
+                            standard_name="surface_temperature")
+        ds["DQF"] = xr.DataArray(np.where(disk, 0, 1).astype(np.uint8), dims=("y", "x"), attrs=dict(
+            units="1", flag_values=np.array([0, 1], np.uint8), flag_meanings="good_quality_qf invalid_qf",
+            grid_mapping="goes_imager_projection"))
+    elif product == "MCMIPF":
+        for c in range(1, 17):
+            if c in REFLECTIVE_CHANNELS:
+                values = 0.05 + 0.6 * np.abs(np.sin(X * (20 + c)) * np.cos(Y * 15)) + noise * 0.01
+                ds[f"CMI_C{c:02d}"] = _packed(values, disk, 0.0003, 0.0, "1",
+                                              standard_name="toa_lambertian_equivalent_albedo_multiplied_by_cosine_solar_zenith_angle")
+            else:
+                values = 220 + 60 * np.abs(np.sin(X * c)) + noise
+                ds[f"CMI_C{c:02d}"] = _packed(values, disk, 0.01, 150.0, "K",
+                                              standard_name="toa_brightness_temperature")
+            ds[f"DQF_C{c:02d}"] = xr.DataArray(np.where(disk, 0, 1).astype(np.uint8), dims=("y", "x"),
+                                               attrs=dict(units="1", grid_mapping="goes_imager_projection"))
+    elif product == "FDCF":
+        # Fuegos dispersos dentro del disco (~0.02 % de los píxeles), con FRP log-normal
+        fire = disk & (rng.random((size, size)) < 2e-4)
+        mask = np.where(disk, FDC_CLEAR_LAND, -99).astype(np.int16)
+        mask[fire] = rng.choice(FDC_FIRE_CODES, size=int(fire.sum()))
+        ds["Mask"] = xr.DataArray(mask, dims=("y", "x"), attrs=dict(
+            _FillValue=np.int16(-99), units="1", long_name="ABI L2+ Fire-Hot Spot Characterization: Fire Mask",
+            grid_mapping="goes_imager_projection"))
+        power = np.full((size, size), np.nan, dtype=np.float32)
+        power[fire] = rng.lognormal(3.0, 1.0, size=int(fire.sum())).astype(np.float32)
+        ds["Power"] = xr.DataArray(power, dims=("y", "x"), attrs=dict(
+            units="MW", long_name="ABI L2+ Fire-Hot Spot Characterization: Fire Radiative Power",
+            grid_mapping="goes_imager_projection"))
+    else:
+        raise ValueError(f"Producto sintético no soportado: {product}")
+
+    ds["nominal_satellite_subpoint_lat"] = xr.DataArray(np.float32(0.0), attrs={"units": "degrees_north"})
+    ds["nominal_satellite_subpoint_lon"] = xr.DataArray(np.float32(-75.0), attrs={"units": "degrees_east"})
+    ds["nominal_satellite_height"] = xr.DataArray(np.float32(35786.023), attrs={"units": "km"})
+
+    end = start + timedelta(minutes=9, seconds=20)
+    ds.attrs = dict(
+        Conventions="CF-1.7",
+        title=f"ABI L2 {product} (sintético)",
+        dataset_name=path.name,
+        time_coverage_start=start.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-5] + "Z",
+        time_coverage_end=end.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-5] + "Z",
+        spatial_resolution="2km at nadir",
+        orbital_slot="GOES-East",
+        platform_ID="G19",
+        instrument_ID="FM4",
+        scene_id="Full Disk",
+        timeline_id="ABI Mode 6",
+        production_site="SYNTH",
+    )
+
+    chunk = min(size, 226)
+    encoding = {k: {"zlib": compress, "complevel": 1, "chunksizes": (chunk, chunk)}
+                for k in ds.data_vars if ds[k].ndim == 2}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ds.to_netcdf(path, encoding=encoding)
+    return path
+
+
+def make_archive(base_dir, product: str = "LSTF", size: int = 1356, count: int = 1,
+                 start: datetime = None, step_minutes: int = 10, satellite: str = "19"):
+    """Crea `count` archivos con la estructura de data/raw (noaa-goesX/producto/YYYY/JJJ/HH)."""
+    start = start or datetime(2026, 1, 3, 12, 0, 21)
+    paths = []
+    for i in range(count):
+        t = start + timedelta(minutes=step_minutes * i)
+        folder = Path(base_dir) / f"noaa-goes{satellite}" / f"ABI-L2-{product}" / f"{t:%Y}" / f"{t:%j}" / f"{t:%H}"
+        paths.append(make_abi_l2(folder / abi_filename(product, t, satellite), product, size, t, seed=i))
+    return paths
+
+
+def glm_filename(start: datetime, satellite: str = "19") -> str:
+    end = start + timedelta(seconds=20)
+    created = end + timedelta(seconds=2)
+    fmt = lambda t: t.strftime("%Y%j%H%M%S") + str(t.microsecond // 100000)  # noqa: E731
+    return f"OR_GLM-L2-LCFA_G{satellite}_s{fmt(start)}_e{fmt(end)}_c{fmt(created)}.nc"
+
+
+def _glm_coord(values, scale, offset, units):
+    raw = np.clip(np.round((values - offset) / scale), 0, 65534).astype(np.uint16).view(np.int16)
+    return raw, dict(scale_factor=np.float32(scale), add_offset=np.float32(offset), _Unsigned="true", units=units)
+
+
+def make_glm_lcfa(path, start: datetime = None, flashes: int = 2000, seed: int = 0) -> Path:
+    """
+    LCFA sintético: `flashes` flashes agrupados en tormentas dentro del campo
+    de visión, ~4 grupos por flash y ~5 eventos por grupo (lat/lon de eventos
+    empaquetadas en int16 como en el producto real).
+    """
+    path = Path(path)
+    start = start or datetime(2026, 1, 3, 12, 0, 0)
+    rng = np.random.default_rng(seed)
+    storms = np.column_stack([rng.uniform(-130, -20, 40), rng.uniform(-50, 50, 40)])
+
+    def scatter(centers, n, spread):
+        idx = rng.integers(0, len(centers), n)
+        return (centers[idx, 0] + rng.normal(0, spread, n), centers[idx, 1] + rng.normal(0, spread, n), idx)
+
+    f_lon, f_lat, _ = scatter(storms, flashes, 1.5)
+    g_lon, g_lat, g_parent = scatter(np.column_stack([f_lon, f_lat]), flashes * 4, 0.05)
+    e_lon, e_lat, e_parent = scatter(np.column_stack([g_lon, g_lat]), flashes * 20, 0.02)
+
+    ds = xr.Dataset()
+    for prefix, lon, lat in (("flash", f_lon, f_lat), ("group", g_lon, g_lat)):
+        dim = f"number_of_{prefix}es" if prefix == "flash" else f"number_of_{prefix}s"
+        ds[f"{prefix}_lat"] = xr.DataArray(lat.astype(np.float32), dims=dim, attrs={"units": "degrees_north"})
+        ds[f"{prefix}_lon"] = xr.DataArray(lon.astype(np.float32), dims=dim, attrs={"units": "degrees_east"})
+        ds[f"{prefix}_quality_flag"] = xr.DataArray(np.zeros(lat.size, np.int16), dims=dim)
+    ds["group_parent_flash_id"] = xr.DataArray(g_parent.astype(np.int32), dims="number_of_groups")
+    raw_lat, lat_attrs = _glm_coord(e_lat, 0.00203128, -66.56, "degrees_north")
+    raw_lon, lon_attrs = _glm_coord(e_lon, 0.00203128, -141.56, "degrees_east")
+    ds["event_lat"] = xr.DataArray(raw_lat, dims="number_of_events", attrs=lat_attrs)
+    ds["event_lon"] = xr.DataArray(raw_lon, dims="number_of_events", attrs=lon_attrs)
+    ds["event_parent_group_id"] = xr.DataArray(e_parent.astype(np.int32), dims="number_of_events")
+
+    ds.attrs = dict(Conventions="CF-1.7", title="GLM L2 Lightning Detections (sintético)",
+                    dataset_name=path.name, platform_ID="G19",
+                    time_coverage_start=start.strftime("%Y-%m-%dT%H:%M:%S.0Z"),
+                    time_coverage_end=(start + timedelta(seconds=20)).strftime("%Y-%m-%dT%H:%M:%S.0Z"))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ds.to_netcdf(path, encoding={k: {"zlib": True, "complevel": 1} for k in ds.data_vars})
+    return path
+
+
+def make_glm_archive(base_dir, count: int = 45, start: datetime = None, flashes: int = 2000,
+                     satellite: str = "19"):
+    """`count` LCFA consecutivos (uno cada 20 s) con la estructura de data/raw."""
+    start = start or datetime(2026, 1, 3, 12, 0, 0)
+    paths = []
+    for i in range(count):
+        t = start + timedelta(seconds=20 * i)
+        folder = Path(base_dir) / f"noaa-goes{satellite}" / "GLM-L2-LCFA" / f"{t:%Y}" / f"{t:%j}" / f"{t:%H}"
+        paths.append(make_glm_lcfa(folder / glm_filename(t, satellite), t, flashes, seed=i))
+    return paths
+
+
+def make_empty_tree(base_dir, n_files: int, products=("ABI-L2-LSTF", "ABI-L2-MCMIPF"),
+                    start: datetime = None, satellite: str = "19"):
+    """Árbol de archivos vacíos con nombres válidos (para medir el crawler)."""
+    start = start or datetime(2026, 1, 1, 0, 0, 21)
+    per_product = max(1, n_files // len(products))
+    for product in products:
+        short = product.split("-", 2)[2]
+        for i in range(per_product):
+            t = start + timedelta(minutes=10 * i)
+            folder = Path(base_dir) / f"noaa-goes{satellite}" / product / f"{t:%Y}" / f"{t:%j}" / f"{t:%H}"
+            folder.mkdir(parents=True, exist_ok=True)
+            (folder / abi_filename(short, t, satellite)).touch()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--product", default="LSTF", choices=["LSTF", "MCMIPF", "FDCF", "GLM"])
+    parser.add_argument("--size", type=int, default=5424, help="Píxeles por lado (5424 = full disk 2 km)")
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--out", default="data/synthetic")
+    args = parser.parse_args()
+    if args.product == "GLM":
+        paths = make_glm_archive(args.out, args.count)
+    else:
+        paths = make_archive(args.out, args.product, args.size, args.count)
+    for p in paths:
+        print(f"[*] {p} ({p.stat().st_size / 1024**2:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,28 @@
 import fsspec
 from pathlib import Path
 import os
-import shutil
-from typing import List
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional
 import socket
 import time
 from datetime import datetime
 
+from .listing import LISTING_NAME, ListingCache
+from .manifest import DirectoryManifest, ManifestRegistry
+from ..processing.logic_crawler.index import update_index
+from ..storage.quota import notify as notify_storage
+from ..telemetry import span
+
+log = logging.getLogger(__name__)
+
+# Tamaño de bloque para lecturas remotas y copia a disco (8 MB)
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Sufijo de las descargas parciales (retomables)
+PART_SUFFIX = ".part"
+
 def check_internet():
     try:
         socket.create_connection(("8.8.8.8", 53), timeout=3)
@@ -16,98 +32,314 @@ def check_internet():
     except OSError:
         return False
 
+
+class ByteBudget:
+    """
+    Presupuesto de bytes en vuelo compartido entre los workers.
+    Un archivo más grande que el presupuesto igual se descarga, pero solo.
+    """
+
+    def __init__(self, limit_bytes: int):
+        self.limit = max(1, int(limit_bytes))
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, n: int) -> int:
+        n = min(max(0, int(n)), self.limit)
+        with self._cond:
+            while self.in_flight and self.in_flight + n > self.limit:
+                self._cond.wait()
+            self.in_flight += n
+        return n
+
+    def release(self, n: int):
+        with self._cond:
+            self.in_flight -= n
+            self._cond.notify_all()
+
+
+def make_filesystem(workers: int = 4):
+    """
+    Filesystem S3 anónimo con un único pool de conexiones dimensionado
+    para la cantidad de workers (todas las descargas comparten el cliente).
+    """
+    return fsspec.filesystem(
+        's3',
+        anon=True,
+        config_kwargs={'max_pool_connections': max(10, workers * 2)},
+    )
+
+
+def list_product_files(fs, satellite: str, product: str, year: str, day_of_year: str,
+                       hour: str, minute: str = "all", cache: Optional[ListingCache] = None) -> Dict[str, dict]:
+    """
+    Claves (con tamaño/ETag) de un producto para un día/hora/minuto ("all" = todo).
+    Lista los prefijos de hora directamente (en paralelo) a través de `cache`;
+    sin cache persistente se usa uno en memoria para esta llamada.
+    """
+    path_prefix = f"noaa-goes{satellite}/{product}/{year}/{day_of_year.zfill(3)}"
+    if hour != "all":
+        path_prefix += f"/{hour.zfill(2)}"
+
+    log.info(f"[*] Escaneando: s3://{path_prefix}")
+    owned = cache is None
+    cache = cache or ListingCache()
+    try:
+        with span("download.list", product=product, prefix=path_prefix) as sp:
+            before = dict(cache.stats)
+            remote_info = cache.list(fs, satellite, product, year, day_of_year, hour, minute)
+            sp.set(objects=len(remote_info), **{k: v - before[k] for k, v in cache.stats.items()})
+    finally:
+        if owned:
+            cache.close()
+    return remote_info
+
+
+def _fetch(fs, remote_file: str, local_path: Path, remote_size: int, budget: ByteBudget,
+           manifest: DirectoryManifest, etag: Optional[str] = None, retries: int = 3,
+           reserved: Optional[int] = None) -> int:
+    """
+    Descarga por rangos de bytes a un archivo .part, retomando desde el último
+    offset bueno ante cortes de red. Al completar se renombra de forma atómica.
+    `reserved`: bytes de `budget` que el llamador ya tomó para este archivo
+    (el spool del streaming los libera recién al procesarlo); en ese caso aquí
+    no se reserva ni se libera.
+    """
+    part_path = local_path.with_name(local_path.name + PART_SUFFIX)
+    part_key = part_path.name
+
+    # Un .part de otra versión del objeto (ETag distinto) no sirve para retomar
+    part_entry = manifest.get(part_key)
+    if part_path.exists() and etag and part_entry and part_entry.get("etag") not in (None, etag):
+        part_path.unlink()
+    if not part_path.exists():
+        part_path.touch()
+        manifest.record(part_key, 0, etag)
+
+    offset = part_path.stat().st_size
+    if offset > remote_size:
+        part_path.write_bytes(b"")
+        offset = 0
+    elif offset:
+        log.info(f"         └─> [RETOMANDO] {local_path.name} desde {offset/(1024**2):.1f} MB")
+
+    owned = reserved is None
+    if owned:
+        reserved = budget.acquire(remote_size - offset)
+    try:
+        attempt = 0
+        with span("download.transfer", file=local_path.name, resumed_from=offset) as sp, \
+                open(part_path, 'ab') as lf:
+            while offset < remote_size:
+                end = min(offset + CHUNK_SIZE, remote_size)
+                try:
+                    chunk = fs.cat_file(remote_file, start=offset, end=end)
+                except Exception:
+                    attempt += 1
+                    if attempt > retries:
+                        raise
+                    time.sleep(min(2 ** attempt, 30))
+                    continue
+                if not chunk:
+                    break
+                lf.write(chunk)
+                lf.flush()
+                offset += len(chunk)
+                sp.add_bytes(len(chunk))
+                attempt = 0
+    finally:
+        if owned:
+            budget.release(reserved)
+
+    with span("download.verify", file=local_path.name, valid=offset == remote_size):
+        if offset == remote_size:
+            os.replace(part_path, local_path)
+            manifest.forget(part_key)
+            manifest.record(local_path.name, remote_size, etag)
+    return offset
+
+
+def _fetch_subset(fs, remote_file: str, local_path: Path, remote_size: int, etag: Optional[str],
+                  subset, refs_dir: Path, manifest: DirectoryManifest, tag: str) -> int:
+    """
+    Lectura parcial: índice de chunks (cacheado en refs_dir) y NetCDF reducido
+    con solo las variables/ventana de `subset`. Devuelve el tamaño local.
+    """
+    # Import diferido: h5py/netCDF4 solo con --variables/--region
+    from .references import references_for, write_subset
+
+    with span("download.subset", file=local_path.name, subset=subset.describe()) as sp:
+        refs = references_for(fs, remote_file, refs_dir, remote_size, etag, subset.variables)
+        stats = write_subset(fs, remote_file, refs, local_path, subset)
+        sp.add_bytes(stats["fetched_bytes"])
+        sp.set(variables=len(stats["variables"]), window=stats["window"], remote_bytes=remote_size)
+    manifest.record(local_path.name, local_path.stat().st_size, tag)
+    return stats["fetched_bytes"]
+
+
 def download_files(
     product: str,
     year: str,
-    day_of_year: str, 
+    day_of_year: str,
     hour: str,
     minute: str = "all",
     output_dir: str = "data/raw",
     satellite: str = "19",
-    overwrite: bool = False
+    overwrite: bool = False,
+    workers: int = 4,
+    max_inflight_mb: int = 2048,
+    retries: int = 3,
+    fs=None,
+    listing_cache: bool = True,
+    subset=None,
 ) -> List[Path]:
-    
+    """
+    Descarga los NetCDF de un producto. Con `subset` (references.Subset) no se
+    baja el archivo entero: solo los chunks de las variables/ventana pedidas,
+    escritos como un NetCDF reducido con el mismo nombre.
+    """
+
     start_time_process = time.time()
     system_start_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    print(f"\n[*] Inicio del sistema: {system_start_time}")
-    
-    if not check_internet():
-        print("\n" + "!"*60 + "\n[!] ERROR: SIN ACCESO A INTERNET.\n" + "!"*60)
-        return []
+    log.info(f"[*] Inicio del sistema: {system_start_time}")
+
+    # Con un filesystem inyectado (p.ej. memoria/local en pruebas) no chequeamos la red
+    if fs is None:
+        if not check_internet():
+            log.error("[!] ERROR: SIN ACCESO A INTERNET.")
+            return []
+        fs = make_filesystem(workers)
 
     bucket_name = f"noaa-goes{satellite}"
-    fs = fsspec.filesystem('s3', anon=True)
-    
-    path_prefix = f"{bucket_name}/{product}/{year}/{day_of_year.zfill(3)}"
-    if hour != "all":
-        path_prefix += f"/{hour.zfill(2)}"
 
-    print(f"[*] Escaneando: s3://{path_prefix}")
-    
+    # Cache de listados junto a las descargas: las horas cerradas no se vuelven a listar
+    cache = ListingCache(Path(output_dir) / LISTING_NAME) if listing_cache else None
     try:
-        all_files = fs.glob(f"{path_prefix}/**/*.nc")
+        remote_info = list_product_files(fs, satellite, product, year, day_of_year, hour, minute, cache)
     except Exception as e:
-        print(f"[!] Error al acceder al bucket: {e}")
+        log.warning(f"[!] Error al acceder al bucket: {e}")
         return []
+    finally:
+        if cache is not None:
+            cache.close()
 
-    if minute != "all":
-        time_match = f"s{year}{day_of_year.zfill(3)}{hour.zfill(2)}{minute.zfill(2)}"
-        files_to_download = [f for f in all_files if time_match in f]
-    else:
-        files_to_download = all_files
+    files_to_download = list(remote_info)
 
     total_files = len(files_to_download)
     if total_files == 0:
-        print(f"[!] No se encontraron archivos.")
+        log.warning(f"[!] No se encontraron archivos.")
         return []
 
-    print(f"[*] Se encontraron {total_files} archivos.")
+    workers = max(1, int(workers))
+    log.info(f"[*] Se encontraron {total_files} archivos. Workers: {workers}")
+    refs_dir = None
+    if subset is not None:
+        from .references import REFS_DIR
+        refs_dir = Path(output_dir) / REFS_DIR
+        log.info(f"[*] Lectura parcial: {subset.describe()}")
 
     # --- LÓGICA DE PADDING PARA EL CONTADOR (01/24) ---
     padding = len(str(total_files))
     if padding < 2: padding = 2  # Mínimo siempre 2 dígitos (01)
 
-    downloaded_paths = []
-    
-    for i, remote_file in enumerate(files_to_download, 1):
-        filename = remote_file.split('/')[-1]
-        h_folder = remote_file.split('/')[-2]
-        
+    budget = ByteBudget(max_inflight_mb * 1024**2)
+    manifests = ManifestRegistry()
+    counter_lock = threading.Lock()
+    done_count = [0]
+
+    def progress_label():
+        with counter_lock:
+            done_count[0] += 1
+            return f"[{done_count[0]:0{padding}d}/{total_files:0{padding}d}]"
+
+    def worker(remote_file: str) -> Optional[Path]:
+        parts = remote_file.rstrip('/').split('/')
+        filename, h_folder = parts[-1], parts[-2]
+
         local_path = Path(output_dir) / bucket_name / product / year / day_of_year.zfill(3) / h_folder / filename
         local_path.parent.mkdir(parents=True, exist_ok=True)
 
-        remote_size = fs.size(remote_file)
-        
-        # Formateo del contador con ceros a la izquierda
-        progress_label = f"[{i:0{padding}d}/{total_files:0{padding}d}]"
+        remote_size = remote_info[remote_file]['size']
+        etag = remote_info[remote_file]['etag']
+        manifest = manifests.for_dir(local_path.parent)
+        # Un recorte se registra con su propio "ETag": otro recorte o el archivo completo no lo confunden
+        subset_tag = f"{etag}#{subset.key()}" if subset is not None else None
 
-        # VERIFICACIÓN DE INTEGRIDAD
+        # VERIFICACIÓN DE INTEGRIDAD (contra el manifiesto: solo stat local)
         if local_path.exists():
             local_size = local_path.stat().st_size
-            if local_size == remote_size:
-                if not overwrite:
-                    print(f"   {progress_label} [OK - EXISTE] {filename} ({local_size/(1024**2):.1f} MB)")
-                    downloaded_paths.append(local_path)
-                    continue
-            else:
-                print(f"   {progress_label} [CORRUPTO] {local_size} != {remote_size}. Re-descargando...")
-                local_path.unlink()
+            if not overwrite:
+                with span("download.verify", file=filename) as sp:
+                    # El archivo completo también sirve cuando se pidió un recorte
+                    valid = manifest.is_valid(filename, remote_size, etag)
+                    entry = manifest.get(filename)
+                    if not valid and subset_tag and entry and entry.get("etag") == subset_tag:
+                        valid = manifest.is_valid(filename, entry["size"], subset_tag)
+                    if not valid and local_size == remote_size and entry is None:
+                        # Archivo previo al manifiesto: se adopta tal cual
+                        manifest.record(filename, remote_size, etag)
+                        valid = True
+                    sp.set(valid=valid)
+                if valid:
+                    log.info(f"   {progress_label()} [OK - EXISTE] {filename} ({local_size/(1024**2):.1f} MB)")
+                    return local_path
+                if entry and "#" in str(entry.get("etag")):
+                    log.warning(f"   [OTRO RECORTE] {filename}: lo local es una lectura parcial distinta. Re-descargando...")
+                else:
+                    log.warning(f"   [CORRUPTO] {filename}: {local_size} != {remote_size} (o ETag distinto). Re-descargando...")
+            local_path.unlink()
+            manifest.forget(filename)
 
-        # DESCARGA
-        print(f"   {progress_label} [BAJANDO] {filename}...")
+        # --overwrite yes: tampoco se retoma un .part previo (exista o no el archivo final)
+        if overwrite:
+            part_path = local_path.with_name(filename + PART_SUFFIX)
+            if part_path.exists():
+                part_path.unlink()
+            manifest.forget(part_path.name)
+
+        # LECTURA PARCIAL (si el layout no lo permite, se baja el archivo completo)
+        if subset is not None:
+            from .references import UnsupportedLayout
+            try:
+                fetched = _fetch_subset(fs, remote_file, local_path, remote_size, etag, subset, refs_dir,
+                                        manifest, subset_tag)
+                log.info(f"   {progress_label()} [DONE - PARCIAL] {filename} ({fetched/(1024**2):.1f} de "
+                         f"{remote_size/(1024**2):.1f} MB)")
+                notify_storage(output_dir, [local_path])
+                return local_path
+            except UnsupportedLayout as e:
+                log.warning(f"   [!] {filename}: sin lectura parcial ({e}); se baja completo")
+            except Exception as e:
+                log.error(f"   {progress_label()} [!] ERROR en la lectura parcial de {filename}: {e}")
+                return None
+
+        # DESCARGA (retomable: el .part se conserva ante errores de red)
         try:
-            with fs.open(remote_file, 'rb') as rf, open(local_path, 'wb') as lf:
-                shutil.copyfileobj(rf, lf)
-            
-            if local_path.stat().st_size == remote_size:
-                print(f"         └─> [DONE] {local_path.stat().st_size/(1024**2):.1f} MB")
-                downloaded_paths.append(local_path)
-            else:
-                print(f"         └─> [!] ERROR: Tamaño final incorrecto.")
+            final_size = _fetch(fs, remote_file, local_path, remote_size, budget, manifest, etag, retries)
+            label = progress_label()
+            if final_size == remote_size:
+                log.info(f"   {label} [DONE] {filename} ({final_size/(1024**2):.1f} MB)")
+                # Cuota de data/raw (si está configurada): registro incremental y desalojo LRU
+                notify_storage(output_dir, [local_path])
+                return local_path
+            log.error(f"   {label} [!] ERROR: Tamaño final incorrecto en {filename} ({final_size} != {remote_size}).")
         except Exception as e:
-            print(f"         └─> [!] ERROR DE RED: {e}")
-            if local_path.exists(): local_path.unlink()
+            log.error(f"   {progress_label()} [!] ERROR DE RED en {filename}: {e} (se retomará en la próxima corrida)")
+        return None
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="goes-dl") as pool:
+        futures = {pool.submit(worker, f): f for f in files_to_download}
+        for fut in as_completed(futures):
+            results[futures[fut]] = fut.result()
+
+    # Conservamos el orden del listado (cronológico) en el resultado
+    downloaded_paths = [results[f] for f in files_to_download if results.get(f) is not None]
+
+    # Registro incremental en el índice local del crawler
+    if downloaded_paths:
+        update_index(output_dir, downloaded_paths)
 
-    print(f"\n[*] PROCESO FINALIZADO en {(time.time() - start_time_process)/60:.2f} min")
+    log.info(f"[*] PROCESO FINALIZADO en {(time.time() - start_time_process)/60:.2f} min")
     return downloaded_paths
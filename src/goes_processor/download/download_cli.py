@@ -1,7 +1,7 @@
 # src/goes_processor/download/download_cli.py
 
 import click
-from .download import download_files
+from ..telemetry import cli_options, profiled, start_from_cli
 
 @click.group(name="download")
 def download():
@@ -20,7 +20,22 @@ def download():
               type=click.Choice(['yes', 'no']), 
               default='no', 
               help='Forzar descarga aunque el peso sea correcto (yes/no).')
-def download_files_cli(satellite, product, year, day, hour, minute, output, overwrite):
+@click.option('--workers', default=4, show_default=True, type=click.IntRange(1, 64),
+              help='Descargas concurrentes (comparten un único pool de conexiones).')
+@click.option('--max-inflight-mb', default=2048, show_default=True, type=click.IntRange(1),
+              help='Tope de MB en vuelo entre todos los workers.')
+@click.option('--listing-cache/--no-listing-cache', default=True, show_default=True,
+              help='Cachear los listados de S3 por hora en la carpeta de destino (horas cerradas no se re-listan).')
+@click.option('--variables', default=None,
+              help='Lectura parcial: procesador (p.ej. truecolor → CMI_C01-C03) o variables separadas por comas. '
+                   'Solo se bajan sus chunks y se escribe un NetCDF reducido.')
+@click.option('--region', default=None,
+              help='Lectura parcial: solo los chunks que cubren la región (preset, lon_min,lat_min,lon_max,lat_max '
+                   'o areas.yaml:nombre).')
+@cli_options
+def download_files_cli(satellite, product, year, day, hour, minute, output, overwrite, workers, max_inflight_mb,
+                       listing_cache, variables, region, verbose, metrics_jsonl, metrics_prom, profile_files,
+                       profile_dir):
     """Descarga archivos NetCDF directamente desde NOAA S3 con validación de peso."""
     
     # 1. Validar Hora
@@ -38,17 +53,35 @@ def download_files_cli(satellite, product, year, day, hour, minute, output, over
     # 3. Convertir overwrite a Booleano para el núcleo
     should_overwrite = (overwrite == 'yes')
 
+    # 4. Lectura parcial por chunks
+    subset = None
+    if variables or region:
+        from .references import make_subset
+        try:
+            subset = make_subset(variables, region)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint='--variables/--region') from e
+
     # --- EJECUCIÓN ---
+    start_from_cli(metrics_jsonl, metrics_prom, profile_files, profile_dir, verbose)
+    # Import diferido: `--help` no paga el import de fsspec/s3fs
+    from .download import download_files
     try:
-        download_files(
-            product=product,
-            year=year,
-            day_of_year=day.zfill(3),
-            hour=hour,
-            minute=minute,
-            output_dir=output,
-            satellite=satellite,
-            overwrite=should_overwrite
-        )
+        with profiled(f"download_{product}_{year}{day.zfill(3)}"):
+            paths = download_files(
+                product=product,
+                year=year,
+                day_of_year=day.zfill(3),
+                hour=hour,
+                minute=minute,
+                output_dir=output,
+                satellite=satellite,
+                overwrite=should_overwrite,
+                workers=workers,
+                max_inflight_mb=max_inflight_mb,
+                listing_cache=listing_cache,
+                subset=subset,
+            )
+        click.echo(f"[*] {len(paths)} archivos listos en {output} (-v para el detalle por archivo)")
     except Exception as e:
         click.secho(f"\n[!] ERROR CRÍTICO EN CLI: {e}", fg="red")
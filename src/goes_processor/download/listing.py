@@ -0,0 +1,242 @@
+# src/goes_processor/download/listing.py
+
+"""
+Listado de S3 por prefijo de hora, con cache e incremental.
+
+En lugar de un listado recursivo del día (`find` sobre .../YYYY/JJJ), se
+listan directamente los prefijos de hora pedidos (en paralelo si son
+varios) y se guarda el resultado por prefijo:
+
+- hora cerrada (terminó hace más de `late_seconds`, margen para archivos
+  tardíos) y listada después de cerrar: inmutable, nunca se vuelve a listar;
+- hora abierta: se re-lista pasado `ttl_seconds`, y solo lo nuevo, con
+  StartAfter = última clave vista (en S3 las claves de una serie ordenan
+  cronológicamente). Si en la hora hay varias series (p.ej. RadF con un
+  canal por clave) el orden ya no es temporal y se re-lista la hora entera;
+- hora futura: no se lista.
+
+Los filtros de minuto / rango de tiempo se aplican sobre el inicio de
+escaneo parseado del nombre, no por substring (que también coincidía con
+el sello de creación `_c...`).
+
+El cache vive en SQLite (.goes_listing.sqlite en la carpeta de descargas);
+sin ruta se usa uno en memoria.
+"""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..processing.logic_crawler.index import parse_filename
+
+LISTING_NAME = ".goes_listing.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prefixes (
+    prefix    TEXT PRIMARY KEY,
+    listed_at REAL NOT NULL,
+    closed    INTEGER NOT NULL,
+    marker    TEXT
+);
+CREATE TABLE IF NOT EXISTS objects (
+    key    TEXT PRIMARY KEY,
+    prefix TEXT NOT NULL,
+    size   INTEGER,
+    etag   TEXT,
+    series TEXT,
+    start  TEXT
+);
+CREATE INDEX IF NOT EXISTS objects_prefix ON objects (prefix);
+"""
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _series(key: str) -> str:
+    """Parte del nombre previa al inicio de escaneo (producto, modo, canal, satélite)."""
+    name = key.rsplit("/", 1)[-1]
+    return name.split("_s", 1)[0]
+
+
+def list_prefix(fs, prefix: str, start_after: Optional[str] = None) -> List[Tuple[str, int, Optional[str]]]:
+    """
+    Claves .nc directamente bajo `prefix` (bucket/producto/YYYY/JJJ/HH), con
+    tamaño y ETag, posteriores a `start_after`. Con s3fs va directo a
+    ListObjectsV2 (StartAfter del lado del servidor); con otros filesystems
+    (local, memoria) lista y filtra.
+    """
+    prefix = prefix.strip("/")
+    out = []
+    if hasattr(fs, "call_s3"):
+        bucket, _, key_prefix = prefix.partition("/")
+        kwargs = {"Bucket": bucket, "Prefix": key_prefix + "/"}
+        if start_after:
+            kwargs["StartAfter"] = start_after.split("/", 1)[1]
+        while True:
+            resp = fs.call_s3("list_objects_v2", **kwargs)
+            for obj in resp.get("Contents", []):
+                if obj["Key"].endswith(".nc"):
+                    out.append((f"{bucket}/{obj['Key']}", int(obj.get("Size") or 0), obj.get("ETag")))
+            if not resp.get("IsTruncated"):
+                break
+            kwargs["ContinuationToken"] = resp["NextContinuationToken"]
+            kwargs.pop("StartAfter", None)
+        return out
+
+    if hasattr(fs, "invalidate_cache"):
+        fs.invalidate_cache(prefix)
+    try:
+        listing = fs.ls(prefix, detail=True)
+    except FileNotFoundError:
+        return out
+    for info in listing:
+        key = info["name"].rstrip("/")
+        if key.endswith(".nc") and info.get("type", "file") == "file" and (not start_after or key > start_after):
+            out.append((key, int(info.get("size") or 0), info.get("ETag") or info.get("etag")))
+    return out
+
+
+def hour_prefixes(satellite: str, product: str, year: str, day_of_year: str, hour: str = "all") -> List[str]:
+    base = f"noaa-goes{satellite}/{product}/{year}/{day_of_year.zfill(3)}"
+    hours = range(24) if hour == "all" else [int(hour)]
+    return [f"{base}/{h:02d}" for h in hours]
+
+
+def _prefix_hour(prefix: str) -> datetime:
+    year, day, hour = prefix.rstrip("/").split("/")[-3:]
+    return datetime.strptime(f"{year}{day}{hour}", "%Y%j%H")
+
+
+class ListingCache:
+    """Listados por prefijo de hora con TTL; horas cerradas inmutables."""
+
+    def __init__(self, db_path=None, ttl_seconds: float = 30.0, late_seconds: float = 900.0,
+                 clock: Callable[[], datetime] = utcnow, workers: int = 16):
+        self.db_path = Path(db_path) if db_path else None
+        self.ttl = ttl_seconds
+        self.late = timedelta(seconds=late_seconds)
+        self.clock = clock
+        self.workers = workers
+        if self.db_path is not None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path) if self.db_path else ":memory:", timeout=30,
+                                    check_same_thread=False)
+        # Journal clásico: WAL no es seguro en filesystems compartidos (como la cola de trabajo)
+        self.conn.execute("PRAGMA journal_mode=DELETE" if self.db_path else "PRAGMA journal_mode=MEMORY")
+        self.conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self.stats = {"listed": 0, "incremental": 0, "cached": 0, "skipped_future": 0}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _plan(self, prefix: str, now: datetime, wall: float) -> Optional[str]:
+        """'skip' | 'cached' | 'full' | 'incremental' para un prefijo de hora."""
+        start = _prefix_hour(prefix)
+        if start > now:
+            return "skip"
+        row = self.conn.execute("SELECT listed_at, closed, marker FROM prefixes WHERE prefix = ?",
+                                (prefix,)).fetchone()
+        if row is None:
+            return "full"
+        listed_at, closed, marker = row
+        if closed or wall - listed_at < self.ttl:
+            return "cached"
+        if marker is None:
+            return "full"
+        series = self.conn.execute("SELECT COUNT(DISTINCT series) FROM objects WHERE prefix = ?",
+                                   (prefix,)).fetchone()[0]
+        return "incremental" if series <= 1 else "full"
+
+    def _store(self, prefix: str, rows, full: bool, closed: bool, wall: float):
+        with self._lock, self.conn:
+            self.stats["listed" if full else "incremental"] += 1
+            if full:
+                self.conn.execute("DELETE FROM objects WHERE prefix = ?", (prefix,))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO objects VALUES (?,?,?,?,?,?)",
+                [(k, prefix, size, etag, _series(k), (parse_filename(k.rsplit('/', 1)[-1]) or {}).get("start_time"))
+                 for k, size, etag in rows])
+            marker = self.conn.execute("SELECT MAX(key) FROM objects WHERE prefix = ?", (prefix,)).fetchone()[0]
+            self.conn.execute("INSERT OR REPLACE INTO prefixes VALUES (?,?,?,?)",
+                              (prefix, wall, int(closed), marker))
+
+    def refresh(self, fs, prefixes: List[str]) -> Dict[str, str]:
+        """Lista (en paralelo) lo que haga falta de `prefixes`; devuelve la acción por prefijo."""
+        now = self.clock()
+        wall = time.time()
+        with self._lock:
+            plans = {p: self._plan(p, now, wall) for p in prefixes}
+        todo = []
+        for prefix, action in plans.items():
+            if action == "skip":
+                self.stats["skipped_future"] += 1
+            elif action == "cached":
+                self.stats["cached"] += 1
+            else:
+                todo.append((prefix, action))
+
+        def work(item):
+            prefix, action = item
+            # Cerrada si terminó (más el margen de tardíos) antes de empezar este listado
+            closed = _prefix_hour(prefix) + timedelta(hours=1) + self.late <= now
+            marker = None
+            if action == "incremental":
+                with self._lock:
+                    marker = self.conn.execute("SELECT marker FROM prefixes WHERE prefix = ?",
+                                               (prefix,)).fetchone()[0]
+            rows = list_prefix(fs, prefix, marker)
+            self._store(prefix, rows, action == "full", closed, wall)
+
+        if len(todo) > 1 and self.workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(todo)), thread_name_prefix="goes-ls") as pool:
+                list(pool.map(work, todo))
+        else:
+            for item in todo:
+                work(item)
+        return plans
+
+    def retain(self, prefixes: List[str]):
+        """Olvida todo prefijo fuera de `prefixes` (cache en memoria de un proceso residente)."""
+        marks = ",".join("?" * len(prefixes))
+        with self._lock, self.conn:
+            self.conn.execute(f"DELETE FROM objects WHERE prefix NOT IN ({marks})", prefixes)
+            self.conn.execute(f"DELETE FROM prefixes WHERE prefix NOT IN ({marks})", prefixes)
+
+    def query(self, prefixes: List[str], minute: str = "all", start_time: Optional[datetime] = None,
+              end_time: Optional[datetime] = None) -> Dict[str, dict]:
+        """Objetos cacheados de `prefixes`, filtrados por el inicio de escaneo parseado."""
+        sql = [f"SELECT key, size, etag, start FROM objects WHERE prefix IN ({','.join('?' * len(prefixes))})"]
+        params = list(prefixes)
+        if minute != "all":
+            sql.append("AND substr(start, 15, 2) = ?")
+            params.append(minute.zfill(2))
+        if start_time is not None:
+            sql.append("AND start >= ?")
+            params.append(start_time.isoformat())
+        if end_time is not None:
+            sql.append("AND start <= ?")
+            params.append(end_time.isoformat())
+        sql.append("ORDER BY key")
+        with self._lock:
+            rows = self.conn.execute(" ".join(sql), params).fetchall()
+        return {key: {"size": size, "etag": etag} for key, size, etag, _ in rows}
+
+    def list(self, fs, satellite: str, product: str, year: str, day_of_year: str, hour: str = "all",
+             minute: str = "all", start_time: Optional[datetime] = None,
+             end_time: Optional[datetime] = None) -> Dict[str, dict]:
+        prefixes = hour_prefixes(satellite, product, year, day_of_year, hour)
+        self.refresh(fs, prefixes)
+        return self.query(prefixes, minute, start_time, end_time)
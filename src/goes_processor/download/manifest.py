@@ -0,0 +1,124 @@
+# src/goes_processor/download/manifest.py
+
+"""
+Manifiesto de integridad por carpeta de descarga.
+Guarda tamaño, ETag y mtime local de cada archivo completo, para que las
+siguientes corridas verifiquen lo ya bajado sin consultar S3 archivo por archivo.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+MANIFEST_NAME = ".goes_manifest.json"
+
+
+class DirectoryManifest:
+    """Manifiesto JSON de una carpeta (p.ej. .../ABI-L2-LSTF/2026/003/12)."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.path = self.directory / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self.entries: Dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get("files", {})
+            except (OSError, ValueError):
+                # Manifiesto ilegible: se reconstruye desde cero
+                self.entries = {}
+
+    def get(self, filename: str) -> Optional[dict]:
+        with self._lock:
+            return self.entries.get(filename)
+
+    def record(self, filename: str, size: int, etag: Optional[str] = None):
+        """Registra un archivo completo y persiste el manifiesto."""
+        local_path = self.directory / filename
+        with self._lock:
+            self.entries[filename] = {
+                "size": int(size),
+                "etag": etag,
+                "mtime": local_path.stat().st_mtime,
+            }
+            self._save()
+
+    def forget(self, filename: str):
+        with self._lock:
+            if self.entries.pop(filename, None) is not None:
+                self._save()
+
+    def is_valid(self, filename: str, size: int, etag: Optional[str] = None) -> bool:
+        """
+        True si el archivo local coincide con lo registrado y con lo remoto.
+        Solo hace un stat() local; nunca toca la red.
+        """
+        entry = self.get(filename)
+        if entry is None or entry["size"] != int(size):
+            return False
+        if etag and entry.get("etag") and entry["etag"] != etag:
+            return False
+        local_path = self.directory / filename
+        try:
+            st = local_path.stat()
+        except OSError:
+            return False
+        return st.st_size == entry["size"] and st.st_mtime == entry["mtime"]
+
+    def _save(self):
+        # Escritura atómica: tmp + rename
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": 1, "files": self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+# Entradas por manifiesto, cacheadas por (inodo, mtime_ns, tamaño) del JSON (_save lo reemplaza: inodo nuevo)
+_ENTRIES_CACHE: Dict[Path, tuple] = {}
+
+
+def recorded_entry(path: Path, st: Optional[os.stat_result] = None) -> Optional[dict]:
+    """
+    Entrada del manifiesto de su carpeta para un archivo bajado que no cambió
+    desde entonces (mismo tamaño y mtime), o None. Solo lee disco local y
+    cada manifiesto una vez mientras no cambie: planificar miles de archivos
+    de una carpeta no lo re-parsea por archivo.
+    """
+    path = Path(path)
+    manifest_path = path.parent / MANIFEST_NAME
+    try:
+        st = st or path.stat()
+        mst = manifest_path.stat()
+    except OSError:
+        return None
+    stamp = (mst.st_ino, mst.st_mtime_ns, mst.st_size)
+    cached = _ENTRIES_CACHE.get(manifest_path)
+    if cached is None or cached[0] != stamp:
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get("files", {})
+        except (OSError, ValueError):
+            entries = {}
+        cached = _ENTRIES_CACHE[manifest_path] = (stamp, entries)
+    entry = cached[1].get(path.name)
+    if entry is None or entry.get("size") != st.st_size or entry.get("mtime") != st.st_mtime:
+        return None
+    return entry
+
+
+class ManifestRegistry:
+    """Un manifiesto por carpeta, compartido entre los workers de descarga."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._manifests: Dict[Path, DirectoryManifest] = {}
+
+    def for_dir(self, directory: Path) -> DirectoryManifest:
+        directory = Path(directory)
+        with self._lock:
+            if directory not in self._manifests:
+                self._manifests[directory] = DirectoryManifest(directory)
+            return self._manifests[directory]
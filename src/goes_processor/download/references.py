@@ -0,0 +1,524 @@
+# src/goes_processor/download/references.py
+
+"""
+Índice de chunks HDF5 por variable (al estilo kerchunk) y lecturas parciales.
+
+Un NetCDF4 es un HDF5: cada variable chunkeada guarda sus chunks como bloques
+comprimidos en offsets fijos del archivo. build_references abre el archivo
+remoto por rangos (solo se leen cabeceras y B-trees, no los datos) y arma,
+por variable, forma, tipo, dimensiones, filtros, atributos y el
+(offset, tamaño) de cada chunk (recorrer el B-tree de chunks cuesta pedidos:
+se indexan solo las variables pedidas y se completa si después se piden
+otras). Con ese índice write_subset baja solo los
+chunks de las variables pedidas (y, con un bbox, solo los que cortan la
+ventana de la grilla fija), los decodifica y escribe un NetCDF reducido con
+el mismo nombre, dimensiones, coordenadas y atributos: los lectores de satpy
+lo abren igual que al original. Fuera de la ventana queda _FillValue.
+
+Las variables chicas (coordenadas, escalares, proyección) van inline en el
+índice. Filtros soportados: deflate, shuffle y fletcher32, los que usan los
+productos ABI; con otro layout se levanta UnsupportedLayout y la descarga
+vuelve al archivo completo.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+REFS_DIR = ".goes_refs"
+REFS_VERSION = 1
+
+# Variables hasta este tamaño se guardan enteras en el índice
+INLINE_BYTES = 64 * 1024
+# Rangos separados por menos que esto se piden juntos (menos pedidos, algo más de bytes)
+MERGE_GAP = 256 * 1024
+MAX_REQUEST = 32 * 1024 * 1024
+
+# Bloque de lectura del archivo remoto al armar el índice. Las cabeceras y
+# B-trees de cada variable están junto a sus datos: bloques chicos y cacheados
+# (64 KB: ~25 pedidos y ~1.5 MB para un MCMIPF; 512 KB baja 6 veces más)
+METADATA_BLOCK = 64 * 1024
+
+H5Z_DEFLATE, H5Z_SHUFFLE, H5Z_FLETCHER32 = 1, 2, 3
+
+# Atributos internos de HDF5/netCDF4 (dimensiones, escalas): netCDF4 los regenera
+_INTERNAL_ATTRS = {"DIMENSION_LIST", "REFERENCE_LIST", "CLASS", "NAME", "_Netcdf4Dimid",
+                   "_Netcdf4Coordinates", "_nc3_strict", "_NCProperties"}
+
+
+class UnsupportedLayout(Exception):
+    """El archivo (o lo pedido) no se puede leer por chunks: hay que bajarlo entero."""
+
+
+@dataclass(frozen=True)
+class Subset:
+    """Qué bajar de cada archivo: variables (vacío = todas) y bbox lon/lat opcional."""
+    variables: Tuple[str, ...] = ()
+    bbox: Optional[Tuple[float, float, float, float]] = None
+
+    def key(self) -> str:
+        text = json.dumps([sorted(self.variables), self.bbox])
+        return "subset-" + hashlib.sha1(text.encode()).hexdigest()[:10]
+
+    def describe(self) -> str:
+        parts = [",".join(self.variables) if self.variables else "todas las variables"]
+        if self.bbox:
+            parts.append("bbox " + ",".join(f"{v:g}" for v in self.bbox))
+        return "; ".join(parts)
+
+
+def make_subset(variables: Optional[str] = None, region=None) -> Subset:
+    """
+    `variables`: nombre de un procesador registrado (usa sus variables
+    declaradas, p.ej. truecolor → CMI_C01..C03) o lista separada por comas.
+    `region`: lo que acepta --region (preset, bbox o área YAML).
+    """
+    names: Tuple[str, ...] = ()
+    if variables:
+        from ..processing.logic_how.registry import get_processor
+        try:
+            processor = get_processor(variables.strip())
+        except KeyError:
+            names = tuple(v.strip() for v in variables.split(",") if v.strip())
+        else:
+            if not processor.variables:
+                raise ValueError(f"El procesador {processor.name} no declara variables para lectura parcial")
+            names = tuple(processor.variables)
+    bbox = None
+    if region is not None:
+        from ..processing.logic_resample.regions import parse_region
+        parsed = parse_region(region)
+        if parsed is not None:
+            bbox = parsed.bbox if parsed.area is None else tuple(parsed.area.area_extent_ll)
+    return Subset(names, tuple(float(v) for v in bbox) if bbox else None)
+
+
+# --- ATRIBUTOS ---
+def _attr(value) -> list:
+    """Atributo HDF5 → [dtype, valor] serializable (el tipo importa: scale_factor float32, _FillValue int16)."""
+    if isinstance(value, bytes):
+        return ["str", value.decode("utf-8", "replace")]
+    if isinstance(value, str):
+        return ["str", value]
+    arr = np.asarray(value)
+    if arr.dtype.kind in "SUO":
+        items = [v.decode("utf-8", "replace") if isinstance(v, bytes) else str(v) for v in arr.ravel()]
+        return ["str", items[0] if len(items) == 1 else " ".join(items)]
+    return [arr.dtype.str, arr.tolist()]
+
+
+def _attr_value(spec):
+    dtype, value = spec
+    if dtype == "str":
+        return value
+    arr = np.array(value, dtype=dtype)
+    # netCDF guarda los atributos como vectores: uno de largo 1 es un escalar
+    return arr.reshape(())[()] if arr.size == 1 else arr
+
+
+def _attrs(obj) -> Dict[str, list]:
+    out = {}
+    for key in obj.attrs:
+        if key in _INTERNAL_ATTRS:
+            continue
+        try:
+            out[key] = _attr(obj.attrs[key])
+        except (OSError, TypeError, ValueError):
+            continue  # tipos que h5py no lee (referencias, etc.)
+    return out
+
+
+# --- ÍNDICE ---
+def _dims(ds, scales: dict) -> List[str]:
+    """
+    Nombres de dimensión vía las escalas (por identidad de objeto: resolver el
+    nombre de una referencia con h5py recorre el grupo entero).
+    """
+    if ds.ndim == 1 and ds.id in scales:
+        return [scales[ds.id]]
+    dim_list = ds.attrs.get("DIMENSION_LIST")
+    if dim_list is None:
+        return [f"phony_dim_{i}" for i in range(ds.ndim)]
+    return [(scales.get(ds.file[refs[0]].id) if len(refs) else None) or f"phony_dim_{i}"
+            for i, refs in enumerate(dim_list)]
+
+
+def _is_dimension_only(ds) -> bool:
+    """Dimensiones de netCDF sin variable asociada (se ven como datasets vacíos en HDF5)."""
+    name = ds.attrs.get("NAME", b"")
+    return isinstance(name, bytes) and name.startswith(b"This is a netCDF dimension but not a netCDF variable")
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _variable(ds, scales: dict, with_refs: bool = True) -> dict:
+    entry = {
+        "shape": list(ds.shape),
+        "dtype": ds.dtype.str,
+        "dims": _dims(ds, scales),
+        "attrs": _attrs(ds),
+        "chunks": list(ds.chunks) if ds.chunks else None,
+        "filters": [],
+        "fillvalue": np.asarray(ds.fillvalue).item() if ds.fillvalue is not None else None,
+    }
+
+    nbytes = int(np.prod(ds.shape, dtype=np.int64)) * ds.dtype.itemsize
+    if nbytes <= INLINE_BYTES:
+        offset = None if ds.chunks else ds.id.get_offset()
+        if offset is not None:
+            # Contiguo: se pide después, junto con el resto de las chicas, en un solo lote
+            entry["pending"] = [int(offset), nbytes]
+        else:   # compacto (en la cabecera), chunkeado o nunca escrito
+            entry["inline"] = _b64(np.ascontiguousarray(ds[()]).tobytes())
+        return entry
+
+    plist = ds.id.get_create_plist()
+    for i in range(plist.get_nfilters()):
+        code, _flags, values, _name = plist.get_filter(i)
+        entry["filters"].append([int(code), [int(v) for v in values]])
+    if not with_refs:
+        return entry   # recorrer el B-tree de chunks cuesta pedidos: solo lo pedido
+
+    refs = {}
+    if ds.chunks:
+        chunks = ds.chunks
+
+        def visit(info):
+            key = ".".join(str(o // c) for o, c in zip(info.chunk_offset, chunks, strict=True))
+            refs[key] = [int(info.byte_offset), int(info.size), int(info.filter_mask)]
+
+        ds.id.chunk_iter(visit)
+    else:
+        offset = ds.id.get_offset()
+        if offset is not None:   # None: nunca se escribió (todo fillvalue)
+            refs[".".join("0" * ds.ndim)] = [int(offset), int(ds.id.get_storage_size()), 0]
+    entry["refs"] = refs
+    return entry
+
+
+def build_references(fs, url: str, size: Optional[int] = None, etag: Optional[str] = None,
+                     variables=None) -> dict:
+    """
+    Índice de `url` leyendo solo metadatos (bloques de METADATA_BLOCK bajo
+    demanda). Las cabeceras de todas las variables, los chunks solo de
+    `variables` (None = todas) y de las que no son imagen.
+    """
+    import h5py
+
+    entries, skipped = {}, []
+    with fs.open(url, "rb", block_size=METADATA_BLOCK, cache_type="blockcache",
+                 cache_options={"maxblocks": 256}) as f, \
+            h5py.File(f, "r") as h5:
+        attrs = _attrs(h5)
+        datasets = [(name, obj) for name, obj in h5.items() if isinstance(obj, h5py.Dataset)]
+        scales = {obj.id: name for name, obj in datasets if obj.attrs.get("CLASS") == b"DIMENSION_SCALE"}
+        for name, obj in datasets:
+            if _is_dimension_only(obj):
+                continue
+            if obj.dtype.kind not in "biuf":
+                skipped.append(name)
+                continue
+            entries[name] = _variable(obj, scales, variables is None or name in variables or obj.ndim < 2)
+
+    pending = [(name, e.pop("pending")) for name, e in entries.items() if "pending" in e]
+    for (name, _), raw in zip(pending, fetch_ranges(fs, url, [r for _, r in pending]), strict=True):
+        entries[name]["inline"] = _b64(raw)
+    return {"version": REFS_VERSION, "source": url, "size": size, "etag": etag,
+            "attrs": attrs, "variables": entries, "skipped": skipped}
+
+
+def _refs_path(refs_dir, url: str) -> Path:
+    return Path(refs_dir) / (url.rstrip("/").rsplit("/", 1)[-1] + ".json.gz")
+
+
+def load_references(refs_dir, url: str, etag: Optional[str] = None) -> Optional[dict]:
+    path = _refs_path(refs_dir, url)
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            refs = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if refs.get("version") != REFS_VERSION or (etag and refs.get("etag") not in (None, etag)):
+        return None
+    return refs
+
+
+def save_references(refs_dir, refs: dict) -> Path:
+    path = _refs_path(refs_dir, refs["source"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=5) as f:
+        json.dump(refs, f, separators=(",", ":"))
+    os.replace(tmp, path)
+    return path
+
+
+def _indexed(var: dict) -> bool:
+    return "inline" in var or "refs" in var
+
+
+def references_for(fs, url: str, refs_dir=None, size: Optional[int] = None, etag: Optional[str] = None,
+                   variables=None) -> dict:
+    """
+    Índice cacheado en refs_dir (por nombre y ETag) o construido en el momento.
+    Si al cacheado le faltan los chunks de alguna de `variables`, se rehace
+    sumándolas a las ya indexadas.
+    """
+    wanted = set(variables) if variables else None
+    refs = load_references(refs_dir, url, etag) if refs_dir is not None else None
+    if refs is not None:
+        known = refs["variables"]
+        if wanted is None:
+            missing = [n for n, v in known.items() if not _indexed(v)]
+        else:
+            missing = [n for n in wanted if n in known and not _indexed(known[n])]
+        if not missing:
+            return refs
+        if wanted is not None:
+            wanted |= {n for n, v in known.items() if "refs" in v}
+    refs = build_references(fs, url, size, etag, wanted)
+    if refs_dir is not None:
+        save_references(refs_dir, refs)
+    return refs
+
+
+# --- SELECCIÓN ---
+def select_variables(refs: dict, wanted=()) -> List[str]:
+    """Variables pedidas más todo lo que no es imagen (coordenadas, escalares, proyección, tiempos)."""
+    wanted = set(wanted or ())
+    variables = refs["variables"]
+    if wanted and not wanted & set(variables):
+        raise UnsupportedLayout(f"ninguna de las variables pedidas está en el archivo ({', '.join(sorted(wanted))})")
+    names = [n for n, v in variables.items() if not wanted or n in wanted or len(v["shape"]) < 2]
+    unindexed = [n for n in names if not _indexed(variables[n])]
+    if unindexed:
+        raise UnsupportedLayout(f"variables sin indexar: {', '.join(unindexed)}")
+    return names
+
+
+def _inline(var: dict) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(var["inline"]), dtype=var["dtype"]).reshape(var["shape"])
+
+
+def _scaled(var: dict) -> np.ndarray:
+    data = _inline(var).astype(np.float64)
+    attrs = var["attrs"]
+    if "scale_factor" in attrs:
+        data = data * float(_attr_value(attrs["scale_factor"]))
+    if "add_offset" in attrs:
+        data = data + float(_attr_value(attrs["add_offset"]))
+    return data
+
+
+def region_window(refs: dict, bbox, pad: int = 8) -> Optional[Tuple[int, int, int, int]]:
+    """
+    (fila0, fila1, col0, col1) de la grilla fija (y, x) que cubre el bbox
+    lon/lat, o None si el archivo no tiene grilla fija o el bbox no toca el disco.
+    """
+    from pyproj import CRS, Transformer
+
+    variables = refs["variables"]
+    if not {"x", "y", "goes_imager_projection"} <= set(variables) \
+            or "inline" not in variables["x"] or "inline" not in variables["y"]:
+        return None
+    proj = {k: _attr_value(v) for k, v in variables["goes_imager_projection"]["attrs"].items()}
+    h = float(proj["perspective_point_height"])
+    crs = CRS.from_dict({"proj": "geos", "h": h, "lon_0": float(proj["longitude_of_projection_origin"]),
+                         "sweep": str(proj.get("sweep_angle_axis", "x")),
+                         "a": float(proj["semi_major_axis"]), "b": float(proj["semi_minor_axis"])})
+    x, y = _scaled(variables["x"]), _scaled(variables["y"])
+
+    # Malla completa del bbox (no solo el borde): un bbox que excede el disco tiene bordes fuera
+    lon_min, lat_min, lon_max, lat_max = bbox
+    lons, lats = np.meshgrid(np.linspace(lon_min, lon_max, 80), np.linspace(lat_min, lat_max, 80))
+    px, py = Transformer.from_crs("EPSG:4326", crs, always_xy=True).transform(lons.ravel(), lats.ravel())
+    ok = np.isfinite(px) & np.isfinite(py)
+    if not ok.any():
+        return None
+    ax, ay = px[ok] / h, py[ok] / h   # metros → ángulo de escaneo (rad)
+
+    step_x, step_y = x[1] - x[0], y[1] - y[0]
+    cols = np.round((ax - x[0]) / step_x)
+    rows = np.round((ay - y[0]) / step_y)
+    c0 = int(np.clip(cols.min() - pad, 0, x.size))
+    c1 = int(np.clip(cols.max() + pad + 1, 0, x.size))
+    r0 = int(np.clip(rows.min() - pad, 0, y.size))
+    r1 = int(np.clip(rows.max() + pad + 1, 0, y.size))
+    if r0 >= r1 or c0 >= c1:
+        return None
+    return r0, r1, c0, c1
+
+
+# --- LECTURA POR CHUNKS ---
+def _unshuffle(raw: bytes, itemsize: int) -> bytes:
+    n = len(raw) // itemsize
+    body = np.frombuffer(raw, dtype=np.uint8, count=n * itemsize).reshape(itemsize, n).T.tobytes()
+    return body + raw[n * itemsize:]
+
+
+def _decode(raw: bytes, var: dict, mask: int) -> np.ndarray:
+    dtype = np.dtype(var["dtype"])
+    filters = var["filters"]
+    for i in reversed(range(len(filters))):
+        if mask & (1 << i):
+            continue   # filtro salteado para este chunk
+        code = filters[i][0]
+        if code == H5Z_DEFLATE:
+            raw = zlib.decompress(raw)
+        elif code == H5Z_SHUFFLE:
+            raw = _unshuffle(raw, dtype.itemsize)
+        elif code == H5Z_FLETCHER32:
+            raw = raw[:-4]
+        else:
+            raise UnsupportedLayout(f"filtro HDF5 {code} no soportado")
+    return np.frombuffer(raw, dtype=dtype).reshape(var["chunks"] or var["shape"])
+
+
+def fetch_ranges(fs, url: str, ranges: List[Tuple[int, int]], max_gap: int = MERGE_GAP) -> List[bytes]:
+    """
+    Bytes de cada (offset, tamaño). Los rangos cercanos se agrupan en un pedido
+    y los grupos se piden juntos con cat_ranges (concurrente en s3fs).
+    """
+    groups = []   # [inicio, fin, índices]
+    for i in sorted(range(len(ranges)), key=lambda i: ranges[i][0]):
+        offset, size = ranges[i]
+        if groups and offset - groups[-1][1] <= max_gap and offset + size - groups[-1][0] <= MAX_REQUEST:
+            groups[-1][1] = max(groups[-1][1], offset + size)
+            groups[-1][2].append(i)
+        else:
+            groups.append([offset, offset + size, [i]])
+    if not groups:
+        return []
+    blobs = fs.cat_ranges([url] * len(groups), [g[0] for g in groups], [g[1] for g in groups])
+    out: List[Optional[bytes]] = [None] * len(ranges)
+    for (start, _end, idx), blob in zip(groups, blobs, strict=True):
+        if isinstance(blob, Exception):
+            raise blob
+        for i in idx:
+            offset, size = ranges[i]
+            out[i] = blob[offset - start:offset - start + size]
+    return out
+
+
+def _window_slices(var: dict, window) -> Tuple[slice, ...]:
+    """Ventana aplicada a las dos últimas dimensiones si son (y, x); el resto entero."""
+    slices = [slice(0, n) for n in var["shape"]]
+    if window is not None and var["dims"][-2:] == ["y", "x"]:
+        r0, r1, c0, c1 = window
+        slices[-2], slices[-1] = slice(r0, r1), slice(c0, c1)
+    return tuple(slices)
+
+
+def _wanted_chunks(var: dict, region) -> list:
+    """(origen, ref) de los chunks que cortan `region`."""
+    chunks = var["chunks"] or var["shape"]
+    wanted = []
+    for key, ref in var["refs"].items():
+        lo = [int(i) * c for i, c in zip(key.split("."), chunks, strict=True)]
+        if all(o < s.stop and o + c > s.start for o, c, s in zip(lo, chunks, region, strict=True)):
+            wanted.append((lo, ref))
+    return wanted
+
+
+def read_variables(fs, url: str, refs: dict, names: List[str], window=None):
+    """
+    Genera (nombre, datos crudos sin escala recortados a `window`, región que
+    ocupan) por variable. Los chunks de todas se piden en un solo lote de
+    rangos (concurrente); los ausentes (nunca escritos) quedan con el fillvalue.
+    """
+    plan, ranges = {}, []
+    for name in names:
+        var = refs["variables"][name]
+        if "inline" not in var:
+            region = _window_slices(var, window)
+            wanted = _wanted_chunks(var, region)
+            plan[name] = (region, wanted, len(ranges))
+            ranges.extend((ref[0], ref[1]) for _, ref in wanted)
+    blobs = fetch_ranges(fs, url, ranges)
+
+    for name in names:
+        var = refs["variables"][name]
+        if name not in plan:
+            yield name, _inline(var), tuple(slice(0, n) for n in var["shape"])
+            continue
+        region, wanted, first = plan[name]
+        fill = var["fillvalue"] if var["fillvalue"] is not None else 0
+        out = np.full(tuple(s.stop - s.start for s in region), fill, dtype=var["dtype"])
+        chunks = var["chunks"] or var["shape"]
+        for i, (lo, ref) in enumerate(wanted, first):
+            block = _decode(blobs[i], var, ref[2])
+            blobs[i] = None
+            src, dst = [], []
+            for o, c, s in zip(lo, chunks, region, strict=True):
+                a, b = max(o, s.start), min(o + c, s.stop)
+                src.append(slice(a - o, b - o))
+                dst.append(slice(a - s.start, b - s.start))
+            out[tuple(dst)] = block[tuple(src)]
+        yield name, out, region
+
+
+def subset_bytes(refs: dict, names: List[str], window=None) -> int:
+    """Bytes comprimidos a bajar para `names` dentro de `window` (sin contar el agrupado de rangos)."""
+    return sum(ref[1] for name in names if "inline" not in refs["variables"][name]
+               for _, ref in _wanted_chunks(refs["variables"][name],
+                                            _window_slices(refs["variables"][name], window)))
+
+
+def write_subset(fs, url: str, refs: dict, local_path, subset: Optional[Subset] = None, complevel: int = 1) -> dict:
+    """
+    Escribe en local_path un NetCDF4 con las variables de `subset` (más
+    coordenadas y escalares), bajando solo sus chunks. Atómico (.part + rename).
+    Devuelve variables, ventana y bytes pedidos. Sin `subset`, todas las
+    variables del archivo completo.
+    """
+    import netCDF4
+
+    subset = subset if subset is not None else Subset()
+    names = select_variables(refs, subset.variables)
+    window = region_window(refs, subset.bbox) if subset.bbox else None
+    if subset.bbox and window is None:
+        raise UnsupportedLayout("el bbox no corta la grilla fija del archivo")
+
+    local_path = Path(local_path)
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+    fetched = subset_bytes(refs, names, window)
+    tmp = local_path.with_name(local_path.name + ".subset.part")  # no pisa el .part retomable de la descarga completa
+    try:
+        with netCDF4.Dataset(tmp, "w", format="NETCDF4") as nc:
+            variables = refs["variables"]
+            for name in names:
+                for dim, n in zip(variables[name]["dims"], variables[name]["shape"], strict=True):
+                    if dim not in nc.dimensions:
+                        nc.createDimension(dim, n)
+            nc.setncatts({k: _attr_value(v) for k, v in refs["attrs"].items()})
+            nc.setncattr("goes_processor_subset", subset.describe())
+            if window is not None:
+                nc.setncattr("goes_processor_window", "y {}:{}, x {}:{}".format(*window))
+
+            for name, data, region in read_variables(fs, url, refs, names, window):
+                var = variables[name]
+                attrs = {k: _attr_value(v) for k, v in var["attrs"].items()}
+                fill = attrs.pop("_FillValue", None)
+                chunked = bool(var["chunks"]) and "inline" not in var
+                v = nc.createVariable(name, np.dtype(var["dtype"]), tuple(var["dims"]),
+                                      zlib=chunked, complevel=complevel, shuffle=chunked,
+                                      chunksizes=tuple(var["chunks"]) if chunked else None,
+                                      fill_value=fill)
+                v.set_auto_maskandscale(False)
+                v.setncatts(attrs)
+                v[region if region else ...] = data
+        os.replace(tmp, local_path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return {"variables": names, "window": window, "fetched_bytes": fetched}
@@ -0,0 +1,318 @@
+# src/goes_processor/ingest/daemon.py
+
+"""
+Ingesta en proceso, guiada por eventos (reemplaza el polling de scheduler.py).
+
+- PrefixWatcher: lista el prefijo S3 de la hora actual por producto y devuelve
+  solo las claves nuevas.
+- Cola de claves nuevas → stage de descarga (hilos residentes) → stage de
+  procesamiento (hilo residente: satpy y LUTs quedan calientes).
+- Cada archivo reporta la latencia desde el inicio del escaneo que lo detectó
+  hasta que la imagen quedó escrita.
+- Con `service` (dirección del servicio residente, processing service run)
+  el procesamiento se envía a sus workers calientes con prioridad alta,
+  por delante de los backfills de bulk --via-daemon; si el servicio no
+  responde (o no termina el trabajo en `service_timeout` segundos) se
+  procesa en este proceso como antes y se deja de usar el servicio durante
+  ese mismo lapso.
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from ..download.download import ByteBudget, _fetch, make_filesystem
+from ..download.listing import ListingCache
+from ..download.manifest import ManifestRegistry
+from ..processing.logic_crawler.index import parse_filename, update_index
+from ..processing.logic_how.registry import processor_for
+from ..storage.holds import FileHold
+from ..storage.quota import notify as notify_storage
+
+log = logging.getLogger(__name__)
+
+# Prioridad de los trabajos de ingesta en el servicio residente (bulk --via-daemon usa 0)
+INGEST_PRIORITY = 10
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass
+class IngestJob:
+    key: str
+    product: str
+    size: int
+    etag: Optional[str]
+    scan_started: float            # time.monotonic() al iniciar el escaneo que la detectó
+    detected: float                # time.monotonic() al detectarla
+    local_path: Optional[Path] = None
+    downloaded: Optional[float] = None
+    written: Optional[float] = None
+    output: Optional[Path] = None
+    error: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    hold: Optional[FileHold] = None   # en uso desde la descarga hasta la imagen escrita
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Segundos desde el inicio del escaneo hasta la imagen escrita."""
+        if self.written is None:
+            return None
+        return self.written - self.scan_started
+
+
+class PrefixWatcher:
+    """Diferencia el listado del prefijo de la hora actual (y la anterior) de un producto."""
+
+    def __init__(self, fs, satellite: str, product: str, clock: Callable[[], datetime] = utcnow,
+                 lookback_minutes: int = 15):
+        self.fs = fs
+        self.bucket = f"noaa-goes{satellite}"
+        self.product = product
+        self.clock = clock
+        self.lookback = timedelta(minutes=lookback_minutes)
+        # Claves ya entregadas al demonio, solo de los prefijos que se siguen listando
+        self.seen = set()
+        self._seen_lock = threading.Lock()
+        # Sin TTL (el intervalo lo pone el demonio): cada poll pide solo lo posterior a la última clave
+        self.listing = ListingCache(ttl_seconds=0, late_seconds=lookback_minutes * 60, clock=clock)
+
+    def hour_prefixes(self) -> List[str]:
+        now = self.clock()
+        # Tras el cambio de hora seguimos mirando la anterior un rato (archivos tardíos)
+        hours = [now - self.lookback, now] if (now - self.lookback).hour != now.hour else [now]
+        return [f"{self.bucket}/{self.product}/{t:%Y}/{t:%j}/{t:%H}" for t in hours]
+
+    def poll(self) -> List[dict]:
+        prefixes = self.hour_prefixes()
+        self.listing.retain(prefixes)
+        self.listing.refresh(self.fs, prefixes)
+        listed = self.listing.query(prefixes)
+        new = []
+        with self._seen_lock:
+            # Las horas que ya no se listan no vuelven: sus claves se olvidan (memoria acotada)
+            retained = set(prefixes)
+            self.seen = {k for k in self.seen if k.rsplit("/", 1)[0] in retained}
+            for key, info in listed.items():
+                if key in self.seen:
+                    continue
+                self.seen.add(key)
+                new.append({"key": key, "size": info["size"], "etag": info["etag"]})
+        return new
+
+    def forget(self, key: str):
+        """La clave vuelve a ofrecerse en el próximo poll (p.ej. si su descarga falló)."""
+        with self._seen_lock:
+            self.seen.discard(key)
+
+
+class IngestDaemon:
+    """
+    Demonio residente: watcher por producto → descarga → procesamiento.
+
+    products: {producto: segundos entre escaneos}
+    """
+
+    def __init__(self, products: Dict[str, float], satellite: str = "19",
+                 raw_dir: str = "data/raw", output_dir: str = "data/processed_01_original",
+                 format: str = "both", download_workers: int = 2, fs=None,
+                 clock: Callable[[], datetime] = utcnow, process: bool = True,
+                 on_done: Optional[Callable[[IngestJob], None]] = None, service: Optional[str] = None,
+                 service_timeout: float = 600.0):
+        self.products = products
+        self.satellite = satellite
+        self.raw_dir = Path(raw_dir)
+        self.output_dir = Path(output_dir)
+        self.format = format
+        self.fs = fs if fs is not None else make_filesystem(download_workers)
+        self.process = process
+        self.clock = clock
+        self.on_done = on_done
+        self.service = None
+        self.service_timeout = service_timeout
+        self._service_down_until = 0.0
+        if service:
+            from ..processing.logic_service.client import ServiceClient
+            self.service = ServiceClient(service)
+
+        self.watchers = {p: PrefixWatcher(self.fs, satellite, p, clock) for p in products}
+        self.download_queue: "queue.Queue[Optional[IngestJob]]" = queue.Queue()
+        self.process_queue: "queue.Queue[Optional[IngestJob]]" = queue.Queue()
+        self.download_workers = download_workers
+        self.budget = ByteBudget(2048 * 1024**2)
+        self.manifests = ManifestRegistry()
+        self.completed: List[IngestJob] = []
+
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    # --- WATCHER ---
+    def poll_once(self, product: str) -> int:
+        scan_started = time.monotonic()
+        found = self.watchers[product].poll()
+        for item in found:
+            self.download_queue.put(IngestJob(item["key"], product, item["size"], item["etag"],
+                                              scan_started, time.monotonic()))
+        if found:
+            log.info(f"[{product}] {len(found)} claves nuevas")
+        return len(found)
+
+    def prime(self):
+        """Marca como vistas las claves ya publicadas (arrancar sin backlog)."""
+        for watcher in self.watchers.values():
+            watcher.poll()
+
+    def _watch_loop(self, product: str, interval: float):
+        while not self._stop.is_set():
+            t0 = time.monotonic()
+            try:
+                self.poll_once(product)
+            except Exception as e:
+                log.warning(f"[{product}] Error listando S3: {e}")
+            self._stop.wait(max(0.0, interval - (time.monotonic() - t0)))
+
+    # --- DESCARGA ---
+    def _local_path(self, job: IngestJob) -> Path:
+        # bucket/producto/YYYY/JJJ/HH/archivo → misma estructura que download_files
+        parts = job.key.strip("/").split("/")
+        return self.raw_dir.joinpath(*parts[-6:])
+
+    def _download_loop(self):
+        while True:
+            job = self.download_queue.get()
+            if job is None:
+                break
+            try:
+                local_path = self._local_path(job)
+                local_path.parent.mkdir(parents=True, exist_ok=True)
+                manifest = self.manifests.for_dir(local_path.parent)
+                if not manifest.is_valid(local_path.name, job.size, job.etag):
+                    t0 = time.monotonic()
+                    _fetch(self.fs, job.key, local_path, job.size, self.budget, manifest, job.etag)
+                    job.timings["download"] = time.monotonic() - t0
+                job.local_path = local_path
+                job.downloaded = time.monotonic()
+                job.hold = FileHold([local_path]).acquire()
+                update_index(self.raw_dir, [local_path])
+                notify_storage(self.raw_dir, [local_path])
+                if self.process and processor_for(job.product):
+                    self.process_queue.put(job)
+                else:
+                    self._finish(job)
+            except Exception as e:
+                job.error = f"descarga: {e} (se reintenta en el próximo escaneo)"
+                # Sin esto el escaneo se perdería: el watcher ya no volvería a ofrecer la clave
+                self.watchers[job.product].forget(job.key)
+                self._finish(job)
+
+    # --- PROCESAMIENTO ---
+    def _process_loop(self):
+        while True:
+            job = self.process_queue.get()
+            if job is None:
+                break
+            try:
+                processor = processor_for(job.product)
+                t0 = time.monotonic()
+                job.output = self._process_remote(processor, job)
+                if job.output is None:
+                    job.output = processor.process_file(job.local_path, self.raw_dir, self.output_dir, self.format,
+                                                        False)
+                job.timings["process"] = time.monotonic() - t0
+                job.written = time.monotonic()
+            except Exception as e:
+                job.error = f"proceso: {e}"
+            self._finish(job)
+
+    def _process_remote(self, processor, job: IngestJob) -> Optional[Path]:
+        """Procesa en el servicio residente; None si no hay servicio o no responde (se procesa acá)."""
+        if self.service is None or time.monotonic() < self._service_down_until:
+            return None
+        from ..processing.logic_queue.work_queue import file_job
+        from ..processing.logic_service.client import FINISHED, ServiceError
+
+        params = {"input_base": str(self.raw_dir.resolve()), "output_base": str(self.output_dir.resolve()),
+                  "format": self.format, "overwrite": False}
+        try:
+            # La clave de file_job solo la usa la cola compartida: alcanza con la carpeta base
+            res = self.service.run(file_job(processor.name, job.local_path, params, self.output_dir),
+                                   priority=INGEST_PRIORITY, timeout=self.service_timeout)
+        except (OSError, ServiceError) as e:
+            log.warning(f"Servicio {self.service.address} no disponible ({e}): se procesa en este proceso")
+            return None
+        if res["state"] not in FINISHED:
+            # Aceptó el trabajo pero no lo terminó a tiempo: se trata como caído (salidas idempotentes)
+            self._service_down_until = time.monotonic() + self.service_timeout
+            log.warning(f"El servicio {self.service.address} no terminó {Path(job.key).name} en "
+                        f"{self.service_timeout:.0f} s ({res['state']}): se procesa en este proceso y se deja "
+                        f"de usar el servicio por {self.service_timeout:.0f} s")
+            return None
+        job.timings["service_queue"] = res["queue_seconds"]
+        if res["state"] == "cancelled":
+            log.warning(f"El servicio canceló {Path(job.key).name} (se está deteniendo): se procesa en este proceso")
+            return None
+        if not res["ok"]:
+            raise RuntimeError(res["error"])
+        return Path(res["output"]) if res["output"] else self.output_dir
+
+    def _finish(self, job: IngestJob):
+        if job.hold is not None:
+            job.hold.release()
+            job.hold = None
+        if job.written is None and job.error is None:
+            job.written = job.downloaded
+        self.completed.append(job)
+        name = Path(job.key).name
+        if job.error:
+            log.error(f"[{job.product}] {name}: {job.error}")
+        else:
+            info = parse_filename(name)
+            age = ""
+            if info:
+                obs = datetime.fromisoformat(info["start_time"])
+                age = f", {(self.clock() - obs).total_seconds():.0f} s desde el inicio de la observación"
+            log.info(f"[{job.product}] {name}: latencia {job.latency:.2f} s "
+                     f"(escaneo→imagen escrita{age}) {job.timings}")
+        if self.on_done is not None:
+            self.on_done(job)
+
+    # --- CICLO DE VIDA ---
+    def start(self):
+        self._stop.clear()
+        for product, interval in self.products.items():
+            self._threads.append(threading.Thread(target=self._watch_loop, args=(product, interval),
+                                                  name=f"watch-{product}", daemon=True))
+        for i in range(self.download_workers):
+            self._threads.append(threading.Thread(target=self._download_loop, name=f"download-{i}", daemon=True))
+        self._threads.append(threading.Thread(target=self._process_loop, name="process", daemon=True))
+        for t in self._threads:
+            t.start()
+        log.info(f"Ingesta iniciada: {', '.join(self.products)}")
+
+    def stop(self, timeout: float = 30.0):
+        self._stop.set()
+        for _ in range(self.download_workers):
+            self.download_queue.put(None)
+        for t in self._threads:
+            if t.name.startswith("download"):
+                t.join(timeout)
+        self.process_queue.put(None)
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+        log.info("Ingesta detenida.")
+
+    def run_forever(self):
+        self.start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            self.stop()
@@ -0,0 +1,60 @@
+# src/goes_processor/ingest/ingest_cli.py
+
+import logging
+import click
+from ..processing.logic_output.formats import FORMATS
+
+# Productos e intervalos de escaneo por defecto (segundos)
+DEFAULT_PRODUCTS = {
+    "ABI-L2-LSTF": 60,
+    "ABI-L2-MCMIPF": 30,
+    "ABI-L2-FDCF": 30,
+    "GLM-L2-LCFA": 10,
+}
+
+@click.group(name="ingest")
+def ingest():
+    """Ingesta continua guiada por eventos (watcher S3 → descarga → proceso)."""
+    pass
+
+@ingest.command(name="run")
+@click.option('--satellite', default="19", type=click.Choice(["16", "17", "18", "19"]), help='Satélite GOES.')
+@click.option('--product', 'products', multiple=True,
+              help='Producto a vigilar (repetible). Por defecto: LSTF, MCMIPF, FDC y GLM.')
+@click.option('--interval', default=None, type=click.FloatRange(1),
+              help='Segundos entre escaneos (por defecto, el de cada producto).')
+@click.option('--raw-dir', default="data/raw", help='Carpeta de descargas.')
+@click.option('--output-dir', default="data/processed_01_original", help='Carpeta de productos.')
+@click.option('--format', default="both", type=click.Choice(FORMATS))
+@click.option('--download-workers', default=2, show_default=True, type=click.IntRange(1))
+@click.option('--backlog/--no-backlog', default=False, show_default=True,
+              help='Procesar también lo ya publicado en la hora actual al arrancar.')
+@click.option('--via-daemon', is_flag=True, default=False,
+              help='Procesar en el servicio residente (processing service run) con prioridad alta; '
+                   'si no responde, se procesa en este proceso.')
+@click.option('--daemon-address', default=None,
+              help='Dirección del servicio: unix:/ruta.sock o host:puerto (por defecto: $GOES_PROCESSOR_SERVICE '
+                   'o el socket del usuario en el temporal del sistema).')
+@click.option('--daemon-timeout', default=600, show_default=True, type=click.FloatRange(1),
+              help='Segundos que se espera un trabajo en el servicio; vencidos, se procesa en este proceso.')
+def ingest_run(satellite, products, interval, raw_dir, output_dir, format, download_workers, backlog, via_daemon,
+               daemon_address, daemon_timeout):
+    """Demonio residente: detecta claves nuevas y las descarga y procesa al instante."""
+    from .daemon import IngestDaemon
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    selected = {p: DEFAULT_PRODUCTS.get(p, 60) for p in products} if products else dict(DEFAULT_PRODUCTS)
+    if interval:
+        selected = {p: interval for p in selected}
+
+    service = None
+    if via_daemon:
+        from ..processing.logic_service.client import default_address
+        service = daemon_address or default_address()
+
+    daemon = IngestDaemon(selected, satellite=satellite, raw_dir=raw_dir, output_dir=output_dir,
+                          format=format, download_workers=download_workers, service=service,
+                          service_timeout=daemon_timeout)
+    if not backlog:
+        daemon.prime()
+    daemon.run_forever()
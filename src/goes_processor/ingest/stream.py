@@ -0,0 +1,177 @@
+# src/goes_processor/ingest/stream.py
+
+"""
+Pipeline en streaming: listado S3 → descarga a un spool acotado → proceso →
+(opcional) archivo crudo.
+
+La descarga del archivo N+1 se superpone con el procesamiento del archivo N.
+La contrapresión la dan una cola acotada (cantidad de archivos) y un
+presupuesto de bytes sobre el spool (por defecto tmpfs en /dev/shm).
+"""
+
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from ..download.download import ByteBudget, _fetch, check_internet, list_product_files, make_filesystem
+from ..download.manifest import ManifestRegistry
+from ..processing.logic_crawler.index import update_index
+from ..processing.logic_how.registry import processor_for
+
+log = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+def default_spool_dir() -> Path:
+    """tmpfs si existe (RAM), si no el temporal del sistema."""
+    shm = Path("/dev/shm")
+    base = shm if shm.is_dir() and os.access(shm, os.W_OK) else Path(tempfile.gettempdir())
+    return base / "goes_spool"
+
+
+@dataclass
+class StreamItem:
+    key: str
+    size: int
+    etag: Optional[str]
+    spool_path: Path
+    reserved: int = 0
+    download_seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def stream_process(product: str, year: str, day_of_year: str, hour: str, minute: str = "all",
+                   satellite: str = "19", output_dir: str = "data/processed_01_original",
+                   format: str = "both", raw_dir: Optional[str] = None, spool_dir: Optional[str] = None,
+                   buffer_files: int = 2, buffer_mb: int = 2048, download_workers: int = 1,
+                   fs=None) -> List[dict]:
+    """
+    Descarga y procesa en streaming. Si raw_dir es None los NetCDF se descartan
+    después de procesarlos (solo quedan los productos).
+    """
+    processor = processor_for(product)
+    if processor is None:
+        raise ValueError(f"No hay lógica de procesamiento para {product}")
+
+    if fs is None:
+        if not check_internet():
+            log.error("[!] ERROR: SIN ACCESO A INTERNET.")
+            return []
+        fs = make_filesystem(download_workers)
+
+    remote_info = list_product_files(fs, satellite, product, year, day_of_year, hour, minute)
+    keys = list(remote_info)
+    if not keys:
+        log.warning(f"[!] No se encontraron archivos.")
+        return []
+
+    spool_root = Path(spool_dir) if spool_dir else default_spool_dir()
+    spool_root.mkdir(parents=True, exist_ok=True)
+    spool = Path(tempfile.mkdtemp(prefix="run_", dir=spool_root))
+    log.info(f"[*] {len(keys)} archivos en streaming. Spool: {spool} "
+             f"({buffer_files} archivos / {buffer_mb} MB máx.). Crudos: {raw_dir or 'descartados'}")
+
+    budget = ByteBudget(buffer_mb * 1024**2)
+    manifests = ManifestRegistry()
+    ready: "queue.Queue" = queue.Queue(maxsize=max(1, buffer_files))
+    pending: "queue.Queue" = queue.Queue()
+    for key in keys:
+        pending.put(key)
+    stop = threading.Event()
+
+    # --- STAGE 1: DESCARGA AL SPOOL ---
+    def downloader():
+        # _DONE se publica siempre: si este hilo muere sin avisar, el consumidor queda esperando
+        try:
+            while not stop.is_set():
+                try:
+                    key = pending.get_nowait()
+                except queue.Empty:
+                    break
+                parts = key.strip("/").split("/")
+                item = StreamItem(key, 0, None, spool.joinpath(*parts[-6:]))
+                t0 = time.perf_counter()
+                try:
+                    info = remote_info[key]
+                    item.size, item.etag = info["size"], info["etag"]
+                    item.spool_path.parent.mkdir(parents=True, exist_ok=True)
+                    # El espacio del spool se libera recién cuando el archivo se procesa
+                    item.reserved = budget.acquire(item.size)
+                    t0 = time.perf_counter()
+                    _fetch(fs, key, item.spool_path, item.size, budget, manifests.for_dir(item.spool_path.parent),
+                           item.etag, reserved=item.reserved)
+                    if not item.spool_path.exists():
+                        item.error = "descarga incompleta"
+                except Exception as e:
+                    item.error = f"descarga: {e}"
+                item.download_seconds = time.perf_counter() - t0
+                ready.put(item)
+        finally:
+            ready.put(_DONE)
+
+    threads = [threading.Thread(target=downloader, name=f"stream-dl-{i}", daemon=True)
+               for i in range(max(1, download_workers))]
+    for t in threads:
+        t.start()
+
+    # --- STAGE 2: PROCESO (en este hilo: satpy queda caliente) ---
+    processor.load()  # import del pipeline antes del primer archivo
+
+    results = []
+    finished_workers = 0
+    try:
+        while finished_workers < len(threads):
+            item = ready.get()
+            if item is _DONE:
+                finished_workers += 1
+                continue
+            res = {"file": Path(item.key).name, "download_seconds": item.download_seconds}
+            try:
+                if item.error:
+                    raise RuntimeError(item.error)
+                t0 = time.perf_counter()
+                res["output"] = str(processor.process_file(item.spool_path, spool, Path(output_dir), format, False))
+                res["process_seconds"] = time.perf_counter() - t0
+
+                # --- STAGE 3: RETENER O DESCARTAR EL CRUDO ---
+                if raw_dir:
+                    rel = item.spool_path.relative_to(spool)
+                    final = Path(raw_dir) / rel
+                    final.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.move(str(item.spool_path), final)
+                    manifests.for_dir(final.parent).record(final.name, item.size, item.etag)
+                    update_index(raw_dir, [final])
+                    res["raw"] = str(final)
+                res["ok"] = True
+                log.info(f"   [DONE] {res['file']} (descarga {item.download_seconds:.1f} s, "
+                         f"proceso {res['process_seconds']:.1f} s)")
+            except Exception as e:
+                res["ok"] = False
+                res["error"] = str(e)
+                log.error(f"   [!] ERROR {res['file']}: {e}")
+            finally:
+                if item.spool_path.exists():
+                    item.spool_path.unlink()
+                budget.release(item.reserved)
+            results.append(res)
+    finally:
+        stop.set()
+        # Desbloquea a los descargadores si quedaron esperando lugar en la cola
+        while any(t.is_alive() for t in threads):
+            try:
+                item = ready.get(timeout=0.1)
+                if item is not _DONE:
+                    budget.release(item.reserved)
+            except queue.Empty:
+                pass
+        shutil.rmtree(spool, ignore_errors=True)
+
+    return results
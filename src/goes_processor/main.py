@@ -1,12 +1,41 @@
 # src/goes19_processor/main.py
 
+import importlib
 import click
 
-# Importa y aplica la configuración global de Satpy (se ejecuta automáticamente)
-from .config_satpy import *  # Esto ejecuta todo el código de config_satpy.py
+
+class LazyGroup(click.Group):
+    """
+    Grupo de click que importa cada subcomando recién cuando se usa (o se lista
+    en --help). Satpy se configura aparte, de forma perezosa (config_satpy.apply).
+    """
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # nombre → "modulo:atributo"
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands:
+            module_name, attr = self.lazy_subcommands[cmd_name].split(":")
+            return getattr(importlib.import_module(module_name, __package__), attr)
+        return super().get_command(ctx, cmd_name)
+
 
 # Importa el grupo principal (definido aquí)
-@click.group()
+@click.group(cls=LazyGroup, lazy_subcommands={
+    # Comando download (desde su archivo separado)
+    "download": ".download.download_cli:download",
+    # Comando processing_group (desde su archivo separado)
+    "processing": ".processing.processing_cli:processing_group",
+    # Comando ingest (demonio de ingesta continua)
+    "ingest": ".ingest.ingest_cli:ingest",
+    # Comando storage (cuotas de disco y desalojo LRU)
+    "storage": ".storage.storage_cli:storage",
+})
 @click.version_option(version="0.0.1", prog_name="Satellite Processor Tool")
 def cli():
     """
@@ -14,13 +43,5 @@ def cli():
     """
     pass
 
-# Importa y registra el comando download (desde su archivo separado)
-from .download.download_cli import download
-cli.add_command(download)
-
-# Importa y registra el comando processing_group (desde su archivo separado)
-from .processing.processing_cli import processing_group 
-cli.add_command(processing_group)
-
 if __name__ == "__main__":
     cli()
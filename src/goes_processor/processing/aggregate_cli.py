@@ -0,0 +1,53 @@
+import click
+from .logic_crawler.crawler import find_files
+from .logic_parallel.profile import PROFILES
+from ..telemetry import cli_options, start_from_cli
+
+@click.command(name="aggregate")
+@click.option('--satellite', default="19", type=click.Choice(['16', '17', '18', '19']), help="Número del satélite (ej: 19)")
+@click.option('--product', default="ABI-L2-LSTF", show_default=True, help="Producto LST de entrada")
+@click.option('--year', required=True, help="Año YYYY o all")
+@click.option('--day', default="all", help="Día JJJ o all")
+@click.option('--hour', default="all", help="Hora HH o all")
+@click.option('--input-dir', required=True, type=click.Path(exists=True))
+@click.option('--output-dir', required=True, type=click.Path())
+@click.option('--period', default="daily", show_default=True, type=click.Choice(['daily', 'monthly']))
+@click.option('--format', default="both", show_default=True, type=click.Choice(['netcdf', 'cog', 'both']),
+              help="NetCDF con todas las estadísticas y/o un COG float32 por estadística.")
+@click.option('--variance/--no-variance', default=False, show_default=True,
+              help="Acumular también media/desvío de Welford.")
+@click.option('--region', default=None, help="Preset, bbox lon_min,lat_min,lon_max,lat_max o areas.yaml:nombre.")
+@click.option('--jobs', default=1, show_default=True, type=click.IntRange(1),
+              help="Procesos que pliegan archivos en paralelo (reducción de acumuladores al final).")
+@click.option('--processing-profile', 'profile_name', default='default', show_default=True,
+              type=click.Choice(['auto', *PROFILES]))
+@click.option('--index/--no-index', 'use_index', default=True, show_default=True)
+@cli_options
+def aggregate_cmd(satellite, product, year, day, hour, input_dir, output_dir, period, format, variance,
+                  region, jobs, profile_name, use_index, verbose, metrics_jsonl, metrics_prom, profile_files,
+                  profile_dir):
+    """Compuestos LST diarios/mensuales (mín/máx/media/conteo) incrementales y en memoria constante."""
+    if "LST" not in product:
+        click.secho(f"El agregado temporal solo está implementado para LST (recibido: {product})", fg="yellow")
+        return
+    files = find_files(input_dir, satellite, product, year, day, hour, "all", use_index=use_index)
+    if not files:
+        click.secho(f"No se encontró nada para G{satellite} - {product} en {year}/{day}", fg="yellow")
+        return
+
+    start_from_cli(metrics_jsonl, metrics_prom, profile_files, profile_dir, verbose)
+    from .logic_aggregate.aggregate import aggregate
+    from .logic_parallel.profile import apply_profile, resolve_profile
+
+    profile = resolve_profile(profile_name, jobs)
+    if jobs == 1:
+        apply_profile(profile)
+    click.echo(f"[*] {len(files)} archivos → compuestos {period} ({format}), perfil {profile.describe()}")
+    summaries = aggregate(files, output_dir, satellite=satellite, product=product, period=period,
+                          region=region, welford=variance, format=format, jobs=jobs, profile=profile)
+
+    for s in summaries:
+        status = "sin cambios" if not s["new"] else f"+{s['new']} archivos"
+        click.secho(f"   - {s['period']}: {s['total']} archivos acumulados ({status})", fg="green")
+        for out in s["outputs"]:
+            click.echo(f"       {out}")
@@ -0,0 +1,119 @@
+import click
+from pathlib import Path
+from .bulk_cli import _parse_time
+from .logic_crawler.crawler import find_files
+from .logic_how.registry import processor_for
+from .logic_parallel.profile import PROFILES
+from ..telemetry import cli_options, start_from_cli
+
+@click.command(name="animate")
+@click.option('--satellite', default="19", type=click.Choice(['16', '17', '18', '19']), help="Número del satélite (ej: 19)")
+@click.option('--product', required=True, help="Ej: ABI-L2-MCMIPF (true color) o ABI-L2-LSTF")
+@click.option('--year', required=True, help="Año YYYY o all")
+@click.option('--day', default="all", help="Día JJJ o all")
+@click.option('--hour', default="all", help="Hora HH o all")
+@click.option('--minute', default="all", help="Minuto MM o all")
+@click.option('--start-time', default=None, help="Inicio de escaneo mínimo YYYY-MM-DD_HH:MM (UTC).")
+@click.option('--end-time', default=None, help="Inicio de escaneo máximo YYYY-MM-DD_HH:MM (UTC).")
+@click.option('--input-dir', required=True, type=click.Path(exists=True), help="NetCDF de origen (data/raw).")
+@click.option('--output-dir', required=True, type=click.Path(),
+              help="Salidas de bulk/stream donde están los PNG por archivo.")
+@click.option('--output', required=True, type=click.Path(dir_okay=False),
+              help="Archivo de la animación (.mp4, .webm, .gif o .png/.apng).")
+@click.option('--format', 'fmt', default=None, type=click.Choice(['mp4', 'webm', 'gif', 'apng']),
+              help="Formato (por defecto, según la extensión de --output). mp4/webm requieren ffmpeg.")
+@click.option('--frame', default=None,
+              help="Cuadro a usar (truecolor: wgs84, native; LST: color, gray, native_color, native_gray; "
+                   "GLM/FDC: 5min, 1min, 15min). Por defecto, el primero.")
+@click.option('--source', default="frames", show_default=True, type=click.Choice(['frames', 'netcdf', 'auto']),
+              help="frames: PNG ya procesados; netcdf: renderiza desde el NetCDF con la LUT cacheada, sin "
+                   "pasada de PNG; auto: el PNG si existe, si no el NetCDF.")
+@click.option('--region', default=None,
+              help="Región con la que se procesaron los cuadros (o a renderizar): preset, bbox o areas.yaml:nombre.")
+@click.option('--fps', default=10.0, show_default=True, type=click.FloatRange(0.1, 120))
+@click.option('--width', default=None, type=click.IntRange(16),
+              help="Ancho de salida en píxeles (mantiene la proporción). Por defecto, el del cuadro.")
+@click.option('--label/--no-label', default=True, show_default=True, help="Rotular la fecha de escaneo.")
+@click.option('--loop', default=0, show_default=True, type=click.IntRange(0),
+              help="Repeticiones de gif/apng (0 = infinitas).")
+@click.option('--crf', default=None, type=click.IntRange(0, 63), help="Calidad mp4/webm (menor = mejor).")
+@click.option('--jobs', default=1, show_default=True, type=click.IntRange(1),
+              help="Workers que preparan cuadros (hilos para PNG, procesos para NetCDF).")
+@click.option('--processing-profile', 'profile_name', default='default', show_default=True,
+              type=click.Choice(['auto', *PROFILES]), help="Perfil de los workers que renderizan desde NetCDF.")
+@click.option('--index/--no-index', 'use_index', default=True, show_default=True)
+@cli_options
+def animate_cmd(satellite, product, year, day, hour, minute, start_time, end_time, input_dir, output_dir, output,
+                fmt, frame, source, region, fps, width, label, loop, crf, jobs, profile_name, use_index,
+                verbose, metrics_jsonl, metrics_prom, profile_files, profile_dir):
+    """Animación (timelapse) en streaming a partir de los cuadros procesados de un rango de tiempo."""
+    from .logic_animate.animate import LABEL_FORMAT, animate, collect_frames, frame_spec
+    from .logic_animate.encoders import find_ffmpeg, format_for, needs_even_size
+
+    proc = processor_for(product)
+    if proc is None:
+        raise click.BadParameter(f"No hay lógica de procesamiento para {product}", param_hint='--product')
+    try:
+        fmt = format_for(output, fmt)
+        frame, _, dataset, _ = frame_spec(proc, frame)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+    if needs_even_size(fmt) and find_ffmpeg() is None:
+        raise click.BadParameter(f"{fmt} requiere ffmpeg en el PATH (o el paquete imageio-ffmpeg); "
+                                 f"gif y apng no lo necesitan", param_hint='--output/--format')
+    if source == "netcdf" and dataset is None:
+        raise click.BadParameter(f"El cuadro '{frame}' de {proc.name} solo existe como PNG procesado "
+                                 f"(usar --source frames)", param_hint='--source')
+    if region:
+        from .logic_resample.regions import parse_region
+        try:
+            parse_region(region)
+        except (ValueError, OSError) as e:
+            raise click.BadParameter(str(e), param_hint='--region') from e
+
+    files = find_files(input_dir, satellite, product, year, day, hour, minute,
+                       start_time=_parse_time(start_time, '--start-time'),
+                       end_time=_parse_time(end_time, '--end-time'), use_index=use_index)
+    if not files:
+        click.secho(f"No se encontró nada para G{satellite} - {product} en {year}/{day}", fg="yellow")
+        return
+    sources = collect_frames(files, proc, frame, Path(input_dir), Path(output_dir), region)
+    with_png = sum(s.png is not None for s in sources)
+    click.echo(f"[*] {len(sources)} escaneos, {with_png} con PNG '{frame}' procesado → {output} ({fmt}, {fps:g} fps)")
+
+    start_from_cli(metrics_jsonl, metrics_prom, profile_files, profile_dir, verbose)
+    profile = None
+    if source != "frames" and with_png < len(sources):
+        from .logic_parallel.profile import resolve_profile
+        profile = resolve_profile(profile_name, jobs)
+
+    with click.progressbar(length=len(sources), label="Cuadros") as bar:
+        def on_frame(res):
+            bar.update(1)
+            if not res["ok"]:
+                click.secho(f"\n[ERROR] {Path(res['file']).name}: {res['error']}", fg="red")
+
+        try:
+            summary = animate(sources, output, fmt, proc, frame, fps=fps, width=width, source=source, region=region,
+                              label=LABEL_FORMAT if label else None, jobs=jobs, loop=loop, crf=crf, profile=profile,
+                              on_frame=on_frame)
+        except (RuntimeError, ValueError) as e:
+            raise click.ClickException(str(e)) from e
+
+    # --- RESUMEN ---
+    if summary["missing"]:
+        click.secho(f"[!] {len(summary['missing'])} escaneos sin PNG '{frame}' (procesarlos con bulk o usar "
+                    f"--source auto/netcdf); se omiten:", fg="yellow")
+        for name in summary["missing"][:10]:
+            click.echo(f"   - {name}")
+        if len(summary["missing"]) > 10:
+            click.echo(f"   - ... y {len(summary['missing']) - 10} más")
+    if not summary["frames"]:
+        click.secho("[!] Ningún cuadro: no se escribió la animación", fg="red")
+        return
+    color = "green" if not summary["errors"] else "yellow"
+    click.secho(f"[*] {output}: {summary['frames']} cuadros {summary['width']}x{summary['height']} "
+                f"({summary['from_png']} desde PNG, {summary['from_netcdf']} desde NetCDF), "
+                f"{summary['bytes'] / 1024**2:.1f} MB en {summary['seconds']:.1f} s", fg=color)
+    for err in summary["errors"]:
+        click.secho(f"   - {err['file']}: {err['error']}", fg="red")
@@ -1,44 +1,337 @@
 import click
+from datetime import datetime
 from pathlib import Path
 from .logic_crawler.crawler import find_files
-from .logic_how.lst import process_file as run_lst
-from .logic_how.truecolor import process_file as run_truecolor
+from .logic_how.registry import processor_for
+from .logic_parallel.pool import run_parallel, run_parallel_scans, default_dask_threads
+from .logic_parallel.profile import PROFILES, PeakMemory, apply_profile, resolve_profile
+from .logic_output.formats import FORMATS
+from ..telemetry import cli_options, start_from_cli
+
+def _parse_time(value, option_name):
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d_%H:%M")
+    except ValueError:
+        raise click.BadParameter(f"Formato esperado YYYY-MM-DD_HH:MM, recibido: {value}", param_hint=option_name) from None
+
+def _plan(jobs, input_path, output_path, format, overwrite, tile_zoom, region, memory_lean=False, verbose=False):
+    """Filtra los (procesador, archivo) cuya salida ya está al día según el manifiesto de su carpeta."""
+    from .logic_output.job_manifest import stale_reason
+
+    todo = []
+    for proc, f in jobs:
+        reason = "--overwrite yes" if overwrite else stale_reason(
+            proc.job_spec(f, input_path, output_path, format, tile_zoom, region, memory_lean))
+        if reason is not None:
+            todo.append((proc, f))
+        if verbose:
+            if reason is None:
+                click.echo(f"   = {f.name}: al día")
+            else:
+                click.secho(f"   + {f.name}: {reason}", fg="yellow")
+
+    skipped = len(jobs) - len(todo)
+    label = "[dry-run] " if verbose else ""
+    click.secho(f"[*] {label}{len(todo)} a (re)construir, {skipped} al día según el manifiesto",
+                fg="green" if not todo else "yellow")
+    return todo
+
+def _job_dicts(jobs_list, input_path, output_path, format, overwrite, tile_zoom, region, memory_lean,
+               multi_product):
+    """Un trabajo autocontenido (rutas absolutas) por archivo o por escaneo, para la cola o el servicio."""
+    from .logic_queue.work_queue import file_job, scan_job
+
+    params = {"input_base": str(input_path.resolve()), "output_base": str(output_path.resolve()), "format": format,
+              "overwrite": overwrite, "tile_zoom": tile_zoom, "region": region, "memory_lean": memory_lean}
+    if multi_product:
+        from .logic_how.multi_product import group_by_scan
+        return [scan_job(g, params) for g in group_by_scan([f for _, f in jobs_list]).values()]
+    return [file_job(proc.name, f, params, proc.job_spec(f, input_path, output_path, format, tile_zoom,
+                                                          region, memory_lean).output_dir)
+            for proc, f in jobs_list]
+
+def _enqueue(location, jobs_list, input_path, output_path, format, overwrite, tile_zoom, region, memory_lean,
+             multi_product, max_attempts):
+    """Publica en la cola un trabajo por archivo (o por escaneo); los workers leen todo de los parámetros."""
+    from .logic_queue.work_queue import open_queue
+
+    queued = _job_dicts(jobs_list, input_path, output_path, format, overwrite, tile_zoom, region, memory_lean,
+                        multi_product)
+    with open_queue(location) as queue:
+        added = queue.enqueue(queued, max_attempts=max_attempts)
+        remaining = queue.status()["remaining"]
+    click.secho(f"[*] Encolados {added} de {len(queued)} trabajos en {location} "
+                f"({len(queued) - added} ya estaban en la cola); pendientes en total: {remaining}", fg="green")
+
+
+def _run_via_service(address, queued, priority, satellite):
+    """Envía los trabajos al servicio residente y espera sus resultados (sin importar satpy acá)."""
+    from .logic_service.client import ServiceClient, ServiceError
+
+    client = ServiceClient(address)
+    try:
+        st = client.status()
+        submitted = [client.submit(job, priority) for job in queued]
+    except (OSError, ServiceError) as e:
+        raise click.ClickException(f"No responde el servicio en {client.address} ({e}); arrancarlo con "
+                                   f"`processing service run` o quitar --via-daemon") from e
+    click.echo(f"[*] {len(submitted)} trabajos enviados al servicio {client.address} "
+               f"({st['workers']} workers calientes, prioridad {priority})")
+
+    results = []
+    with click.progressbar(submitted, label=f"Procesando G{satellite}") as bar:
+        for job in bar:
+            try:
+                res = client.wait(job["id"])
+            except (OSError, ServiceError) as e:
+                res = dict(job, ok=False, error=f"servicio: {e}")
+            if res["state"] == "cancelled":
+                res.update(ok=False, error="cancelado (el servicio se detuvo)")
+            res["file"] = res["files"][0]
+            if not res["ok"]:
+                click.secho(f"\n[ERROR] {Path(res['file']).name}: {res['error']}", fg="red")
+            results.append(res)
+    waits = [r["queue_seconds"] for r in results if r.get("ok")]
+    if waits:
+        click.echo(f"[*] Espera media en la cola del servicio: {sum(waits) / len(waits):.2f} s")
+    return results
+
+def _run_queue_worker(location, jobs, dask_threads, profile_name, chunk_mb, memory_limit_mb, spill_dir,
+                      lease_seconds, wait, verbose, metrics_jsonl, metrics_prom, profile_files, profile_dir):
+    from .logic_queue.worker import run_workers, worker_name
+
+    start_from_cli(metrics_jsonl, metrics_prom, profile_files, profile_dir, verbose)
+    profile = resolve_profile(profile_name, jobs, threads=dask_threads, chunk_mb=chunk_mb,
+                              memory_limit_mb=memory_limit_mb, spill_dir=spill_dir)
+    click.echo(f"[*] Worker {worker_name()} sobre {location}: {jobs} proceso(s), lease {lease_seconds} s")
+    click.echo(f"[*] Perfil: {profile.describe()}")
+
+    def on_result(res):
+        name = Path(res["file"]).name
+        if res["ok"]:
+            click.echo(f"   - [OK] {name} en {res['seconds']:.1f} s (pico RSS {res['peak_rss_mb']:.0f} MB)")
+        else:
+            retry = "reintento pendiente" if res["state"] == "pending" else res["state"]
+            click.secho(f"   - [ERROR] {name} (intento {res['attempt']}/{res['max_attempts']}, {retry}): "
+                        f"{res['error']}", fg="red")
+
+    results = run_workers(location, jobs, dask_threads=profile.threads or default_dask_threads(jobs),
+                          profile=profile, lease_seconds=lease_seconds, wait=wait, on_result=on_result)
+    errors = [r for r in results if not r["ok"]]
+    click.secho(f"[*] Trabajos procesados por este nodo: {len(results)}  Errores: {len(errors)}",
+                fg="green" if not errors else "yellow")
 
 @click.command(name="bulk")
-@click.option('--satellite', required=True, type=click.Choice(['16', '17', '18', '19']), help="Número del satélite (ej: 19)")
-@click.option('--product', required=True, help="Ej: ABI-L2-LSTF o ABI-L2-MCMIPF")
-@click.option('--year', required=True, help="Año YYYY o all")
-@click.option('--day', required=True, help="Día JJJ o all")
-@click.option('--hour', required=True, help="Hora HH o all")
-@click.option('--minute', required=True, help="Minuto MM o all")
-@click.option('--input-dir', required=True, type=click.Path(exists=True))
-@click.option('--output-dir', required=True, type=click.Path())
-@click.option('--format', required=True, type=click.Choice(['png', 'tiff', 'both']))
-@click.option('--overwrite', required=True, type=click.Choice(['yes', 'no']))
-def bulk_cmd(satellite, product, year, day, hour, minute, input_dir, output_dir, format, overwrite):
+@click.option('--satellite', type=click.Choice(['16', '17', '18', '19']), help="Número del satélite (ej: 19)")
+@click.option('--product',
+              help="Ej: ABI-L2-LSTF o ABI-L2-MCMIPF; varios separados por coma (ABI-L2-LSTF,ABI-L2-MCMIPF).")
+@click.option('--year', help="Año YYYY o all")
+@click.option('--day', help="Día JJJ o all")
+@click.option('--hour', help="Hora HH o all")
+@click.option('--minute', help="Minuto MM o all")
+@click.option('--input-dir', type=click.Path(exists=True))
+@click.option('--output-dir', type=click.Path())
+@click.option('--format', type=click.Choice(FORMATS),
+              help="png, tiff, both o cog (PNG + Cloud-Optimized GeoTIFF con tiles y overviews).")
+@click.option('--overwrite', type=click.Choice(['yes', 'no']))
+@click.option('--start-time', default=None, help="Inicio de escaneo mínimo YYYY-MM-DD_HH:MM (UTC).")
+@click.option('--end-time', default=None, help="Inicio de escaneo máximo YYYY-MM-DD_HH:MM (UTC).")
+@click.option('--index/--no-index', 'use_index', default=True, show_default=True,
+              help="Usar el índice SQLite incremental del input-dir en lugar de escanear el disco.")
+@click.option('--jobs', default=1, show_default=True, type=click.IntRange(1),
+              help="Procesos en paralelo (1 = en serie, en este proceso).")
+@click.option('--dask-threads', default=None, type=click.IntRange(1),
+              help="Hilos de dask por proceso (por defecto: núcleos / jobs).")
+@click.option('--processing-profile', 'profile_name', default='default', show_default=True,
+              type=click.Choice(['auto', *PROFILES]),
+              help="Perfil de chunks/hilos/memoria. 'auto' lo calcula según RAM disponible y núcleos.")
+@click.option('--chunk-mb', default=None, type=click.IntRange(1),
+              help="Tamaño de chunk de dask en MB (sobrescribe el del perfil).")
+@click.option('--memory-limit-mb', default=None, type=click.IntRange(64),
+              help="Techo de memoria por proceso; los arrays grandes se vuelcan a disco.")
+@click.option('--spill-dir', default=None, type=click.Path(file_okay=False),
+              help="Carpeta para el volcado a disco (por defecto: temporal del sistema).")
+@click.option('--region', default=None,
+              help="Región: preset (south_america, argentina, brazil, conus, central_america, caribbean), "
+                   "bbox lon_min,lat_min,lon_max,lat_max o areas.yaml:nombre. Solo se leen y remuestrean esos píxeles.")
+@click.option('--tile-zoom', default=None, type=click.IntRange(0, 6),
+              help="Además escribe una pirámide XYZ (Web Mercator) hasta este zoom; omite tiles vacíos.")
+@click.option('--dry-run', is_flag=True, default=False,
+              help="Solo informa qué salidas se reconstruirían (y por qué), sin procesar nada.")
+@click.option('--memory-lean', is_flag=True, default=False,
+              help="Sin reducciones sobre el disco completo: realce gris de rango fijo y GeoTIFF LST en °C float32.")
+@click.option('--multi-product', is_flag=True, default=False,
+              help="Agrupa por escaneo: una Scene por lector con todos los productos, remuestreo compartido "
+                   "y una sola pasada de escritura.")
+@click.option('--queue', 'queue_location', default=None,
+              help="Cola compartida entre nodos: ruta SQLite en un filesystem compartido (o esquema://destino).")
+@click.option('--enqueue', is_flag=True, default=False,
+              help="Solo publica en --queue los archivos (o escaneos) a procesar, sin procesarlos.")
+@click.option('--worker', is_flag=True, default=False,
+              help="Procesa trabajos de --queue con lease y heartbeats (--jobs workers en este nodo); "
+                   "no requiere los filtros de búsqueda.")
+@click.option('--lease-seconds', default=600, show_default=True, type=click.IntRange(30),
+              help="Duración de la lease de un trabajo; se renueva cada lease/3 mientras se procesa.")
+@click.option('--max-attempts', default=3, show_default=True, type=click.IntRange(1),
+              help="Intentos por trabajo antes de darlo por fallido (al encolar).")
+@click.option('--wait', 'worker_wait', is_flag=True, default=False,
+              help="Con --worker: seguir esperando trabajos nuevos en lugar de salir al vaciarse la cola.")
+@click.option('--via-daemon', is_flag=True, default=False,
+              help="Envía los trabajos al servicio residente (processing service run) en lugar de procesar "
+                   "acá: sin import de satpy ni LUTs por corrida. Jobs y perfil los fija el servicio.")
+@click.option('--daemon-address', default=None,
+              help="Dirección del servicio: unix:/ruta.sock o host:puerto (por defecto: $GOES_PROCESSOR_SERVICE "
+                   "o el socket del usuario en el temporal del sistema).")
+@click.option('--priority', default=0, show_default=True, type=int,
+              help="Con --via-daemon: prioridad de estos trabajos (mayor sale antes; la ingesta usa 10).")
+@cli_options
+def bulk_cmd(satellite, product, year, day, hour, minute, input_dir, output_dir, format, overwrite,
+             start_time, end_time, use_index, jobs, dask_threads, profile_name, chunk_mb, memory_limit_mb,
+             spill_dir, region, tile_zoom, dry_run, memory_lean, multi_product, queue_location, enqueue, worker,
+             lease_seconds, max_attempts, worker_wait, via_daemon, daemon_address, priority, verbose, metrics_jsonl,
+             metrics_prom, profile_files, profile_dir):
     """Procesamiento masivo con filtro de satélite y productos mixtos."""
-    
-    # El crawler filtra por la carpeta noaa-goesX usando el nuevo orden de búsqueda
-    files = find_files(input_dir, satellite, product, year, day, hour, minute)
-    
-    if not files:
-        click.secho(f"No se encontró nada para G{satellite} - {product} en {year}/{day}", fg="yellow")
+
+    if (enqueue or worker) and not queue_location:
+        raise click.UsageError("--enqueue y --worker requieren --queue.")
+    if enqueue and worker:
+        raise click.UsageError("--enqueue y --worker son modos distintos: usar uno por corrida.")
+    if via_daemon and (enqueue or worker):
+        raise click.UsageError("--via-daemon no se combina con --enqueue/--worker.")
+    if worker:
+        _run_queue_worker(queue_location, jobs, dask_threads, profile_name, chunk_mb, memory_limit_mb, spill_dir,
+                          lease_seconds, worker_wait, verbose, metrics_jsonl, metrics_prom, profile_files, profile_dir)
+        return
+    missing = [name for name, value in (("--satellite", satellite), ("--product", product), ("--year", year),
+                                        ("--day", day), ("--hour", hour), ("--minute", minute),
+                                        ("--input-dir", input_dir), ("--output-dir", output_dir),
+                                        ("--format", format), ("--overwrite", overwrite)) if value is None]
+    if missing:
+        raise click.UsageError(f"Faltan opciones: {', '.join(missing)}")
+
+    start_dt = _parse_time(start_time, '--start-time')
+    end_dt = _parse_time(end_time, '--end-time')
+
+    # El crawler filtra por la carpeta noaa-goesX; cada producto va a su procesador registrado
+    jobs_list = []
+    for prod in [p.strip() for p in product.split(",") if p.strip()]:
+        proc = processor_for(prod)
+        if proc is None:
+            click.secho(f"No hay lógica de procesamiento para {prod}", fg="yellow")
+            continue
+        found = find_files(input_dir, satellite, prod, year, day, hour, minute,
+                           start_time=start_dt, end_time=end_dt, use_index=use_index)
+        if not found:
+            click.secho(f"No se encontró nada para G{satellite} - {prod} en {year}/{day}", fg="yellow")
+        jobs_list += [(proc, f) for f in found]
+    if not jobs_list:
         return
 
     input_path = Path(input_dir)
     output_path = Path(output_dir)
     should_overwrite = (overwrite == 'yes')
+    if region:
+        from .logic_resample.regions import parse_region
+        try:
+            parse_region(region)
+        except (ValueError, OSError) as e:
+            raise click.BadParameter(str(e), param_hint='--region') from e
 
-    with click.progressbar(files, label=f"Procesando G{satellite}") as bar:
-        for f in bar:
-            try:
-                # Lógica para Land Surface Temperature (LST)
-                if "LST" in product:
-                    run_lst(f, input_path, output_path, format, should_overwrite)
-                
-                # Lógica para True Color (MCMIP o Radiancias)
-                elif "MCMIP" in product or "Rad" in product:
-                    run_truecolor([f], input_path, output_path, format, should_overwrite)
-                    
-            except Exception as e:
-                click.secho(f"\n[ERROR] {f.name}: {e}", fg="red")
+    # Manifiesto de trabajo: un stat() + un JSON por archivo, sin abrir NetCDF
+    if dry_run or not should_overwrite:
+        jobs_list = _plan(jobs_list, input_path, output_path, format, should_overwrite, tile_zoom, region,
+                          memory_lean, verbose=dry_run)
+        if dry_run or not jobs_list:
+            return
+    files = [f for _, f in jobs_list]
+
+    if enqueue:
+        _enqueue(queue_location, jobs_list, input_path, output_path, format, should_overwrite, tile_zoom, region,
+                 memory_lean, multi_product, max_attempts)
+        return
+
+    errors = []
+    peaks = []
+    if via_daemon:
+        queued = _job_dicts(jobs_list, input_path, output_path, format, should_overwrite, tile_zoom, region,
+                            memory_lean, multi_product)
+        results = _run_via_service(daemon_address, queued, priority, satellite)
+        errors = [r for r in results if not r["ok"]]
+        peaks = [(Path(r["file"]).name, r.get("peak_rss_mb") or 0.0) for r in results]
+        _summary(peaks, errors)
+        return
+
+    start_from_cli(metrics_jsonl, metrics_prom, profile_files, profile_dir, verbose)
+    profile = resolve_profile(profile_name, jobs, threads=dask_threads, chunk_mb=chunk_mb,
+                              memory_limit_mb=memory_limit_mb, spill_dir=spill_dir)
+    click.echo(f"[*] Perfil: {profile.describe()}")
+    options = dict(tile_zoom=tile_zoom, region=region, memory_lean=memory_lean)
+
+    if multi_product:
+        from .logic_how.multi_product import group_by_scan
+        scans = list(group_by_scan(files).values())
+        click.echo(f"[*] Multi-producto: {len(files)} archivos en {len(scans)} escaneos")
+    else:
+        scans = None
+
+    if jobs > 1:
+        threads = profile.threads or default_dask_threads(jobs)
+        units = scans if scans is not None else files
+        click.echo(f"[*] {len(units)} {'escaneos' if scans is not None else 'archivos'} en {jobs} procesos "
+                   f"({threads} hilos dask c/u)")
+        with click.progressbar(length=len(units), label=f"Procesando G{satellite}") as bar:
+            def on_result(res):
+                bar.update(1)
+                if not res["ok"]:
+                    click.secho(f"\n[ERROR] {Path(res['file']).name}: {res['error']}", fg="red")
+
+            if scans is not None:
+                results = run_parallel_scans(scans, input_path, output_path, format, should_overwrite, jobs=jobs,
+                                             dask_threads=threads, on_result=on_result, profile=profile, **options)
+            else:
+                # Un pool por procesador (cada tarea conoce su pipeline por nombre)
+                results = []
+                for proc in dict.fromkeys(p for p, _ in jobs_list):
+                    results += run_parallel([f for p, f in jobs_list if p is proc], proc.name, input_path,
+                                            output_path, format, should_overwrite, jobs=jobs, dask_threads=threads,
+                                            on_result=on_result, profile=profile, **options)
+        errors = [r for r in results if not r["ok"]]
+        peaks = [(Path(r["file"]).name, r["peak_rss_mb"]) for r in results]
+    else:
+        apply_profile(profile)
+        if scans is not None:
+            from .logic_how.multi_product import process_scan
+            units = [(Path(g[0]).name, lambda g=g: process_scan(g, input_path, output_path, format,
+                                                                  should_overwrite, **options)) for g in scans]
+        else:
+            units = [(f.name, lambda p=p, f=f: p.process_file(f, input_path, output_path, format,
+                                                               should_overwrite, **options)) for p, f in jobs_list]
+
+        with click.progressbar(units, label=f"Procesando G{satellite}") as bar:
+            for name, run in bar:
+                mem = PeakMemory()
+                try:
+                    with mem:
+                        run()
+                except Exception as e:
+                    click.secho(f"\n[ERROR] {name}: {e}", fg="red")
+                    errors.append({"file": name, "error": str(e)})
+                peaks.append((name, mem.peak_mb))
+
+    _summary(peaks, errors)
+
+def _summary(peaks, errors):
+    # --- RESUMEN ---
+    # En modo multi-producto la unidad es el escaneo
+    ok_count = len(peaks) - len(errors)
+    color = "green" if not errors else "yellow"
+    click.secho(f"[*] Procesados OK: {ok_count}/{len(peaks)}  Errores: {len(errors)}", fg=color)
+    # Pico de memoria por archivo / escaneo (para dimensionar máquinas)
+    for name, peak in peaks:
+        click.echo(f"   - {name}: pico RSS {peak:.0f} MB")
+    if peaks:
+        click.echo(f"[*] Pico máximo por archivo: {max(p for _, p in peaks):.0f} MB")
+    for err in errors:
+        click.secho(f"   - {Path(err['file']).name}: {err['error']}", fg="red")
@@ -0,0 +1,138 @@
+# src/goes_processor/processing/logic_aggregate/accumulator.py
+
+"""
+Acumuladores por píxel para compuestos temporales (mín/máx/suma/conteo y,
+opcionalmente, media/varianza de Welford) en memoria constante: cada archivo
+se pliega sobre arrays del tamaño de la grilla y se descarta.
+
+Los acumuladores se combinan (merge) con la fórmula paralela de Chan, así que
+el resultado es el mismo si los archivos se reparten entre procesos, y se
+guardan en un .npz junto con la lista de fuentes ya incorporadas para poder
+agregar archivos nuevos sin reprocesar los anteriores.
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+STATE_VERSION = 1
+
+
+class LSTAccumulator:
+    def __init__(self, shape, welford: bool = False):
+        self.shape = tuple(shape)
+        self.welford = welford
+        self.count = np.zeros(self.shape, dtype=np.int32)
+        self.total = np.zeros(self.shape, dtype=np.float64)
+        self.min = np.full(self.shape, np.inf, dtype=np.float32)
+        self.max = np.full(self.shape, -np.inf, dtype=np.float32)
+        self.mean = np.zeros(self.shape, dtype=np.float64) if welford else None
+        self.m2 = np.zeros(self.shape, dtype=np.float64) if welford else None
+        self.sources = []
+        self.start_time = None
+        self.end_time = None
+
+    # --- PLEGADO ---
+    def update(self, field: np.ndarray, source: Optional[str] = None, start_time=None):
+        """Incorpora un campo 2D (NaN = sin dato) con operaciones vectorizadas in situ."""
+        field = np.asarray(field, dtype=np.float32)
+        if field.shape != self.shape:
+            raise ValueError(f"Grilla distinta: {field.shape} != {self.shape}")
+        valid = ~np.isnan(field)
+        values = np.where(valid, field, 0.0)
+
+        self.count += valid
+        self.total += values
+        # fmin/fmax ignoran NaN: los píxeles sin dato conservan el valor previo
+        np.fmin(self.min, field, out=self.min)
+        np.fmax(self.max, field, out=self.max)
+        if self.welford:
+            delta = values - self.mean
+            self.mean += np.where(valid, delta / np.maximum(self.count, 1), 0.0)
+            self.m2 += np.where(valid, delta * (values - self.mean), 0.0)
+
+        if source is not None:
+            self.sources.append(source)
+        if start_time is not None:
+            self.start_time = min(self.start_time or start_time, start_time)
+            self.end_time = max(self.end_time or start_time, start_time)
+
+    def merge(self, other: "LSTAccumulator") -> "LSTAccumulator":
+        """Reducción paralela: combina `other` en este acumulador (Chan et al.)."""
+        if other.shape != self.shape or other.welford != self.welford:
+            raise ValueError("Acumuladores incompatibles (grilla o modo Welford distintos)")
+        if self.welford:
+            n_a, n_b = self.count.astype(np.float64), other.count.astype(np.float64)
+            n = n_a + n_b
+            with np.errstate(invalid="ignore", divide="ignore"):
+                delta = other.mean - self.mean
+                self.mean = np.where(n > 0, self.mean + delta * n_b / n, 0.0)
+                self.m2 = np.where(n > 0, self.m2 + other.m2 + delta ** 2 * n_a * n_b / n, 0.0)
+        self.count += other.count
+        self.total += other.total
+        np.minimum(self.min, other.min, out=self.min)
+        np.maximum(self.max, other.max, out=self.max)
+        self.sources.extend(other.sources)
+        for t in (other.start_time, other.end_time):
+            if t is not None:
+                self.start_time = min(self.start_time or t, t)
+                self.end_time = max(self.end_time or t, t)
+        return self
+
+    # --- RESULTADOS ---
+    def finalize(self) -> dict:
+        """Compuestos float32 (NaN donde no hubo datos) y el conteo."""
+        empty = self.count == 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.mean if self.welford else self.total / self.count
+        out = {
+            "min": np.where(empty, np.nan, self.min).astype(np.float32),
+            "max": np.where(empty, np.nan, self.max).astype(np.float32),
+            "mean": np.where(empty, np.nan, mean).astype(np.float32),
+            "count": self.count.copy(),
+        }
+        if self.welford:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                var = np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+            out["std"] = np.sqrt(var).astype(np.float32)
+        return out
+
+    # --- ESTADO (actualizaciones incrementales) ---
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = dict(count=self.count, total=self.total, min=self.min, max=self.max)
+        if self.welford:
+            arrays.update(mean=self.mean, m2=self.m2)
+        tmp = path.with_name(path.name + f".tmp{os.getpid()}.npz")
+        np.savez(tmp, version=STATE_VERSION, welford=self.welford,
+                 sources=np.array(self.sources, dtype=str),
+                 times=np.array([t.isoformat() if t else "" for t in (self.start_time, self.end_time)]),
+                 **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path) -> "LSTAccumulator":
+        with np.load(path, allow_pickle=False) as z:
+            if int(z["version"]) != STATE_VERSION:
+                raise ValueError(f"Versión de estado no soportada: {path}")
+            acc = cls(z["count"].shape, welford=bool(z["welford"]))
+            acc.count, acc.total = z["count"], z["total"]
+            acc.min, acc.max = z["min"], z["max"]
+            if acc.welford:
+                acc.mean, acc.m2 = z["mean"], z["m2"]
+            acc.sources = [str(s) for s in z["sources"]]
+            start, end = (str(t) for t in z["times"])
+            acc.start_time = datetime.fromisoformat(start) if start else None
+            acc.end_time = datetime.fromisoformat(end) if end else None
+        return acc
+
+    @classmethod
+    def reduce(cls, accumulators: Iterable["LSTAccumulator"]) -> Optional["LSTAccumulator"]:
+        result = None
+        for acc in accumulators:
+            result = acc if result is None else result.merge(acc)
+        return result
@@ -0,0 +1,217 @@
+# src/goes_processor/processing/logic_aggregate/aggregate.py
+
+"""
+Compuestos temporales de LST (diarios / mensuales) sobre la grilla WGS84.
+
+Cada archivo horario se remuestrea con lst.resampled_field y se pliega en un
+LSTAccumulator; nada por archivo se escribe a disco. El estado del período
+(.npz) se guarda junto a los productos, así una corrida posterior solo
+incorpora los archivos nuevos. Con jobs > 1 los archivos se reparten entre
+procesos que devuelven acumuladores parciales, combinados al final.
+"""
+
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ...telemetry import current_config, span
+from ..logic_crawler.index import parse_filename, parse_stamp
+from ..logic_output.formats import COG_BLOCK_SIZE
+from .accumulator import LSTAccumulator
+
+PERIODS = ("daily", "monthly")
+AGG_FORMATS = ("netcdf", "cog", "both")
+STATE_NAME = "state.npz"
+
+
+def period_key(start, period: str) -> str:
+    if period == "daily":
+        return start.strftime("%Y-%m-%d")
+    if period == "monthly":
+        return start.strftime("%Y-%m")
+    raise ValueError(f"Período no soportado: {period}")
+
+
+def _start_time(path: Path):
+    info = parse_filename(Path(path).name)
+    return parse_stamp(info["stamp"]) if info else None
+
+
+def group_by_period(files, period: str) -> Dict[str, List[Path]]:
+    groups = {}
+    for f in sorted(Path(p) for p in files):
+        start = _start_time(f)
+        if start is None:
+            print(f"   [!] Nombre no reconocido, se omite: {f.name}")
+            continue
+        groups.setdefault(period_key(start, period), []).append(f)
+    return groups
+
+
+def target_grid(region=None):
+    """AreaDefinition de salida (global 0.1° o la región)."""
+    from ..logic_how.lst import _global_area
+    from ..logic_resample.regions import parse_region, region_area
+    return region_area(_global_area(), parse_region(region))
+
+
+def fold_files(files, region=None, welford: bool = False, acc: LSTAccumulator = None) -> LSTAccumulator:
+    """Pliega los archivos uno a uno (memoria constante: un campo a la vez)."""
+    from ..logic_how.lst import resampled_field
+
+    for f in files:
+        t0 = time.perf_counter()
+        with span("aggregate.fold", file=Path(f).name):
+            field, area = resampled_field(f, region)
+            if acc is None:
+                acc = LSTAccumulator(area.shape, welford=welford)
+            acc.update(field.values, source=Path(f).name, start_time=_start_time(f))
+        print(f"   - {Path(f).name} ({time.perf_counter() - t0:.1f} s)")
+    return acc
+
+
+def _fold_worker(files, region, welford: bool, partial_dir: str) -> Optional[str]:
+    acc = fold_files([Path(f) for f in files], region, welford)
+    if acc is None:
+        return None
+    fd, path = tempfile.mkstemp(suffix=".npz", dir=partial_dir)
+    os.close(fd)
+    acc.save(path)
+    return path
+
+
+def _parallel_fold(files, region, welford, jobs, profile) -> Optional[LSTAccumulator]:
+    from ..logic_parallel.pool import _init_worker, default_dask_threads
+
+    # Reparto round-robin: cada worker lleva su propio acumulador parcial
+    chunks = [list(map(str, files[i::jobs])) for i in range(jobs)]
+    chunks = [c for c in chunks if c]
+    dask_threads = (profile and profile.threads) or default_dask_threads(len(chunks))
+    with tempfile.TemporaryDirectory(prefix="goes_agg_") as partial_dir:
+        with ProcessPoolExecutor(max_workers=len(chunks), initializer=_init_worker,
+                                 initargs=(dask_threads, profile, current_config())) as pool:
+            paths = list(pool.map(_fold_worker, chunks, [region] * len(chunks),
+                                  [welford] * len(chunks), [partial_dir] * len(chunks)))
+        return LSTAccumulator.reduce(LSTAccumulator.load(p) for p in paths if p)
+
+
+# ---------------------------------------------------------------------------
+# Escritura
+# ---------------------------------------------------------------------------
+def _grid_coords(area):
+    x, y = area.get_proj_vectors()
+    if area.crs.is_geographic:
+        return {"lon": ("x", x.astype(np.float64), {"units": "degrees_east", "standard_name": "longitude"}),
+                "lat": ("y", y.astype(np.float64), {"units": "degrees_north", "standard_name": "latitude"})}
+    return {"x": ("x", x, {"standard_name": "projection_x_coordinate", "units": "m"}),
+            "y": ("y", y, {"standard_name": "projection_y_coordinate", "units": "m"})}
+
+
+def write_netcdf(path: Path, composites: dict, area, attrs: dict):
+    import xarray as xr
+
+    ds = xr.Dataset(coords=_grid_coords(area))
+    ds["crs"] = xr.DataArray(np.int32(0), attrs={"crs_wkt": area.crs.to_wkt(), "spatial_ref": area.crs.to_wkt()})
+    for name, arr in composites.items():
+        var_attrs = {"grid_mapping": "crs"}
+        if name != "count":
+            var_attrs.update(units="Celsius", long_name=f"LST {name}")
+        else:
+            var_attrs.update(units="1", long_name="Observaciones válidas")
+        ds[f"LST_{name}"] = xr.DataArray(arr, dims=("y", "x"), attrs=var_attrs)
+    ds.attrs = dict(Conventions="CF-1.8", **{k: str(v) for k, v in attrs.items()})
+    encoding = {v: {"zlib": True, "complevel": 4} for v in ds.data_vars if v != "crs"}
+    tmp = path.with_name(path.name + ".tmp")
+    ds.to_netcdf(tmp, encoding=encoding)
+    os.replace(tmp, path)
+
+
+def write_cog(path: Path, array: np.ndarray, area):
+    import rasterio
+    import rasterio.shutil
+    from affine import Affine
+    from rasterio.io import MemoryFile
+
+    x0, _, _, y1 = area.area_extent
+    transform = Affine(area.pixel_size_x, 0, x0, 0, -area.pixel_size_y, y1)
+    nodata = np.nan if np.issubdtype(array.dtype, np.floating) else None
+    with MemoryFile() as mem:
+        with mem.open(driver="GTiff", width=array.shape[1], height=array.shape[0], count=1,
+                      dtype=array.dtype, crs=area.crs.to_wkt(), transform=transform, nodata=nodata) as ds:
+            ds.write(array, 1)
+            tmp = path.with_name(path.name + ".tmp")
+            rasterio.shutil.copy(ds, tmp, driver="COG", compress="DEFLATE", blocksize=COG_BLOCK_SIZE,
+                                 overview_resampling="average" if nodata is not None else "nearest")
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Orquestación
+# ---------------------------------------------------------------------------
+def aggregate(files, output_dir, satellite: str = "19", product: str = "ABI-L2-LSTF", period: str = "daily",
+              region=None, welford: bool = False, format: str = "both", jobs: int = 1, profile=None) -> List[dict]:
+    """
+    Agrega `files` por período y escribe los compuestos float32. Devuelve un
+    resumen por período (archivos nuevos, total acumulado, salidas).
+    """
+    from ..logic_resample.regions import parse_region
+
+    region_obj = parse_region(region)
+    tag = f"_{region_obj.name}" if region_obj else ""
+    summaries = []
+
+    for key, group in group_by_period(files, period).items():
+        out_dir = Path(output_dir) / f"noaa-goes{satellite}" / product / period / key
+        state_path = out_dir / (STATE_NAME if not tag else f"state{tag}.npz")
+
+        acc = None
+        if state_path.exists():
+            acc = LSTAccumulator.load(state_path)
+            if acc.welford != welford:
+                print(f"[!] {key}: el estado existente {'tiene' if acc.welford else 'no tiene'} varianza; se recalcula")
+                acc = None
+        done = set(acc.sources) if acc else set()
+        new_files = [f for f in group if f.name not in done]
+        print(f"[*] {period} {key}: {len(new_files)} archivos nuevos ({len(done)} ya incorporados)")
+        if not new_files:
+            summaries.append({"period": key, "new": 0, "total": len(done), "outputs": []})
+            continue
+
+        if jobs > 1 and len(new_files) > 1:
+            partial = _parallel_fold(new_files, region, welford, min(jobs, len(new_files)), profile)
+            acc = partial if acc is None else acc.merge(partial)
+        else:
+            acc = fold_files(new_files, region, welford, acc)
+
+        acc.save(state_path)
+        composites = acc.finalize()
+        area = target_grid(region)
+        base = f"LST_{period}_{key}{tag}"
+        attrs = {
+            "title": f"LST {period} composite {key}",
+            "satellite": f"GOES-{satellite}",
+            "source_product": product,
+            "period": period,
+            "time_coverage_start": acc.start_time.isoformat() if acc.start_time else "",
+            "time_coverage_end": acc.end_time.isoformat() if acc.end_time else "",
+            "source_count": len(acc.sources),
+            "region": region_obj.name if region_obj else "global",
+        }
+        outputs = []
+        if format in ("netcdf", "both"):
+            nc = out_dir / f"{base}.nc"
+            write_netcdf(nc, composites, area, attrs)
+            outputs.append(nc)
+        if format in ("cog", "both"):
+            for name, arr in composites.items():
+                tif = out_dir / f"{base}_{name}.tif"
+                write_cog(tif, arr, area)
+                outputs.append(tif)
+        summaries.append({"period": key, "new": len(new_files), "total": len(acc.sources),
+                          "outputs": [str(o) for o in outputs]})
+    return summaries
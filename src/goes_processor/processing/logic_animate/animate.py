@@ -0,0 +1,270 @@
+# src/goes_processor/processing/logic_animate/animate.py
+
+"""
+Animaciones (timelapse) a partir de los cuadros procesados.
+
+Los archivos fuente salen del crawler; cada uno aporta un cuadro:
+
+- frames: el PNG que ya dejó su procesador en la carpeta de salida
+  (truecolor *_wgs84.png, LST *_wgs84_color_preview.png, ...);
+- netcdf: se renderiza desde el NetCDF con la LUT de remuestreo cacheada
+  (mismo realce que el PNG, sin escribirlo), en workers con satpy ya cargado;
+- auto: el PNG si existe, si no el NetCDF.
+
+Los cuadros se preparan y codifican en un pool (lectura, escalado, rótulo de
+fecha, cuantización o compresión) con a lo sumo `window` en vuelo, y se
+entregan en orden al codificador, que solo los escribe: la memoria queda
+acotada por la ventana, no por la cantidad de cuadros. El primer cuadro
+válido fija el tamaño de la animación; los demás se escalan a ese tamaño.
+"""
+
+import logging
+import os
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..logic_crawler.index import parse_filename, parse_stamp
+from ..logic_how.registry import get_processor
+from ...telemetry import current_config, span
+from .encoders import encode_frame, needs_even_size, open_encoder
+
+log = logging.getLogger(__name__)
+
+SOURCES = ("frames", "netcdf", "auto")
+# Rótulo por defecto (strftime sobre el inicio de escaneo)
+LABEL_FORMAT = "%Y-%m-%d %H:%M UTC"
+
+
+@dataclass
+class FrameSource:
+    """Un cuadro de la animación: su NetCDF de origen y el PNG procesado (si existe)."""
+    netcdf: Path
+    start: datetime
+    png: Optional[Path] = None
+
+
+def frame_spec(proc, frame: Optional[str] = None) -> Tuple[str, str, Optional[str], bool]:
+    """(nombre, sufijo del PNG, dataset, nativo) del cuadro pedido o del de por defecto."""
+    if not proc.frames:
+        raise ValueError(f"El procesador {proc.name} no declara cuadros para animar")
+    name = frame or next(iter(proc.frames))
+    if name not in proc.frames:
+        raise ValueError(f"Cuadro '{name}' desconocido para {proc.name} (opciones: {', '.join(proc.frames)})")
+    return (name, *proc.frames[name])
+
+
+def collect_frames(files, proc, frame: str, input_base, output_base, region=None) -> List[FrameSource]:
+    """Ordena los archivos por inicio de escaneo y ubica el PNG de cada uno (vía job_spec, sin abrir nada)."""
+    _, suffix, _, _ = frame_spec(proc, frame)
+    sources = []
+    for f in files:
+        info = parse_filename(Path(f).name)
+        if info is None:
+            log.warning(f"   [!] Nombre no reconocido, se omite: {Path(f).name}")
+            continue
+        out_dir = proc.job_spec(f, input_base, output_base, region=region).output_dir
+        png = out_dir / f"{out_dir.name}{suffix}"
+        sources.append(FrameSource(Path(f), parse_stamp(info["stamp"]), png if png.exists() else None))
+    return sorted(sources, key=lambda s: (s.start, s.netcdf.name))
+
+
+def fit_size(size: Tuple[int, int], width: Optional[int], even: bool = False) -> Tuple[int, int]:
+    """(ancho, alto) de salida: `width` manteniendo la proporción, pares para yuv420p."""
+    w, h = size
+    if width:
+        w, h = width, max(1, round(h * width / w))
+    if even:
+        w, h = max(2, w - w % 2), max(2, h - h % 2)
+    return w, h
+
+
+def _label(image, text: str):
+    from PIL import ImageDraw, ImageFont
+
+    draw = ImageDraw.Draw(image)
+    size = max(12, image.height // 30)
+    try:
+        font = ImageFont.load_default(size=size)
+    except TypeError:                      # Pillow < 10.1: fuente bitmap fija
+        font = ImageFont.load_default()
+    pad = max(2, size // 3)
+    box = draw.textbbox((pad, pad), text, font=font)
+    draw.rectangle((box[0] - pad, box[1] - pad, box[2] + pad, box[3] + pad),
+                   fill=(0, 0, 0, 160) if image.mode == "RGBA" else (0, 0, 0))
+    draw.text((pad, pad), text, font=font, fill=(255, 255, 255, 255) if image.mode == "RGBA" else (255, 255, 255))
+
+
+def finish_frame(image, width: Optional[int] = None, even: bool = False, label: Optional[str] = None,
+                 size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """Imagen PIL → uint8 RGB/RGBA escalado a `size` (o según `width`) y rotulado."""
+    from PIL import Image
+
+    image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+    size = size or fit_size(image.size, width, even)
+    if size != image.size:
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    if label:
+        _label(image, label)
+    return np.asarray(image)
+
+
+def render_png(path, width: Optional[int] = None, even: bool = False, label: Optional[str] = None,
+               size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    from PIL import Image
+
+    with Image.open(path) as image:
+        return finish_frame(image, width, even, label, size)
+
+
+def render_netcdf(proc_name: str, path, frame: str, region=None, width: Optional[int] = None, even: bool = False,
+                  label: Optional[str] = None, size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """
+    Cuadro desde el NetCDF: carga, recorte, preparación y remuestreo del
+    procesador (LUT cacheada) y el realce de satpy, sin pasar por disco.
+    """
+    from satpy import Scene
+    from satpy.writers import get_enhanced_image
+
+    from ..logic_resample.lut import resample_scene
+    from ..logic_resample.regions import crop_to_target, parse_region
+
+    proc = get_processor(proc_name)
+    _, _, dataset, native = frame_spec(proc, frame)
+    if dataset is None:
+        raise ValueError(f"El cuadro '{frame}' de {proc.name} solo existe como PNG procesado")
+    region = parse_region(region)
+    area = proc.target_area(region)
+
+    scn = Scene(filenames=[str(path)], reader=proc.reader)
+    scn.load(list(proc.datasets))
+    if region is not None:
+        scn = crop_to_target(scn, area)
+    proc.prepare_scene(scn)
+    if not native:
+        scn = resample_scene(scn, area, resampler=proc.resampler, datasets=[dataset])
+    return finish_frame(get_enhanced_image(scn[dataset]).pil_image(), width, even, label, size)
+
+
+def _render(task: dict) -> dict:
+    """Cuadro listo para el codificador (en un worker): render + encode_frame."""
+    t0 = time.perf_counter()
+    try:
+        if task["png"] is not None:
+            frame = render_png(task["png"], task["width"], task["even"], task["label"], task["size"])
+        else:
+            frame = render_netcdf(task["processor"], task["netcdf"], task["frame"], task["region"], task["width"],
+                                  task["even"], task["label"], task["size"])
+        return {"file": task["netcdf"], "ok": True, "payload": encode_frame(task["fmt"], frame),
+                "size": (frame.shape[1], frame.shape[0]), "from_png": task["png"] is not None,
+                "seconds": time.perf_counter() - t0, "pid": os.getpid()}
+    except Exception as e:
+        return {"file": task["netcdf"], "ok": False, "error": f"{type(e).__name__}: {e}",
+                "traceback": traceback.format_exc(), "seconds": time.perf_counter() - t0, "pid": os.getpid()}
+
+
+def ordered_map(pool, fn, items, window: int) -> Iterator:
+    """Como pool.map, en orden de entrada, pero con a lo sumo `window` tareas en vuelo."""
+    items = iter(items)
+    pending = deque(pool.submit(fn, item) for _, item in zip(range(window), items))
+    while pending:
+        result = pending.popleft().result()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            break
+        yield result
+
+
+def _pool(needs_satpy: bool, jobs: int, profile=None):
+    if not needs_satpy:
+        # PIL libera el GIL al decodificar/escalar: alcanza con hilos
+        return ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="goes-frame")
+    from ..logic_parallel.pool import _init_worker, default_dask_threads
+
+    dask_threads = (profile and profile.threads) or default_dask_threads(jobs)
+    return ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                               initargs=(dask_threads, profile, current_config()))
+
+
+def animate(sources: List[FrameSource], output, fmt: str, proc, frame: Optional[str] = None, fps: float = 10,
+            width: Optional[int] = None, source: str = "frames", region=None, label: Optional[str] = LABEL_FORMAT,
+            jobs: int = 1, window: Optional[int] = None, loop: int = 0, crf: Optional[int] = None, profile=None,
+            on_frame=None) -> dict:
+    """
+    Arma la animación `output` (formato `fmt`) con un cuadro por fuente, en
+    orden cronológico. `label` es un formato strftime para rotular la fecha
+    de escaneo (None: sin rótulo). Los cuadros que faltan o fallan se omiten
+    y se informan en el resumen.
+    """
+    if source not in SOURCES:
+        raise ValueError(f"Origen de cuadros no soportado: {source}")
+    name, _, dataset, _ = frame_spec(proc, frame)
+    even = needs_even_size(fmt)
+    window = window or 2 * jobs
+
+    tasks, missing = [], []
+    for s in sources:
+        png = s.png if source in ("frames", "auto") else None
+        if png is None and (source == "frames" or dataset is None):
+            missing.append(s.netcdf.name)
+            continue
+        tasks.append({"processor": proc.name, "netcdf": str(s.netcdf), "png": str(png) if png else None,
+                      "frame": name, "region": region, "width": width, "even": even, "size": None, "fmt": fmt,
+                      "label": s.start.strftime(label) if label else None})
+
+    summary = {"output": str(output), "format": fmt, "frames": 0, "from_png": 0, "from_netcdf": 0,
+               "missing": missing, "errors": []}
+    if not tasks:
+        return summary
+
+    t0 = time.perf_counter()
+    encoder = None
+    needs_satpy = any(t["png"] is None for t in tasks)
+
+    def write(res):
+        nonlocal encoder
+        if not res["ok"]:
+            summary["errors"].append({"file": Path(res["file"]).name, "error": res["error"]})
+        else:
+            if encoder is None:
+                encoder = open_encoder(output, fmt, *res["size"], fps, loop, crf)
+            encoder.write_encoded(res.pop("payload"))
+            summary["frames"] += 1
+            summary["from_png" if res["from_png"] else "from_netcdf"] += 1
+        if on_frame is not None:
+            on_frame(res)
+
+    with span("animate.encode", processor=proc.name, frame=name, format=fmt) as sp:
+        try:
+            with _pool(needs_satpy, jobs, profile) as pool:
+                # El primer cuadro válido fija el tamaño; el resto se escala a él en los workers
+                rest = iter(tasks)
+                for task in rest:
+                    write(pool.submit(_render, task).result())
+                    if encoder is not None:
+                        break
+                pending = list(rest)
+                for task in pending:
+                    task["size"] = (encoder.width, encoder.height)
+                for res in ordered_map(pool, _render, pending, window):
+                    write(res)
+            if encoder is not None:
+                encoder.close()
+                sp.add_bytes(Path(output).stat().st_size)
+        except BaseException:
+            if encoder is not None:
+                encoder.abort()
+            raise
+        sp.set(frames=summary["frames"])
+
+    summary["seconds"] = time.perf_counter() - t0
+    if encoder is not None:
+        summary.update(width=encoder.width, height=encoder.height, bytes=Path(output).stat().st_size)
+    return summary
@@ -0,0 +1,322 @@
+# src/goes_processor/processing/logic_animate/encoders.py
+
+"""
+Codificadores de animación en streaming: reciben los cuadros de a uno
+(arrays uint8 alto x ancho x 3|4, todos del mismo tamaño) y los escriben al
+archivo sin acumularlos, así la memoria no depende de la cantidad de cuadros.
+
+- mp4 / webm: ffmpeg como subproceso, cuadros RGB crudos por stdin;
+- gif: cada cuadro se cuantiza con su propia paleta (PIL) y se anexa como
+  bloque de imagen con tabla de color local;
+- apng: cada cuadro se comprime como PNG (PIL) y sus IDAT pasan a fdAT; la
+  cantidad de cuadros del acTL se corrige al cerrar.
+
+La parte cara (cuantizar, comprimir) no depende de los otros cuadros:
+encode_frame() corre en los workers y el codificador solo escribe lo ya
+codificado, en orden (write_encoded).
+
+Todos escriben a `<salida>.part` y la renombran al cerrar sin errores.
+"""
+
+import io
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import zlib
+from fractions import Fraction
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+ENCODERS = ("mp4", "webm", "gif", "apng")
+_EXTENSIONS = {".mp4": "mp4", ".webm": "webm", ".gif": "gif", ".png": "apng", ".apng": "apng"}
+# Fondo de los píxeles transparentes (fuera del disco) en los formatos sin alfa
+BACKGROUND = (0, 0, 0)
+
+# Argumentos de salida de ffmpeg por formato (yuv420p: reproducible en navegadores)
+_FFMPEG_OUTPUT = {
+    "mp4": ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-preset", "medium", "-crf", "{crf}",
+            "-movflags", "+faststart", "-f", "mp4"],
+    "webm": ["-c:v", "libvpx-vp9", "-pix_fmt", "yuv420p", "-b:v", "0", "-crf", "{crf}", "-row-mt", "1",
+             "-f", "webm"],
+}
+_DEFAULT_CRF = {"mp4": 23, "webm": 32}
+
+
+def format_for(path, fmt: Optional[str] = None) -> str:
+    """Formato pedido o, si no, el que corresponde a la extensión de `path`."""
+    if fmt:
+        if fmt not in ENCODERS:
+            raise ValueError(f"Formato no soportado: {fmt} (opciones: {', '.join(ENCODERS)})")
+        return fmt
+    ext = Path(path).suffix.lower()
+    if ext not in _EXTENSIONS:
+        raise ValueError(f"No se puede deducir el formato de '{Path(path).name}' "
+                         f"(extensiones: {', '.join(sorted(_EXTENSIONS))})")
+    return _EXTENSIONS[ext]
+
+
+def needs_even_size(fmt: str) -> bool:
+    # yuv420p submuestrea el croma 2x2: ancho y alto pares
+    return fmt in _FFMPEG_OUTPUT
+
+
+def find_ffmpeg() -> Optional[str]:
+    """ffmpeg del PATH o, si está instalado, el binario de imageio-ffmpeg."""
+    exe = shutil.which("ffmpeg")
+    if exe:
+        return exe
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+def flatten(frame: np.ndarray, background=BACKGROUND) -> np.ndarray:
+    """RGBA → RGB sobre un fondo liso (RGB queda igual)."""
+    if frame.shape[2] == 3:
+        return frame
+    alpha = frame[..., 3:4].astype(np.uint16)
+    rgb = frame[..., :3].astype(np.uint16) * alpha
+    rgb += np.asarray(background, dtype=np.uint16) * (255 - alpha)
+    return (rgb // 255).astype(np.uint8)
+
+
+def _gif_block(data: bytes) -> bytes:
+    """Descriptor + tabla local + datos LZW de un GIF de un cuadro (el que escribe PIL)."""
+    flags = data[10]
+    pos = 13
+    table = b""
+    if flags & 0x80:
+        size = 3 * 2 ** ((flags & 0x07) + 1)
+        table, pos = data[pos:pos + size], pos + size
+    while data[pos] == 0x21:                 # extensiones: se descartan
+        pos += 2
+        while data[pos]:
+            pos += data[pos] + 1
+        pos += 1
+    if data[pos] != 0x2C:
+        raise ValueError("GIF inesperado: falta el descriptor de imagen")
+    descriptor = bytearray(data[pos:pos + 10])
+    pos += 10
+    if table and not descriptor[9] & 0x80:
+        descriptor[9] = 0x80 | (descriptor[9] & 0x40) | (flags & 0x07)
+    else:
+        table = b""
+    end = len(data) - 1 if data[-1] == 0x3B else len(data)
+    return bytes(descriptor) + table + data[pos:end]
+
+
+def _png_chunks(data: bytes):
+    pos = 8
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        yield kind, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+
+def encode_frame(fmt: str, frame: np.ndarray, compress_level: int = 6):
+    """
+    Codificación de un cuadro que no depende de los demás (corre en los
+    workers): RGB crudo para ffmpeg, bloque de imagen GIF, o (IHDR, [IDAT])
+    de un PNG RGBA para el APNG.
+    """
+    from PIL import Image
+
+    if fmt in _FFMPEG_OUTPUT:
+        return np.ascontiguousarray(flatten(frame)).tobytes()
+    buf = io.BytesIO()
+    if fmt == "gif":
+        image = Image.fromarray(flatten(frame), "RGB").quantize(256, method=Image.Quantize.MEDIANCUT)
+        image.save(buf, format="GIF")
+        return _gif_block(buf.getvalue())
+    if fmt == "apng":
+        # Siempre RGBA: el IHDR tiene que ser el mismo en todos los cuadros
+        if frame.shape[2] == 3:
+            frame = np.dstack([frame, np.full(frame.shape[:2], 255, np.uint8)])
+        Image.fromarray(frame, "RGBA").save(buf, format="PNG", compress_level=compress_level)
+        chunks = list(_png_chunks(buf.getvalue()))
+        return dict(chunks)[b"IHDR"], [data for kind, data in chunks if kind == b"IDAT"]
+    raise ValueError(f"Formato no soportado: {fmt}")
+
+
+class Encoder:
+    """
+    Base: `write(frame)` (o `write_encoded(encode_frame(...))`) por cuadro y
+    `close()` al final, o como context manager.
+    """
+    fmt: str = None
+
+    def __init__(self, path, width: int, height: int, fps: float):
+        self.path = Path(path)
+        self.tmp = self.path.with_name(self.path.name + ".part")
+        self.width, self.height = width, height
+        self.fps = fps
+        self.frames = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, frame: np.ndarray):
+        if frame.shape[:2] != (self.height, self.width):
+            raise ValueError(f"Cuadro de {frame.shape[1]}x{frame.shape[0]}, se esperaba {self.width}x{self.height}")
+        self.write_encoded(encode_frame(self.fmt, frame))
+
+    def write_encoded(self, payload):
+        self._write(payload)
+        self.frames += 1
+
+    def _write(self, payload):
+        raise NotImplementedError
+
+    def _finish(self):
+        raise NotImplementedError
+
+    def close(self) -> Path:
+        self._finish()
+        os.replace(self.tmp, self.path)
+        return self.path
+
+    def abort(self):
+        self.tmp.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class FFmpegEncoder(Encoder):
+    def __init__(self, path, width: int, height: int, fps: float, fmt: str = "mp4", crf: Optional[int] = None):
+        super().__init__(path, width, height, fps)
+        self.fmt = fmt
+        exe = find_ffmpeg()
+        if exe is None:
+            raise RuntimeError(f"{fmt}: hace falta ffmpeg en el PATH (o el paquete imageio-ffmpeg); "
+                               "gif y apng no lo necesitan")
+        crf = str(crf if crf is not None else _DEFAULT_CRF[fmt])
+        cmd = [exe, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+               "-s", f"{width}x{height}", "-framerate", str(fps), "-i", "-",
+               *[a.format(crf=crf) for a in _FFMPEG_OUTPUT[fmt]], str(self.tmp)]
+        # stderr a un archivo: una tubería sin leer podría bloquear a ffmpeg
+        self._log = tempfile.TemporaryFile()
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._log)
+
+    def _error(self) -> str:
+        self._log.seek(0)
+        return self._log.read().decode("utf-8", "replace").strip()[-2000:]
+
+    def _write(self, payload: bytes):
+        try:
+            self.proc.stdin.write(payload)
+        except BrokenPipeError:
+            self.proc.wait()
+            raise RuntimeError(f"ffmpeg terminó antes de tiempo: {self._error()}") from None
+
+    def _finish(self):
+        self.proc.stdin.close()
+        if self.proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg salió con código {self.proc.returncode}: {self._error()}")
+        self._log.close()
+
+    def abort(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+            self.proc.wait()
+        self._log.close()
+        super().abort()
+
+
+class GifEncoder(Encoder):
+    """
+    GIF89a sin tabla global: cada cuadro lleva su paleta de 256 colores, así
+    un día completo no queda con los colores del primer cuadro.
+    """
+    fmt = "gif"
+
+    def __init__(self, path, width: int, height: int, fps: float, loop: int = 0):
+        super().__init__(path, width, height, fps)
+        # Demora en centésimas; los navegadores suben a 10 todo lo menor a 2
+        self.delay = max(2, round(100 / fps))
+        self.f = open(self.tmp, "wb")
+        self.f.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0, 0, 0))
+        self.f.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00")
+
+    def _write(self, payload: bytes):
+        # Control gráfico: demora, sin transparencia, disposal 1 (cuadros opacos completos)
+        self.f.write(b"\x21\xf9\x04\x04" + struct.pack("<H", self.delay) + b"\x00\x00")
+        self.f.write(payload)
+
+    def _finish(self):
+        self.f.write(b"\x3b")
+        self.f.close()
+
+    def abort(self):
+        self.f.close()
+        super().abort()
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+class APNGEncoder(Encoder):
+    """PNG animado RGBA: los cuadros conservan el alfa (transparencia fuera del disco)."""
+    fmt = "apng"
+
+    def __init__(self, path, width: int, height: int, fps: float, loop: int = 0):
+        super().__init__(path, width, height, fps)
+        delay = Fraction(1 / fps).limit_denominator(1000)
+        self.delay = (delay.numerator, delay.denominator)
+        self.loop = loop
+        self.seq = 0
+        self.actl_offset = None
+        self.f = open(self.tmp, "wb")
+
+    def _write(self, payload):
+        ihdr, idats = payload
+        if self.actl_offset is None:
+            self.f.write(b"\x89PNG\r\n\x1a\n")
+            self.f.write(_chunk(b"IHDR", ihdr))
+            self.actl_offset = self.f.tell()
+            self.f.write(_chunk(b"acTL", struct.pack(">II", 0, self.loop)))
+
+        self.f.write(_chunk(b"fcTL", struct.pack(">IIIIIHHBB", self.seq, self.width, self.height, 0, 0,
+                                                 *self.delay, 0, 0)))
+        self.seq += 1
+        for data in idats:
+            if self.frames == 0:
+                self.f.write(_chunk(b"IDAT", data))
+            else:
+                self.f.write(_chunk(b"fdAT", struct.pack(">I", self.seq) + data))
+                self.seq += 1
+
+    def _finish(self):
+        if self.actl_offset is None:
+            raise ValueError("APNG sin cuadros")
+        self.f.write(_chunk(b"IEND", b""))
+        # Cantidad real de cuadros (los que fallaron se omitieron)
+        self.f.seek(self.actl_offset)
+        self.f.write(_chunk(b"acTL", struct.pack(">II", self.frames, self.loop)))
+        self.f.close()
+
+    def abort(self):
+        self.f.close()
+        super().abort()
+
+
+def open_encoder(path, fmt: str, width: int, height: int, fps: float, loop: int = 0,
+                 crf: Optional[int] = None) -> Encoder:
+    if fmt in _FFMPEG_OUTPUT:
+        return FFmpegEncoder(path, width, height, fps, fmt, crf)
+    if fmt == "gif":
+        return GifEncoder(path, width, height, fps, loop)
+    if fmt == "apng":
+        return APNGEncoder(path, width, height, fps, loop)
+    raise ValueError(f"Formato no soportado: {fmt}")
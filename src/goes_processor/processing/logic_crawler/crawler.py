@@ -1,36 +1,58 @@
+import sqlite3
 from pathlib import Path
 
-def find_files(base_dir, satellite, product, year, day, hour, minute):
+from .index import FileIndex, parse_stamp
+
+def find_files(base_dir, satellite, product, year, day, hour, minute,
+               start_time=None, end_time=None, use_index=True):
     """
     Busca archivos de forma inteligente filtrando por satélite, producto y tiempo.
+
+    Por defecto consulta el índice SQLite del directorio (actualizado de forma
+    incremental); start_time/end_time (datetime) acotan por inicio de escaneo.
     """
     base_path = Path(base_dir).resolve()
     sat_folder = f"noaa-goes{satellite}"
-    
+
+    if use_index:
+        try:
+            with FileIndex(base_path) as idx:
+                # Si existe la carpeta del producto, solo se re-lista ese subárbol
+                sub = f"{sat_folder}/{product}" if (base_path / sat_folder / product).is_dir() else sat_folder
+                idx.refresh(sub)
+                return idx.query(satellite, product, year, day, hour, minute,
+                                 start_time=start_time, end_time=end_time)
+        except sqlite3.Error as e:
+            print(f"[!] Índice no disponible ({e}); escaneando el disco...")
+
     # 1. Buscamos TODOS los archivos .nc dentro de la carpeta del satélite y producto
     # Usamos rglob para que no importe la estructura de carpetas (año/día/hora)
-    all_files = list(base_path.glob(f"{sat_folder}/**/{product}/*.nc"))
-    
+    all_files = list(base_path.glob(f"{sat_folder}/{product}/**/*.nc"))
+
     # Si no hay carpeta del producto, intentamos en la raíz del satélite
     if not all_files:
         all_files = list(base_path.glob(f"{sat_folder}/**/*.nc"))
 
     matched_files = []
-    
+
     # 2. Filtramos por el nombre del archivo (Patrón: ..._sYYYYJJJHHMM...)
     # Ejemplo: OR_ABI-L2-MCMIPF-M6_G19_s20250031500...
-    
+
     # Construimos el "prefijo" de tiempo que buscamos
     # Si es 'all', lo dejamos vacío para que coincida con cualquier cosa
     y_filt = year if year != "all" else ""
     d_filt = day if day != "all" else ""
     h_filt = hour if hour != "all" else ""
     m_filt = minute if minute != "all" else ""
-    
+
     time_match = f"_s{y_filt}{d_filt}{h_filt}{m_filt}"
 
     for f in all_files:
         if product in f.name and time_match in f.name:
+            if start_time or end_time:
+                t = parse_stamp(f.name.split("_s", 1)[1][:13])
+                if (start_time and t < start_time) or (end_time and t > end_time):
+                    continue
             matched_files.append(f)
 
     return sorted(matched_files)
@@ -0,0 +1,246 @@
+# src/goes_processor/processing/logic_crawler/index.py
+
+"""
+Índice persistente (SQLite) del archivo local de NetCDF GOES.
+
+Guarda los campos parseados del nombre ABI/GLM (satélite, producto, modo de
+escaneo, canal, inicio/fin), tamaño y mtime. Se actualiza de forma incremental:
+- desde la descarga (add_files), archivo por archivo;
+- desde el disco (refresh), re-listando solo las carpetas cuyo mtime cambió.
+  Las que no cambiaron cuestan un stat(): sus subcarpetas salen del índice,
+  así que una consulta en caliente no lista ningún directorio.
+"""
+
+import os
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+INDEX_NAME = ".goes_index.sqlite"
+SCHEMA_VERSION = 1
+
+# OR_ABI-L2-LSTF-M6_G19_s20260031200210_e..._c....nc
+# OR_ABI-L1b-RadF-M6C02_G19_s..._e..._c....nc
+# OR_GLM-L2-LCFA_G19_s..._e..._c....nc
+FILENAME_RE = re.compile(
+    r"^(?P<env>[A-Z]{2})_(?P<product>(?P<instrument>ABI|GLM)-(?P<level>L[0-9a-z]+)-(?P<name>[A-Za-z0-9]+?))"
+    r"(?:-M(?P<mode>\d)(?:C(?P<channel>\d{2}))?)?"
+    r"_G(?P<sat>\d{2})_s(?P<start>\d{14})_e(?P<end>\d{14})_c(?P<created>\d{14})\.nc$"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path       TEXT PRIMARY KEY,
+    dir        TEXT NOT NULL,
+    name       TEXT NOT NULL,
+    satellite  TEXT NOT NULL,
+    product    TEXT NOT NULL,
+    scan_mode  TEXT,
+    channel    TEXT,
+    stamp      TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time   TEXT NOT NULL,
+    size       INTEGER,
+    mtime      REAL
+);
+CREATE INDEX IF NOT EXISTS files_sat_stamp ON files (satellite, stamp);
+CREATE INDEX IF NOT EXISTS files_sat_start ON files (satellite, start_time);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime REAL);
+"""
+
+
+def parse_stamp(stamp: str) -> datetime:
+    """sYYYYJJJHHMMSSt (14 dígitos) → datetime UTC sin tz."""
+    return datetime.strptime(stamp[:13], "%Y%j%H%M%S")
+
+
+def parse_filename(name: str) -> Optional[dict]:
+    """Campos de un nombre ABI/GLM, o None si no sigue la convención NOAA."""
+    m = FILENAME_RE.match(name)
+    if not m:
+        return None
+    return {
+        "satellite": str(int(m["sat"])),
+        "product": m["product"],
+        "scan_mode": f"M{m['mode']}" if m["mode"] else None,
+        "channel": m["channel"],
+        "stamp": m["start"],
+        "start_time": parse_stamp(m["start"]).isoformat(),
+        "end_time": parse_stamp(m["end"]).isoformat(),
+    }
+
+
+class FileIndex:
+    """Índice SQLite de un directorio base (p.ej. data/raw)."""
+
+    def __init__(self, base_dir, db_path=None):
+        self.base_dir = Path(base_dir).resolve()
+        self.db_path = Path(db_path) if db_path else self.base_dir / INDEX_NAME
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        # Journal clásico: WAL no es seguro en filesystems compartidos (como la cola de trabajo)
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        self.conn.executescript(_SCHEMA)
+        self.conn.execute("INSERT OR IGNORE INTO meta VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- ACTUALIZACIÓN ---
+    def _row(self, path: Path, st=None) -> Optional[tuple]:
+        info = parse_filename(path.name)
+        if info is None:
+            return None
+        st = st or path.stat()
+        return (str(path), str(path.parent), path.name, info["satellite"], info["product"],
+                info["scan_mode"], info["channel"], info["stamp"], info["start_time"],
+                info["end_time"], st.st_size, st.st_mtime)
+
+    def add_files(self, paths: Iterable) -> int:
+        """Alta/actualización de archivos concretos (p.ej. recién descargados)."""
+        rows = []
+        for p in paths:
+            p = Path(p).resolve()
+            try:
+                row = self._row(p)
+            except OSError:
+                continue
+            if row:
+                rows.append(row)
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?,?,?,?,?,?,?,?,?,?,?,?)", rows)
+        return len(rows)
+
+    def remove_files(self, paths: Iterable) -> int:
+        """Baja de archivos concretos (p.ej. desalojados por la cuota de disco)."""
+        with self.conn:
+            cur = self.conn.executemany("DELETE FROM files WHERE path = ?",
+                                        [(str(Path(p).resolve()),) for p in paths])
+        return cur.rowcount
+
+    def refresh(self, subdir: Optional[str] = None) -> int:
+        """
+        Sincroniza con el disco. Solo se listan los archivos de las carpetas cuyo
+        mtime cambió desde la última vez (alta o baja de entradas).
+        Devuelve la cantidad de carpetas re-listadas.
+        """
+        root = self.base_dir / subdir if subdir else self.base_dir
+        if not root.exists():
+            return 0
+
+        known = dict(self.conn.execute(
+            "SELECT path, mtime FROM dirs WHERE path = ? OR path LIKE ?",
+            (str(root), str(root) + os.sep + "%")))
+        seen = set()
+        rescanned = 0
+        stack = [root]
+
+        # Subcarpetas ya indexadas: una carpeta sin cambios tiene las mismas, sin listarla
+        children = {}
+        for path in known:
+            children.setdefault(os.path.dirname(path), []).append(path)
+
+        with self.conn:
+            while stack:
+                directory = stack.pop()
+                key = str(directory)
+                try:
+                    dir_mtime = directory.stat().st_mtime
+                    if known.get(key) == dir_mtime:
+                        seen.add(key)
+                        stack.extend(Path(c) for c in children.get(key, ()))
+                        continue
+                    entries = list(os.scandir(directory))
+                except OSError:
+                    continue
+                seen.add(key)
+
+                files = []
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    elif entry.name.endswith(".nc"):
+                        files.append(entry)
+
+                rescanned += 1
+                rows = []
+                for entry in files:
+                    try:
+                        row = self._row(Path(entry.path), entry.stat())
+                    except OSError:
+                        continue
+                    if row:
+                        rows.append(row)
+                self.conn.execute("DELETE FROM files WHERE dir = ?", (key,))
+                self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?,?,?,?,?,?,?,?,?,?,?,?)", rows)
+                self.conn.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?)", (key, dir_mtime))
+
+            # Carpetas que desaparecieron
+            for gone in set(known) - seen:
+                self.conn.execute("DELETE FROM files WHERE dir = ?", (gone,))
+                self.conn.execute("DELETE FROM dirs WHERE path = ?", (gone,))
+
+        return rescanned
+
+    # --- CONSULTAS ---
+    def query(self, satellite: str, product: Optional[str] = None, year="all", day="all",
+              hour="all", minute="all", start_time: Optional[datetime] = None,
+              end_time: Optional[datetime] = None) -> List[Path]:
+        """
+        Archivos por satélite/producto con filtros YYYY/JJJ/HH/MM ("all" = comodín)
+        y/o un rango [start_time, end_time] sobre el inicio de escaneo.
+        """
+        sql = ["SELECT path FROM files WHERE satellite = ?"]
+        params = [str(int(satellite))]
+
+        stamp = "".join([
+            year if year != "all" else "____",
+            day.zfill(3) if day != "all" else "___",
+            hour.zfill(2) if hour != "all" else "__",
+            minute.zfill(2) if minute != "all" else "__",
+        ])
+        if stamp.strip("_"):
+            sql.append("AND stamp LIKE ?")
+            params.append(stamp + "%")
+        if product:
+            sql.append("AND name LIKE ?")
+            params.append(f"%{product}%")
+        if start_time is not None:
+            sql.append("AND start_time >= ?")
+            params.append(start_time.isoformat())
+        if end_time is not None:
+            sql.append("AND start_time <= ?")
+            params.append(end_time.isoformat())
+        sql.append("ORDER BY path")
+
+        return [Path(p) for (p,) in self.conn.execute(" ".join(sql), params)]
+
+
+def update_index(base_dir, paths: Iterable) -> int:
+    """Hook para la descarga: registra archivos nuevos sin re-escanear nada."""
+    try:
+        with FileIndex(base_dir) as idx:
+            return idx.add_files(paths)
+    except sqlite3.Error as e:
+        print(f"[!] No se pudo actualizar el índice local: {e}")
+        return 0
+
+
+def remove_from_index(base_dir, paths: Iterable) -> int:
+    """Hook para el desalojo por cuota: da de baja archivos borrados sin re-escanear."""
+    try:
+        with FileIndex(base_dir) as idx:
+            return idx.remove_files(paths)
+    except sqlite3.Error as e:
+        print(f"[!] No se pudo actualizar el índice local: {e}")
+        return 0
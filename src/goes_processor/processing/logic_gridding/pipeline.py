@@ -0,0 +1,282 @@
+# src/goes_processor/processing/logic_gridding/pipeline.py
+
+"""
+Pipeline común de los productos de puntos (GLM, FDC) sobre la grilla WGS84.
+
+Por archivo: lectura de puntos → grillado disperso (binning.bin_points) →
+RollingGrid de ventanas 1/5/15 min → un GeoTIFF (una banda por variable) y
+un PNG de vista previa por ventana, más metadatos y manifiesto.
+
+El RollingGrid vive en memoria del proceso (el demonio de ingesta y bulk lo
+reutilizan entre archivos consecutivos). Si falta historia (primer archivo
+del proceso, o se pide un archivo anterior al último incorporado) las
+ventanas se completan leyendo los archivos vecinos del input: el resultado
+no depende del orden en que se procesen.
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+from pyresample.geometry import AreaDefinition
+
+from .binning import DEFAULT_WINDOWS, RollingGrid, SparseBins, bin_points
+from ..logic_crawler.index import parse_filename, parse_stamp
+from ..logic_output.formats import COG_BLOCK_SIZE, wants_png, wants_tiff
+from ..logic_output.job_manifest import JobSpec, area_signature, invalidate, record, stale_reason
+from ..logic_resample.lut import area_fingerprint
+from ..logic_resample.regions import parse_region, region_area
+from ...telemetry import annotate, profiled, span
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PointProduct:
+    """Descripción de un producto de puntos: variables, lector y vista previa."""
+    name: str
+    version: str
+    fields: Tuple[str, ...]
+    reader: Callable[[Path], dict]
+    preview_field: str
+    units: Dict[str, str]
+
+
+# Campos de ventana por proceso: (producto, satélite, grilla, ventanas) → RollingGrid
+_RINGS: Dict[tuple, RollingGrid] = {}
+
+
+def global_grid():
+    """Misma grilla que LST: WGS84 0.1° (3600x1800)."""
+    return AreaDefinition('global_wgs84', 'Global WGS84', 'epsg4326', 'EPSG:4326',
+                          3600, 1800, [-180.0, -90.0, 180.0, 90.0])
+
+
+def target_area(region=None):
+    return region_area(global_grid(), parse_region(region))
+
+
+def scan_time(path) -> datetime:
+    info = parse_filename(Path(path).name)
+    if info is None:
+        raise ValueError(f"Nombre no reconocido (se espera la convención NOAA): {Path(path).name}")
+    return parse_stamp(info["stamp"])
+
+
+def _output_dir(input_file: Path, input_base: Path, output_base: Path, region=None):
+    stem = input_file.stem if region is None else f"{input_file.stem}_{region.name}"
+    try:
+        return output_base / input_file.relative_to(input_base).parent / stem, stem
+    except ValueError:
+        return output_base / "external" / stem, stem
+
+
+def job_spec(product: PointProduct, input_file, input_base: Path, output_base: Path, format: str = "both",
+             region=None, windows=DEFAULT_WINDOWS) -> JobSpec:
+    input_file = Path(input_file).resolve()
+    region = parse_region(region)
+    final_output_dir, _ = _output_dir(input_file, Path(input_base).resolve(), Path(output_base).resolve(), region)
+    params = {
+        "area": area_signature(target_area(region)),
+        "format": format,
+        "region": region.name if region else None,
+        "windows": list(windows),
+    }
+    return JobSpec(product.name, product.version, input_file, final_output_dir, params)
+
+
+def file_bins(product: PointProduct, path, area) -> Dict[str, SparseBins]:
+    """Lee los puntos de un archivo y los grilla (disperso) en `area`."""
+    return {name: bin_points(lon, lat, area, weights)
+            for name, (lon, lat, weights) in product.reader(path).items()}
+
+
+def _neighbors(input_file: Path, span_td) -> list:
+    """
+    Archivos del mismo producto y satélite con inicio en (t - span, t),
+    buscando en la carpeta del archivo y en la de la hora anterior
+    (estructura noaa-goesX/producto/YYYY/JJJ/HH).
+    """
+    info = parse_filename(input_file.name)
+    t = parse_stamp(info["stamp"])
+    dirs = {input_file.parent}
+    parts = input_file.parent.parts
+    if len(parts) >= 3 and all(p.isdigit() for p in parts[-3:]):
+        before = t - span_td
+        dirs.add(Path(*parts[:-3]) / f"{before:%Y}" / f"{before:%j}" / f"{before:%H}")
+
+    found = []
+    for d in dirs:
+        if not d.is_dir():
+            continue
+        for p in d.glob("*.nc"):
+            other = parse_filename(p.name)
+            if (other and other["product"] == info["product"] and other["satellite"] == info["satellite"]
+                    and t - span_td < parse_stamp(other["stamp"]) < t):
+                found.append(p)
+    return sorted(found, key=lambda p: p.name)
+
+
+def rolling_grid(product: PointProduct, input_file: Path, area, windows=DEFAULT_WINDOWS) -> RollingGrid:
+    """
+    RollingGrid listo para incorporar `input_file`: el del proceso si viene en
+    orden, o uno nuevo; en ambos casos con los vecinos de la ventana cargados.
+    """
+    key = (product.name, parse_filename(input_file.name)["satellite"], area_fingerprint(area), tuple(windows))
+    t = scan_time(input_file)
+    ring = _RINGS.get(key)
+    if ring is None or (ring.newest is not None and t < ring.newest):
+        # Archivo anterior al último incorporado: ventanas propias, sin tocar las del proceso
+        fresh = RollingGrid(area.shape, product.fields, windows)
+        if ring is None:
+            _RINGS[key] = fresh
+        ring = fresh
+
+    for neighbor in _neighbors(input_file, ring.span):
+        if neighbor.name not in ring.sources:
+            ring.push(neighbor.name, scan_time(neighbor), file_bins(product, neighbor, area))
+    return ring
+
+
+# ---------------------------------------------------------------------------
+# Escritura
+# ---------------------------------------------------------------------------
+def _transform(area):
+    from affine import Affine
+    x0, _, _, y1 = area.area_extent
+    return Affine(area.pixel_size_x, 0, x0, 0, -area.pixel_size_y, y1)
+
+
+def write_window_tiff(path: Path, bands: Dict[str, np.ndarray], area, cog: bool = False):
+    """GeoTIFF float32 con una banda por variable (descripción = nombre); COG si cog=True."""
+    import rasterio
+    import rasterio.shutil
+    from rasterio.io import MemoryFile
+
+    height, width = area.shape
+    profile = dict(driver="GTiff", width=width, height=height, count=len(bands), dtype="float32",
+                   crs=area.crs.to_wkt(), transform=_transform(area))
+    tmp = path.with_name(path.name + ".tmp")
+    if cog:
+        with MemoryFile() as mem:
+            with mem.open(**profile) as ds:
+                for i, (name, arr) in enumerate(bands.items(), start=1):
+                    ds.write(arr, i)
+                    ds.set_band_description(i, name)
+                rasterio.shutil.copy(ds, tmp, driver="COG", compress="DEFLATE", blocksize=COG_BLOCK_SIZE,
+                                     overview_resampling="average")
+    else:
+        with rasterio.open(tmp, "w", compress="DEFLATE", tiled=True, blockxsize=COG_BLOCK_SIZE,
+                           blockysize=COG_BLOCK_SIZE, **profile) as ds:
+            for i, (name, arr) in enumerate(bands.items(), start=1):
+                ds.write(arr, i)
+                ds.set_band_description(i, name)
+    os.replace(tmp, path)
+
+
+# Paleta "hot" (negro → rojo → amarillo → blanco) en escala logarítmica; 0 = transparente
+_HOT_STOPS = np.array([0.0, 0.4, 0.8, 1.0])
+_HOT_RGB = np.array([[40, 0, 0], [230, 30, 0], [255, 220, 0], [255, 255, 255]], dtype=np.float64)
+
+
+def write_preview_png(path: Path, field: np.ndarray):
+    from PIL import Image
+
+    # Campo disperso: la paleta se evalúa solo en las celdas con valor
+    valid = np.flatnonzero(field > 0)
+    rgba = np.zeros((field.size, 4), dtype=np.uint8)
+    if valid.size:
+        values = field.ravel()[valid]
+        level = np.log1p(values) / np.log1p(values.max())
+        for c in range(3):
+            rgba[valid, c] = np.interp(level, _HOT_STOPS, _HOT_RGB[:, c]).astype(np.uint8)
+        rgba[valid, 3] = 255
+    rgba = rgba.reshape(field.shape + (4,))
+    tmp = path.with_name(path.name + ".tmp")
+    Image.fromarray(rgba, "RGBA").save(tmp, format="PNG", optimize=False)
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Orquestación
+# ---------------------------------------------------------------------------
+def process_file(product: PointProduct, input_file, input_base: Path, output_base: Path, format: str = "both",
+                 overwrite: bool = False, region=None, windows=DEFAULT_WINDOWS):
+    input_file = Path(input_file).resolve()
+    with span("process.file", pipeline=product.name, file=input_file.name, format=format), \
+            profiled(input_file.stem):
+        return _process_file(product, input_file, Path(input_base).resolve(), Path(output_base).resolve(),
+                             format, overwrite, parse_region(region), tuple(windows))
+
+
+def _process_file(product: PointProduct, input_file: Path, input_base: Path, output_base: Path, format: str,
+                  overwrite: bool, region, windows):
+    spec = job_spec(product, input_file, input_base, output_base, format, region, windows)
+    if not overwrite:
+        reason = stale_reason(spec)
+        if reason is None:
+            log.info(f"  - [SKIP] {input_file.name}: salida al día (manifiesto)")
+            annotate(skipped=True)
+            return spec.output_dir
+
+    area = target_area(region)
+    t0 = time.perf_counter()
+    with span("process.load") as sp:
+        bins = file_bins(product, input_file, area)
+        sp.add_bytes(input_file.stat().st_size)
+    with span("process.grid"):
+        ring = rolling_grid(product, input_file, area, windows)
+        ring.push(input_file.name, scan_time(input_file), bins)
+    t_grid = time.perf_counter() - t0
+
+    final_output_dir, stem = _output_dir(input_file, input_base, output_base, region)
+    final_output_dir.mkdir(parents=True, exist_ok=True)
+    invalidate(spec)
+
+    outputs, summary = [], {}
+    with span("process.pass") as sp:
+        for w in ring.windows:
+            bands = {name: ring.field(w, name) for name in product.fields}
+            if wants_tiff(format):
+                tif = final_output_dir / f"{stem}_{w}min.tif"
+                write_window_tiff(tif, bands, area, cog=(format == "cog"))
+                outputs.append(tif)
+            if wants_png(format):
+                png = final_output_dir / f"{stem}_{w}min_{product.preview_field}.png"
+                write_preview_png(png, bands[product.preview_field])
+                outputs.append(png)
+            members = ring.coverage(w)
+            summary[f"{w}min"] = {
+                "files": len(members),
+                "start": members[0].time.isoformat() if members else None,
+                "end": members[-1].time.isoformat() if members else None,
+                "totals": {name: float(arr.sum(dtype=np.float64)) for name, arr in bands.items()},
+            }
+        sp.add_bytes(sum(p.stat().st_size for p in outputs))
+
+    meta = final_output_dir / f"{stem}_metadata.json"
+    metadata = {
+        "source": input_file.name,
+        "product": product.name,
+        "scan_start": scan_time(input_file).isoformat(),
+        "points": {name: int(b.total) if name.endswith("_count") else round(b.total, 3) for name, b in bins.items()},
+        "units": product.units,
+        "windows": summary,
+        "format": format,
+        "region": region.name if region else "global",
+        "files": [p.name for p in outputs],
+    }
+    with open(meta, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=4)
+    record(spec, outputs + [meta])
+
+    counts = ", ".join(f"{v} {k}" for k, v in metadata["points"].items())
+    log.info(f"  - {input_file.name}: {counts} | grillado {1000 * t_grid:.0f} ms, "
+             f"total {time.perf_counter() - t0:.2f} s")
+    return final_output_dir
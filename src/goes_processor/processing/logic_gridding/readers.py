@@ -0,0 +1,91 @@
+# src/goes_processor/processing/logic_gridding/readers.py
+
+"""
+Lectura de puntos para el grillado: GLM L2 LCFA (flashes, grupos, eventos)
+y ABI L2 FDC (píxeles de fuego de la grilla fija → lon/lat).
+
+Se leen solo las variables necesarias con netCDF4 (escala/offset/máscara
+automáticos); satpy no interviene. Cada lector devuelve
+{variable: (lon, lat, pesos o None)}.
+"""
+
+import numpy as np
+from netCDF4 import Dataset
+
+# GLM: variable de salida → prefijo en el LCFA
+GLM_FIELDS = {"flash_count": "flash", "group_count": "group", "event_count": "event"}
+
+# FDC: categorías de fuego de la máscara (procesado, saturado, nube, prob. alta/media/baja
+# y sus versiones filtradas temporalmente)
+FDC_FIRE_CODES = np.array([10, 11, 12, 13, 14, 15, 30, 31, 32, 33, 34, 35], dtype=np.int16)
+
+
+def _values(var) -> np.ndarray:
+    data = var[:]
+    if np.ma.isMaskedArray(data):
+        return data.astype(np.float64).filled(np.nan)
+    return np.asarray(data, dtype=np.float64)
+
+
+def read_glm_points(path) -> dict:
+    """Flashes/grupos/eventos del LCFA; flashes y grupos solo con quality_flag == 0."""
+    out = {}
+    with Dataset(str(path)) as nc:
+        for name, prefix in GLM_FIELDS.items():
+            if f"{prefix}_lat" not in nc.variables:
+                continue
+            lat = _values(nc.variables[f"{prefix}_lat"])
+            lon = _values(nc.variables[f"{prefix}_lon"])
+            qf_name = f"{prefix}_quality_flag"
+            if qf_name in nc.variables:
+                good = np.asarray(np.ma.filled(nc.variables[qf_name][:], 1)) == 0
+                lat, lon = lat[good], lon[good]
+            out[name] = (lon, lat, None)
+    return out
+
+
+def fixed_grid_to_lonlat(x: np.ndarray, y: np.ndarray, proj) -> tuple:
+    """
+    Ángulos de escaneo de la grilla fija ABI (rad) → lon/lat geodésicas
+    (GOES-R PUG vol. 4, 4.2.8.1). Vectorizado; NaN fuera del disco.
+    """
+    r_eq = float(proj.semi_major_axis)
+    r_pol = float(proj.semi_minor_axis)
+    h = float(proj.perspective_point_height) + r_eq
+    lon_0 = np.deg2rad(float(proj.longitude_of_projection_origin))
+
+    sin_x, cos_x = np.sin(x), np.cos(x)
+    sin_y, cos_y = np.sin(y), np.cos(y)
+    ratio = (r_eq / r_pol) ** 2
+    a = sin_x ** 2 + cos_x ** 2 * (cos_y ** 2 + ratio * sin_y ** 2)
+    b = -2.0 * h * cos_x * cos_y
+    c = h ** 2 - r_eq ** 2
+    disc = b ** 2 - 4 * a * c
+    with np.errstate(invalid="ignore"):
+        r_s = (-b - np.sqrt(np.where(disc >= 0, disc, np.nan))) / (2 * a)
+    s_x = r_s * cos_x * cos_y
+    s_y = -r_s * sin_x
+    s_z = r_s * cos_x * sin_y
+    lat = np.degrees(np.arctan(ratio * s_z / np.sqrt((h - s_x) ** 2 + s_y ** 2)))
+    lon = np.degrees(lon_0 - np.arctan(s_y / (h - s_x)))
+    return lon, lat
+
+
+def read_fdc_points(path) -> dict:
+    """Píxeles de fuego de la máscara FDC: conteo y FRP (Power, MW) por píxel."""
+    with Dataset(str(path)) as nc:
+        mask = np.asarray(np.ma.filled(nc.variables["Mask"][:], -1))
+        rows, cols = np.nonzero(np.isin(mask, FDC_FIRE_CODES))
+        x = np.asarray(nc.variables["x"][:], dtype=np.float64)[cols]
+        y = np.asarray(nc.variables["y"][:], dtype=np.float64)[rows]
+        power = None
+        if "Power" in nc.variables:
+            # Se indexa antes de pasar a float64: solo los píxeles de fuego
+            power = nc.variables["Power"][:][rows, cols]
+            power = np.ma.filled(power.astype(np.float64), np.nan) if np.ma.isMaskedArray(power) \
+                else np.asarray(power, dtype=np.float64)
+        lon, lat = fixed_grid_to_lonlat(x, y, nc.variables["goes_imager_projection"])
+    out = {"fire_count": (lon, lat, None)}
+    if power is not None:
+        out["frp_mw"] = (lon, lat, power)
+    return out
@@ -0,0 +1,44 @@
+# src/goes_processor/processing/logic_how/fdc.py
+
+"""
+ABI L2 FDC → píxeles de fuego (conteo) y potencia radiativa (FRP, MW) en la
+grilla WGS84 0.1°, con ventanas móviles de 1/5/15 minutos.
+Implementación común en logic_gridding/pipeline.py.
+"""
+
+from pathlib import Path
+
+from ..logic_gridding import pipeline
+from ..logic_gridding.readers import read_fdc_points
+from ..logic_parallel.profile import using_profile
+from .registry import get_processor
+
+# Subir cuando cambie lo que se escribe: invalida el manifiesto
+PIPELINE_VERSION = "1"
+
+PRODUCT = pipeline.PointProduct(
+    name="fdc",
+    version=PIPELINE_VERSION,
+    fields=get_processor("fdc").datasets,  # declarados en el registro
+    reader=read_fdc_points,
+    preview_field="fire_count",
+    units={"fire_count": "1", "frp_mw": "MW"},
+)
+
+
+def target_area(region=None):
+    return pipeline.target_area(region)
+
+
+def job_spec(input_file, input_base: Path, output_base: Path, format: str = "both", tile_zoom: int = None,
+             region=None, memory_lean: bool = False):
+    # tile_zoom / memory_lean no aplican a los productos de puntos
+    return pipeline.job_spec(PRODUCT, input_file, input_base, output_base, format, region)
+
+
+def process_file(input_file, input_base: Path, output_base: Path, format: str = "both", overwrite: bool = False,
+                 profile=None, tile_zoom: int = None, region=None, memory_lean: bool = False):
+    if profile is not None:
+        with using_profile(profile):
+            return process_file(input_file, input_base, output_base, format, overwrite, region=region)
+    return pipeline.process_file(PRODUCT, input_file, input_base, output_base, format, overwrite, region)
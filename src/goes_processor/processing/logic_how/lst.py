@@ -1,103 +1,427 @@
 import sys
 import json
+import logging
 import warnings
 import numpy as np
+import dask
+import dask.array as da
 from pathlib import Path
 from datetime import datetime
 from satpy import Scene
 from pyresample.geometry import AreaDefinition
 
-# 1. INTEGRACIÓN CON CONFIGURACIÓN GLOBAL
+# 1. INTEGRACIÓN CON CONFIGURACIÓN GLOBAL (se aplica al importar el pipeline)
 try:
-    from .. import config_satpy
+    from ... import config_satpy
 except ImportError:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
     from goes_processor import config_satpy
+config_satpy.apply()
+
+from ..logic_resample.lut import resample_dataarray, resample_scene
+from ..logic_resample.regions import crop_to_target, parse_region, region_area
+from ..logic_parallel.profile import ProcessingProfile, active_profile, using_profile
+from ..logic_output.formats import geotiff_options, wants_png, wants_tiff
+from ..logic_output.xyz_tiles import xyz_tiles
+from ..logic_output.job_manifest import JobSpec, area_signature, invalidate, record, stale_reason
+from .registry import FanOut, get_processor
+from ...telemetry import annotate, profiled, span, stage_task_timer
+
+log = logging.getLogger(__name__)
 
 warnings.filterwarnings("ignore")
 
-def process_file(input_file, input_base: Path, output_base: Path, format: str = "both", overwrite: bool = False):
+# Datasets, lector y remuestreador se declaran en el registro (registry.LSTProcessor)
+_PROCESSOR = get_processor("lst")
+DATASETS = _PROCESSOR.datasets
+PROD_GRAY, PROD_COLOR = DATASETS
+READER = _PROCESSOR.reader
+KELVIN_UNITS = ('K', 'kelvin', 'Kelvin')
+# Subir cuando cambie lo que se escribe (realces, nombres, dtype): invalida el manifiesto
+PIPELINE_VERSION = "2"
+RESAMPLER = _PROCESSOR.resampler
+# Modo memory-lean: realce gris punto a punto (satpy_configs/enhancements/abi.yaml)
+LEAN_GRAY_STANDARD_NAME = 'lst_celsius_gray'
+# ...y chunks de dask acotados si no hay un perfil activo (menos bloques grandes en vuelo)
+LEAN_CHUNK_MB = 32
+
+
+def _global_area():
+    return AreaDefinition(
+        'global_wgs84', 'Global WGS84', 'epsg4326', 'EPSG:4326',
+        3600, 1800, [-180.0, -90.0, 180.0, 90.0]
+    )
+
+
+def _output_paths(input_file: Path, input_base: Path, output_base: Path, tag: str = None, mkdir: bool = True):
+    # Estructura de salida espejo (las regiones llevan su nombre como sufijo)
+    rel_path = input_file.relative_to(input_base)
+    base_name = input_file.stem if not tag else f"{input_file.stem}_{tag}"
+    final_output_dir = output_base / rel_path.parent / base_name
+    if mkdir:
+        final_output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Definición de las 6 salidas
+    paths = {
+        "png_orig_gray":   final_output_dir / f"{base_name}_original_native_gray.png",
+        "png_orig_color":  final_output_dir / f"{base_name}_original_native_color.png",  # 🌟 Restaurado
+        "tif_wgs84_gray":  final_output_dir / f"{base_name}_wgs84_gray_data_celsius.tif",
+        "png_wgs84_gray":  final_output_dir / f"{base_name}_wgs84_gray_preview.png",
+        "tif_wgs84_color": final_output_dir / f"{base_name}_wgs84_color_enhanced_celsius.tif",
+        "png_wgs84_color": final_output_dir / f"{base_name}_wgs84_color_preview.png",
+        "json_meta":       final_output_dir / f"{base_name}_metadata.json",
+    }
+    return final_output_dir, base_name, paths
+
+
+def _write_metadata(input_file: Path, paths: dict, stats: dict = None, extra: dict = None):
+    files = {
+        "native_color": paths["png_orig_color"],
+        "wgs84_data": paths["tif_wgs84_gray"],
+        "wgs84_color": paths["tif_wgs84_color"],
+    }
+    metadata = {
+        "source": input_file.name,
+        "units": "Celsius",
+        "fixed_kelvin_to_celsius": True,
+        # Solo las salidas que existen (dependen de --format)
+        "files": {k: v.name for k, v in files.items() if v.exists()}
+    }
+    if stats is not None:
+        metadata["stats"] = stats
+    if extra:
+        metadata.update(extra)
+    with open(paths["json_meta"], 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=4)
+
+
+def job_spec(input_file, input_base: Path, output_base: Path, format: str = "both", tile_zoom: int = None,
+             region=None, memory_lean: bool = False) -> JobSpec:
+    """Identidad del trabajo (entrada + versión + parámetros) sin tocar el NetCDF ni crear carpetas."""
+    input_file = Path(input_file).resolve()
+    region = parse_region(region)
+    final_output_dir, _, _ = _output_paths(input_file, Path(input_base).resolve(), Path(output_base).resolve(),
+                                           region.name if region else None, mkdir=False)
+    params = {
+        "area": area_signature(target_area(region)),
+        "resampler": RESAMPLER,
+        "format": format,
+        "region": region.name if region else None,
+        "tile_zoom": tile_zoom,
+    }
+    if memory_lean:
+        params["memory_lean"] = True
+    return JobSpec("lst", PIPELINE_VERSION, input_file, final_output_dir, params)
+
+
+def process_file(input_file, input_base: Path, output_base: Path, format: str = "both",
+                 overwrite: bool = False, single_pass: bool = True, profile=None, tile_zoom: int = None,
+                 region=None, memory_lean: bool = False):
+    """
+    Genera las salidas LST (según `format`: png, tiff, both o cog) desde un
+    único grafo dask que se computa una sola vez. single_pass=False usa el
+    camino anterior (una evaluación por salida), útil como referencia en
+    benchmarks. `profile` (ProcessingProfile) fija chunks, hilos y techo de
+    memoria solo para esta llamada. `tile_zoom` agrega una pirámide XYZ del
+    producto en color hasta ese zoom. `region` (preset, bbox o AreaDefinition)
+    recorta la fuente y la grilla de salida a esa zona. Con overwrite=False
+    se omite si el manifiesto de la carpeta dice que la salida está al día.
+    memory_lean=True evita toda reducción sobre el disco completo: el gris
+    usa un realce de rango fijo (sin percentiles) y el GeoTIFF de datos se
+    escribe en °C float32 sin realzar; sin perfil activo, los chunks de
+    dask se acotan a LEAN_CHUNK_MB.
+    """
+    if profile is None and memory_lean and active_profile() is None:
+        profile = ProcessingProfile("memory_lean", chunk_mb=LEAN_CHUNK_MB)
+    if profile is not None:
+        with using_profile(profile):
+            return process_file(input_file, input_base, output_base, format, overwrite, single_pass,
+                                tile_zoom=tile_zoom, region=region, memory_lean=memory_lean)
+    if not single_pass:
+        return _process_file_legacy(input_file, input_base, output_base, format, overwrite)
+
+    # Span por archivo (y cProfile con --profile); nulos si la instrumentación está apagada
+    name = Path(input_file).name
+    with span("process.file", pipeline="lst", file=name, format=format), profiled(Path(name).stem):
+        return _process_file_single_pass(input_file, input_base, output_base, format, overwrite, tile_zoom, region,
+                                         memory_lean)
+
+
+def _process_file_single_pass(input_file, input_base: Path, output_base: Path, format: str, overwrite: bool,
+                              tile_zoom: int = None, region=None, memory_lean: bool = False):
+    input_file = Path(input_file).resolve()
+    region = parse_region(region)
+    area = target_area(region)
+    spec = job_spec(input_file, input_base, output_base, format, tile_zoom, region, memory_lean)
+    if not overwrite:
+        reason = stale_reason(spec)
+        if reason is None:
+            log.info(f"  - [SKIP] {input_file.name}: salida al día (manifiesto)")
+            annotate(skipped=True)
+            return spec.output_dir
+        log.info(f"  - Reconstruyendo {input_file.name}: {reason}")
+
+    try:
+        with span("process.load") as sp:
+            # 2. CARGAR ESCENA (perezosa: nada se lee hasta el compute final)
+            scn = Scene(filenames=[str(input_file)], reader=READER)
+            sp.add_bytes(input_file.stat().st_size)
+
+            log.info(f"  - Cargando datasets...")
+            scn.load(list(DATASETS))
+
+            # Recorte a la ventana nativa de la región: solo esos chunks se leen
+            if region is not None:
+                log.info(f"  - Región {region.name}: recortando la fuente ({area.width}x{area.height} destino)...")
+                scn = crop_to_target(scn, area)
+            prepare_scene(scn, memory_lean)
+
+        # 3. REMUESTREO WGS84 (3600x1800 o recorte de la región), también perezoso
+        log.info(f"  - Remuestreando a WGS84 (LUT cacheada)...")
+        with span("process.resample"):
+            scn_res = resample_scene(scn, area, resampler=RESAMPLER)
+
+        # 4. ARMADO DEL GRAFO: salidas pedidas + estadísticas, sin computar
+        log.info(f"  - Armando grafo único (formato {format} + estadísticas)...")
+        # Solo el armado (perezoso): lo que algún realce compute acá queda atribuido a process.encode
+        with span("process.graph"), stage_task_timer():
+            out = fan_out(scn, scn_res, input_file, input_base, output_base, format, tile_zoom, region, memory_lean)
+
+        # 5. UNA SOLA PASADA: da.store para los GeoTIFF + delayed de los PNG + stats
+        log.info(f"  - Computando y escribiendo en una sola pasada...")
+        with span("process.pass") as sp, stage_task_timer():
+            computed = compute_outputs(out.pending, extra=out.extra)
+            sp.add_bytes(out.bytes_written())
+
+        # 6. METADATOS + MANIFIESTO
+        return out.finish(computed)
+
+    except Exception as e:
+        log.error(f"  - [ERROR] {input_file.stem}: {str(e)}")
+        raise e
+
+
+def target_area(region=None):
+    """Grilla de salida: WGS84 global 0.1° o su recorte para la región."""
+    return region_area(_global_area(), parse_region(region))
+
+
+def prepare_scene(scn, memory_lean: bool = False):
+    """Kelvin→Celsius según metadatos (sin recorrer el disco completo) y realce lean, sobre la escena cargada."""
+    for p in DATASETS:
+        if scn[p].attrs.get('units') in KELVIN_UNITS:
+            log.info(f"    - [FIX] Restando 273.15 a {p} para obtener Celsius")
+            attrs = dict(scn[p].attrs)
+            scn[p] = scn[p] - 273.15
+            scn[p].attrs = attrs
+            scn[p].attrs['units'] = 'Celsius'
+
+    if memory_lean:
+        scn[PROD_GRAY].attrs['standard_name'] = LEAN_GRAY_STANDARD_NAME
+    return scn
+
+
+def fan_out(scn, scn_res, input_file, input_base: Path, output_base: Path, format: str = "both",
+            tile_zoom: int = None, region=None, memory_lean: bool = False) -> FanOut:
+    """
+    Arma, sin computar, las salidas de un archivo LST a partir de la escena
+    nativa ya preparada (prepare_scene) y su remuestreo a target_area. El
+    cierre del FanOut escribe los metadatos y el manifiesto con las
+    estadísticas computadas. Lo comparten process_file y el modo multi-producto.
+    """
+    input_file = Path(input_file).resolve()
+    region = parse_region(region)
+    spec = job_spec(input_file, input_base, output_base, format, tile_zoom, region, memory_lean)
+    final_output_dir, base_name, paths = _output_paths(input_file, Path(input_base).resolve(),
+                                                       Path(output_base).resolve(), region.name if region else None)
+    invalidate(spec)
+
+    pending = []
+    if wants_png(format):
+        pending += [
+            scn.save_dataset(PROD_GRAY, filename=str(paths["png_orig_gray"]), writer='simple_image', compute=False),
+            scn.save_dataset(PROD_COLOR, filename=str(paths["png_orig_color"]), writer='simple_image', compute=False),
+            scn_res.save_dataset(PROD_GRAY, filename=str(paths["png_wgs84_gray"]), writer='simple_image', compute=False),
+            scn_res.save_dataset(PROD_COLOR, filename=str(paths["png_wgs84_color"]), writer='simple_image', compute=False),
+        ]
+    if wants_tiff(format):
+        pending += [
+            # Grises (Datos científicos)
+            scn_res.save_dataset(PROD_GRAY, filename=str(paths["tif_wgs84_gray"]), writer='geotiff',
+                                 dtype=np.float32, compute=False, enhance=not memory_lean,
+                                 **geotiff_options(format, "average")),
+            # Colores (Visualización)
+            scn_res.save_dataset(PROD_COLOR, filename=str(paths["tif_wgs84_color"]), writer='geotiff',
+                                 compute=False, **geotiff_options(format, "nearest")),
+        ]
+    if tile_zoom is not None:
+        log.info(f"  - Pirámide XYZ hasta zoom {tile_zoom}...")
+        pending.append(xyz_tiles(scn[PROD_COLOR], final_output_dir / "tiles", max_zoom=tile_zoom, compute=False))
+
+    def finish(computed):
+        v_min, v_max, v_mean, v_count = reduce_stats(computed[0])
+        log.info(f"    [CHECK] Rango real: {v_min:.2f} a {v_max:.2f} °C (media {v_mean:.2f})")
+        if v_mean > 100:
+            log.warning(f"    [!] Media > 100: los metadatos de unidades no parecen Kelvin→Celsius")
+
+        extra = {"format": format}
+        if region is not None:
+            area = target_area(region)
+            extra["region"] = {"name": region.name, "area_extent": list(area.area_extent),
+                               "shape": list(area.shape)}
+        if tile_zoom is not None:
+            extra["tiles"] = "tiles/tiles.json"
+        if memory_lean:
+            extra["memory_lean"] = True
+        _write_metadata(input_file, paths, {"min": v_min, "max": v_max, "mean": v_mean, "valid_pixels": v_count},
+                        extra)
+        outputs = list(paths.values())
+        if tile_zoom is not None:
+            outputs.append(final_output_dir / "tiles" / "tiles.json")
+        record(spec, outputs)
+        return final_output_dir
+
+    return FanOut(pending, [streaming_stats(scn[PROD_GRAY].data)], finish, list(paths.values()))
+
+
+def resampled_field(input_file, region=None):
+    """
+    Campo LST en °C (float32) sobre la grilla WGS84 global o de la región,
+    perezoso (dask). Es la misma cadena que process_file (carga, recorte,
+    Kelvin→Celsius por metadatos, LUT) sin realces ni escrituras; lo usan
+    los agregados temporales. Devuelve (DataArray, AreaDefinition).
+    """
+    region = parse_region(region)
+    area = target_area(region)
+
+    scn = Scene(filenames=[str(input_file)], reader=READER)
+    scn.load([PROD_GRAY])
+    if region is not None:
+        scn = crop_to_target(scn, area)
+
+    data = scn[PROD_GRAY]
+    attrs = dict(data.attrs)
+    data = data.astype(np.float32)
+    if attrs.get('units') in KELVIN_UNITS:
+        data = data - np.float32(273.15)
+        attrs['units'] = 'Celsius'
+    data.attrs = attrs
+    return resample_dataarray(data, area, resampler=RESAMPLER), area
+
+
+def _block_stats(block):
+    valid = ~np.isnan(block)
+    count = np.count_nonzero(valid)
+    out = np.full((1, 1, 4), np.nan)
+    out[0, 0, 3] = count
+    if count:
+        out[0, 0, 0] = np.min(block, where=valid, initial=np.inf)
+        out[0, 0, 1] = np.max(block, where=valid, initial=-np.inf)
+        out[0, 0, 2] = np.sum(block, where=valid, dtype=np.float64)
+    return out
+
+
+def streaming_stats(data: da.Array) -> da.Array:
+    """
+    Mín/máx/suma/conteo por chunk en una sola pasada (cada chunk se lee una
+    vez y no se arma ninguna copia enmascarada). Devuelve un array dask
+    pequeño (bloques_y, bloques_x, 4) que se combina con reduce_stats.
+    """
+    return da.map_blocks(_block_stats, data, new_axis=2, chunks=(1, 1, 4), dtype=np.float64)
+
+
+def reduce_stats(blocks: np.ndarray):
+    """Combina los parciales por chunk: (min, max, media, conteo)."""
+    blocks = np.asarray(blocks).reshape(-1, 4)
+    count = int(blocks[:, 3].sum())
+    if count == 0:
+        return float("nan"), float("nan"), float("nan"), 0
+    return (float(np.nanmin(blocks[:, 0])), float(np.nanmax(blocks[:, 1])),
+            float(np.nansum(blocks[:, 2]) / count), count)
+
+
+def compute_outputs(pending, extra=()):
+    """
+    Computa juntos los resultados de save_dataset(..., compute=False) y arrays
+    extra (p.ej. estadísticas). Los writers tipo GeoTIFF devuelven
+    (sources, targets) y se alimentan con un único da.store. Devuelve los
+    valores computados de `extra`.
+    """
+    sources, targets, delayeds = [], [], []
+    for res in pending:
+        if isinstance(res, tuple) and len(res) == 2:
+            srcs, targs = res
+            sources.extend(srcs if isinstance(srcs, list) else [srcs])
+            targets.extend(targs if isinstance(targs, list) else [targs])
+        elif isinstance(res, list):
+            delayeds.extend(res)
+        else:
+            delayeds.append(res)
+
+    graph = list(extra) + delayeds
+    if sources:
+        graph.append(da.store(sources, targets, compute=False))
+    try:
+        computed = dask.compute(*graph)
+    finally:
+        for target in targets:
+            if hasattr(target, "close"):
+                target.close()
+    return list(computed[:len(extra)])
+
+
+def _process_file_legacy(input_file, input_base: Path, output_base: Path, format: str = "both", overwrite: bool = False):
     input_file = Path(input_file).resolve()
     input_base = Path(input_base).resolve()
     output_base = Path(output_base).resolve()
-    
-    # Estructura de salida espejo
-    rel_path = input_file.relative_to(input_base)
-    final_output_dir = output_base / rel_path.parent / input_file.stem
-    final_output_dir.mkdir(parents=True, exist_ok=True)
-    
-    base_name = input_file.stem
-    
-    # Definición de las 6 salidas
-    png_orig_gray   = final_output_dir / f"{base_name}_original_native_gray.png"
-    png_orig_color  = final_output_dir / f"{base_name}_original_native_color.png" # 🌟 Restaurado
-    tif_wgs84_gray  = final_output_dir / f"{base_name}_wgs84_gray_data_celsius.tif"
-    png_wgs84_gray  = final_output_dir / f"{base_name}_wgs84_gray_preview.png"
-    tif_wgs84_color = final_output_dir / f"{base_name}_wgs84_color_enhanced_celsius.tif"
-    png_wgs84_color = final_output_dir / f"{base_name}_wgs84_color_preview.png"
-    json_meta       = final_output_dir / f"{base_name}_metadata.json"
+    final_output_dir, base_name, paths = _output_paths(input_file, input_base, output_base)
 
     try:
         # 2. CARGAR ESCENA
         scn = Scene(filenames=[str(input_file)], reader='abi_l2_nc')
-        prod_gray = 'LST'
-        prod_color = 'lstf_celsius_color01'
-        
-        print(f"  - Cargando datasets...")
+        prod_gray = PROD_GRAY
+        prod_color = PROD_COLOR
+
+        log.info(f"  - Cargando datasets...")
         scn.load([prod_gray, prod_color])
 
         # --- 🌟 FIX MANUAL KELVIN A CELSIUS (v.0.0.1) 🌟 ---
         for p in [prod_gray, prod_color]:
             # Verificamos si los datos están en Kelvin (Media > 100)
             if scn[p].mean() > 100:
-                print(f"    - [FIX] Restando 273.15 a {p} para obtener Celsius")
+                log.info(f"    - [FIX] Restando 273.15 a {p} para obtener Celsius")
                 scn[p] = scn[p] - 273.15
                 scn[p].attrs['units'] = 'Celsius'
-        
+
         # Verificación rápida para el log
         check_val = scn[prod_gray].values
         clean_val = check_val[~np.isnan(check_val)]
-        print(f"    [CHECK] Rango real: {clean_val.min():.2f} a {clean_val.max():.2f} °C")
+        log.info(f"    [CHECK] Rango real: {clean_val.min():.2f} a {clean_val.max():.2f} °C")
         # --------------------------------------------------
 
         # 3. GUARDAR PRODUCTOS ORIGINALES (NATIVOS)
-        print(f"  - Guardando PNGs originales (Nativo)...")
-        scn.save_dataset(prod_gray, filename=str(png_orig_gray), writer='simple_image')
-        scn.save_dataset(prod_color, filename=str(png_orig_color), writer='simple_image')
+        log.info(f"  - Guardando PNGs originales (Nativo)...")
+        scn.save_dataset(prod_gray, filename=str(paths["png_orig_gray"]), writer='simple_image')
+        scn.save_dataset(prod_color, filename=str(paths["png_orig_color"]), writer='simple_image')
 
         # 4. REMUESTREO WGS84 (3600x1800)
-        area_def = AreaDefinition(
-            'global_wgs84', 'Global WGS84', 'epsg4326', 'EPSG:4326',
-            3600, 1800, [-180.0, -90.0, 180.0, 90.0]
-        )
-        print(f"  - Remuestreando a WGS84...")
-        scn_res = scn.resample(area_def)
+        log.info(f"  - Remuestreando a WGS84...")
+        scn_res = scn.resample(_global_area(), resampler='kd_tree')
 
         # 5. GUARDAR PRODUCTOS WGS84
-        print(f"  - Guardando archivos WGS84...")
+        log.info(f"  - Guardando archivos WGS84...")
         # Grises (Datos científicos)
-        scn_res.save_dataset(prod_gray, filename=str(tif_wgs84_gray), writer='geotiff', dtype=np.float32)
-        scn_res.save_dataset(prod_gray, filename=str(png_wgs84_gray), writer='simple_image')
+        scn_res.save_dataset(prod_gray, filename=str(paths["tif_wgs84_gray"]), writer='geotiff', dtype=np.float32)
+        scn_res.save_dataset(prod_gray, filename=str(paths["png_wgs84_gray"]), writer='simple_image')
         # Colores (Visualización)
-        scn_res.save_dataset(prod_color, filename=str(tif_wgs84_color), writer='geotiff')
-        scn_res.save_dataset(prod_color, filename=str(png_wgs84_color), writer='simple_image')
+        scn_res.save_dataset(prod_color, filename=str(paths["tif_wgs84_color"]), writer='geotiff')
+        scn_res.save_dataset(prod_color, filename=str(paths["png_wgs84_color"]), writer='simple_image')
 
         # 6. METADATOS
-        metadata = {
-            "source": input_file.name,
-            "units": "Celsius",
-            "fixed_kelvin_to_celsius": True,
-            "files": {
-                "native_color": png_orig_color.name,
-                "wgs84_data": tif_wgs84_gray.name,
-                "wgs84_color": tif_wgs84_color.name
-            }
-        }
-        with open(json_meta, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=4)
+        _write_metadata(input_file, paths)
 
         return final_output_dir
 
     except Exception as e:
-        print(f"  - [ERROR] {base_name}: {str(e)}")
+        log.error(f"  - [ERROR] {base_name}: {str(e)}")
         raise e
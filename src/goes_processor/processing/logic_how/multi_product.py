@@ -0,0 +1,151 @@
+# src/goes_processor/processing/logic_how/multi_product.py
+
+"""
+Modo multi-producto: los archivos de un mismo escaneo (satélite + inicio de
+escaneo) se procesan juntos.
+
+- Una sola Scene por lector con todos los archivos del escaneo (cada fuente
+  se abre una vez).
+- Los procesadores que comparten grilla destino y remuestreador reciben la
+  misma escena remuestreada: un solo resample_scene por geometría, y la LUT
+  cacheada se reutiliza entre productos de igual grilla nativa.
+- Las salidas de todos los productos (fan_out) se escriben en un único
+  compute.
+
+Las carpetas de salida y los manifiestos son los mismos que en modo por
+archivo: ambos modos se pueden alternar sin reprocesar.
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from satpy import Scene
+
+from ..logic_crawler.index import parse_filename
+from ..logic_output.job_manifest import stale_reason
+from ..logic_resample.lut import area_fingerprint, resample_scene
+from ..logic_resample.regions import crop_to_target, parse_region
+from ...storage.holds import hold
+from ...telemetry import annotate, profiled, span, stage_task_timer
+from .registry import processor_for
+
+log = logging.getLogger(__name__)
+
+
+def scan_key(path) -> Optional[Tuple[str, str]]:
+    """(satélite, inicio de escaneo) de un nombre NOAA, o None."""
+    info = parse_filename(Path(path).name)
+    return (info["satellite"], info["stamp"]) if info else None
+
+
+def group_by_scan(files) -> Dict[Tuple[str, str], List[Path]]:
+    """Agrupa por escaneo los archivos que tienen procesador registrado."""
+    groups = {}
+    for f in sorted(Path(p) for p in files):
+        key = scan_key(f)
+        if key is None or processor_for(parse_filename(f.name)["product"]) is None:
+            log.warning(f"   [!] Sin procesador registrado, se omite: {f.name}")
+            continue
+        groups.setdefault(key, []).append(f)
+    return groups
+
+
+def _pending_jobs(files, input_base, output_base, format, overwrite, tile_zoom, region, memory_lean):
+    jobs = []
+    for f in files:
+        proc = processor_for(parse_filename(f.name)["product"])
+        if not overwrite:
+            reason = stale_reason(proc.job_spec(f, input_base, output_base, format, tile_zoom, region, memory_lean))
+            if reason is None:
+                log.info(f"  - [SKIP] {f.name}: salida al día (manifiesto)")
+                continue
+            log.info(f"  - Reconstruyendo {f.name}: {reason}")
+        jobs.append((proc, f))
+    return jobs
+
+
+def process_scan(files, input_base: Path, output_base: Path, format: str = "both", overwrite: bool = False,
+                 tile_zoom: int = None, region=None, memory_lean: bool = False, profile=None) -> List[Path]:
+    """
+    Procesa juntos los archivos de un escaneo (ver group_by_scan). Devuelve
+    las carpetas de salida escritas; los productos al día se omiten.
+    """
+    if profile is not None:
+        from ..logic_parallel.profile import using_profile
+        with using_profile(profile):
+            return process_scan(files, input_base, output_base, format, overwrite, tile_zoom, region, memory_lean)
+
+    files = [Path(f).resolve() for f in files]
+    stamp = scan_key(files[0])[1]
+    with span("process.scan", stamp=stamp, files=len(files), format=format), profiled(f"scan_{stamp}"), \
+            hold(files):
+        return _process_scan(files, Path(input_base), Path(output_base), format, overwrite, tile_zoom,
+                             parse_region(region), memory_lean)
+
+
+def _process_scan(files, input_base: Path, output_base: Path, format: str, overwrite: bool, tile_zoom: int,
+                  region, memory_lean: bool) -> List[Path]:
+    from .lst import compute_outputs
+
+    jobs = _pending_jobs(files, input_base, output_base, format, overwrite, tile_zoom, region, memory_lean)
+    if not jobs:
+        annotate(skipped=True)
+        return []
+    t0 = time.perf_counter()
+
+    # Productos sin Scene (puntos GLM/FDC): su propio process_file, ya filtrados por el manifiesto
+    written = [p.process_file(f, input_base, output_base, format, True, tile_zoom=tile_zoom, region=region,
+                              memory_lean=memory_lean) for p, f in jobs if not p.scene_based]
+    jobs = [(p, f) for p, f in jobs if p.scene_based]
+    if not jobs:
+        return written
+    log.info(f"  - Escaneo {scan_key(files[0])[1]}: {', '.join(p.name for p, _ in jobs)}")
+
+    # 1. UNA ESCENA POR LECTOR con todos los archivos del escaneo
+    with span("process.load") as sp:
+        scenes = {}
+        for reader in dict.fromkeys(p.reader for p, _ in jobs):
+            members = [(p, f) for p, f in jobs if p.reader == reader]
+            scn = Scene(filenames=[str(f) for _, f in members], reader=reader)
+            scn.load(list(dict.fromkeys(d for p, _ in members for d in p.datasets)))
+            sp.add_bytes(sum(f.stat().st_size for _, f in members))
+            for p, _ in members:
+                p.prepare_scene(scn, memory_lean)
+            scenes[reader] = scn
+
+    # 2. REMUESTREO COMPARTIDO por (lector, grilla destino, remuestreador)
+    with span("process.resample"):
+        shared = {}
+        for p, f in jobs:
+            area = p.target_area(region)
+            key = (p.reader, area_fingerprint(area), p.resampler)
+            shared.setdefault(key, (area, []))[1].append((p, f))
+        views = {}
+        for (reader, _, resampler), (area, members) in shared.items():
+            names = list(dict.fromkeys(d for p, _ in members for d in p.datasets))
+            native = scenes[reader].copy(datasets=names)
+            if region is not None:
+                native = crop_to_target(native, area)
+            resampled = resample_scene(native, area, resampler=resampler, datasets=names)
+            for m in members:
+                views[m] = (native, resampled)
+        log.info(f"  - {len(jobs)} productos, {len(shared)} remuestreos")
+
+    # 3. FAN-OUT: salidas de todos los productos en un solo grafo
+    with span("process.graph"), stage_task_timer():
+        outs = [p.fan_out(*views[(p, f)], f, input_base, output_base, format, tile_zoom, region, memory_lean)
+                for p, f in jobs]
+
+    with span("process.pass") as sp, stage_task_timer():
+        computed = compute_outputs([x for o in outs for x in o.pending], extra=[x for o in outs for x in o.extra])
+        sp.add_bytes(sum(o.bytes_written() for o in outs))
+
+    # 4. CIERRE por producto (metadatos + manifiesto)
+    i = 0
+    for o in outs:
+        written.append(o.finish(computed[i:i + len(o.extra)]))
+        i += len(o.extra)
+    log.info(f"  - Escaneo listo en {time.perf_counter() - t0:.1f} s")
+    return written
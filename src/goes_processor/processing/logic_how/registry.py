@@ -0,0 +1,184 @@
+# src/goes_processor/processing/logic_how/registry.py
+
+"""
+Registro de procesadores por producto.
+
+Cada procesador es una clase registrada con @register que declara qué
+productos atiende (patrones fnmatch sobre el nombre NOAA, p.ej.
+"ABI-L2-LSTF"), qué datasets/composites carga en la Scene, con qué lector y
+remuestreador, y el módulo que implementa las etapas:
+
+    target_area(region)                 grilla de salida
+    job_spec(...)                       identidad para el manifiesto
+    process_file(...)                   un archivo de punta a punta
+    prepare_scene(scn, memory_lean)     ajustes sobre la escena cargada
+    fan_out(scn, scn_res, ...)          salidas pendientes (sin computar)
+
+Los productos de puntos (GLM, FDC) no usan Scene (scene_based = False):
+solo implementan target_area, job_spec y process_file, y el modo
+multi-producto los procesa archivo por archivo.
+
+El módulo se importa recién al usarlo: registrar no carga satpy. Sumar un
+producto (ACM, CMIP...) es escribir ese módulo y registrar su clase,
+sin tocar bulk_cli.py ni el pool.
+"""
+
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from importlib import import_module
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from ...storage.holds import hold
+
+
+@dataclass
+class FanOut:
+    """
+    Salidas de un procesador armadas sobre una escena compartida: escrituras
+    pendientes (resultados de save_dataset(compute=False)), arrays extra a
+    computar en la misma pasada y el cierre que recibe esos extras ya
+    computados (metadatos + manifiesto) y devuelve la carpeta de salida.
+    """
+    pending: list
+    extra: list
+    finish: Callable[[list], Path]
+    outputs: List[Path] = field(default_factory=list)
+
+    def bytes_written(self) -> int:
+        return sum(p.stat().st_size for p in self.outputs if p.exists())
+
+
+class ProductProcessor:
+    """Base de los procesadores registrados; las subclases solo declaran atributos."""
+    name: str = None
+    products: tuple = ()        # patrones fnmatch sobre el producto
+    datasets: tuple = ()        # lo que se pide a Scene.load
+    variables: tuple = ()       # variables del NetCDF que usa (download --variables: lectura parcial)
+    # Cuadros para `animate`: nombre → (sufijo del PNG en la carpeta de salida,
+    # dataset a renderizar desde el NetCDF o None, True si es la grilla nativa).
+    # El primero es el cuadro por defecto.
+    frames: dict = {}
+    reader: str = 'abi_l2_nc'
+    resampler: str = 'nearest'
+    module: str = None          # módulo (relativo a logic_how) con las etapas
+    file_arg_list: bool = False  # process_file espera [archivo] en lugar de archivo
+    scene_based: bool = True    # False: sin Scene de satpy (solo process_file)
+
+    def matches(self, product: str) -> bool:
+        return any(fnmatch(product, pattern) for pattern in self.products)
+
+    @property
+    def impl(self):
+        return import_module(self.module, __package__)
+
+    def load(self):
+        """Importa el módulo de etapas (y con él satpy) antes del primer archivo; devuelve el módulo."""
+        return self.impl
+
+    def target_area(self, region=None):
+        return self.impl.target_area(region)
+
+    def job_spec(self, input_file, input_base, output_base, format: str = "both", tile_zoom: int = None,
+                 region=None, memory_lean: bool = False):
+        return self.impl.job_spec(input_file, input_base, output_base, format, tile_zoom, region, memory_lean)
+
+    def process_file(self, input_file, input_base, output_base, format: str = "both", overwrite: bool = False,
+                     **kwargs):
+        arg = [input_file] if self.file_arg_list else input_file
+        # Marcado en uso: el desalojo por cuota de data/raw no lo toca mientras se procesa
+        with hold([input_file]):
+            return self.impl.process_file(arg, Path(input_base), Path(output_base), format, overwrite, **kwargs)
+
+    def prepare_scene(self, scn, memory_lean: bool = False):
+        return self.impl.prepare_scene(scn, memory_lean)
+
+    def fan_out(self, scn, scn_res, input_file, input_base, output_base, format: str = "both",
+                tile_zoom: int = None, region=None, memory_lean: bool = False) -> FanOut:
+        return self.impl.fan_out(scn, scn_res, input_file, input_base, output_base, format, tile_zoom, region,
+                                 memory_lean)
+
+
+_REGISTRY: Dict[str, ProductProcessor] = {}
+
+
+def register(cls):
+    """Decorador de clase: instancia y registra el procesador bajo cls.name."""
+    if not cls.name or not cls.module:
+        raise ValueError(f"{cls.__name__}: name y module son obligatorios")
+    if cls.name in _REGISTRY:
+        raise ValueError(f"Procesador duplicado: {cls.name}")
+    _REGISTRY[cls.name] = cls()
+    return cls
+
+
+def get_processor(name: str) -> ProductProcessor:
+    return _REGISTRY[name]
+
+
+def processor_for(product: str) -> Optional[ProductProcessor]:
+    """Primer procesador registrado que atiende `product`, o None."""
+    return next((p for p in _REGISTRY.values() if p.matches(product)), None)
+
+
+def processors() -> List[ProductProcessor]:
+    return list(_REGISTRY.values())
+
+
+# ---------------------------------------------------------------------------
+# Procesadores incluidos
+# ---------------------------------------------------------------------------
+@register
+class LSTProcessor(ProductProcessor):
+    name = "lst"
+    products = ("*LST*",)
+    datasets = ('LST', 'lstf_celsius_color01')
+    variables = ('LST', 'DQF')
+    frames = {
+        "color": ("_wgs84_color_preview.png", 'lstf_celsius_color01', False),
+        "gray": ("_wgs84_gray_preview.png", 'LST', False),
+        "native_color": ("_original_native_color.png", 'lstf_celsius_color01', True),
+        "native_gray": ("_original_native_gray.png", 'LST', True),
+    }
+    resampler = 'kd_tree'
+    module = ".lst"
+
+
+@register
+class TrueColorProcessor(ProductProcessor):
+    name = "truecolor"
+    products = ("*MCMIP*", "*Rad*")
+    datasets = ('true_color',)
+    # true_color = C01, C02 y el verde sintético (C01-C03); del MCMIPF de 16 bandas alcanza con esto
+    variables = ('CMI_C01', 'CMI_C02', 'CMI_C03', 'DQF_C01', 'DQF_C02', 'DQF_C03')
+    frames = {
+        "wgs84": ("_wgs84.png", 'true_color', False),
+        "native": ("_original_goes.png", 'true_color', True),
+    }
+    resampler = 'bilinear'
+    module = ".truecolor"
+    file_arg_list = True
+
+
+@register
+class GLMProcessor(ProductProcessor):
+    name = "glm"
+    products = ("GLM-L2-LCFA*",)
+    datasets = ('flash_count', 'group_count', 'event_count')
+    # Vistas previas de las ventanas móviles (solo desde PNG: el grillado no usa Scene)
+    frames = {f"{w}min": (f"_{w}min_flash_count.png", None, False) for w in (5, 1, 15)}
+    resampler = 'binning'
+    module = ".glm"
+    scene_based = False
+
+
+@register
+class FDCProcessor(ProductProcessor):
+    name = "fdc"
+    products = ("*FDC*",)
+    datasets = ('fire_count', 'frp_mw')
+    variables = ('Mask', 'Power', 'DQF')
+    frames = {f"{w}min": (f"_{w}min_fire_count.png", None, False) for w in (5, 1, 15)}
+    resampler = 'binning'
+    module = ".fdc"
+    scene_based = False
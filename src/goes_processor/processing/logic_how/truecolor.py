@@ -5,11 +5,185 @@ from satpy import Scene
 from pyresample.geometry import AreaDefinition  # Import necesario para AreaDefinition
 import warnings
 import json
+import logging
+import numpy as np
 from datetime import datetime
 
+from ... import config_satpy
+from ..logic_resample.lut import resample_scene
+from ..logic_resample.regions import crop_to_target, parse_region, region_area
+from ..logic_parallel.profile import using_profile
+from ..logic_output.formats import geotiff_options, wants_png, wants_tiff
+from ..logic_output.xyz_tiles import xyz_tiles
+from ..logic_output.job_manifest import JobSpec, area_signature, invalidate, record, stale_reason
+from ...telemetry import annotate, profiled, span, stage_task_timer
+from .registry import FanOut, get_processor
+
+log = logging.getLogger(__name__)
+
+# Configuración global de Satpy (composites/enhancements propios, cache)
+config_satpy.apply()
+
 warnings.filterwarnings("ignore")
 
-def process_file(input_file, input_base: Path, output_base: Path, format: str = "both", overwrite: bool = False):
+# Subir cuando cambie lo que se escribe (composite, realces, nombres): invalida el manifiesto
+PIPELINE_VERSION = "2"
+# Datasets, lector y remuestreador se declaran en el registro (registry.TrueColorProcessor)
+_PROCESSOR = get_processor("truecolor")
+DATASETS = _PROCESSOR.datasets
+READER = _PROCESSOR.reader
+RESAMPLER = _PROCESSOR.resampler
+
+
+def _area_def(region=None):
+    # DEFINICIÓN DE ÁREA WGS84 (3600 x 1800), o su recorte para la región pedida
+    area_id = 'global_wgs84'
+    description = 'Lat-Lon Global Plate Carree'
+    proj_id = 'wgs84'
+    projection = {'proj': 'eqc', 'lat_ts': 0, 'lat_0': 0, 'lon_0': 0, 'x_0': 0, 'y_0': 0, 'ellps': 'WGS84', 'units': 'm'}
+    width = 3600
+    height = 1800
+    area_extent = (-20037508.34, -10018754.17, 20037508.34, 10018754.17)
+    return region_area(AreaDefinition(area_id, description, proj_id, projection, width, height, area_extent), region)
+
+
+def _output_dir(input_file: Path, input_base: Path, output_base: Path, region=None):
+    # ESTRUCTURA DE CARPETAS (las regiones llevan su nombre como sufijo)
+    stem = input_file.stem if region is None else f"{input_file.stem}_{region.name}"
+    try:
+        rel_path = input_file.relative_to(input_base)
+        return output_base / rel_path.parent / stem, stem
+    except ValueError:
+        return output_base / "external" / stem, stem
+
+
+def target_area(region=None):
+    """Grilla de salida: WGS84 (eqc) 3600x1800 o su recorte para la región."""
+    return _area_def(parse_region(region))
+
+
+def _output_files(final_output_dir: Path, base_name: str) -> dict:
+    return {
+        "png_goes": final_output_dir / f"{base_name}_original_goes.png",
+        "tif_wgs84": final_output_dir / f"{base_name}_wgs84.tif",
+        "png_wgs84": final_output_dir / f"{base_name}_wgs84.png",
+        "json": final_output_dir / f"{base_name}_metadata.json",
+    }
+
+
+def _write_metadata(scn, input_file: Path, files: dict, area_def, format: str, region=None, tile_zoom: int = None):
+    metadata = {
+        "archivo_fuente": input_file.name,
+        "procesado_el": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "satelite": scn.attrs.get('satellite_name', 'GOES-19'),
+        "producto": "MCMIPF - True Color",
+        "resolucion_wgs84": f"{area_def.width}x{area_def.height} (0.1 deg)",
+        "region": region.name if region is not None else "global",
+        "mascara": "Full Disk Masking (Space exclusion applied via fill_value and alpha)",
+        "formato": format,
+        "outputs": {k: v.name for k, v in files.items() if k != "json" and v.exists()}
+    }
+    metadata["outputs"]["json"] = files["json"].name
+    if tile_zoom is not None:
+        metadata["outputs"]["tiles"] = "tiles/tiles.json"
+    with open(files["json"], 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=4, ensure_ascii=False)
+    return metadata
+
+
+def prepare_scene(scn, memory_lean: bool = False):
+    """
+    Fuera del disco el composite ya es NaN (no hace falta una copia
+    enmascarada). En modo memory-lean se fija float32 para que ninguna
+    corrección promueva a float64 antes del remuestreo.
+    """
+    if memory_lean:
+        attrs = dict(scn['true_color'].attrs)
+        scn['true_color'] = scn['true_color'].astype(np.float32)
+        scn['true_color'].attrs = attrs
+    return scn
+
+
+def fan_out(scn, scn_res, input_file, input_base: Path, output_base: Path, format: str = "both",
+            tile_zoom: int = None, region=None, memory_lean: bool = False) -> FanOut:
+    """
+    Arma, sin computar, las salidas True Color de un archivo (PNG nativo,
+    PNG/GeoTIFF WGS84, tiles) desde la escena preparada y su remuestreo. A
+    diferencia de process_file, que escribe cada salida en su propia pasada,
+    acá todo entra en el compute único del modo multi-producto.
+    """
+    if isinstance(input_file, list):
+        input_file = input_file[0]
+    input_file = Path(input_file).resolve()
+    region = parse_region(region)
+    spec = job_spec(input_file, input_base, output_base, format, tile_zoom, region, memory_lean)
+    final_output_dir, base_name = _output_dir(input_file, Path(input_base).resolve(), Path(output_base).resolve(),
+                                              region)
+    final_output_dir.mkdir(parents=True, exist_ok=True)
+    invalidate(spec)
+    files = _output_files(final_output_dir, base_name)
+
+    pending = []
+    if wants_png(format):
+        pending.append(scn.save_datasets(writer='simple_image', datasets=list(DATASETS),
+                                         base_dir=str(final_output_dir), filename=files["png_goes"].name,
+                                         fill_value=None, compress=True, compute=False))
+        pending.append(scn_res.save_datasets(writer='simple_image', datasets=list(DATASETS),
+                                             base_dir=str(final_output_dir), filename=files["png_wgs84"].name,
+                                             fill_value=None, compress=True, compute=False))
+    if wants_tiff(format):
+        pending.append(scn_res.save_datasets(writer='geotiff', datasets=list(DATASETS),
+                                             base_dir=str(final_output_dir), filename=files["tif_wgs84"].name,
+                                             include_alpha=True, fill_value=0, compute=False,
+                                             **geotiff_options(format, "nearest")))
+    if tile_zoom is not None:
+        pending.append(xyz_tiles(scn['true_color'], final_output_dir / "tiles", max_zoom=tile_zoom, compute=False))
+
+    def finish(_computed):
+        metadata = _write_metadata(scn, input_file, files, target_area(region), format, region, tile_zoom)
+        record(spec, [final_output_dir / name for name in metadata["outputs"].values()])
+        return final_output_dir
+
+    return FanOut(pending, [], finish, [v for k, v in files.items() if k != "json"])
+
+
+def job_spec(input_file, input_base: Path, output_base: Path, format: str = "both", tile_zoom: int = None,
+             region=None, memory_lean: bool = False) -> JobSpec:
+    """Identidad del trabajo (entrada + versión + parámetros) sin tocar el NetCDF ni crear carpetas."""
+    if isinstance(input_file, list):
+        input_file = input_file[0]
+    input_file = Path(input_file).resolve()
+    region = parse_region(region)
+    final_output_dir, _ = _output_dir(input_file, Path(input_base).resolve(), Path(output_base).resolve(), region)
+    params = {
+        "area": area_signature(target_area(region)),
+        "resampler": RESAMPLER,
+        "format": format,
+        "region": region.name if region else None,
+        "tile_zoom": tile_zoom,
+    }
+    if memory_lean:
+        params["memory_lean"] = True
+    return JobSpec("truecolor", PIPELINE_VERSION, input_file, final_output_dir, params)
+
+
+def process_file(input_file, input_base: Path, output_base: Path, format: str = "both", overwrite: bool = False,
+                 profile=None, tile_zoom: int = None, region=None, memory_lean: bool = False):
+    # Perfil de procesamiento (chunks, hilos, techo de memoria) solo para esta llamada
+    if profile is not None:
+        with using_profile(profile):
+            return process_file(input_file, input_base, output_base, format, overwrite, tile_zoom=tile_zoom,
+                                region=region, memory_lean=memory_lean)
+
+    # Span por archivo (y cProfile con --profile); nulos si la instrumentación está apagada
+    name = Path(input_file[0] if isinstance(input_file, list) else input_file).name
+    with span("process.file", pipeline="truecolor", file=name, format=format), profiled(Path(name).stem):
+        return _process_file(input_file, input_base, output_base, format, overwrite, tile_zoom, region,
+                             memory_lean)
+
+
+def _process_file(input_file, input_base: Path, output_base: Path, format: str, overwrite: bool,
+                  tile_zoom: int = None, region=None, memory_lean: bool = False):
     # --- 0. NORMALIZACIÓN DE ENTRADA ---
     if isinstance(input_file, list):
         input_file = input_file[0]
@@ -17,103 +191,108 @@ def process_file(input_file, input_base: Path, output_base: Path, format: str =
     input_file = Path(input_file).resolve()
     input_base = Path(input_base).resolve()
     output_base = Path(output_base).resolve()
-   
+    region = parse_region(region)
+    area_def = _area_def(region)
+    width, height = area_def.width, area_def.height
+
+    # Manifiesto: con overwrite=False se omite lo que ya está al día
+    spec = job_spec(input_file, input_base, output_base, format, tile_zoom, region, memory_lean)
+    if not overwrite:
+        reason = stale_reason(spec)
+        if reason is None:
+            log.info(f"[SKIP] {input_file.name}: salida al día (manifiesto)")
+            annotate(skipped=True)
+            return spec.output_dir
+        log.info(f"Reconstruyendo {input_file.name}: {reason}")
+
     # 1. ESTRUCTURA DE CARPETAS
-    try:
-        rel_path = input_file.relative_to(input_base)
-        final_output_dir = output_base / rel_path.parent / input_file.stem
-    except ValueError:
-        final_output_dir = output_base / "external" / input_file.stem
+    final_output_dir, base_name = _output_dir(input_file, input_base, output_base, region)
     final_output_dir.mkdir(parents=True, exist_ok=True)
-    base_name = input_file.stem
+    invalidate(spec)
 
     # Definición de rutas del Pack
-    png_original = final_output_dir / f"{base_name}_original_goes.png"
-    tif_wgs84 = final_output_dir / f"{base_name}_wgs84.tif"
-    png_wgs84 = final_output_dir / f"{base_name}_wgs84.png"
-    json_meta = final_output_dir / f"{base_name}_metadata.json"
+    files = _output_files(final_output_dir, base_name)
+    png_original, tif_wgs84, png_wgs84, json_meta = (files[k] for k in ("png_goes", "tif_wgs84", "png_wgs84", "json"))
 
     try:
         # 2. CARGAR ESCENA
-        scn = Scene(filenames=[str(input_file)], reader='abi_l2_nc')
-        scn.load(['true_color'])
+        with span("process.load") as sp:
+            scn = Scene(filenames=[str(input_file)], reader=READER)
+            sp.add_bytes(input_file.stat().st_size)
+            scn.load(list(DATASETS))
+
+            # Recorte a la ventana nativa de la región (antes de computar nada)
+            if region is not None:
+                log.info(f"Región {region.name}: recortando la fuente ({width}x{height} destino)...")
+                scn = crop_to_target(scn, area_def)
 
         # --- A. PNG ORIGINAL (Perspectiva Satelital) ---
         # Guardar con fill_value=None para transparencia fuera del disco
-        scn.save_datasets(
-            writer='simple_image',
-            datasets=['true_color'],
-            base_dir=str(final_output_dir),
-            filename=f"{base_name}_original_goes.png",
-            fill_value=None,          # Fuera del disco → transparente
-            compress=True             # Reduce tamaño
-        )
-        print(f"PNG Nativo guardado: {png_original}")
-
-        # --- B. ENMASCARAMIENTO DE DISCO ---
-        # Aplicamos máscara basada en validez (datos reales dentro del disco)
-        true_color_masked = scn["true_color"].where(scn["true_color"].notnull())
-        scn["true_color_masked"] = true_color_masked
-
-        # 3. DEFINICIÓN DE ÁREA WGS84 (3600 x 1800)
-        area_id = 'global_wgs84'
-        description = 'Lat-Lon Global Plate Carree'
-        proj_id = 'wgs84'
-        projection = {'proj': 'eqc', 'lat_ts': 0, 'lat_0': 0, 'lon_0': 0, 'x_0': 0, 'y_0': 0, 'ellps': 'WGS84', 'units': 'm'}
-        width = 3600
-        height = 1800
-        area_extent = (-20037508.34, -10018754.17, 20037508.34, 10018754.17)
-        area_def = AreaDefinition(area_id, description, proj_id, projection, width, height, area_extent)
+        if wants_png(format):
+            with span("process.pass", output="png_goes") as sp, stage_task_timer():
+                scn.save_datasets(
+                    writer='simple_image',
+                    datasets=['true_color'],
+                    base_dir=str(final_output_dir),
+                    filename=f"{base_name}_original_goes.png",
+                    fill_value=None,          # Fuera del disco → transparente
+                    compress=True             # Reduce tamaño
+                )
+                sp.add_bytes(png_original.stat().st_size)
+            log.info(f"PNG Nativo guardado: {png_original}")
+
+        # --- A2. PIRÁMIDE XYZ (Web Mercator, desde la grilla nativa) ---
+        if tile_zoom is not None:
+            with span("process.pass", output="tiles"), stage_task_timer():
+                summary = xyz_tiles(scn['true_color'], final_output_dir / "tiles", max_zoom=tile_zoom)
+            log.info(f"Tiles XYZ: {summary['tiles_written']} escritos, {summary['tiles_skipped_empty']} vacíos omitidos")
+
+        # --- B. MODO MEMORY-LEAN (float32 antes del remuestreo) ---
+        prepare_scene(scn, memory_lean)
 
         # 4. REMUESTREO (Transformación a WGS84)
-        print(f"Remuestreando a WGS84 ({width}x{height})...")
-        scn_wgs84 = scn.resample(area_def, resampler='bilinear')
+        log.info(f"Remuestreando a WGS84 ({width}x{height})...")
+        with span("process.resample"):
+            scn_wgs84 = resample_scene(scn, area_def, resampler=RESAMPLER, datasets=['true_color'])
 
         # --- C. GUARDADO EN WGS84 con transparencia ---
         # PNG WGS84 con fill_value=None (transparente fuera del disco)
-        scn_wgs84.save_datasets(
-            writer='simple_image',
-            datasets=['true_color'],
-            base_dir=str(final_output_dir),
-            filename=f"{base_name}_wgs84.png",
-            fill_value=None,          # Transparente fuera del disco
-            compress=True
-        )
-
-        # TIFF WGS84 con canal alpha (transparencia real en QGIS)
-        scn_wgs84.save_datasets(
-            writer='geotiff',
-            datasets=['true_color'],
-            base_dir=str(final_output_dir),
-            filename=f"{base_name}_wgs84.tif",
-            include_alpha=True,       # Canal alfa para transparencia
-            fill_value=0              # Valor de relleno para no-datos
-        )
+        if wants_png(format):
+            with span("process.pass", output="png_wgs84") as sp, stage_task_timer():
+                scn_wgs84.save_datasets(
+                    writer='simple_image',
+                    datasets=['true_color'],
+                    base_dir=str(final_output_dir),
+                    filename=f"{base_name}_wgs84.png",
+                    fill_value=None,          # Transparente fuera del disco
+                    compress=True
+                )
+                sp.add_bytes(png_wgs84.stat().st_size)
+
+        # TIFF WGS84 con canal alpha (transparencia real en QGIS); COG si format == "cog"
+        if wants_tiff(format):
+            with span("process.pass", output="tif_wgs84") as sp, stage_task_timer():
+                scn_wgs84.save_datasets(
+                    writer='geotiff',
+                    datasets=['true_color'],
+                    base_dir=str(final_output_dir),
+                    filename=f"{base_name}_wgs84.tif",
+                    include_alpha=True,       # Canal alfa para transparencia
+                    fill_value=0,             # Valor de relleno para no-datos
+                    **geotiff_options(format, "nearest")
+                )
+                sp.add_bytes(tif_wgs84.stat().st_size)
 
         # --- D. METADATOS JSON ---
-        metadata = {
-            "archivo_fuente": input_file.name,
-            "procesado_el": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "satelite": scn.attrs.get('satellite_name', 'GOES-19'),
-            "producto": "MCMIPF - True Color",
-            "resolucion_wgs84": "3600x1800 (0.1 deg)",
-            "mascara": "Full Disk Masking (Space exclusion applied via fill_value and alpha)",
-            "outputs": {
-                "png_goes": png_original.name,
-                "tif_wgs84": tif_wgs84.name,
-                "png_wgs84": png_wgs84.name,
-                "json": json_meta.name
-            }
-        }
-        with open(json_meta, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=4, ensure_ascii=False)
-
-        print("-" * 30)
-        print("¡Proceso Exitoso!")
-        print(f"1. Nativo: {png_original.name}")
-        print(f"2. WGS84 PNG: {png_wgs84.name}")
-        print(f"3. WGS84 TIF: {tif_wgs84.name} (Listo para QGIS con transparencia)")
-        print(f"4. Metadatos: {json_meta.name}")
+        metadata = _write_metadata(scn, input_file, files, area_def, format, region, tile_zoom)
+        record(spec, [final_output_dir / name for name in metadata["outputs"].values()])
+
+        log.info("-" * 30)
+        log.info("¡Proceso Exitoso!")
+        log.info(f"1. Nativo: {png_original.name}")
+        log.info(f"2. WGS84 PNG: {png_wgs84.name}")
+        log.info(f"3. WGS84 TIF: {tif_wgs84.name} (Listo para QGIS con transparencia)")
+        log.info(f"4. Metadatos: {json_meta.name}")
 
         return final_output_dir
 
@@ -0,0 +1,39 @@
+# src/goes_processor/processing/logic_output/formats.py
+
+"""
+Formatos de salida de los pipelines (--format):
+
+- png:  solo previews PNG
+- tiff: solo GeoTIFF
+- both: PNG + GeoTIFF
+- cog:  PNG + Cloud-Optimized GeoTIFF (tiles internos de 512 px y overviews)
+"""
+
+FORMATS = ("png", "tiff", "both", "cog")
+
+# Opciones del writer geotiff de satpy (trollimage → rasterio/GDAL COG)
+COG_BLOCK_SIZE = 512
+COG_OPTIONS = {
+    "driver": "COG",
+    "blockxsize": COG_BLOCK_SIZE,
+    "blockysize": COG_BLOCK_SIZE,
+    "compress": "DEFLATE",
+    # Lista vacía: el driver COG genera la cadena completa de overviews
+    "overviews": [],
+}
+
+
+def wants_png(format: str) -> bool:
+    return format in ("png", "both", "cog")
+
+
+def wants_tiff(format: str) -> bool:
+    return format in ("tiff", "both", "cog")
+
+
+def geotiff_options(format: str, overview_resampling: str = "nearest") -> dict:
+    """kwargs extra para save_dataset(writer='geotiff') según el formato."""
+    if format != "cog":
+        return {}
+    # Datos científicos: 'average'; paletas/RGB: 'nearest' para no inventar colores
+    return dict(COG_OPTIONS, overviews_resampling=overview_resampling)
@@ -0,0 +1,132 @@
+# src/goes_processor/processing/logic_output/job_manifest.py
+
+"""
+Manifiesto de trabajo por carpeta de salida (.goes_job.json).
+
+Registra qué produjo cada carpeta: identidad de la entrada (nombre, tamaño
+y el ETag de S3 si el manifiesto de descarga de su carpeta lo registra, si
+no el mtime), versión del pipeline y parámetros que determinan el resultado (área,
+remuestreador, formato, región, zoom de tiles), resumidos en una huella
+sha256. Con overwrite=False un trabajo cuya huella coincide y cuyas salidas
+siguen en disco se omite con un stat() de la entrada y la lectura de este
+JSON, sin abrir el NetCDF.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from ...download.manifest import recorded_entry
+
+JOB_MANIFEST_NAME = ".goes_job.json"
+JOB_MANIFEST_VERSION = 1
+
+
+def area_signature(area) -> dict:
+    """Parámetros de una AreaDefinition que cambian los píxeles de salida."""
+    return {
+        "area_id": area.area_id,
+        "crs": area.crs.to_string(),
+        "shape": list(area.shape),
+        "extent": [round(float(v), 6) for v in area.area_extent],
+    }
+
+
+@dataclass
+class JobSpec:
+    """Lo que define una salida: pipeline + entrada + parámetros."""
+    pipeline: str
+    version: str
+    input_file: Path
+    output_dir: Path
+    params: dict = field(default_factory=dict)
+
+    @property
+    def manifest_path(self) -> Path:
+        return Path(self.output_dir) / JOB_MANIFEST_NAME
+
+    def input_identity(self) -> dict:
+        path = Path(self.input_file)
+        st = path.stat()
+        entry = recorded_entry(path, st)
+        if entry is not None and entry.get("etag"):
+            # Bajado de S3: el objeto se identifica por su ETag, aunque el archivo
+            # se vuelva a bajar o se mueva (spool del streaming → data/raw)
+            return {"name": path.name, "size": st.st_size, "etag": entry["etag"]}
+        return {"name": path.name, "size": st.st_size, "mtime": st.st_mtime}
+
+    def fingerprint(self, identity: Optional[dict] = None) -> str:
+        payload = {
+            "pipeline": self.pipeline,
+            "version": self.version,
+            "input": identity or self.input_identity(),
+            "params": self.params,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _read(path: Path) -> Optional[dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get("version") == JOB_MANIFEST_VERSION else None
+
+
+def stale_reason(spec: JobSpec) -> Optional[str]:
+    """
+    None si la salida está al día; si no, el motivo por el que hay que
+    reconstruirla (para los logs y --dry-run).
+    """
+    entry = _read(spec.manifest_path)
+    if entry is None:
+        return "sin manifiesto"
+    try:
+        identity = spec.input_identity()
+    except OSError:
+        return "entrada inaccesible"
+    if entry.get("fingerprint") == spec.fingerprint(identity):
+        missing = [name for name in entry.get("outputs", []) if not (Path(spec.output_dir) / name).exists()]
+        return f"faltan salidas ({', '.join(missing)})" if missing else None
+
+    # Huella distinta: se informa la primera diferencia
+    if entry.get("input") != identity:
+        return "la entrada cambió"
+    if entry.get("version") != JOB_MANIFEST_VERSION or entry.get("pipeline_version") != spec.version:
+        return f"versión del pipeline {entry.get('pipeline_version')} → {spec.version}"
+    changed = sorted(k for k in set(entry.get("params", {})) | set(spec.params)
+                     if entry.get("params", {}).get(k) != spec.params.get(k))
+    return f"parámetros cambiaron ({', '.join(changed)})" if changed else "huella distinta"
+
+
+def record(spec: JobSpec, outputs: List):
+    """Registra el trabajo terminado (escritura atómica: tmp + rename)."""
+    identity = spec.input_identity()
+    entry = {
+        "version": JOB_MANIFEST_VERSION,
+        "pipeline": spec.pipeline,
+        "pipeline_version": spec.version,
+        "input": identity,
+        "params": spec.params,
+        "fingerprint": spec.fingerprint(identity),
+        "outputs": sorted(os.path.relpath(o, spec.output_dir) for o in outputs if Path(o).exists()),
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    path = spec.manifest_path
+    tmp_path = path.with_name(path.name + f".tmp{os.getpid()}")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def invalidate(spec: JobSpec):
+    """Borra el manifiesto antes de reescribir: una corrida interrumpida no queda 'al día'."""
+    try:
+        spec.manifest_path.unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,186 @@
+# src/goes_processor/processing/logic_output/xyz_tiles.py
+
+"""
+Pirámide de tiles XYZ (Web Mercator, 256 px, y=0 al norte) escrita
+directamente desde el array remuestreado.
+
+El nivel de zoom máximo se remuestrea desde la fuente nativa con la LUT
+cacheada, por bloques de BLOCK_TILES x BLOCK_TILES tiles de la grilla
+EPSG:3857 de ese zoom: nunca se arma el lienzo Mercator completo (a zoom 6
+serían 16384² píxeles). Cada bloque escribe sus niveles y entrega su versión
+reducida a un tile; con esas piezas se arman los niveles más bajos. La
+reducción es 2x2 (promedio pesado por alfa). Los bloques y tiles sin datos
+(espacio o fuera del disco) no se escriben. La codificación PNG corre en un
+pool de hilos.
+"""
+
+import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import dask
+import numpy as np
+from PIL import Image
+from pyresample.geometry import AreaDefinition
+
+from ..logic_resample.lut import get_lut, resample_dataarray
+
+TILE_SIZE = 256
+MERCATOR_HALF_WORLD = 20037508.342789244
+# 4 → 4096 px de lado (~9.8 km/px en el ecuador), comparable a la grilla 0.1°
+DEFAULT_MAX_ZOOM = 4
+MAX_ZOOM_LIMIT = 6
+# Bloque remuestreado de una vez: 8x8 tiles = 2048² px en cualquier zoom
+BLOCK_TILES = 8
+
+
+def mercator_area(zoom: int) -> AreaDefinition:
+    side = TILE_SIZE * 2 ** zoom
+    h = MERCATOR_HALF_WORLD
+    return AreaDefinition(f"webmercator_z{zoom}", f"Web Mercator zoom {zoom}", "epsg3857",
+                          "EPSG:3857", side, side, [-h, -h, h, h])
+
+
+def _as_rgba(data: np.ndarray) -> np.ndarray:
+    """(bands, y, x) uint8 en modo L/LA/RGB/RGBA → (y, x, 4)."""
+    bands = data.shape[0]
+    if bands == 1:
+        rgb, alpha = np.repeat(data, 3, axis=0), np.full(data.shape[1:], 255, np.uint8)[None]
+    elif bands == 2:
+        rgb, alpha = np.repeat(data[:1], 3, axis=0), data[1:]
+    elif bands == 3:
+        rgb, alpha = data, np.full(data.shape[1:], 255, np.uint8)[None]
+    else:
+        rgb, alpha = data[:3], data[3:4]
+    return np.ascontiguousarray(np.concatenate([rgb, alpha]).transpose(1, 2, 0))
+
+
+def _downsample(rgba: np.ndarray) -> np.ndarray:
+    """Reducción 2x2 con promedio premultiplicado por alfa."""
+    h, w = rgba.shape[0] // 2, rgba.shape[1] // 2
+    blocks = rgba[:2 * h, :2 * w].astype(np.float32).reshape(h, 2, w, 2, 4)
+    alpha = blocks[..., 3:4]
+    alpha_sum = alpha.sum(axis=(1, 3))
+    rgb = (blocks[..., :3] * alpha).sum(axis=(1, 3))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rgb = np.where(alpha_sum > 0, rgb / alpha_sum, 0)
+    out = np.concatenate([rgb, alpha_sum / 4], axis=-1)
+    return np.clip(np.rint(out), 0, 255).astype(np.uint8)
+
+
+def _write_level(rgba: np.ndarray, zoom: int, out_dir: Path, pool: ThreadPoolExecutor, col0: int = 0, row0: int = 0):
+    """Escribe los tiles de rgba; (col0, row0) es el tile de su esquina superior izquierda."""
+    rows, cols = rgba.shape[0] // TILE_SIZE, rgba.shape[1] // TILE_SIZE
+    # Un tile se escribe solo si algún píxel tiene alfa > 0
+    occupied = rgba[..., 3].reshape(rows, TILE_SIZE, cols, TILE_SIZE).max(axis=(1, 3)) > 0
+
+    def save(x, y):
+        tile = rgba[y * TILE_SIZE:(y + 1) * TILE_SIZE, x * TILE_SIZE:(x + 1) * TILE_SIZE]
+        path = out_dir / str(zoom) / str(col0 + x) / f"{row0 + y}.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        Image.fromarray(tile, "RGBA").save(path, format="PNG", compress_level=6)
+
+    ys, xs = np.nonzero(occupied)
+    list(pool.map(save, xs, ys))
+    return int(occupied.sum()), int(occupied.size - occupied.sum())
+
+
+def _write_levels(rgba: np.ndarray, out_dir: Path, max_zoom: int, min_zoom: int, pool: ThreadPoolExecutor,
+                  col0: int = 0, row0: int = 0):
+    """Niveles max_zoom..min_zoom de un bloque; devuelve el bloque reducido a min_zoom y los conteos."""
+    written, skipped = 0, 0
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        shift = max_zoom - zoom
+        w, s = _write_level(rgba, zoom, out_dir, pool, col0 >> shift, row0 >> shift)
+        written += w
+        skipped += s
+        if zoom > min_zoom:
+            rgba = _downsample(rgba)
+    return rgba, written, skipped
+
+
+def _write_summary(out_dir: Path, max_zoom: int, min_zoom: int, written: int, skipped: int) -> dict:
+    summary = {"scheme": "xyz", "crs": "EPSG:3857", "tile_size": TILE_SIZE,
+               "min_zoom": min_zoom, "max_zoom": max_zoom,
+               "tiles_written": written, "tiles_skipped_empty": skipped,
+               "url_template": "{z}/{x}/{y}.png"}
+    with open(out_dir / "tiles.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=4)
+    return summary
+
+
+def write_pyramid(data: np.ndarray, out_dir, max_zoom: int, min_zoom: int = 0, workers: int = 4) -> dict:
+    """Escribe los niveles max_zoom..min_zoom a partir de (bands, y, x) uint8 del mundo entero."""
+    out_dir = Path(out_dir)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        _, written, skipped = _write_levels(_as_rgba(np.asarray(data)), out_dir, max_zoom, min_zoom, pool)
+    return _write_summary(out_dir, max_zoom, min_zoom, written, skipped)
+
+
+def _write_pyramid_block(data: np.ndarray, out_dir: Path, max_zoom: int, low_zoom: int, col0: int, row0: int,
+                         workers: int):
+    """Bloque remuestreado (bands, y, x) uint8 → sus tiles de max_zoom a low_zoom."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return _write_levels(_as_rgba(np.asarray(data)), out_dir, max_zoom, low_zoom, pool, col0, row0)
+
+
+def _write_pyramid_top(blocks, out_dir: Path, max_zoom: int, min_zoom: int, low_zoom: int, skipped: int,
+                       workers: int) -> dict:
+    """Arma el nivel low_zoom con las piezas de cada bloque y escribe los niveles por debajo."""
+    written = sum(w for _pos, (_rgba, w, _s) in blocks)
+    skipped += sum(s for _pos, (_rgba, _w, s) in blocks)
+    if low_zoom > min_zoom:
+        side = TILE_SIZE * 2 ** low_zoom
+        canvas = np.zeros((side, side, 4), np.uint8)
+        for (col0, row0), (rgba, _w, _s) in blocks:
+            shift = max_zoom - low_zoom
+            y0, x0 = (row0 >> shift) * TILE_SIZE, (col0 >> shift) * TILE_SIZE
+            canvas[y0:y0 + rgba.shape[0], x0:x0 + rgba.shape[1]] = rgba
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            _, w, s = _write_levels(_downsample(canvas), out_dir, low_zoom - 1, min_zoom, pool)
+        written += w
+        skipped += s
+    return _write_summary(out_dir, max_zoom, min_zoom, written, skipped)
+
+
+def xyz_tiles(data_arr, out_dir, max_zoom: int = DEFAULT_MAX_ZOOM, min_zoom: int = 0,
+              resampler: str = "nearest", fill_value=None, workers: int = 4, compute: bool = True):
+    """
+    Pirámide XYZ de un DataArray de satpy en su grilla nativa, con el mismo
+    realce (enhancement) que las salidas PNG. compute=False devuelve un
+    dask.delayed para sumarlo al grafo único del pipeline.
+    """
+    from satpy.writers import get_enhanced_image
+
+    if not 0 <= min_zoom <= max_zoom <= MAX_ZOOM_LIMIT:
+        raise ValueError(f"Zoom fuera de rango (0 <= min <= max <= {MAX_ZOOM_LIMIT})")
+    out_dir = Path(out_dir)
+    # Una pirámide anterior (otro zoom u otra cobertura) no deja tiles huérfanos
+    shutil.rmtree(out_dir, ignore_errors=True)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    area = mercator_area(max_zoom)
+    n = 2 ** max_zoom
+    step = min(n, BLOCK_TILES)
+    # Cada bloque baja hasta quedar en un tile (o hasta min_zoom)
+    low_zoom = max(min_zoom, max_zoom - (step.bit_length() - 1))
+    blocks, skipped = [], 0
+    for row0 in range(0, n, step):
+        for col0 in range(0, n, step):
+            block_area = area[row0 * TILE_SIZE:(row0 + step) * TILE_SIZE,
+                              col0 * TILE_SIZE:(col0 + step) * TILE_SIZE]
+            if get_lut(data_arr.attrs["area"], block_area, resampler).out_index.size == 0:
+                # Bloque fuera del disco: sus tiles se cuentan como vacíos sin remuestrear nada
+                skipped += sum((step >> (max_zoom - z)) ** 2 for z in range(max_zoom, low_zoom - 1, -1))
+                continue
+            img = get_enhanced_image(resample_dataarray(data_arr, block_area, resampler))
+            # fill_value=None → canal alfa transparente fuera del disco
+            finalized, _mode = img.finalize(fill_value=fill_value, dtype=np.uint8)
+            block = dask.delayed(_write_pyramid_block, pure=False)(
+                finalized.transpose("bands", "y", "x").data, out_dir, max_zoom, low_zoom, col0, row0, workers)
+            blocks.append(((col0, row0), block))
+
+    delayed = dask.delayed(_write_pyramid_top, pure=False)(
+        blocks, out_dir, max_zoom, min_zoom, low_zoom, skipped, workers)
+    return delayed.compute() if compute else delayed
@@ -0,0 +1,139 @@
+# src/goes_processor/processing/logic_parallel/pool.py
+
+"""
+Ejecución en paralelo de los procesadores registrados (logic_how/registry.py)
+con un pool de procesos: un archivo por tarea, o un escaneo completo en modo
+multi-producto.
+
+Cada worker se inicializa una sola vez (import de satpy, configuración global,
+LUTs de remuestreo en memmap) y reutiliza ese estado para todos sus archivos.
+Los hilos de dask por worker se acotan para no sobre-suscribir la máquina y
+cada worker aplica el perfil de procesamiento (chunks, techo de memoria).
+"""
+
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from pathlib import Path
+
+from .profile import PeakMemory, ProcessingProfile, apply_profile
+from ..logic_how.registry import get_processor, processors
+from ...telemetry import configure_worker, current_config
+
+
+def default_dask_threads(jobs: int) -> int:
+    return max(1, (os.cpu_count() or 1) // max(1, jobs))
+
+
+def _limit_native_threads(n: int):
+    # Antes de importar numpy/satpy: BLAS/OpenMP no deben abrir un hilo por núcleo
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS"):
+        os.environ[var] = str(n)
+
+
+def _init_worker(dask_threads: int, profile: ProcessingProfile = None, telemetry: dict = None):
+    _limit_native_threads(dask_threads)
+
+    apply_profile(replace(profile or ProcessingProfile(), threads=dask_threads))
+    # Los spans del worker van al mismo JSON lines que el proceso principal
+    configure_worker(telemetry)
+
+    # Import único de satpy + configuración global + módulos de los procesadores
+    from ..logic_resample.lut import preload_luts
+
+    for proc in processors():
+        proc.load()
+    preload_luts()
+
+
+def _run_one(pipeline: str, input_file: str, input_base: str, output_base: str, format: str, overwrite: bool,
+             tile_zoom: int = None, region: str = None, memory_lean: bool = False):
+    t0 = time.perf_counter()
+    mem = PeakMemory()
+    try:
+        with mem:
+            out_dir = get_processor(pipeline).process_file(input_file, input_base, output_base, format, overwrite,
+                                                           tile_zoom=tile_zoom, region=region,
+                                                           memory_lean=memory_lean)
+        return {"file": input_file, "ok": True, "output": str(out_dir) if out_dir else None,
+                "seconds": time.perf_counter() - t0, "peak_rss_mb": mem.peak_mb, "pid": os.getpid()}
+    except Exception as e:
+        return {"file": input_file, "ok": False, "error": f"{type(e).__name__}: {e}",
+                "traceback": traceback.format_exc(), "seconds": time.perf_counter() - t0,
+                "peak_rss_mb": mem.peak_mb, "pid": os.getpid()}
+
+
+def run_parallel(files, pipeline: str, input_base, output_base, format: str, overwrite: bool,
+                 jobs: int, dask_threads: int = None, on_result=None, profile: ProcessingProfile = None,
+                 tile_zoom: int = None, region: str = None, memory_lean: bool = False):
+    """
+    Procesa `files` en `jobs` procesos. Devuelve los resultados en el mismo orden
+    que `files` (la estructura de salida es la misma que en modo serie: espejo de
+    la entrada), y llama a `on_result(result)` a medida que terminan. Cada
+    resultado incluye el pico de RSS del worker durante ese archivo.
+    """
+    dask_threads = dask_threads or (profile and profile.threads) or default_dask_threads(jobs)
+    files = [str(f) for f in files]
+    results = {}
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(dask_threads, profile, current_config())) as pool:
+        futures = {
+            pool.submit(_run_one, pipeline, f, str(input_base), str(output_base), format, overwrite, tile_zoom,
+                        region, memory_lean): f
+            for f in files
+        }
+        for fut in as_completed(futures):
+            res = fut.result()
+            results[futures[fut]] = res
+            if on_result is not None:
+                on_result(res)
+
+    return [results[f] for f in files]
+
+
+def _run_scan(files: list, input_base: str, output_base: str, format: str, overwrite: bool,
+              tile_zoom: int = None, region: str = None, memory_lean: bool = False):
+    from ..logic_how.multi_product import process_scan
+
+    t0 = time.perf_counter()
+    mem = PeakMemory()
+    try:
+        with mem:
+            out_dirs = process_scan(files, Path(input_base), Path(output_base), format, overwrite,
+                                    tile_zoom=tile_zoom, region=region, memory_lean=memory_lean)
+        return {"file": files[0], "files": files, "ok": True, "output": [str(d) for d in out_dirs],
+                "seconds": time.perf_counter() - t0, "peak_rss_mb": mem.peak_mb, "pid": os.getpid()}
+    except Exception as e:
+        return {"file": files[0], "files": files, "ok": False, "error": f"{type(e).__name__}: {e}",
+                "traceback": traceback.format_exc(), "seconds": time.perf_counter() - t0,
+                "peak_rss_mb": mem.peak_mb, "pid": os.getpid()}
+
+
+def run_parallel_scans(groups, input_base, output_base, format: str, overwrite: bool, jobs: int,
+                       dask_threads: int = None, on_result=None, profile: ProcessingProfile = None,
+                       tile_zoom: int = None, region: str = None, memory_lean: bool = False):
+    """
+    Como run_parallel, pero cada tarea es un escaneo completo (lista de
+    archivos de group_by_scan) procesado con una Scene compartida.
+    """
+    dask_threads = dask_threads or (profile and profile.threads) or default_dask_threads(jobs)
+    groups = [[str(f) for f in g] for g in groups]
+    results = [None] * len(groups)
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(dask_threads, profile, current_config())) as pool:
+        futures = {
+            pool.submit(_run_scan, g, str(input_base), str(output_base), format, overwrite, tile_zoom,
+                        region, memory_lean): i
+            for i, g in enumerate(groups)
+        }
+        for fut in as_completed(futures):
+            res = fut.result()
+            results[futures[fut]] = res
+            if on_result is not None:
+                on_result(res)
+
+    return results
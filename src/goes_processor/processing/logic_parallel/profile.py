@@ -0,0 +1,190 @@
+# src/goes_processor/processing/logic_parallel/profile.py
+
+"""
+Perfiles de procesamiento: tamaño de chunk de dask, hilos y techo de memoria.
+
+Un perfil se activa con `using_profile(perfil)` (contexto de dask.config) o
+`apply_profile(perfil)` (global, para workers). Con techo de memoria, los
+arrays intermedios grandes del remuestreo (fuente materializada y resultado)
+se vuelcan a archivos memmap en `spill_dir` en lugar de vivir en RAM.
+"""
+
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from typing import Optional
+
+from ...telemetry import current_rss_mb
+
+# Estimación de memoria de trabajo por chunk en vuelo (copias float64,
+# máscaras, temporales del compositor y del writer)
+CHUNK_WORKING_SET = 12
+# Parte del techo que puede ocupar un único array antes de volcarlo a disco
+SPILL_FRACTION = 0.25
+
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Perfil activo en este proceso (lo consulta el remuestreo para el volcado)
+_ACTIVE = None
+
+
+@dataclass(frozen=True)
+class ProcessingProfile:
+    name: str = "default"
+    chunk_mb: Optional[int] = None        # array.chunk-size de dask (None = el de satpy, 128 MiB)
+    threads: Optional[int] = None         # hilos del scheduler threads (None = núcleos)
+    memory_limit_mb: Optional[int] = None  # techo por proceso; activa el volcado a disco
+    spill_dir: Optional[str] = None       # carpeta para memmaps (None = temporal del sistema)
+
+    def describe(self) -> str:
+        chunk = f"{self.chunk_mb} MB" if self.chunk_mb else "satpy"
+        threads = self.threads or "auto"
+        limit = f"{self.memory_limit_mb} MB" if self.memory_limit_mb else "sin techo"
+        return f"{self.name} (chunk {chunk}, {threads} hilos, {limit})"
+
+    def spill_threshold_bytes(self) -> Optional[int]:
+        if not self.memory_limit_mb:
+            return None
+        return int(self.memory_limit_mb * 1024**2 * SPILL_FRACTION)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+PROFILES = {
+    "default": ProcessingProfile("default"),
+    # Nodos compartidos: chunks chicos, pocos hilos, techo de 4 GB con volcado
+    "lean": ProcessingProfile("lean", chunk_mb=32, threads=2, memory_limit_mb=4096),
+    # Máquina dedicada: chunks grandes, todos los núcleos
+    "fast": ProcessingProfile("fast", chunk_mb=256),
+}
+
+
+def available_memory_mb() -> int:
+    """Memoria disponible (MemAvailable) o, sin /proc, la física total."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * _PAGE // 1024**2
+    except (ValueError, OSError, AttributeError):
+        return 4096
+
+
+def auto_profile(jobs: int = 1, reserve_fraction: float = 0.25) -> ProcessingProfile:
+    """
+    Elige hilos y chunk a partir de la RAM disponible y los núcleos, repartidos
+    entre `jobs` procesos, dejando `reserve_fraction` de la RAM libre.
+    """
+    jobs = max(1, jobs)
+    threads = max(1, (os.cpu_count() or 1) // jobs)
+    budget_mb = int(available_memory_mb() * (1 - reserve_fraction) / jobs)
+
+    # Mayor potencia de 2 (16..256 MB) cuyo working set entra en el presupuesto
+    chunk_mb = 256
+    while chunk_mb > 16 and threads * chunk_mb * CHUNK_WORKING_SET > budget_mb:
+        chunk_mb //= 2
+    while threads > 1 and threads * chunk_mb * CHUNK_WORKING_SET > budget_mb:
+        threads -= 1
+    return ProcessingProfile("auto", chunk_mb=chunk_mb, threads=threads, memory_limit_mb=budget_mb)
+
+
+def resolve_profile(name: str = "default", jobs: int = 1, **overrides) -> ProcessingProfile:
+    """Perfil por nombre ('auto' se calcula para `jobs`) con overrides no nulos."""
+    if name == "auto":
+        profile = auto_profile(jobs)
+    elif name in PROFILES:
+        profile = PROFILES[name]
+    else:
+        raise ValueError(f"Perfil desconocido: {name} (opciones: auto, {', '.join(PROFILES)})")
+    overrides = {k: v for k, v in overrides.items() if v is not None}
+    return replace(profile, **overrides) if overrides else profile
+
+
+def _dask_settings(profile: ProcessingProfile) -> dict:
+    settings = {"scheduler": "threads"}
+    if profile.threads:
+        settings["num_workers"] = profile.threads
+    if profile.chunk_mb:
+        settings["array.chunk-size"] = f"{profile.chunk_mb}MiB"
+    if profile.spill_dir:
+        settings["temporary-directory"] = profile.spill_dir
+    return settings
+
+
+def apply_profile(profile: ProcessingProfile) -> ProcessingProfile:
+    """Activa el perfil para todo el proceso (workers del pool)."""
+    global _ACTIVE
+    import dask
+    dask.config.set(_dask_settings(profile))
+    _ACTIVE = profile
+    return profile
+
+
+@contextmanager
+def using_profile(profile: Optional[ProcessingProfile]):
+    """Activa el perfil solo dentro del bloque (API de Python)."""
+    global _ACTIVE
+    if profile is None:
+        yield None
+        return
+    import dask
+    previous = _ACTIVE
+    with dask.config.set(_dask_settings(profile)):
+        _ACTIVE = profile
+        try:
+            yield profile
+        finally:
+            _ACTIVE = previous
+
+
+def active_profile() -> Optional[ProcessingProfile]:
+    return _ACTIVE
+
+
+def spill_dir_for(profile: ProcessingProfile) -> str:
+    path = profile.spill_dir or os.path.join(tempfile.gettempdir(), "goes_spill")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Medición de memoria por archivo
+# ---------------------------------------------------------------------------
+class PeakMemory:
+    """
+    Pico de RSS dentro de un bloque (muestreo en un hilo), para reportar la
+    memoria por archivo aunque el proceso procese muchos:
+
+        with PeakMemory() as mem:
+            process_file(...)
+        mem.peak_mb
+    """
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def __enter__(self):
+        self.peak_mb = current_rss_mb()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+        return False
@@ -0,0 +1,317 @@
+# src/goes_processor/processing/logic_queue/work_queue.py
+
+"""
+Cola de trabajo compartida para procesar en varios nodos.
+
+`bulk --enqueue` publica un trabajo por archivo (o por escaneo en modo
+multi-producto) y cada `bulk --worker` los toma con una lease de duración
+fija que renueva con heartbeats mientras procesa:
+
+- lease(): toma el trabajo pendiente más antiguo de forma atómica; antes
+  reclama las leases vencidas (nodo caído o colgado) y las devuelve a la
+  cola, o las da por fallidas si agotaron los intentos.
+- fail(): reintento con espera exponencial hasta max_attempts.
+- status(): conteos por estado, trabajos/min recientes y ETA.
+
+El backend por defecto es SQLite sobre un filesystem compartido (NFS, CIFS,
+disco local para un solo nodo). Se usa el journal clásico y no WAL: WAL
+necesita memoria compartida y no funciona entre máquinas. Los tiempos son
+de pared (time.time()); el desfase de reloj entre nodos debe ser muy
+inferior a la duración de la lease.
+
+Otros backends se registran en BACKENDS con un esquema de URL
+(p.ej. "sqlite:///mnt/shared/cola.sqlite").
+"""
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+SCHEMA_VERSION = 1
+
+# Estados de un trabajo
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS jobs (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind          TEXT NOT NULL,
+    pipeline      TEXT NOT NULL,
+    job_key       TEXT NOT NULL UNIQUE,
+    files         TEXT NOT NULL,
+    params        TEXT NOT NULL,
+    state         TEXT NOT NULL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    max_attempts  INTEGER NOT NULL,
+    available_at  REAL NOT NULL,
+    owner         TEXT,
+    lease_expires REAL,
+    reclaims      INTEGER NOT NULL DEFAULT 0,
+    enqueued      REAL NOT NULL,
+    started       REAL,
+    finished      REAL,
+    seconds       REAL,
+    peak_rss_mb   REAL,
+    error         TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, available_at, id);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (state, finished);
+"""
+
+
+@dataclass
+class Job:
+    """Trabajo tomado de la cola: un archivo (kind='file') o un escaneo (kind='scan')."""
+    id: int
+    kind: str
+    pipeline: str
+    files: List[str]
+    params: dict
+    attempts: int
+    max_attempts: int
+
+
+class WorkQueue:
+    """Interfaz de los backends de la cola (ver SQLiteWorkQueue)."""
+
+    def enqueue(self, jobs: Iterable[dict], max_attempts: int = 3) -> int:
+        raise NotImplementedError
+
+    def lease(self, owner: str, lease_seconds: float) -> Optional[Job]:
+        raise NotImplementedError
+
+    def heartbeat(self, job_id: int, owner: str, lease_seconds: float) -> bool:
+        raise NotImplementedError
+
+    def complete(self, job_id: int, owner: str, seconds: float = None, peak_rss_mb: float = None):
+        raise NotImplementedError
+
+    def fail(self, job_id: int, owner: str, error: str, retry_delay: float = 30.0) -> str:
+        raise NotImplementedError
+
+    def reclaim(self) -> int:
+        raise NotImplementedError
+
+    def drained(self) -> bool:
+        raise NotImplementedError
+
+    def queued_files(self) -> set:
+        raise NotImplementedError
+
+    def status(self, window_seconds: float = 900.0) -> dict:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """Cola en un archivo SQLite (compartido entre nodos vía filesystem de red)."""
+
+    def __init__(self, db_path, clock=time.time):
+        self.db_path = Path(db_path)
+        self.clock = clock
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit: las transacciones se abren explícitamente con BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(str(self.db_path), timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        self.conn.executescript(_SCHEMA)
+        self.conn.execute("INSERT OR IGNORE INTO meta VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+
+    def close(self):
+        self.conn.close()
+
+    def _tx(self):
+        return _Immediate(self.conn)
+
+    # --- PRODUCTOR ---
+    def enqueue(self, jobs: Iterable[dict], max_attempts: int = 3) -> int:
+        """
+        Publica trabajos {kind, pipeline, key, files, params}. Un trabajo con la
+        misma clave ya pendiente o en curso se ignora; uno terminado o fallido
+        vuelve a la cola (el productor ya decidió que hay que reconstruirlo).
+        """
+        now = self.clock()
+        rows = [(j["kind"], j["pipeline"], j["key"], json.dumps(j["files"]), json.dumps(j["params"]), PENDING,
+                 max_attempts, now, now) for j in jobs]
+        with self._tx():
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT INTO jobs (kind, pipeline, job_key, files, params, state, max_attempts, available_at, "
+                "enqueued) VALUES (?,?,?,?,?,?,?,?,?) "
+                "ON CONFLICT (job_key) DO UPDATE SET state = excluded.state, params = excluded.params, "
+                "attempts = 0, max_attempts = excluded.max_attempts, available_at = excluded.available_at, "
+                "enqueued = excluded.enqueued, owner = NULL, lease_expires = NULL, started = NULL, "
+                "finished = NULL, seconds = NULL, error = NULL "
+                "WHERE jobs.state IN ('done', 'failed')", rows)
+            return self.conn.total_changes - before
+
+    # --- WORKERS ---
+    def _reclaim(self, now: float) -> int:
+        expired = "state = 'leased' AND lease_expires < ?"
+        cur = self.conn.execute(
+            f"UPDATE jobs SET state = 'pending', owner = NULL, lease_expires = NULL, reclaims = reclaims + 1, "
+            f"available_at = ? WHERE {expired} AND attempts < max_attempts", (now, now))
+        reclaimed = cur.rowcount
+        cur = self.conn.execute(
+            f"UPDATE jobs SET state = 'failed', owner = NULL, lease_expires = NULL, reclaims = reclaims + 1, "
+            f"finished = ?, error = COALESCE(error, 'lease vencida en el último intento') "
+            f"WHERE {expired} AND attempts >= max_attempts", (now, now))
+        return reclaimed + cur.rowcount
+
+    def reclaim(self) -> int:
+        """Devuelve a la cola (o da por fallidas) las leases vencidas. Devuelve cuántas."""
+        with self._tx():
+            return self._reclaim(self.clock())
+
+    def lease(self, owner: str, lease_seconds: float) -> Optional[Job]:
+        now = self.clock()
+        with self._tx():
+            self._reclaim(now)
+            row = self.conn.execute(
+                "SELECT id, kind, pipeline, files, params, attempts, max_attempts FROM jobs "
+                "WHERE state = 'pending' AND available_at <= ? ORDER BY id LIMIT 1", (now,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET state = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                "started = ? WHERE id = ?", (owner, now + lease_seconds, now, row[0]))
+        return Job(row[0], row[1], row[2], json.loads(row[3]), json.loads(row[4]), row[5] + 1, row[6])
+
+    def heartbeat(self, job_id: int, owner: str, lease_seconds: float) -> bool:
+        """Extiende la lease; False si ya no es de `owner` (venció y otro la reclamó)."""
+        with self._tx():
+            cur = self.conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND owner = ? AND state = 'leased'",
+                (self.clock() + lease_seconds, job_id, owner))
+            return cur.rowcount == 1
+
+    def complete(self, job_id: int, owner: str, seconds: float = None, peak_rss_mb: float = None):
+        # Idempotente: si la lease se perdió pero el trabajo terminó bien, igual queda hecho
+        with self._tx():
+            self.conn.execute(
+                "UPDATE jobs SET state = 'done', owner = ?, lease_expires = NULL, finished = ?, seconds = ?, "
+                "peak_rss_mb = ?, error = NULL WHERE id = ? AND state != 'done'",
+                (owner, self.clock(), seconds, peak_rss_mb, job_id))
+
+    def fail(self, job_id: int, owner: str, error: str, retry_delay: float = 30.0) -> str:
+        """Registra un error: reintento con espera exponencial, o 'failed' al agotar intentos."""
+        now = self.clock()
+        with self._tx():
+            row = self.conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ? AND owner = ? "
+                                    "AND state = 'leased'", (job_id, owner)).fetchone()
+            if row is None:
+                return "lost"
+            attempts, max_attempts = row
+            state = PENDING if attempts < max_attempts else FAILED
+            delay = min(retry_delay * 2 ** (attempts - 1), 3600.0)
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, owner = NULL, lease_expires = NULL, available_at = ?, error = ?, "
+                "finished = ? WHERE id = ?",
+                (state, now + delay, error, now if state == FAILED else None, job_id))
+        return state
+
+    def drained(self) -> bool:
+        """True si no queda nada pendiente ni en curso (las leases vencidas cuentan como pendientes)."""
+        row = self.conn.execute("SELECT COUNT(*) FROM jobs WHERE state IN ('pending', 'leased')").fetchone()
+        return row[0] == 0
+
+    def queued_files(self) -> set:
+        """Archivos de entrada de los trabajos pendientes o en curso."""
+        out = set()
+        for (files,) in self.conn.execute("SELECT files FROM jobs WHERE state IN ('pending', 'leased')"):
+            out.update(json.loads(files))
+        return out
+
+    # --- ESTADO ---
+    def status(self, window_seconds: float = 900.0) -> dict:
+        now = self.clock()
+        counts = {s: 0 for s in (PENDING, LEASED, DONE, FAILED)}
+        counts.update(dict(self.conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state")))
+        recent, avg_seconds = self.conn.execute(
+            "SELECT COUNT(*), AVG(seconds) FROM jobs WHERE state = 'done' AND finished >= ?",
+            (now - window_seconds,)).fetchone()
+        workers = [r[0] for r in self.conn.execute(
+            "SELECT DISTINCT owner FROM jobs WHERE state = 'leased' AND lease_expires >= ? ORDER BY owner",
+            (now,))]
+        expired = self.conn.execute("SELECT COUNT(*) FROM jobs WHERE state = 'leased' AND lease_expires < ?",
+                                    (now,)).fetchone()[0]
+        first = self.conn.execute("SELECT MIN(finished) FROM jobs WHERE state = 'done' AND finished >= ?",
+                                  (now - window_seconds,)).fetchone()[0]
+        # Ritmo sobre el tramo efectivamente observado (no toda la ventana si recién arrancó)
+        elapsed = min(window_seconds, now - first) if first is not None else 0.0
+        per_minute = 60.0 * recent / elapsed if elapsed > 0 and recent > 1 else None
+        remaining = counts[PENDING] + counts[LEASED]
+        eta = 60.0 * remaining / per_minute if per_minute else None
+        failures = [dict(zip(("files", "attempts", "error"), (json.loads(r[0]), r[1], r[2]))) for r in
+                    self.conn.execute("SELECT files, attempts, error FROM jobs WHERE state = 'failed' "
+                                      "ORDER BY finished DESC LIMIT 5")]
+        return {
+            "counts": counts,
+            "remaining": remaining,
+            "expired_leases": expired,
+            "workers": workers,
+            "done_in_window": recent,
+            "window_seconds": window_seconds,
+            "jobs_per_minute": per_minute,
+            "avg_seconds": avg_seconds,
+            "eta_seconds": eta,
+            "retrying": self.conn.execute("SELECT COUNT(*) FROM jobs WHERE state = 'pending' AND attempts > 0")
+                                 .fetchone()[0],
+            "reclaims": self.conn.execute("SELECT COALESCE(SUM(reclaims), 0) FROM jobs").fetchone()[0],
+            "recent_failures": failures,
+        }
+
+
+class _Immediate:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK: toma el lock de escritura al entrar (sin carreras de lease)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, *exc):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+# Esquema de URL → clase del backend
+BACKENDS: Dict[str, type] = {"sqlite": SQLiteWorkQueue}
+
+
+def open_queue(location) -> WorkQueue:
+    """'esquema://destino' de un backend registrado, o una ruta (SQLite)."""
+    location = str(location)
+    scheme, sep, rest = location.partition("://")
+    if not sep:
+        return SQLiteWorkQueue(location)
+    if scheme not in BACKENDS:
+        raise ValueError(f"Backend de cola desconocido: {scheme} (disponibles: {', '.join(BACKENDS)})")
+    # sqlite:///ruta/absoluta → /ruta/absoluta
+    return BACKENDS[scheme](rest)
+
+
+def file_job(pipeline: str, input_file, params: dict, output_dir) -> dict:
+    """Trabajo de un archivo; la clave incluye la carpeta de salida (mismo archivo, otra región = otro trabajo)."""
+    input_file = str(Path(input_file).resolve())
+    return {"kind": "file", "pipeline": pipeline, "key": f"{pipeline}|{input_file}|{Path(output_dir)}",
+            "files": [input_file], "params": params}
+
+
+def scan_job(files, params: dict) -> dict:
+    """Trabajo de un escaneo completo (modo multi-producto)."""
+    files = sorted(str(Path(f).resolve()) for f in files)
+    key = "|".join(["scan", str(params["output_base"]), str(params.get("region"))] + files)
+    return {"kind": "scan", "pipeline": "scan", "key": key, "files": files, "params": params}
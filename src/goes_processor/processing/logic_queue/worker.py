@@ -0,0 +1,135 @@
+# src/goes_processor/processing/logic_queue/worker.py
+
+"""
+Worker de la cola compartida (`bulk --worker`).
+
+Cada worker toma trabajos con lease, los procesa con las mismas funciones
+que el pool local (pool._run_one / pool._run_scan) y mientras tanto un hilo
+renueva la lease cada lease/3 segundos. Si el nodo muere, la lease vence y
+otro worker reclama el trabajo; las salidas son idempotentes (escritura
+atómica + manifiesto), así que un trabajo repetido no deja archivos a medias.
+
+Con --jobs N se lanzan N workers en procesos separados, inicializados como
+los del pool (satpy, perfil y LUTs cargados una vez).
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from .work_queue import open_queue
+from ..logic_parallel.pool import _init_worker, _run_one, _run_scan, default_dask_threads
+from ..logic_parallel.profile import ProcessingProfile, apply_profile
+from ...telemetry import current_config
+
+log = logging.getLogger(__name__)
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Heartbeat:
+    """Hilo que renueva la lease de un trabajo mientras se procesa (conexión propia a la cola)."""
+
+    def __init__(self, location, job_id: int, owner: str, lease_seconds: float):
+        self.location = location
+        self.job_id = job_id
+        self.owner = owner
+        self.lease_seconds = lease_seconds
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name=f"heartbeat-{job_id}", daemon=True)
+
+    def _loop(self):
+        with open_queue(self.location) as queue:
+            while not self._stop.wait(self.lease_seconds / 3):
+                try:
+                    if not queue.heartbeat(self.job_id, self.owner, self.lease_seconds):
+                        self.lost = True
+                        return
+                except Exception as e:  # cola momentáneamente inaccesible: se reintenta en el próximo ciclo
+                    log.warning(f"   [!] Heartbeat del trabajo {self.job_id} falló: {e}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _run_job(job) -> dict:
+    p = job.params
+    options = dict(tile_zoom=p.get("tile_zoom"), region=p.get("region"), memory_lean=p.get("memory_lean", False))
+    if job.kind == "scan":
+        return _run_scan(job.files, p["input_base"], p["output_base"], p["format"], p["overwrite"], **options)
+    return _run_one(job.pipeline, job.files[0], p["input_base"], p["output_base"], p["format"], p["overwrite"],
+                    **options)
+
+
+def run_worker(location, lease_seconds: float = 600.0, poll_seconds: float = 10.0, retry_delay: float = 30.0,
+               max_jobs: int = None, wait: bool = False, owner: str = None,
+               on_result: Optional[Callable[[dict], None]] = None) -> list:
+    """
+    Toma y procesa trabajos hasta vaciar la cola (o indefinidamente con
+    wait=True). Mientras otros workers tengan leases vigentes se espera: si
+    vencen, sus trabajos vuelven a estar disponibles.
+    """
+    owner = owner or worker_name()
+    results = []
+    with open_queue(location) as queue:
+        while max_jobs is None or len(results) < max_jobs:
+            job = queue.lease(owner, lease_seconds)
+            if job is None:
+                if not wait and queue.drained():
+                    break
+                time.sleep(poll_seconds)
+                continue
+
+            with Heartbeat(location, job.id, owner, lease_seconds) as hb:
+                res = _run_job(job)
+            if hb.lost:
+                log.warning(f"   [!] Se perdió la lease de {os.path.basename(job.files[0])} (otro worker la reclamó)")
+            if res["ok"]:
+                queue.complete(job.id, owner, res["seconds"], res["peak_rss_mb"])
+                res["state"] = "done"
+            else:
+                res["state"] = queue.fail(job.id, owner, res["error"], retry_delay)
+            res.update(attempt=job.attempts, max_attempts=job.max_attempts, owner=owner)
+            results.append(res)
+            if on_result is not None:
+                on_result(res)
+    return results
+
+
+def _worker_process(location, lease_seconds, poll_seconds, retry_delay, max_jobs, wait):
+    return run_worker(location, lease_seconds, poll_seconds, retry_delay, max_jobs, wait)
+
+
+def run_workers(location, jobs: int = 1, dask_threads: int = None, profile: ProcessingProfile = None,
+                lease_seconds: float = 600.0, poll_seconds: float = 10.0, retry_delay: float = 30.0,
+                max_jobs: int = None, wait: bool = False, on_result=None) -> list:
+    """`jobs` workers en este nodo: en este proceso si jobs == 1, si no en un pool de procesos."""
+    if jobs == 1:
+        apply_profile(profile or ProcessingProfile())
+        return run_worker(location, lease_seconds, poll_seconds, retry_delay, max_jobs, wait, on_result=on_result)
+
+    dask_threads = dask_threads or (profile and profile.threads) or default_dask_threads(jobs)
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(dask_threads, profile, current_config())) as pool:
+        futures = [pool.submit(_worker_process, str(location), lease_seconds, poll_seconds, retry_delay,
+                               max_jobs, wait) for _ in range(jobs)]
+        for fut in futures:
+            batch = fut.result()
+            results += batch
+            if on_result is not None:
+                for res in batch:
+                    on_result(res)
+    return results
@@ -0,0 +1,322 @@
+# src/goes_processor/processing/logic_resample/lut.py
+
+"""
+Cache persistente de tablas de remuestreo (LUT) fuente → destino.
+
+La geometría full-disk de GOES-19 y las grillas globales WGS84 de salida no
+cambian entre archivos, así que los índices de vecinos y sus pesos se calculan
+una sola vez, se guardan como .npy (memory-mappable) dentro de CACHE_DIR y se
+aplican como un gather vectorizado de NumPy.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+import dask
+import dask.array as da
+import numpy as np
+import xarray as xr
+from pyproj import Transformer
+
+from ..logic_parallel.profile import active_profile, spill_dir_for
+
+log = logging.getLogger(__name__)
+
+LUT_VERSION = 1
+
+# Alias de satpy → método de la LUT
+RESAMPLER_ALIASES = {
+    "kd_tree": "nearest",
+    "nearest": "nearest",
+    "bilinear": "bilinear",
+}
+
+# LUTs ya cargadas en este proceso (clave → ResampleLUT)
+_LOADED = {}
+_LOCK = threading.Lock()
+
+# Filas de la grilla destino transformadas por bloque al construir la LUT
+_BUILD_ROWS = 256
+# Puntos destino por bloque al aplicar la LUT bilineal
+_APPLY_BLOCK = 1 << 20
+
+
+def lut_cache_dir() -> Path:
+    """Carpeta de LUTs dentro del CACHE_DIR global de Satpy."""
+    try:
+        from ... import config_satpy
+        base = Path(config_satpy.CACHE_DIR)
+    except ImportError:
+        base = Path(os.getenv("SATPY_CACHE_DIR", "resample_cache"))
+    return base / "lut"
+
+
+def area_fingerprint(area) -> str:
+    """Huella estable de un AreaDefinition (CRS, forma y extensión)."""
+    extent = ",".join(f"{v:.6f}" for v in area.area_extent)
+    raw = f"{area.crs.to_wkt()}|{area.shape}|{extent}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def lut_key(source_area, target_area, method: str) -> str:
+    return f"v{LUT_VERSION}_{method}_{area_fingerprint(source_area)}_{area_fingerprint(target_area)}"
+
+
+class ResampleLUT:
+    """
+    Tabla de remuestreo precalculada.
+
+    - out_index: índices planos de la grilla destino que reciben dato (M,)
+    - src_index: índices planos en la grilla fuente por vecino (M, k)
+    - weights:   pesos por vecino (M, k); k=1 y peso 1 para nearest
+    """
+
+    def __init__(self, method, target_shape, out_index, src_index, weights):
+        self.method = method
+        self.target_shape = tuple(target_shape)
+        self.out_index = out_index
+        self.src_index = src_index
+        self.weights = weights
+
+    def apply(self, data: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        Remuestrea un array (y, x) o (bands, y, x) con un gather vectorizado.
+        `out` permite escribir en un buffer externo (p.ej. un memmap de volcado).
+        """
+        data = np.asarray(data)
+        out_dtype = data.dtype if np.issubdtype(data.dtype, np.floating) else np.float32
+        lead = data.shape[:-2]
+        flat = data.reshape(lead + (-1,))
+        if out is None:
+            out = np.empty(lead + self.target_shape, dtype=out_dtype)
+        out_flat = out.reshape(lead + (-1,))
+        out_flat[...] = np.nan
+
+        if self.method == "nearest":
+            out_flat[..., self.out_index] = flat[..., self.src_index[:, 0]]
+        else:
+            # Por bloques de puntos destino: los temporales (..., M, k) quedan acotados
+            for start in range(0, len(self.out_index), _APPLY_BLOCK):
+                sl = slice(start, start + _APPLY_BLOCK)
+                vals = flat[..., self.src_index[sl]]                      # (..., m, k)
+                valid = ~np.isnan(vals)
+                w = np.where(valid, self.weights[sl], 0.0).astype(out_dtype)
+                num = np.sum(np.where(valid, vals, 0) * w, axis=-1)
+                den = np.sum(w, axis=-1)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    out_flat[..., self.out_index[sl]] = np.where(den > 0, num / den, np.nan)
+
+        return out
+
+    # --- PERSISTENCIA ---
+    def save(self, directory: Path):
+        directory = Path(directory)
+        tmp_dir = directory.with_name(directory.name + f".tmp{os.getpid()}")
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        np.save(tmp_dir / "out_index.npy", self.out_index)
+        np.save(tmp_dir / "src_index.npy", self.src_index)
+        np.save(tmp_dir / "weights.npy", self.weights)
+        with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+            json.dump({"version": LUT_VERSION, "method": self.method,
+                       "target_shape": list(self.target_shape)}, f)
+        try:
+            os.replace(tmp_dir, directory)
+        except OSError:
+            # Otro proceso ya la guardó: nos quedamos con la suya
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: Path) -> "ResampleLUT":
+        directory = Path(directory)
+        with open(directory / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(
+            meta["method"],
+            meta["target_shape"],
+            np.load(directory / "out_index.npy", mmap_mode="r"),
+            np.load(directory / "src_index.npy", mmap_mode="r"),
+            np.load(directory / "weights.npy", mmap_mode="r"),
+        )
+
+
+def build_lut(source_area, target_area, method: str = "nearest") -> ResampleLUT:
+    """
+    Construye la LUT proyectando los centros de píxel destino al sistema de la
+    grilla fuente (p.ej. geos) y calculando su posición fraccional en ella.
+    """
+    transformer = Transformer.from_crs(target_area.crs, source_area.crs, always_xy=True)
+    src_rows, src_cols = source_area.shape
+    ul_x, ul_y = source_area.pixel_upper_left
+    psx, psy = source_area.pixel_size_x, source_area.pixel_size_y
+    t_rows, t_cols = target_area.shape
+
+    out_parts, src_parts, w_parts = [], [], []
+    for r0 in range(0, t_rows, _BUILD_ROWS):
+        r1 = min(r0 + _BUILD_ROWS, t_rows)
+        tx, ty = target_area.get_proj_coords(data_slice=(slice(r0, r1), slice(None)))
+        with np.errstate(invalid="ignore"):
+            sx, sy = transformer.transform(tx.ravel(), ty.ravel(), errcheck=False)
+        col = (np.asarray(sx) - ul_x) / psx
+        row = (ul_y - np.asarray(sy)) / psy
+        ok = np.isfinite(col) & np.isfinite(row)
+        ok &= (col >= -0.5) & (col <= src_cols - 0.5) & (row >= -0.5) & (row <= src_rows - 0.5)
+        flat_out = np.flatnonzero(ok).astype(np.int64) + r0 * t_cols
+        col, row = col[ok], row[ok]
+
+        if method == "nearest":
+            c = np.clip(np.rint(col), 0, src_cols - 1).astype(np.int64)
+            r = np.clip(np.rint(row), 0, src_rows - 1).astype(np.int64)
+            src = (r * src_cols + c)[:, None]
+            w = np.ones_like(src, dtype=np.float32)
+        else:
+            c0 = np.floor(col)
+            r0f = np.floor(row)
+            fx = (col - c0).astype(np.float32)
+            fy = (row - r0f).astype(np.float32)
+            c0 = c0.astype(np.int64)
+            r0i = r0f.astype(np.int64)
+            cs = [np.clip(c0, 0, src_cols - 1), np.clip(c0 + 1, 0, src_cols - 1)]
+            rs = [np.clip(r0i, 0, src_rows - 1), np.clip(r0i + 1, 0, src_rows - 1)]
+            src = np.stack([rs[0] * src_cols + cs[0], rs[0] * src_cols + cs[1],
+                            rs[1] * src_cols + cs[0], rs[1] * src_cols + cs[1]], axis=1)
+            w = np.stack([(1 - fx) * (1 - fy), fx * (1 - fy), (1 - fx) * fy, fx * fy], axis=1)
+
+        out_parts.append(flat_out)
+        src_parts.append(src)
+        w_parts.append(w)
+
+    return ResampleLUT(
+        method,
+        target_area.shape,
+        np.concatenate(out_parts).astype(np.int32),
+        np.concatenate(src_parts).astype(np.int32),
+        np.concatenate(w_parts).astype(np.float32),
+    )
+
+
+def get_lut(source_area, target_area, resampler: str = "nearest") -> ResampleLUT:
+    """
+    Devuelve la LUT para (fuente, destino, método): primero memoria del proceso,
+    luego disco (memmap) y, si no existe, la construye y la persiste.
+    """
+    method = RESAMPLER_ALIASES.get(resampler)
+    if method is None:
+        raise ValueError(f"Remuestreador sin soporte de LUT: {resampler}")
+    key = lut_key(source_area, target_area, method)
+
+    with _LOCK:
+        lut = _LOADED.get(key)
+        if lut is not None:
+            return lut
+        directory = lut_cache_dir() / key
+        if (directory / "meta.json").exists():
+            lut = ResampleLUT.load(directory)
+        else:
+            log.info(f"    - [LUT] Construyendo tabla de remuestreo {method} (una sola vez)...")
+            lut = build_lut(source_area, target_area, method)
+            directory.parent.mkdir(parents=True, exist_ok=True)
+            lut.save(directory)
+            lut = ResampleLUT.load(directory)
+            # Cuota del cache (si está configurada): la LUT es un bundle que se desaloja entera
+            from ...storage.quota import notify
+            notify(lut_cache_dir().parent, [directory])
+        _LOADED[key] = lut
+        return lut
+
+
+def preload_luts() -> int:
+    """Carga (memmap) todas las LUTs ya guardadas en disco. Devuelve cuántas."""
+    base = lut_cache_dir()
+    if not base.exists():
+        return 0
+    count = 0
+    with _LOCK:
+        for directory in base.iterdir():
+            if directory.name in _LOADED or not (directory / "meta.json").exists():
+                continue
+            try:
+                _LOADED[directory.name] = ResampleLUT.load(directory)
+                count += 1
+            except (OSError, ValueError, KeyError):
+                continue
+    return count
+
+
+def supports(resampler: str) -> bool:
+    return resampler in RESAMPLER_ALIASES
+
+
+def resample_dataarray(data_arr: xr.DataArray, target_area, resampler: str = "nearest") -> xr.DataArray:
+    """
+    Remuestrea un DataArray de satpy de forma perezosa (dask) usando la LUT.
+    Si el perfil activo tiene techo de memoria y el array lo justifica, la
+    fuente materializada y el resultado viven en memmaps (volcado a disco).
+    """
+    lut = get_lut(data_arr.attrs["area"], target_area, resampler)
+    lead_dims = data_arr.dims[:-2]
+    lead_shape = data_arr.shape[:-2]
+    out_dtype = data_arr.dtype if np.issubdtype(data_arr.dtype, np.floating) else np.float32
+    out_shape = lead_shape + lut.target_shape
+
+    profile = active_profile()
+    threshold = profile.spill_threshold_bytes() if profile else None
+    if threshold and max(data_arr.nbytes, np.prod(out_shape) * np.dtype(out_dtype).itemsize) > threshold:
+        delayed_out = _spilled_apply(lut, data_arr.data, out_shape, out_dtype, spill_dir_for(profile))
+    else:
+        delayed_out = dask.delayed(lut.apply, pure=True)(data_arr.data)
+    out = da.from_delayed(delayed_out, shape=out_shape, dtype=out_dtype)
+
+    coords = {d: data_arr.coords[d] for d in lead_dims if d in data_arr.coords}
+    attrs = dict(data_arr.attrs)
+    attrs["area"] = target_area
+    return xr.DataArray(out, dims=lead_dims + ("y", "x"), coords=coords, attrs=attrs)
+
+
+def _open_spill(spill_dir: str, shape, dtype) -> np.memmap:
+    # El archivo se borra apenas se mapea: el mapping lo mantiene vivo y el
+    # espacio se libera solo cuando el array deja de usarse
+    fd, path = tempfile.mkstemp(suffix=".npy", dir=spill_dir)
+    os.close(fd)
+    mm = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=tuple(shape))
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+    return mm
+
+
+def _spilled_apply(lut: ResampleLUT, data: da.Array, out_shape, out_dtype, spill_dir: str):
+    """
+    La fuente se escribe chunk a chunk en un memmap (da.store, sin juntarla en
+    RAM) y la LUT escribe su resultado en otro memmap.
+    """
+    src = _open_spill(spill_dir, data.shape, data.dtype)
+    stored = da.store(data, src, lock=False, compute=False, return_stored=False)
+
+    def _apply(_stored):
+        return lut.apply(src, out=_open_spill(spill_dir, out_shape, out_dtype))
+
+    return dask.delayed(_apply, pure=True)(stored)
+
+
+def resample_scene(scn, target_area, resampler: str = "nearest", datasets=None):
+    """
+    Equivalente a scn.resample(target_area, resampler=...) para las grillas
+    fijas del proyecto, reutilizando la LUT cacheada.
+    """
+    from satpy import Scene
+
+    if not supports(resampler):
+        return scn.resample(target_area, resampler=resampler)
+
+    new_scn = Scene()
+    new_scn.attrs.update(scn.attrs)
+    for data_id in (datasets or scn.keys()):
+        new_scn[data_id] = resample_dataarray(scn[data_id], target_area, resampler)
+    return new_scn
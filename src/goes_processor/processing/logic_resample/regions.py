@@ -0,0 +1,107 @@
+# src/goes_processor/processing/logic_resample/regions.py
+
+"""
+Regiones de interés (--region): presets con nombre, bbox en grados o una
+AreaDefinition propia (YAML de pyresample).
+
+Para presets y bbox la grilla destino es un recorte alineado de la grilla
+global del pipeline, así que los píxeles coinciden con los del producto
+global. La escena fuente se recorta a la ventana nativa que cubre el destino
+(Scene.crop, perezoso) antes de computar y remuestrear: la lectura y el
+cómputo escalan con el tamaño de la región y no con el full disk.
+"""
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+from pyproj import Transformer
+
+log = logging.getLogger(__name__)
+
+# lon_min, lat_min, lon_max, lat_max (dentro de la cobertura de GOES-Este)
+REGION_PRESETS = {
+    "south_america": (-82.0, -56.0, -34.0, 13.0),
+    "argentina": (-74.0, -56.0, -53.0, -21.0),
+    "brazil": (-74.0, -34.0, -34.0, 6.0),
+    "conus": (-125.0, 24.0, -66.0, 50.0),
+    "central_america": (-93.0, 5.0, -77.0, 19.0),
+    "caribbean": (-86.0, 9.0, -59.0, 24.0),
+}
+
+
+@dataclass(frozen=True)
+class Region:
+    name: str
+    bbox: Optional[Tuple[float, float, float, float]] = None
+    area: object = None          # AreaDefinition propia (tiene prioridad sobre bbox)
+
+
+def parse_region(value) -> Optional[Region]:
+    """
+    Acepta None/'global', un preset, 'lon_min,lat_min,lon_max,lat_max',
+    'archivo.yaml:nombre_area' o directamente un AreaDefinition/Region.
+    """
+    if value is None or isinstance(value, Region):
+        return value
+    if hasattr(value, "area_extent"):
+        return Region(getattr(value, "area_id", "custom"), area=value)
+
+    text = str(value).strip()
+    if text in ("", "global", "full_disk"):
+        return None
+    if text in REGION_PRESETS:
+        return Region(text, REGION_PRESETS[text])
+
+    if ":" in text and text.split(":", 1)[0].endswith((".yaml", ".yml")):
+        from pyresample import load_area
+        path, area_name = text.split(":", 1)
+        return Region(area_name, area=load_area(Path(path), area_name))
+
+    try:
+        lon_min, lat_min, lon_max, lat_max = (float(v) for v in text.replace("bbox:", "").split(","))
+    except ValueError:
+        raise ValueError(f"Región inválida: {value!r} (presets: {', '.join(REGION_PRESETS)}; "
+                         "o lon_min,lat_min,lon_max,lat_max; o areas.yaml:nombre)") from None
+    if not (-180 <= lon_min < lon_max <= 180 and -90 <= lat_min < lat_max <= 90):
+        raise ValueError(f"BBox fuera de rango: {text}")
+    return Region("bbox_" + "_".join(f"{v:g}" for v in (lon_min, lat_min, lon_max, lat_max)),
+                  (lon_min, lat_min, lon_max, lat_max))
+
+
+def region_area(base_area, region: Optional[Region]):
+    """Grilla destino: la global, el recorte alineado del bbox o el área propia."""
+    if region is None:
+        return base_area
+    if region.area is not None:
+        return region.area
+
+    lon_min, lat_min, lon_max, lat_max = region.bbox
+    # Borde del bbox muestreado (no solo esquinas): en proyecciones como eqc
+    # los extremos pueden no caer en las esquinas
+    lons = np.concatenate([np.linspace(lon_min, lon_max, 50), np.full(50, lon_max),
+                           np.linspace(lon_max, lon_min, 50), np.full(50, lon_min)])
+    lats = np.concatenate([np.full(50, lat_min), np.linspace(lat_min, lat_max, 50),
+                           np.full(50, lat_max), np.linspace(lat_max, lat_min, 50)])
+    to_proj = Transformer.from_crs("EPSG:4326", base_area.crs, always_xy=True)
+    xs, ys = to_proj.transform(lons, lats)
+    cols, rows = base_area.get_array_indices_from_projection_coordinates(xs, ys)
+    cols = np.clip(np.asarray(cols), 0, base_area.width - 1)
+    rows = np.clip(np.asarray(rows), 0, base_area.height - 1)
+    sub = base_area[int(rows.min()):int(rows.max()) + 1, int(cols.min()):int(cols.max()) + 1]
+    sub.area_id = f"{base_area.area_id}_{region.name}"
+    return sub
+
+
+def crop_to_target(scn, target_area):
+    """
+    Recorta la escena a la ventana de píxeles nativos que cubre target_area.
+    Si el destino no intersecta la fuente se devuelve la escena sin cambios.
+    """
+    try:
+        return scn.crop(area=target_area)
+    except (NotImplementedError, ValueError) as e:
+        log.warning(f"    [!] No se pudo recortar la fuente a {target_area.area_id} ({e}); se usa el disco completo")
+        return scn
@@ -0,0 +1,123 @@
+# src/goes_processor/processing/logic_service/client.py
+
+"""
+Cliente del servicio residente (ver service.py): HTTP/JSON sobre un socket
+Unix o un puerto local, solo con la biblioteca estándar. Es lo que usan
+`bulk --via-daemon` y la ingesta para enviar trabajos en lugar de procesar
+en un proceso frío.
+
+Direcciones:
+    unix:/ruta/al.sock     (o una ruta terminada en .sock)
+    http://127.0.0.1:8765  (o host:puerto)
+
+Sin --daemon-address se usa $GOES_PROCESSOR_SERVICE o, si no está, un
+socket en el temporal del sistema propio del usuario.
+"""
+
+import http.client
+import json
+import os
+import socket
+import tempfile
+import time
+from typing import Optional, Tuple
+
+ENV_ADDRESS = "GOES_PROCESSOR_SERVICE"
+FINISHED = ("done", "failed", "cancelled")
+# Espera máxima por pedido GET /jobs/<id>?wait= (el cliente repite hasta el timeout total)
+_POLL_SECONDS = 60.0
+
+
+class ServiceError(RuntimeError):
+    """El servicio rechazó el pedido o no respondió como se esperaba."""
+
+
+def default_address() -> str:
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.environ.get(ENV_ADDRESS) or f"unix:{tempfile.gettempdir()}/goes-processor-{uid}.sock"
+
+
+def parse_address(address: Optional[str]) -> Tuple[str, object]:
+    """('unix', ruta) o ('tcp', (host, puerto))."""
+    address = address or default_address()
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    if address.endswith(".sock") or address.startswith("/"):
+        return "unix", address
+    rest = address.split("://", 1)[1] if "://" in address else address
+    host, sep, port = rest.rstrip("/").rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Dirección del servicio no reconocida: {address} (unix:/ruta.sock o host:puerto)")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class ServiceClient:
+    """Pedidos al servicio; una conexión por pedido (local: el costo es despreciable)."""
+
+    def __init__(self, address: Optional[str] = None, timeout: float = 30.0):
+        self.address = address or default_address()
+        self.kind, self.target = parse_address(self.address)
+        self.timeout = timeout
+
+    def _connection(self, timeout: float):
+        if self.kind == "unix":
+            return _UnixHTTPConnection(self.target, timeout)
+        return http.client.HTTPConnection(*self.target, timeout=timeout)
+
+    def _request(self, method: str, path: str, body: dict = None, timeout: float = None) -> dict:
+        conn = self._connection(timeout or self.timeout)
+        try:
+            payload = json.dumps(body).encode("utf-8") if body is not None else None
+            conn.request(method, path, body=payload, headers={"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            data = json.loads(resp.read() or b"{}")
+        finally:
+            conn.close()
+        if resp.status >= 400:
+            raise ServiceError(data.get("error") or f"HTTP {resp.status}")
+        return data
+
+    def available(self) -> bool:
+        """True si el servicio responde en la dirección configurada."""
+        try:
+            self.status()
+            return True
+        except (OSError, ServiceError, ValueError):
+            return False
+
+    def status(self) -> dict:
+        return self._request("GET", "/status")
+
+    def submit(self, job: dict, priority: int = 0) -> dict:
+        """Envía un trabajo (work_queue.file_job / scan_job); devuelve su estado inicial (con id)."""
+        return self._request("POST", "/jobs", dict(job, priority=priority))
+
+    def job(self, job_id: int, wait: float = 0) -> dict:
+        return self._request("GET", f"/jobs/{job_id}?wait={wait:g}", timeout=self.timeout + wait)
+
+    def wait(self, job_id: int, timeout: Optional[float] = None) -> dict:
+        """Espera a que el trabajo termine (o venza `timeout`) y devuelve su estado."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = _POLL_SECONDS if deadline is None else max(0.0, min(_POLL_SECONDS, deadline - time.monotonic()))
+            job = self.job(job_id, wait=remaining)
+            if job["state"] in FINISHED or (deadline is not None and time.monotonic() >= deadline):
+                return job
+
+    def run(self, job: dict, priority: int = 0, timeout: Optional[float] = None) -> dict:
+        """submit + wait."""
+        return self.wait(self.submit(job, priority)["id"], timeout)
+
+    def shutdown(self) -> dict:
+        return self._request("POST", "/shutdown")
@@ -0,0 +1,388 @@
+# src/goes_processor/processing/logic_service/service.py
+
+"""
+Servicio residente de procesamiento (`processing service run`).
+
+Cada invocación del CLI importa satpy, lee los YAML de satpy_configs y
+carga las LUTs de remuestreo antes de hacer unos pocos segundos de trabajo.
+El servicio paga eso una sola vez: levanta un pool de procesos
+inicializados como los de bulk (pool._init_worker) y recibe trabajos por
+HTTP/JSON en un socket Unix o un puerto local (ver client.py).
+
+- Los trabajos tienen la forma de los de la cola compartida
+  (work_queue.file_job / scan_job) más una prioridad: sale antes el de
+  mayor prioridad y, a igual prioridad, el más antiguo.
+- Concurrencia: a lo sumo `workers` trabajos en curso y, opcionalmente, un
+  tope por procesador (p.ej. truecolor=1 para acotar la memoria).
+- Cada trabajo devuelve el resultado de _run_one/_run_scan (salidas,
+  segundos, pico de RSS) más la espera en cola y la latencia total.
+- Si un worker muere (OOM, señal) sus trabajos en curso fallan y el pool se
+  recrea; el servicio sigue atendiendo.
+
+API:
+    POST /jobs                 {kind, pipeline, files, params, priority} → trabajo (202)
+    GET  /jobs/<id>?wait=S     estado (espera hasta S segundos a que termine)
+    GET  /status               workers, topes, conteos y tiempos recientes
+    POST /shutdown             cancela lo encolado, termina lo que está en curso y sale
+"""
+
+import json
+import logging
+import os
+import re
+import socketserver
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .client import FINISHED, ServiceClient, parse_address
+from ..logic_how.registry import get_processor
+from ..logic_parallel.pool import _init_worker, default_dask_threads
+from ..logic_parallel.profile import ProcessingProfile
+from ..logic_queue.work_queue import Job
+from ...telemetry import current_config
+
+log = logging.getLogger(__name__)
+
+# Tope de GET /jobs/<id>?wait= por pedido (el cliente repite)
+MAX_WAIT_SECONDS = 300.0
+_REQUIRED_PARAMS = ("input_base", "output_base", "format", "overwrite")
+
+
+def _warm() -> int:
+    return os.getpid()
+
+
+def _execute(kind: str, pipeline: str, files: list, params: dict) -> dict:
+    """En el worker: el mismo camino que la cola compartida (worker._run_job)."""
+    from ..logic_queue.worker import _run_job
+
+    return _run_job(Job(0, kind, pipeline, files, params, 1, 1))
+
+
+@dataclass
+class ServiceJob:
+    id: int
+    kind: str
+    pipeline: str
+    files: List[str]
+    params: dict
+    priority: int = 0
+    state: str = "queued"          # queued → running → done | failed (o cancelled al apagar)
+    submitted: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Optional[dict] = None
+
+    def to_dict(self) -> dict:
+        now = time.time()
+        d = {"id": self.id, "kind": self.kind, "pipeline": self.pipeline, "files": self.files,
+             "priority": self.priority, "state": self.state, "submitted": self.submitted,
+             "queue_seconds": (self.started or self.finished or now) - self.submitted}
+        if self.result is not None:
+            r = self.result
+            d.update(ok=r["ok"], output=r.get("output"), seconds=r.get("seconds"),
+                     peak_rss_mb=r.get("peak_rss_mb"), pid=r.get("pid"))
+            if not r["ok"]:
+                d.update(error=r["error"], traceback=r.get("traceback"))
+        if self.finished is not None:
+            d["total_seconds"] = self.finished - self.submitted
+        return d
+
+
+def validate_job(body: dict) -> dict:
+    """Normaliza el cuerpo de POST /jobs; ValueError si no es un trabajo válido."""
+    if not isinstance(body, dict):
+        raise ValueError("Se esperaba un objeto JSON")
+    kind = body.get("kind", "file")
+    if kind not in ("file", "scan"):
+        raise ValueError(f"kind debe ser 'file' o 'scan', no {kind!r}")
+    files = body.get("files")
+    if not isinstance(files, list) or not files or not all(isinstance(f, str) for f in files):
+        raise ValueError("files: lista no vacía de rutas")
+    params = body.get("params")
+    if not isinstance(params, dict):
+        raise ValueError("params: objeto con input_base, output_base, format y overwrite")
+    missing = [k for k in _REQUIRED_PARAMS if k not in params]
+    if missing:
+        raise ValueError(f"params: faltan {', '.join(missing)}")
+    # El servicio corre en otra carpeta: nada relativo
+    relative = [p for p in files + [params["input_base"], params["output_base"]] if not os.path.isabs(p)]
+    if relative:
+        raise ValueError(f"Se requieren rutas absolutas: {relative[0]}")
+    pipeline = body.get("pipeline") or "scan"
+    if kind == "file":
+        try:
+            get_processor(pipeline)
+        except KeyError:
+            raise ValueError(f"Procesador desconocido: {pipeline}") from None
+    try:
+        priority = int(body.get("priority", 0))
+    except (TypeError, ValueError):
+        raise ValueError("priority debe ser un entero") from None
+    return {"kind": kind, "pipeline": pipeline, "files": files, "params": params, "priority": priority}
+
+
+class WarmService:
+    """
+    Pool de workers calientes con cola de prioridades y topes de concurrencia.
+
+    limits: {procesador: máximo en curso} (sin entrada: hasta `workers`).
+    """
+
+    def __init__(self, workers: int = 1, limits: Optional[Dict[str, int]] = None, dask_threads: int = None,
+                 profile: ProcessingProfile = None, keep_finished: int = 1000):
+        self.workers = workers
+        self.limits = dict(limits or {})
+        self.dask_threads = dask_threads or (profile and profile.threads) or default_dask_threads(workers)
+        self.profile = profile
+        self.keep_finished = keep_finished
+        self.started = time.time()
+        self.warm_seconds: Optional[float] = None
+        self.pool_restarts = 0
+
+        self._cond = threading.Condition()
+        self._jobs: "OrderedDict[int, ServiceJob]" = OrderedDict()
+        self._queued: List[ServiceJob] = []
+        self._running: Counter = Counter()
+        self._totals: Counter = Counter()
+        self._finished_ids: deque = deque()
+        self._recent: deque = deque(maxlen=200)   # (segundos de proceso, segundos en cola)
+        self._next_id = 1
+        self._stopping = False
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="service-dispatch", daemon=True)
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=(self.dask_threads, self.profile, current_config()))
+
+    # --- CICLO DE VIDA ---
+    def start(self):
+        """Levanta los workers (import de satpy, configuración y LUTs) antes de aceptar trabajos."""
+        t0 = time.perf_counter()
+        self._pool = self._new_pool()
+        for fut in [self._pool.submit(_warm) for _ in range(self.workers)]:
+            fut.result()
+        self.warm_seconds = time.perf_counter() - t0
+        self._dispatcher.start()
+
+    def stop(self):
+        """Cancela lo encolado y espera a que terminen los trabajos en curso."""
+        with self._cond:
+            self._stopping = True
+            for job in self._queued:
+                job.state, job.finished = "cancelled", time.time()
+                self._totals["cancelled"] += 1
+            self._queued = []
+            self._cond.notify_all()
+        if self._dispatcher.is_alive():
+            self._dispatcher.join()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    # --- TRABAJOS ---
+    def submit(self, body: dict) -> dict:
+        spec = validate_job(body)
+        with self._cond:
+            if self._stopping:
+                raise RuntimeError("El servicio se está deteniendo")
+            job = ServiceJob(self._next_id, **spec)
+            self._next_id += 1
+            self._jobs[job.id] = job
+            self._queued.append(job)
+            self._cond.notify_all()
+            return job.to_dict()
+
+    def get(self, job_id: int, wait: float = 0) -> Optional[dict]:
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if wait > 0:
+                self._cond.wait_for(lambda: job.state in FINISHED, timeout=wait)
+            return job.to_dict()
+
+    def _pick(self) -> Optional[ServiceJob]:
+        if sum(self._running.values()) >= self.workers:
+            return None
+        eligible = [j for j in self._queued if self._running[j.pipeline] < self.limits.get(j.pipeline, self.workers)]
+        return min(eligible, key=lambda j: (-j.priority, j.id), default=None)
+
+    def _dispatch_loop(self):
+        with self._cond:
+            while not self._stopping:
+                job = self._pick()
+                if job is None:
+                    self._cond.wait()
+                    continue
+                self._queued.remove(job)
+                job.state, job.started = "running", time.time()
+                self._running[job.pipeline] += 1
+                pool = self._pool
+                try:
+                    fut = pool.submit(_execute, job.kind, job.pipeline, job.files, job.params)
+                except Exception as e:    # pool roto entre dos trabajos
+                    self._on_error(job, pool, e)
+                    continue
+                fut.add_done_callback(partial(self._on_done, job, pool))
+
+    def _on_done(self, job: ServiceJob, pool, fut):
+        try:
+            res = fut.result()
+        except Exception as e:
+            with self._cond:
+                self._on_error(job, pool, e)
+            return
+        with self._cond:
+            self._finish(job, res)
+
+    def _on_error(self, job: ServiceJob, pool, exc: Exception):
+        self._finish(job, {"file": job.files[0], "ok": False, "error": f"{type(exc).__name__}: {exc}",
+                           "seconds": time.time() - job.started, "peak_rss_mb": None, "pid": None})
+        # Un worker murió: todos los futures de ese pool fallan; se recrea una sola vez
+        if isinstance(exc, BrokenProcessPool) and pool is self._pool and not self._stopping:
+            log.warning(f"   [!] El pool de workers se rompió ({exc}); se recrea")
+            self.pool_restarts += 1
+            pool.shutdown(wait=False)
+            self._pool = self._new_pool()
+
+    def _finish(self, job: ServiceJob, res: dict):
+        # Con self._cond tomado
+        job.result = res
+        job.state = "done" if res["ok"] else "failed"
+        job.finished = time.time()
+        self._running[job.pipeline] -= 1
+        self._totals[job.state] += 1
+        if res["ok"]:
+            self._recent.append((res["seconds"], job.started - job.submitted))
+        self._finished_ids.append(job.id)
+        while len(self._finished_ids) > self.keep_finished:
+            self._jobs.pop(self._finished_ids.popleft(), None)
+        self._cond.notify_all()
+
+    def status(self) -> dict:
+        with self._cond:
+            recent = list(self._recent)
+            return {
+                "pid": os.getpid(),
+                "workers": self.workers,
+                "dask_threads": self.dask_threads,
+                "profile": self.profile.describe() if self.profile else None,
+                "limits": self.limits,
+                "uptime_seconds": time.time() - self.started,
+                "warm_seconds": self.warm_seconds,
+                "pool_restarts": self.pool_restarts,
+                "queued": len(self._queued),
+                "queued_by_priority": dict(Counter(j.priority for j in self._queued)),
+                "running": {k: v for k, v in self._running.items() if v},
+                "done": self._totals["done"],
+                "failed": self._totals["failed"],
+                "cancelled": self._totals["cancelled"],
+                "avg_seconds": sum(s for s, _ in recent) / len(recent) if recent else None,
+                "avg_queue_seconds": sum(q for _, q in recent) / len(recent) if recent else None,
+                "stopping": self._stopping,
+            }
+
+
+# ---------------------------------------------------------------------------
+# HTTP/JSON
+# ---------------------------------------------------------------------------
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "goes-processor-service"
+
+    def log_message(self, format, *args):
+        # Sin log por pedido (en sockets Unix client_address ni siquiera es una tupla)
+        pass
+
+    def _reply(self, status: int, body: dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        service = self.server.service
+        if url.path == "/status":
+            return self._reply(200, dict(service.status(), address=self.server.address))
+        m = re.fullmatch(r"/jobs/(\d+)", url.path)
+        if not m:
+            return self._reply(404, {"error": f"Ruta desconocida: {url.path}"})
+        try:
+            wait = min(MAX_WAIT_SECONDS, float(parse_qs(url.query).get("wait", ["0"])[0]))
+        except ValueError:
+            return self._reply(400, {"error": "wait debe ser un número de segundos"})
+        job = service.get(int(m[1]), wait)
+        if job is None:
+            return self._reply(404, {"error": f"Trabajo {m[1]} desconocido (o ya descartado)"})
+        self._reply(200, job)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        service = self.server.service
+        if url.path == "/shutdown":
+            self._reply(200, {"stopping": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        if url.path != "/jobs":
+            return self._reply(404, {"error": f"Ruta desconocida: {url.path}"})
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            return self._reply(202, service.submit(body))
+        except ValueError as e:            # JSON inválido o trabajo mal formado
+            return self._reply(400, {"error": str(e)})
+        except RuntimeError as e:
+            return self._reply(503, {"error": str(e)})
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(address: str, service: WarmService):
+    """Servidor HTTP en `address` (unix:/ruta.sock o host:puerto); falla si ya hay un servicio ahí."""
+    kind, target = parse_address(address)
+    if kind == "unix":
+        path = Path(target)
+        if path.exists():
+            if ServiceClient(address, timeout=2).available():
+                raise RuntimeError(f"Ya hay un servicio escuchando en {address}")
+            path.unlink()               # socket huérfano de una corrida anterior
+        path.parent.mkdir(parents=True, exist_ok=True)
+        old = os.umask(0o177)           # solo el usuario dueño puede enviar trabajos
+        try:
+            server = _UnixHTTPServer(str(path), _Handler)
+        finally:
+            os.umask(old)
+    else:
+        server = ThreadingHTTPServer(target, _Handler)
+    server.service = service
+    server.address = address
+    return server
+
+
+def serve(service: WarmService, address: str, on_ready=None):
+    """Calienta los workers y atiende pedidos hasta POST /shutdown (o Ctrl+C)."""
+    server = make_server(address, service)
+    kind, target = parse_address(address)
+    try:
+        service.start()
+        if on_ready is not None:
+            on_ready(service)
+        server.serve_forever()
+    finally:
+        service.stop()
+        server.server_close()
+        if kind == "unix" and os.path.exists(target):
+            os.unlink(target)
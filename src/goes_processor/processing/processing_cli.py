@@ -1,5 +1,10 @@
 import click
 from .bulk_cli import bulk_cmd 
+from .stream_cli import stream_cmd
+from .aggregate_cli import aggregate_cmd
+from .queue_cli import queue_status_cmd
+from .animate_cli import animate_cmd
+from .service_cli import service_group
 
 @click.group(name="processing")
 def processing_group():
@@ -7,3 +12,9 @@ def processing_group():
     pass
 
 processing_group.add_command(bulk_cmd)
+processing_group.add_command(stream_cmd)
+processing_group.add_command(aggregate_cmd)
+processing_group.add_command(queue_status_cmd)
+processing_group.add_command(animate_cmd)
+processing_group.add_command(service_group)
+
@@ -0,0 +1,62 @@
+import json
+import time
+import click
+from pathlib import Path
+
+
+def _duration(seconds):
+    if seconds is None:
+        return "—"
+    seconds = int(seconds)
+    h, rem = divmod(seconds, 3600)
+    return f"{h}h{rem // 60:02d}m" if h else f"{rem // 60}m{rem % 60:02d}s"
+
+
+def _print_status(location, st):
+    c = st["counts"]
+    total = sum(c.values())
+    click.echo(f"[*] Cola {location}: {total} trabajos")
+    click.echo(f"   - pendientes {c['pending']} (reintentando {st['retrying']}), en curso {c['leased']}, "
+               f"hechos {c['done']}, fallidos {c['failed']}")
+    if st["expired_leases"]:
+        click.secho(f"   - {st['expired_leases']} leases vencidas (se reclaman en la próxima toma)", fg="yellow")
+    click.echo(f"   - workers activos: {len(st['workers'])}" + (f" ({', '.join(st['workers'])})" if st['workers'] else ""))
+    rate = st["jobs_per_minute"]
+    window = int(st["window_seconds"] // 60)
+    if rate:
+        avg = f", {st['avg_seconds']:.1f} s/trabajo" if st["avg_seconds"] else ""
+        click.echo(f"   - ritmo (últimos {window} min): {rate:.2f} trabajos/min{avg}")
+    if not st["remaining"]:
+        click.secho("[*] Cola vacía", fg="green")
+    elif rate:
+        click.secho(f"[*] ETA: {_duration(st['eta_seconds'])} para {st['remaining']} trabajos", fg="green")
+    else:
+        click.secho(f"   - sin trabajos terminados en los últimos {window} min: ETA desconocida", fg="yellow")
+    if st["reclaims"]:
+        click.echo(f"   - leases reclamadas (acumulado): {st['reclaims']}")
+    for f in st["recent_failures"]:
+        click.secho(f"   - [FALLIDO] {Path(f['files'][0]).name} ({f['attempts']} intentos): {f['error']}", fg="red")
+
+
+@click.command(name="queue-status")
+@click.option('--queue', 'queue_location', required=True,
+              help="Cola compartida (la misma ruta o esquema://destino que en bulk --enqueue/--worker).")
+@click.option('--window-minutes', default=15, show_default=True, type=click.IntRange(1),
+              help="Ventana para medir el ritmo y estimar la ETA.")
+@click.option('--watch', default=None, type=click.IntRange(1),
+              help="Repetir cada N segundos hasta vaciarse la cola.")
+@click.option('--json', 'as_json', is_flag=True, default=False, help="Salida en JSON.")
+def queue_status_cmd(queue_location, window_minutes, watch, as_json):
+    """Estado de la cola de bulk distribuido: conteos, workers, ritmo y ETA."""
+    from .logic_queue.work_queue import open_queue
+
+    with open_queue(queue_location) as queue:
+        while True:
+            st = queue.status(window_seconds=60.0 * window_minutes)
+            if as_json:
+                click.echo(json.dumps(st, indent=2))
+            else:
+                _print_status(queue_location, st)
+            if not watch or st["remaining"] == 0:
+                break
+            time.sleep(watch)
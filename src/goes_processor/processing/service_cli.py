@@ -0,0 +1,120 @@
+import json
+import signal
+import click
+from .logic_parallel.profile import PROFILES
+from ..telemetry import cli_options, start_from_cli
+
+ADDRESS_HELP = ("unix:/ruta.sock o host:puerto (por defecto: $GOES_PROCESSOR_SERVICE o un socket del usuario "
+                "en el temporal del sistema).")
+
+
+def _parse_limits(values):
+    from .logic_how.registry import get_processor
+
+    limits = {}
+    for value in values:
+        name, sep, count = value.partition("=")
+        if not sep or not count.isdigit() or int(count) < 1:
+            raise click.BadParameter(f"Formato esperado procesador=N, recibido: {value}", param_hint='--limit')
+        try:
+            get_processor(name)
+        except KeyError:
+            raise click.BadParameter(f"Procesador desconocido: {name}", param_hint='--limit') from None
+        limits[name] = int(count)
+    return limits
+
+
+@click.group(name="service")
+def service_group():
+    """Servicio residente con workers calientes (satpy, configs y LUTs cargados una vez)."""
+    pass
+
+
+@service_group.command(name="run")
+@click.option('--address', default=None, help=f"Dónde escuchar: {ADDRESS_HELP}")
+@click.option('--workers', default=1, show_default=True, type=click.IntRange(1),
+              help="Procesos calientes: trabajos en curso a la vez.")
+@click.option('--limit', 'limits', multiple=True,
+              help="Tope de trabajos en curso por procesador, p.ej. truecolor=1 (repetible).")
+@click.option('--dask-threads', default=None, type=click.IntRange(1),
+              help="Hilos de dask por worker (por defecto: núcleos / workers).")
+@click.option('--processing-profile', 'profile_name', default='default', show_default=True,
+              type=click.Choice(['auto', *PROFILES]), help="Perfil de chunks/hilos/memoria de los workers.")
+@click.option('--chunk-mb', default=None, type=click.IntRange(1))
+@click.option('--memory-limit-mb', default=None, type=click.IntRange(64))
+@click.option('--spill-dir', default=None, type=click.Path(file_okay=False))
+@cli_options
+def service_run(address, workers, limits, dask_threads, profile_name, chunk_mb, memory_limit_mb, spill_dir,
+                verbose, metrics_jsonl, metrics_prom, profile_files, profile_dir):
+    """Atiende trabajos (bulk --via-daemon, ingesta) hasta `service stop` o Ctrl+C."""
+    from .logic_parallel.profile import resolve_profile
+    from .logic_service.client import default_address
+    from .logic_service.service import WarmService, serve
+
+    address = address or default_address()
+    limits = _parse_limits(limits)
+    start_from_cli(metrics_jsonl, metrics_prom, profile_files, profile_dir, verbose)
+    profile = resolve_profile(profile_name, workers, threads=dask_threads, chunk_mb=chunk_mb,
+                              memory_limit_mb=memory_limit_mb, spill_dir=spill_dir)
+    service = WarmService(workers, limits, dask_threads=profile.threads, profile=profile)
+    click.echo(f"[*] Perfil: {profile.describe()}")
+    click.echo(f"[*] Calentando {workers} worker(s) (satpy, configuraciones y LUTs)...")
+
+    def on_ready(svc):
+        topes = ", ".join(f"{k}={v}" for k, v in svc.limits.items()) or "ninguno"
+        click.secho(f"[*] Servicio listo en {address} en {svc.warm_seconds:.1f} s "
+                    f"({svc.workers} workers, {svc.dask_threads} hilos dask c/u, topes: {topes})", fg="green")
+
+    # SIGTERM (systemd, kill) se trata como Ctrl+C: se termina lo que está en curso
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        serve(service, address, on_ready=on_ready)
+    except KeyboardInterrupt:
+        pass
+    except (RuntimeError, OSError, ValueError) as e:
+        raise click.ClickException(str(e)) from e
+    st = service.status()
+    click.echo(f"[*] Servicio detenido: {st['done']} hechos, {st['failed']} fallidos, {st['cancelled']} cancelados")
+
+
+@service_group.command(name="status")
+@click.option('--address', default=None, help=ADDRESS_HELP)
+@click.option('--json', 'as_json', is_flag=True, default=False, help="Salida en JSON.")
+def service_status(address, as_json):
+    """Estado del servicio: workers, topes, cola por prioridad y tiempos recientes."""
+    from .logic_service.client import ServiceClient, ServiceError
+
+    client = ServiceClient(address)
+    try:
+        st = client.status()
+    except (OSError, ServiceError) as e:
+        raise click.ClickException(f"No responde el servicio en {client.address}: {e}") from e
+    if as_json:
+        click.echo(json.dumps(st, indent=2))
+        return
+    click.echo(f"[*] Servicio {st['address']} (pid {st['pid']}), arriba hace {st['uptime_seconds'] / 60:.0f} min "
+               f"(calentamiento {st['warm_seconds']:.1f} s)")
+    topes = ", ".join(f"{k}={v}" for k, v in st["limits"].items()) or "ninguno"
+    click.echo(f"   - workers {st['workers']} ({st['dask_threads']} hilos dask c/u), topes: {topes}")
+    running = ", ".join(f"{k}: {v}" for k, v in st["running"].items()) or "nada"
+    by_priority = ", ".join(f"p{k}: {v}" for k, v in sorted(st["queued_by_priority"].items(), reverse=True))
+    click.echo(f"   - en curso: {running}; en cola {st['queued']}" + (f" ({by_priority})" if by_priority else ""))
+    click.echo(f"   - hechos {st['done']}, fallidos {st['failed']}, cancelados {st['cancelled']}"
+               + (f", pool recreado {st['pool_restarts']} veces" if st["pool_restarts"] else ""))
+    if st["avg_seconds"] is not None:
+        click.echo(f"   - recientes: {st['avg_seconds']:.2f} s de proceso, {st['avg_queue_seconds']:.2f} s en cola "
+                   f"por trabajo")
+
+
+@service_group.command(name="stop")
+@click.option('--address', default=None, help=ADDRESS_HELP)
+def service_stop(address):
+    """Detiene el servicio: cancela lo encolado y termina lo que está en curso."""
+    from .logic_service.client import ServiceClient, ServiceError
+
+    client = ServiceClient(address)
+    try:
+        client.shutdown()
+    except (OSError, ServiceError) as e:
+        raise click.ClickException(f"No responde el servicio en {client.address}: {e}") from e
+    click.secho(f"[*] Pedido de apagado enviado a {client.address}", fg="green")
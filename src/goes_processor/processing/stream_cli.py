@@ -0,0 +1,39 @@
+import click
+from .logic_output.formats import FORMATS
+from ..telemetry import cli_options, start_from_cli
+
+@click.command(name="stream")
+@click.option('--satellite', default="19", type=click.Choice(['16', '17', '18', '19']), help="Número del satélite (ej: 19)")
+@click.option('--product', required=True, help="Ej: ABI-L2-LSTF o ABI-L2-MCMIPF")
+@click.option('--year', required=True, help="Año YYYY")
+@click.option('--day', required=True, help="Día JJJ")
+@click.option('--hour', default="all", help="Hora HH o all")
+@click.option('--minute', default="all", help="Minuto MM o all")
+@click.option('--output-dir', required=True, type=click.Path())
+@click.option('--format', default="both", type=click.Choice(FORMATS))
+@click.option('--raw-dir', default=None, type=click.Path(),
+              help="Si se indica, los NetCDF se conservan aquí; si no, se descartan tras procesarlos.")
+@click.option('--spool-dir', default=None, type=click.Path(),
+              help="Spool temporal (por defecto /dev/shm/goes_spool si existe).")
+@click.option('--buffer-files', default=2, show_default=True, type=click.IntRange(1),
+              help="Archivos descargados esperando proceso (contrapresión).")
+@click.option('--buffer-mb', default=2048, show_default=True, type=click.IntRange(1),
+              help="Tope de MB en el spool.")
+@click.option('--download-workers', default=1, show_default=True, type=click.IntRange(1))
+@cli_options
+def stream_cmd(satellite, product, year, day, hour, minute, output_dir, format, raw_dir, spool_dir,
+               buffer_files, buffer_mb, download_workers, verbose, metrics_jsonl, metrics_prom, profile_files,
+               profile_dir):
+    """Descarga y procesa en streaming, sin esperar a bajar todo a data/raw."""
+    start_from_cli(metrics_jsonl, metrics_prom, profile_files, profile_dir, verbose)
+    from ..ingest.stream import stream_process
+
+    results = stream_process(product, year, day.zfill(3), hour, minute, satellite=satellite,
+                             output_dir=output_dir, format=format, raw_dir=raw_dir,
+                             spool_dir=spool_dir, buffer_files=buffer_files, buffer_mb=buffer_mb,
+                             download_workers=download_workers)
+    errors = [r for r in results if not r.get("ok")]
+    color = "green" if not errors else "yellow"
+    click.secho(f"[*] Procesados OK: {len(results) - len(errors)}/{len(results)}  Errores: {len(errors)}", fg=color)
+    for err in errors:
+        click.secho(f"   - {err['file']}: {err['error']}", fg="red")
@@ -1,86 +1,33 @@
 # src/goes19_processor/scheduler.py
 
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
-from apscheduler.triggers.cron import CronTrigger
-import subprocess
-import datetime
+"""
+Punto de entrada histórico del planificador.
+
+Antes usaba APScheduler para lanzar `goes19 download` / `goes19 process` como
+subprocesos a intervalos fijos. Ahora arranca el demonio de ingesta en proceso
+(goes_processor.ingest.daemon): escanea el prefijo S3 de la hora actual,
+encola solo las claves nuevas y descarga/procesa con workers residentes.
+Equivale a `goes-processor ingest run`.
+
+Si $GOES_PROCESSOR_SERVICE apunta a un servicio residente (`processing
+service run`), el procesamiento se le envía en lugar de cargar satpy acá
+(equivale a `ingest run --via-daemon`).
+"""
+
 import logging
+import os
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from .ingest.daemon import IngestDaemon
+from .ingest.ingest_cli import DEFAULT_PRODUCTS
+from .processing.logic_service.client import ENV_ADDRESS
 
-def run_download_and_process(product: str, schedule_type: str, interval_minutes: int = None, cron_expr: str = None):
-    """Run the CLI for download and process"""
-    def job():
-        now = datetime.datetime.now()
-        year = now.strftime("%Y")
-        day = now.strftime("%j")
-        hour = now.strftime("%H")
-        
-        cmd_download = [
-            "goes19", "download",
-            "--product", product,
-            "--year", year,
-            "--day", day,
-            "--hour", hour,
-            # Add --all, --band, etc. if needed for this product
-        ]
-        logging.info(f"Running download for {product}: {cmd_download}")
-        subprocess.call(cmd_download)
-        
-        # Assume the downloaded file path is known or latest in data/raw
-        # For simplicity, process the latest downloaded (adjust as needed)
-        cmd_process = [
-            "goes19", "process",
-            "--file", "path/to/latest/file.nc",  # Replace with logic to find latest file
-            "--product", product.lower().replace("-", "_"),
-        ]
-        logging.info(f"Running process for {product}: {cmd_process}")
-        subprocess.call(cmd_process)
-    
-    return job
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 if __name__ == "__main__":
-    scheduler = BackgroundScheduler()
-    
-    # Example schedules
-    # LST every 1 hour
-    scheduler.add_job(
-        run_download_and_process("ABI-L2-LSTF"),
-        IntervalTrigger(minutes=60)  # every 1 hour
-    )
-    
-    # True Color every 10 minutes
-    scheduler.add_job(
-        run_download_and_process("ABI-L1b-RadF"),  # Adjust for true_color composites
-        IntervalTrigger(minutes=10)
-    )
-    
-    # Fire detection every 5 minutes (example)
-    scheduler.add_job(
-        run_download_and_process("ABI-L2-FDC"),
-        IntervalTrigger(minutes=5)
-    )
-    
-    # Lightning every 1 minute (example)
-    scheduler.add_job(
-        run_download_and_process("GLM-L2-LCFA"),
-        IntervalTrigger(minutes=1)
-    )
-    
-    # Or use cron for specific times, e.g., LST at every hour on the hour
-    # scheduler.add_job(
-    #     run_download_and_process("ABI-L2-LSTF"),
-    #     CronTrigger(hour='*', minute='0')
-    # )
-    
-    scheduler.start()
+    # Intervalos de escaneo (segundos) por producto:
+    # LST cada 60 s, True Color (MCMIPF) y fuegos (FDC) cada 30 s, rayos (GLM) cada 10 s
+    daemon = IngestDaemon(dict(DEFAULT_PRODUCTS), service=os.environ.get(ENV_ADDRESS))
+    daemon.prime()
     logging.info("Scheduler started. Press Ctrl+C to exit.")
-    
-    try:
-        import time
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        scheduler.shutdown()
-        logging.info("Scheduler stopped.")
+    daemon.run_forever()
+    logging.info("Scheduler stopped.")
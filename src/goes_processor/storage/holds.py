@@ -0,0 +1,124 @@
+# src/goes_processor/storage/holds.py
+
+"""
+Marcas de "archivo en uso" que respeta el desalojo por cuota (storage/quota.py).
+
+FileHold registra los archivos en este proceso y además toma un flock
+compartido sobre cada uno: otro proceso (el hook del downloader, `storage
+enforce`) detecta que están en uso intentando un flock exclusivo sin
+bloquear. Se usa alrededor de cada process_file / escaneo y, en el demonio
+de ingesta, desde que termina la descarga hasta que la imagen queda escrita.
+
+El desalojo (evicting) mantiene ese flock exclusivo hasta después del
+unlink: un FileHold que llega en el medio espera y, al obtener su flock,
+ve que el archivo ya no es el que abrió (no queda marcado un archivo
+borrado). Así no hay ventana entre "no está en uso" y el borrado.
+"""
+
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: solo la marca en proceso
+    fcntl = None
+
+_HELD = Counter()
+_LOCK = threading.Lock()
+
+
+def _key(path) -> str:
+    return os.path.abspath(str(path))
+
+
+def _lock_shared(key: str):
+    """fd con flock compartido sobre `key`, o None si no existe (o se desalojó mientras se esperaba)."""
+    try:
+        fd = os.open(key, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        # Si el desalojo tenía el flock exclusivo, el archivo abierto ya no es el de la ruta
+        if os.fstat(fd).st_ino == os.stat(key).st_ino:
+            return fd
+    except OSError:
+        pass
+    os.close(fd)
+    return None
+
+
+class FileHold:
+    """Context manager (o acquire/release) que marca `paths` como en uso."""
+
+    def __init__(self, paths):
+        self.keys = [_key(p) for p in paths]
+        self._fds = []
+
+    def acquire(self):
+        with _LOCK:
+            _HELD.update(self.keys)
+        if fcntl is not None:
+            for key in self.keys:
+                fd = _lock_shared(key)
+                if fd is not None:
+                    self._fds.append(fd)
+        return self
+
+    def release(self):
+        for fd in self._fds:
+            os.close(fd)  # cerrar el descriptor libera el flock
+        self._fds = []
+        with _LOCK:
+            _HELD.subtract(self.keys)
+            for key in self.keys:
+                if _HELD[key] <= 0:
+                    del _HELD[key]
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def hold(paths) -> FileHold:
+    return FileHold([paths] if isinstance(paths, (str, Path)) else paths)
+
+
+def held_here(path) -> bool:
+    with _LOCK:
+        return _HELD.get(_key(path), 0) > 0
+
+
+@contextmanager
+def evicting(path):
+    """
+    Para el desalojo: True si el archivo no está en uso, y en ese caso el
+    flock exclusivo se mantiene hasta salir del bloque (borrar adentro).
+    False si está marcado en este proceso o tiene un flock de otro.
+    """
+    if held_here(path):
+        yield False
+        return
+    if fcntl is None:
+        yield True
+        return
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        yield True                  # ya no existe: nada que proteger
+        return
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        # Un FileHold de este proceso pudo marcarlo entre el primer chequeo y el flock
+        yield not held_here(path)
+    finally:
+        os.close(fd)
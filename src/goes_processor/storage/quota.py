@@ -0,0 +1,428 @@
+# src/goes_processor/storage/quota.py
+
+"""
+Cuotas de disco con desalojo LRU para data/raw y el resample_cache.
+
+Cada carpeta administrada tiene un ledger SQLite (.goes_storage.sqlite en su
+raíz) con la política (cuota, marca baja, edad máxima/mínima, pinning) y un
+registro de ítems con tamaño y último uso. El uso total se mantiene con
+triggers al dar de alta/baja ítems: consultar la cuota es leer una fila,
+sin recorrer el árbol.
+
+- record(): alta de archivos concretos (hook del downloader y de las LUTs).
+- refresh(): sincroniza con el disco re-listando solo las carpetas cuyo
+  mtime cambió (como el índice del crawler).
+- enforce(): desaloja por último uso hasta bajar a la marca baja (y todo lo
+  más viejo que max_age), salteando lo que no se puede borrar:
+    * en uso (storage.holds: marca en proceso o flock de otro proceso),
+    * en una cola de trabajo pendiente o en curso (bulk --enqueue),
+    * recién llegado (min_age: aún no encolado ni procesado),
+    * con pinning: archivos de entrada cuyos productos todavía no están al
+      día según el manifiesto de salida (pin_output).
+
+Un ítem es un archivo, o una carpeta "bundle" completa (LUT con meta.json,
+caches .zarr de satpy) que se borra entera.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .holds import evicting
+
+LEDGER_NAME = ".goes_storage.sqlite"
+SCHEMA_VERSION = 1
+
+_UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS items (
+    path      TEXT PRIMARY KEY,
+    dir       TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    bundle    INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS items_lru ON items (last_used, path);
+CREATE INDEX IF NOT EXISTS items_dir ON items (dir);
+CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime REAL);
+CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 1), bytes INTEGER, items INTEGER);
+INSERT OR IGNORE INTO totals VALUES (1, 0, 0);
+CREATE TRIGGER IF NOT EXISTS items_ins AFTER INSERT ON items BEGIN
+    UPDATE totals SET bytes = bytes + NEW.size, items = items + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS items_del AFTER DELETE ON items BEGIN
+    UPDATE totals SET bytes = bytes - OLD.size, items = items - 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS items_upd AFTER UPDATE OF size ON items BEGIN
+    UPDATE totals SET bytes = bytes + NEW.size - OLD.size WHERE id = 1;
+END;
+"""
+
+_UPSERT = ("INSERT INTO items VALUES (?,?,?,?,?) ON CONFLICT (path) DO UPDATE SET size = excluded.size, "
+           "last_used = MAX(items.last_used, excluded.last_used), bundle = excluded.bundle")
+
+# Un solo desalojo a la vez por carpeta en este proceso (los hilos del downloader comparten el hook)
+_ENFORCING = {}
+_ENFORCING_LOCK = threading.Lock()
+# Tras un desalojo que no liberó nada (todo en uso/encolado/pinned) el hook espera antes de reintentar
+_FUTILE_UNTIL = {}
+FUTILE_BACKOFF_SECONDS = 60.0
+
+
+def parse_size(text) -> int:
+    """'500G', '1.5T', '800M', '1024' (bytes) → bytes."""
+    text = str(text).strip().upper().removesuffix("B").removesuffix("I")
+    if text and text[-1] in _UNITS:
+        return int(float(text[:-1]) * _UNITS[text[-1]])
+    return int(float(text))
+
+
+def format_size(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(n) < 1024 or unit == "TB":
+            return f"{n:.1f} {unit}" if unit != "B" else f"{int(n)} B"
+        n /= 1024
+
+
+@dataclass
+class QuotaPolicy:
+    """Política de una carpeta administrada (se guarda en el ledger)."""
+    max_bytes: Optional[int] = None
+    low_watermark: float = 0.9        # al desalojar se baja hasta esta fracción de la cuota
+    max_age_days: Optional[float] = None
+    min_age_minutes: float = 10.0     # nunca desalojar lo llegado hace menos
+    pin_output: Optional[str] = None  # salida cuyos productos deben estar al día antes de borrar la entrada
+    pin_format: str = "both"
+    queues: List[str] = field(default_factory=list)
+
+
+@dataclass
+class EvictionReport:
+    usage_before: int = 0
+    usage_after: int = 0
+    evicted: List[tuple] = field(default_factory=list)   # (ruta, bytes)
+    skipped: dict = field(default_factory=lambda: {"in_use": 0, "queued": 0, "pinned": 0, "young": 0})
+
+    @property
+    def freed(self) -> int:
+        return sum(size for _, size in self.evicted)
+
+
+def _is_bundle(path: Path) -> bool:
+    return path.name.endswith(".zarr") or (path / "meta.json").exists()
+
+
+def _ignored(name: str) -> bool:
+    # Ledger, índices, manifiestos y escrituras a medio terminar no se administran
+    return name.startswith(".") or name.endswith((".part", ".tmp"))
+
+
+def _bundle_size(path: Path) -> int:
+    total = 0
+    for dirpath, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class StorageLedger:
+    """Ledger SQLite de una carpeta administrada (p.ej. data/raw o resample_cache)."""
+
+    def __init__(self, root, clock=time.time):
+        self.root = Path(root).resolve()
+        self.db_path = self.root / LEDGER_NAME
+        self.clock = clock
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        # Journal clásico, no WAL: data/raw suele estar en un filesystem compartido entre nodos
+        # (ver logic_queue/work_queue.py)
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        self.conn.executescript(_SCHEMA)
+        self.conn.execute("INSERT OR IGNORE INTO meta VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- POLÍTICA ---
+    @property
+    def policy(self) -> QuotaPolicy:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'policy'").fetchone()
+        return QuotaPolicy(**json.loads(row[0])) if row else QuotaPolicy()
+
+    def set_policy(self, policy: QuotaPolicy):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('policy', ?)", (json.dumps(asdict(policy)),))
+
+    # --- USO ---
+    def usage(self) -> tuple:
+        """(bytes, ítems) según el ledger: una fila, sin tocar el disco."""
+        return tuple(self.conn.execute("SELECT bytes, items FROM totals WHERE id = 1").fetchone())
+
+    def over_quota(self) -> bool:
+        policy = self.policy
+        if policy.max_age_days is not None:
+            oldest = self.conn.execute("SELECT MIN(last_used) FROM items").fetchone()[0]
+            if oldest is not None and oldest < self.clock() - policy.max_age_days * 86400:
+                return True
+        return policy.max_bytes is not None and self.usage()[0] > policy.max_bytes
+
+    def _row(self, path: Path, st=None) -> tuple:
+        bundle = path.is_dir()
+        st = st or path.stat()
+        size = _bundle_size(path) if bundle else st.st_size
+        return (str(path), str(path.parent), size, max(st.st_mtime, st.st_atime), int(bundle))
+
+    def record(self, paths: Iterable, used: float = None) -> int:
+        """Alta/actualización de archivos o bundles concretos, con último uso = ahora (o `used`)."""
+        used = used or self.clock()
+        rows = []
+        for p in paths:
+            p = Path(p).resolve()
+            try:
+                row = self._row(p)
+            except OSError:
+                continue
+            rows.append(row[:3] + (max(row[3], used),) + row[4:])
+        with self.conn:
+            self.conn.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def refresh(self) -> int:
+        """
+        Sincroniza con el disco re-listando solo las carpetas cuyo mtime cambió
+        (altas, bajas y tamaños). Devuelve la cantidad de carpetas re-listadas.
+        """
+        known = dict(self.conn.execute("SELECT path, mtime FROM dirs"))
+        seen = set()
+        rescanned = 0
+        stack = [self.root]
+        with self.conn:
+            while stack:
+                directory = stack.pop()
+                try:
+                    dir_mtime = directory.stat().st_mtime
+                    entries = list(os.scandir(directory))
+                except OSError:
+                    continue
+                key = str(directory)
+                seen.add(key)
+                changed = known.get(key) != dir_mtime
+
+                items = []
+                for entry in entries:
+                    if _ignored(entry.name):
+                        continue
+                    path = Path(entry.path)
+                    if entry.is_dir(follow_symlinks=False):
+                        if _is_bundle(path):
+                            items.append(path)
+                        else:
+                            stack.append(path)
+                    elif changed and entry.is_file(follow_symlinks=False):
+                        items.append(path)
+
+                if not changed:
+                    continue
+                rescanned += 1
+                rows = []
+                for path in items:
+                    try:
+                        rows.append(self._row(path))
+                    except OSError:
+                        continue
+                present = {r[0] for r in rows}
+                stale = [(p,) for (p,) in self.conn.execute("SELECT path FROM items WHERE dir = ?", (key,))
+                         if p not in present]
+                self.conn.executemany("DELETE FROM items WHERE path = ?", stale)
+                self.conn.executemany(_UPSERT, rows)
+                self.conn.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?)", (key, dir_mtime))
+
+            for gone in set(known) - seen:
+                self.conn.execute("DELETE FROM items WHERE dir = ?", (gone,))
+                self.conn.execute("DELETE FROM dirs WHERE path = ?", (gone,))
+        return rescanned
+
+    # --- DESALOJO ---
+    def _candidates(self, batch: int = 500):
+        """Ítems del menos al más recientemente usado (paginado por clave, tolera bajas en el medio)."""
+        last = (-1.0, "")
+        while True:
+            rows = self.conn.execute(
+                "SELECT path, size, last_used, bundle FROM items WHERE (last_used, path) > (?, ?) "
+                "ORDER BY last_used, path LIMIT ?", (*last, batch)).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last = (rows[-1][2], rows[-1][0])
+
+    def _queued(self, policy: QuotaPolicy) -> set:
+        if not policy.queues:
+            return set()
+        from ..processing.logic_queue.work_queue import open_queue
+
+        queued = set()
+        for location in policy.queues:
+            try:
+                with open_queue(location) as queue:
+                    queued |= queue.queued_files()
+            except (sqlite3.Error, OSError, ValueError) as e:
+                # Sin poder consultar la cola no se puede saber qué está encolado: no se desaloja nada
+                raise RuntimeError(f"Cola {location} inaccesible: {e}") from e
+        return queued
+
+    def _pinned(self, path: Path, policy: QuotaPolicy) -> bool:
+        """Entrada cuyo producto registrado todavía no está al día en pin_output."""
+        if policy.pin_output is None:
+            return False
+        from ..processing.logic_crawler.index import parse_filename
+        from ..processing.logic_how.registry import processor_for
+        from ..processing.logic_output.job_manifest import stale_reason
+
+        info = parse_filename(path.name)
+        proc = processor_for(info["product"]) if info else None
+        if proc is None:
+            return False
+        try:
+            spec = proc.job_spec(path, self.root, Path(policy.pin_output), policy.pin_format)
+            return stale_reason(spec) is not None
+        except Exception:
+            return True  # ante la duda, se conserva
+
+    @staticmethod
+    def _remove(p: Path, remove, dry_run: bool) -> bool:
+        if dry_run:
+            return True
+        try:
+            remove(p)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"   [!] No se pudo borrar {p}: {e}")
+            return False
+        return True
+
+    def enforce(self, dry_run: bool = False) -> EvictionReport:
+        """Desaloja por LRU hasta cumplir la política; ver el docstring del módulo."""
+        policy = self.policy
+        now = self.clock()
+        usage = self.usage()[0]
+        report = EvictionReport(usage_before=usage, usage_after=usage)
+        target = None
+        if policy.max_bytes is not None and usage > policy.max_bytes:
+            target = int(policy.max_bytes * policy.low_watermark)
+        cutoff = now - policy.max_age_days * 86400 if policy.max_age_days is not None else None
+        if target is None and cutoff is None:
+            return report
+
+        queued = self._queued(policy)
+        young = now - policy.min_age_minutes * 60
+        evicted_raw = []
+        for path, size, last_used, bundle in self._candidates():
+            over = target is not None and usage > target
+            expired = cutoff is not None and last_used < cutoff
+            if not (over or expired):
+                break
+            if last_used >= young:
+                # Orden por último uso: todo lo que sigue también es reciente
+                report.skipped["young"] += 1
+                break
+            p = Path(path)
+            if path in queued:
+                report.skipped["queued"] += 1
+                continue
+            if not bundle and self._pinned(p, policy):
+                report.skipped["pinned"] += 1
+                continue
+            if bundle:
+                removed = self._remove(p, shutil.rmtree, dry_run)
+            else:
+                # El flock exclusivo se mantiene hasta después del unlink
+                with evicting(p) as free:
+                    if not free:
+                        report.skipped["in_use"] += 1
+                        continue
+                    removed = self._remove(p, Path.unlink, dry_run)
+            if not removed:
+                continue
+            if not dry_run:
+                with self.conn:
+                    self.conn.execute("DELETE FROM items WHERE path = ?", (path,))
+                if not bundle:
+                    evicted_raw.append(p)
+            usage -= size
+            report.evicted.append((path, size))
+
+        if evicted_raw:
+            _forget_downloads(self.root, evicted_raw)
+        report.usage_after = usage
+        return report
+
+
+def _forget_downloads(root: Path, paths: List[Path]):
+    """
+    Baja de los archivos desalojados en el índice del crawler. Los manifiestos
+    de descarga no se tocan (los escribe el downloader en paralelo): ante un
+    archivo ausente is_valid() ya da False y se vuelve a bajar si se pide.
+    """
+    from ..processing.logic_crawler.index import INDEX_NAME, remove_from_index
+
+    if (root / INDEX_NAME).exists():
+        remove_from_index(root, paths)
+
+
+def is_managed(root) -> bool:
+    return (Path(root) / LEDGER_NAME).exists()
+
+
+def notify(root, paths) -> Optional[EvictionReport]:
+    """
+    Hook para quien escribe en una carpeta administrada (downloader, LUTs):
+    registra `paths` y, si se pasó la cuota, desaloja. Sin ledger (carpeta sin
+    cuota configurada) no hace nada más que un stat.
+    """
+    root = Path(root)
+    if not is_managed(root):
+        return None
+    key = str(root.resolve())
+    with _ENFORCING_LOCK:
+        lock = _ENFORCING.setdefault(key, threading.Lock())
+    try:
+        with StorageLedger(root) as ledger:
+            ledger.record(paths)
+            if time.monotonic() < _FUTILE_UNTIL.get(key, 0.0) or not ledger.over_quota():
+                return None
+            if not lock.acquire(blocking=False):
+                return None
+            try:
+                report = ledger.enforce()
+            finally:
+                lock.release()
+        if not report.evicted:
+            _FUTILE_UNTIL[key] = time.monotonic() + FUTILE_BACKOFF_SECONDS
+    except (sqlite3.Error, RuntimeError) as e:
+        print(f"[!] Cuota de {root}: {e}")
+        return None
+    if not report.evicted:
+        print(f"[!] Cuota de {root} excedida ({format_size(report.usage_after)}) y nada desalojable: "
+              f"{', '.join(f'{k} {v}' for k, v in report.skipped.items() if v)}")
+    else:
+        print(f"   [*] Cuota {root}: desalojados {len(report.evicted)} ítems ({format_size(report.freed)}), "
+              f"uso {format_size(report.usage_after)}")
+    return report
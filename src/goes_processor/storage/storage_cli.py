@@ -0,0 +1,111 @@
+# src/goes_processor/storage/storage_cli.py
+
+import click
+from datetime import datetime
+from pathlib import Path
+
+
+@click.group(name="storage")
+def storage():
+    """Cuotas de disco y desalojo LRU de data/raw y del resample_cache."""
+    pass
+
+
+@storage.command(name="set-quota")
+@click.argument('directory', type=click.Path(exists=True, file_okay=False))
+@click.option('--max-size', default=None, help="Cuota (p.ej. 500G, 1.5T, 800M). Sin valor: sin tope de tamaño.")
+@click.option('--low-watermark', default=0.9, show_default=True, type=click.FloatRange(0.1, 1.0),
+              help="Al pasarse de la cuota se desaloja hasta esta fracción (evita desalojar en cada archivo).")
+@click.option('--max-age-days', default=None, type=click.FloatRange(0, min_open=True),
+              help="Además, desalojar todo lo no usado en más de N días.")
+@click.option('--min-age-minutes', default=10.0, show_default=True, type=click.FloatRange(0),
+              help="Nunca desalojar lo llegado hace menos (todavía sin encolar ni procesar).")
+@click.option('--pin-output', default=None, type=click.Path(file_okay=False),
+              help="Conservar las entradas cuyos productos aún no están al día en esta carpeta de salida.")
+@click.option('--pin-format', default="both", show_default=True,
+              help="Formato con el que se comprueban los productos de --pin-output.")
+@click.option('--protect-queue', 'queues', multiple=True,
+              help="Cola de bulk distribuido: no desalojar sus archivos pendientes o en curso (repetible).")
+def set_quota_cmd(directory, max_size, low_watermark, max_age_days, min_age_minutes, pin_output, pin_format, queues):
+    """Configura la cuota de DIRECTORY (crea su ledger y lo sincroniza con el disco)."""
+    from .quota import QuotaPolicy, StorageLedger, format_size, parse_size
+
+    try:
+        max_bytes = parse_size(max_size) if max_size else None
+    except ValueError:
+        raise click.BadParameter(f"Tamaño no reconocido: {max_size}", param_hint='--max-size') from None
+    policy = QuotaPolicy(max_bytes=max_bytes, low_watermark=low_watermark, max_age_days=max_age_days,
+                         min_age_minutes=min_age_minutes,
+                         pin_output=str(Path(pin_output).resolve()) if pin_output else None,
+                         pin_format=pin_format, queues=[str(q) for q in queues])
+    with StorageLedger(directory) as ledger:
+        ledger.set_policy(policy)
+        rescanned = ledger.refresh()
+        used, items = ledger.usage()
+    quota = format_size(max_bytes) if max_bytes else "sin tope"
+    click.secho(f"[*] {directory}: cuota {quota}, uso {format_size(used)} en {items} ítems "
+                f"({rescanned} carpetas sincronizadas)", fg="green")
+    if max_bytes and used > max_bytes:
+        click.secho("[!] Uso por encima de la cuota: `storage enforce` (o la próxima descarga) desaloja.", fg="yellow")
+
+
+@storage.command(name="status")
+@click.argument('directories', nargs=-1, required=True, type=click.Path(exists=True, file_okay=False))
+@click.option('--refresh/--no-refresh', default=False, show_default=True,
+              help="Sincronizar antes con el disco (solo carpetas modificadas).")
+def status_cmd(directories, refresh):
+    """Uso, cuota y ítems más antiguos de cada carpeta administrada."""
+    from .quota import StorageLedger, format_size, is_managed
+
+    for directory in directories:
+        if not is_managed(directory):
+            click.secho(f"[!] {directory}: sin cuota configurada (storage set-quota)", fg="yellow")
+            continue
+        with StorageLedger(directory) as ledger:
+            if refresh:
+                ledger.refresh()
+            policy = ledger.policy
+            used, items = ledger.usage()
+            oldest = ledger.conn.execute("SELECT MIN(last_used) FROM items").fetchone()[0]
+        quota = format_size(policy.max_bytes) if policy.max_bytes else "sin tope"
+        pct = f" ({100 * used / policy.max_bytes:.0f} %)" if policy.max_bytes else ""
+        color = "yellow" if policy.max_bytes and used > policy.max_bytes else "green"
+        click.secho(f"[*] {directory}: {format_size(used)}{pct} de {quota}, {items} ítems", fg=color)
+        if oldest:
+            click.echo(f"   - último uso más antiguo: {datetime.fromtimestamp(oldest):%Y-%m-%d %H:%M}")
+        if policy.max_age_days:
+            click.echo(f"   - edad máxima: {policy.max_age_days:g} días")
+        if policy.pin_output:
+            click.echo(f"   - pinning: productos al día en {policy.pin_output} ({policy.pin_format})")
+        for q in policy.queues:
+            click.echo(f"   - protege la cola: {q}")
+
+
+@storage.command(name="enforce")
+@click.argument('directories', nargs=-1, required=True, type=click.Path(exists=True, file_okay=False))
+@click.option('--dry-run', is_flag=True, default=False, help="Solo informar qué se desalojaría.")
+@click.option('--verbose', is_flag=True, default=False, help="Listar cada ítem desalojado.")
+def enforce_cmd(directories, dry_run, verbose):
+    """Sincroniza (incremental) y desaloja por LRU hasta cumplir la cuota de cada carpeta."""
+    from .quota import StorageLedger, format_size, is_managed
+
+    for directory in directories:
+        if not is_managed(directory):
+            click.secho(f"[!] {directory}: sin cuota configurada (storage set-quota)", fg="yellow")
+            continue
+        with StorageLedger(directory) as ledger:
+            ledger.refresh()
+            try:
+                report = ledger.enforce(dry_run=dry_run)
+            except RuntimeError as e:
+                click.secho(f"[!] {directory}: {e}; no se desaloja nada", fg="red")
+                continue
+        label = "[dry-run] se desalojarían" if dry_run else "desalojados"
+        click.secho(f"[*] {directory}: {label} {len(report.evicted)} ítems ({format_size(report.freed)}); "
+                    f"uso {format_size(report.usage_before)} → {format_size(report.usage_after)}", fg="green")
+        skipped = ", ".join(f"{k} {v}" for k, v in report.skipped.items() if v)
+        if skipped:
+            click.echo(f"   - conservados: {skipped}")
+        if verbose:
+            for path, size in report.evicted:
+                click.echo(f"   - {path} ({format_size(size)})")
@@ -0,0 +1,555 @@
+# src/goes_processor/telemetry.py
+
+"""
+Instrumentación por etapas (spans) del camino caliente.
+
+    with span("download.transfer", file=name) as s:
+        ...
+        s.add_bytes(n)
+
+Cada span registra duración, bytes, pico de RSS mientras estuvo abierto y
+las etiquetas de su span padre (p.ej. `file`), y se emite como una línea JSON.
+Al cerrar la sesión se agregan las líneas de la corrida (también las de los
+workers del pool, que escriben al mismo archivo) en un textfile de Prometheus
+para el node_exporter.
+
+Sin configure() el layer está apagado: span() devuelve un contexto nulo
+compartido, así que el costo es una comparación por llamada.
+
+Etapas: download.list / download.transfer / download.verify y
+process.load / process.resample / process.compute / process.encode /
+process.write. Los pipelines computan, remuestrean, codifican y escriben en
+pasadas de dask (span process.pass, tiempo de reloj); dentro de cada pasada
+stage_task_timer() atribuye el tiempo de cada tarea a su etapa según el
+nombre de la tarea, y esos registros llevan attributed=True (segundos de
+tarea sumados entre hilos, no de reloj). El span process.graph es solo el
+armado perezoso del grafo: el cómputo y la codificación ocurren después,
+dentro de process.pass.
+
+El progreso de los pipelines va por logging (logger `goes_processor`):
+con sesión, cada línea queda en el mismo JSON lines como evento "log" con
+las etiquetas del span abierto; en consola solo se ven las advertencias,
+salvo con -v/--verbose (o GOES_VERBOSE=1), que muestra también el progreso.
+
+--profile corre cProfile en el hilo que procesa el archivo (armado del
+grafo, E/S, cierre), que no ve las tareas ejecutadas por los hilos del pool
+de dask; para esas se agrega un resumen por tipo de tarea (callbacks de
+dask, segundos sumados entre hilos).
+"""
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import resource
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+# Sesión activa en este proceso (None = instrumentación apagada)
+_SESSION = None
+_LOCAL = threading.local()
+
+STAGES = (
+    "download.list", "download.transfer", "download.verify",
+    "process.load", "process.resample", "process.compute", "process.encode", "process.write",
+    "process.graph", "process.pass", "process.file",
+)
+
+# Logger raíz del paquete: los módulos usan logging.getLogger(__name__)
+LOGGER = logging.getLogger("goes_processor")
+
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE / 1024**2
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class _NullSpan:
+    """Span vacío compartido: lo que se usa con la instrumentación apagada."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add_bytes(self, n):
+        pass
+
+    def set(self, **labels):
+        pass
+
+
+_NULL = _NullSpan()
+
+
+class Span:
+    __slots__ = ("session", "stage", "labels", "bytes", "peak_mb", "t0", "ts", "parent")
+
+    def __init__(self, session, stage: str, labels: dict):
+        self.session = session
+        self.stage = stage
+        self.labels = labels
+        self.bytes = 0
+        self.peak_mb = 0.0
+        self.parent = None
+
+    def add_bytes(self, n):
+        self.bytes += int(n or 0)
+
+    def set(self, **labels):
+        self.labels.update(labels)
+
+    def __enter__(self):
+        stack = getattr(_LOCAL, "stack", None)
+        if stack is None:
+            stack = _LOCAL.stack = []
+        if stack:
+            self.parent = stack[-1].stage
+            # Las etiquetas del padre (file, pipeline...) se heredan
+            self.labels = {**stack[-1].labels, **self.labels}
+        stack.append(self)
+        self.ts = time.time()
+        self.peak_mb = current_rss_mb()
+        self.session._open(self)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.t0
+        self.session._close(self)
+        _LOCAL.stack.pop()
+        self.session.emit(self.stage, seconds, self.bytes, max(self.peak_mb, current_rss_mb()),
+                          self.labels, parent=self.parent, ts=self.ts,
+                          error=exc_type.__name__ if exc_type else None)
+        return False
+
+
+class Session:
+    """Destino de los spans de una corrida: JSON lines + (opcional) Prometheus."""
+
+    def __init__(self, jsonl: Optional[str] = None, prometheus: Optional[str] = None,
+                 profile_dir: Optional[str] = None, sample_interval: float = 0.05, aggregate: bool = True):
+        if jsonl is None:
+            fd, jsonl = tempfile.mkstemp(prefix="goes_spans_", suffix=".jsonl")
+            os.close(fd)
+            self._owns_jsonl = True
+        else:
+            Path(jsonl).parent.mkdir(parents=True, exist_ok=True)
+            self._owns_jsonl = False
+        self.jsonl = str(jsonl)
+        self.prometheus = prometheus
+        self.profile_dir = profile_dir
+        self.aggregate = aggregate
+        # O_APPEND + una sola escritura por línea: varios procesos comparten el archivo
+        self._fd = os.open(self.jsonl, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._start_offset = os.fstat(self._fd).st_size
+        self._lock = threading.Lock()
+        self._open_spans = set()
+        self._stop = threading.Event()
+        self.interval = sample_interval
+        self._sampler = threading.Thread(target=self._sample, name="telemetry-rss", daemon=True)
+        self._sampler.start()
+
+    def config(self) -> dict:
+        """Lo que necesita un worker para escribir en la misma sesión."""
+        return {"jsonl": self.jsonl, "profile_dir": self.profile_dir}
+
+    # --- SPANS ---
+    def _open(self, s: Span):
+        with self._lock:
+            self._open_spans.add(s)
+
+    def _close(self, s: Span):
+        with self._lock:
+            self._open_spans.discard(s)
+
+    def _sample(self):
+        # Un solo hilo muestrea el RSS para todos los spans abiertos
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                spans = list(self._open_spans)
+            if spans:
+                rss = current_rss_mb()
+                for s in spans:
+                    if rss > s.peak_mb:
+                        s.peak_mb = rss
+
+    def emit(self, stage: str, seconds: float, nbytes: int = 0, peak_mb: Optional[float] = None, labels: dict = None,
+             **extra):
+        record = {"ts": round(extra.pop("ts", None) or time.time(), 3), "stage": stage,
+                  "seconds": round(seconds, 6), "bytes": int(nbytes), "pid": os.getpid()}
+        if peak_mb is not None:
+            record["peak_rss_mb"] = round(peak_mb, 1)
+        if labels:
+            record.update(labels)
+        record.update({k: v for k, v in extra.items() if v is not None})
+        os.write(self._fd, (json.dumps(record, default=str) + "\n").encode())
+
+    def log(self, record: logging.LogRecord, labels: dict):
+        event = {"ts": round(record.created, 3), "event": "log", "level": record.levelname.lower(),
+                 "logger": record.name, "message": record.getMessage(), "pid": os.getpid()}
+        event.update(labels)
+        os.write(self._fd, (json.dumps(event, default=str) + "\n").encode())
+
+    # --- CIERRE ---
+    def close(self):
+        self._stop.set()
+        self._sampler.join()
+        os.close(self._fd)
+        if self.aggregate and self.prometheus:
+            write_prometheus(self.prometheus, read_spans(self.jsonl, self._start_offset))
+        if self._owns_jsonl:
+            os.unlink(self.jsonl)
+
+
+class _SessionLogHandler(logging.Handler):
+    """Manda los registros de logging a la sesión activa, con las etiquetas del span abierto."""
+
+    def emit(self, record):
+        session = _SESSION
+        if session is None:
+            return
+        stack = getattr(_LOCAL, "stack", None)
+        labels = {**stack[-1].labels, "parent": stack[-1].stage} if stack else {}
+        try:
+            session.log(record, labels)
+        except OSError:
+            self.handleError(record)
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """Como logging.lastResort: escribe en el sys.stderr vigente, no en el de su creación."""
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+_LOG_HANDLER = _SessionLogHandler(logging.INFO)
+_CONSOLE = None
+
+
+def console_logging(verbose: bool = False):
+    """
+    Salida de consola del logger del paquete: advertencias siempre y el
+    progreso por archivo solo con verbose. Los workers del pool la heredan
+    vía GOES_VERBOSE.
+    """
+    global _CONSOLE
+    os.environ["GOES_VERBOSE"] = "1" if verbose else "0"
+    if _CONSOLE is None:
+        _CONSOLE = _ConsoleHandler()
+        _CONSOLE.setFormatter(logging.Formatter("%(message)s"))
+        LOGGER.addHandler(_CONSOLE)
+    _CONSOLE.setLevel(logging.INFO if verbose else logging.WARNING)
+    LOGGER.setLevel(logging.INFO)
+
+
+def configure(jsonl: Optional[str] = None, prometheus: Optional[str] = None, profile_dir: Optional[str] = None,
+              aggregate: bool = True) -> Optional[Session]:
+    """
+    Enciende la instrumentación en este proceso. Sin ningún destino queda
+    apagada (devuelve None). aggregate=False es para workers: solo escriben
+    JSON lines, el proceso principal arma el textfile de Prometheus.
+    """
+    global _SESSION
+    shutdown()
+    if not (jsonl or prometheus or profile_dir):
+        return None
+    _SESSION = Session(jsonl, prometheus, profile_dir, aggregate=aggregate)
+    LOGGER.addHandler(_LOG_HANDLER)
+    if LOGGER.level == logging.NOTSET or LOGGER.level > logging.INFO:
+        LOGGER.setLevel(logging.INFO)
+    return _SESSION
+
+
+@contextmanager
+def session(jsonl: Optional[str] = None, prometheus: Optional[str] = None, profile_dir: Optional[str] = None):
+    """configure() + shutdown() alrededor de una corrida (escribe el textfile al salir)."""
+    sess = configure(jsonl, prometheus, profile_dir)
+    try:
+        yield sess
+    finally:
+        shutdown()
+
+
+def cli_options(func):
+    """Opciones de click comunes: -v/--verbose, --metrics-jsonl, --metrics-prom, --profile, --profile-dir."""
+    import click
+
+    options = [
+        click.option('-v', '--verbose', is_flag=True, default=False,
+                     help="Mostrar en consola el progreso por archivo (sin esto, solo advertencias y errores)."),
+        click.option('--metrics-jsonl', default=None, type=click.Path(dir_okay=False),
+                     help="Registrar spans por etapa (duración, bytes, pico de RSS) como JSON lines."),
+        click.option('--metrics-prom', default=None, type=click.Path(dir_okay=False),
+                     help="Textfile de Prometheus (collector textfile del node_exporter) con el resumen por etapa."),
+        click.option('--profile', 'profile_files', is_flag=True, default=False,
+                     help="Perfilar cada archivo: cProfile del hilo que lo procesa (.prof + resumen .txt; no ve "
+                          "los hilos de dask) y tiempo por tipo de tarea de dask sumado entre hilos (.tasks.txt)."),
+        click.option('--profile-dir', default="goes_profiles", show_default=True, type=click.Path(file_okay=False),
+                     help="Carpeta de los reportes de --profile."),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+def start_from_cli(metrics_jsonl=None, metrics_prom=None, profile_files=False, profile_dir=None, verbose=False):
+    """Enciende la sesión según las opciones de cli_options y la cierra al terminar el comando."""
+    import click
+
+    console_logging(verbose)
+    sess = configure(metrics_jsonl, metrics_prom, profile_dir if profile_files else None)
+    if sess is not None:
+        click.get_current_context().call_on_close(shutdown)
+        targets = [t for t in (metrics_jsonl, metrics_prom, profile_dir if profile_files else None) if t]
+        click.echo(f"[*] Instrumentación por etapas → {', '.join(targets)}")
+    return sess
+
+
+def configure_worker(config: Optional[dict]):
+    """Initializer de workers del pool: misma sesión, sin agregar, y la consola del padre."""
+    console_logging(os.environ.get("GOES_VERBOSE") == "1")
+    if config:
+        configure(config.get("jsonl"), profile_dir=config.get("profile_dir"), aggregate=False)
+
+
+def shutdown():
+    global _SESSION
+    if _SESSION is not None:
+        session, _SESSION = _SESSION, None
+        LOGGER.removeHandler(_LOG_HANDLER)
+        session.close()
+
+
+def enabled() -> bool:
+    return _SESSION is not None
+
+
+def current_config() -> Optional[dict]:
+    return _SESSION.config() if _SESSION is not None else None
+
+
+def span(stage: str, **labels):
+    """Context manager de una etapa; nulo (sin costo) si no hay sesión."""
+    session = _SESSION
+    if session is None:
+        return _NULL
+    return Span(session, stage, labels)
+
+
+def annotate(**labels):
+    """Agrega etiquetas al span abierto más interno de este hilo (p.ej. skipped=True)."""
+    stack = getattr(_LOCAL, "stack", None) if _SESSION is not None else None
+    if stack:
+        stack[-1].labels.update(labels)
+
+
+def emit(stage: str, seconds: float, nbytes: int = 0, **labels):
+    """Registro de una etapa medida por fuera de un span (p.ej. tiempo atribuido)."""
+    session = _SESSION
+    if session is None:
+        return
+    stack = getattr(_LOCAL, "stack", None)
+    if stack:
+        labels = {**stack[-1].labels, **labels}
+        labels.setdefault("parent", stack[-1].stage)
+    session.emit(stage, seconds, nbytes, None, labels)
+
+
+# ---------------------------------------------------------------------------
+# Perfilado por archivo (--profile)
+# ---------------------------------------------------------------------------
+@contextmanager
+def profiled(name: str, top: int = 40):
+    """
+    Con profile_dir configurado, corre el bloque bajo cProfile y deja
+    <name>.prof (para snakeviz/pstats) y <name>.txt (top por tiempo acumulado).
+    cProfile solo ve este hilo: el tiempo de las tareas que ejecutan los
+    hilos del pool de dask va a <name>.tasks.txt, por tipo de tarea.
+    """
+    session = _SESSION
+    if session is None or not session.profile_dir:
+        yield
+        return
+    out_dir = Path(session.profile_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    prof = cProfile.Profile()
+    tasks = {}
+    with _dask_task_times(tasks):
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+    prof.dump_stats(str(out_dir / f"{name}.prof"))
+    text = io.StringIO()
+    pstats.Stats(prof, stream=text).sort_stats("cumulative").print_stats(top)
+    (out_dir / f"{name}.txt").write_text(text.getvalue(), encoding="utf-8")
+    if tasks:
+        lines = [f"{'tarea':<48} {'n':>7} {'segundos':>10}"]
+        for prefix, (n, seconds) in sorted(tasks.items(), key=lambda kv: -kv[1][1])[:top]:
+            lines.append(f"{prefix[:48]:<48} {n:>7} {seconds:>10.3f}")
+        (out_dir / f"{name}.tasks.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@contextmanager
+def _dask_task_times(out: dict):
+    """Segundos por tipo de tarea (key_split) en todos los hilos de dask: prefijo → [n, segundos]."""
+    try:
+        from dask.callbacks import Callback
+        from dask.utils import key_split
+    except ImportError:
+        yield
+        return
+
+    starts = {}
+    lock = threading.Lock()
+
+    def pretask(key, dsk, state):
+        starts[key] = time.perf_counter()
+
+    def posttask(key, result, dsk, state, worker_id):
+        elapsed = time.perf_counter() - starts.pop(key, time.perf_counter())
+        with lock:
+            entry = out.setdefault(key_split(key), [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+
+    with Callback(pretask=pretask, posttask=posttask):
+        yield
+
+
+# ---------------------------------------------------------------------------
+# Atribución de tareas de dask a etapas (pasada única)
+# ---------------------------------------------------------------------------
+# Marcadores en el nombre de la tarea (las tareas fusionadas concatenan
+# nombres: gana la primera regla que aparezca)
+_TASK_RULES = (
+    ("process.write", ("store-map", "save_img", "write_level", "write_pyramid", "to_netcdf")),
+    ("process.encode", ("colorize", "palettize", "quantile", "stretch", "enhance", "to_image", "as_rgba")),
+    ("process.resample", ("apply", "resample", "lut", "downsample")),
+    ("process.load", ("open_dataset", "original-")),
+)
+
+
+def task_stage(key) -> str:
+    name = key[0] if isinstance(key, tuple) else key
+    name = str(name)
+    for stage, markers in _TASK_RULES:
+        if any(m in name for m in markers):
+            return stage
+    return "process.compute"
+
+
+@contextmanager
+def stage_task_timer():
+    """
+    Durante un compute de dask suma el tiempo de cada tarea en su etapa y al
+    salir emite un registro por etapa (attributed=True). Apagado: no instala
+    ningún callback.
+    """
+    if _SESSION is None:
+        yield
+        return
+    from dask.callbacks import Callback
+
+    totals, counts, starts = {}, {}, {}
+    lock = threading.Lock()
+
+    def pretask(key, dsk, state):
+        starts[key] = time.perf_counter()
+
+    def posttask(key, result, dsk, state, worker_id):
+        elapsed = time.perf_counter() - starts.pop(key, time.perf_counter())
+        stage = task_stage(key)
+        with lock:
+            totals[stage] = totals.get(stage, 0.0) + elapsed
+            counts[stage] = counts.get(stage, 0) + 1
+
+    with Callback(pretask=pretask, posttask=posttask):
+        yield
+    for stage, seconds in sorted(totals.items()):
+        emit(stage, seconds, attributed=True, tasks=counts[stage])
+
+
+# ---------------------------------------------------------------------------
+# Lectura y exportación
+# ---------------------------------------------------------------------------
+def read_spans(path, offset: int = 0):
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def summarize(records) -> dict:
+    """(stage, kind) → {count, seconds, bytes, peak_rss_mb, errors}; kind es wall o task."""
+    out = {}
+    for r in records:
+        if "stage" not in r:
+            continue  # eventos de log
+        # Tiempo de reloj (span) y tiempo de tarea atribuido se cuentan por separado
+        key = (r["stage"], "task" if r.get("attributed") else "wall")
+        s = out.setdefault(key, {"count": 0, "seconds": 0.0, "bytes": 0, "peak_rss_mb": 0.0, "errors": 0})
+        s["count"] += 1
+        s["seconds"] += r.get("seconds", 0.0)
+        s["bytes"] += r.get("bytes", 0)
+        s["peak_rss_mb"] = max(s["peak_rss_mb"], r.get("peak_rss_mb", 0.0))
+        s["errors"] += 1 if r.get("error") else 0
+    return out
+
+
+def write_prometheus(path, records, prefix: str = "goes_stage"):
+    """
+    Textfile para el collector textfile del node_exporter (escritura atómica).
+    Cada corrida reemplaza el archivo, así que todo se exporta como gauge con
+    los valores de la última corrida (no son contadores monótonos).
+    """
+    summary = summarize(records)
+    metrics = (
+        ("seconds", "gauge", "Tiempo por etapa en la última corrida (s)", "seconds"),
+        ("runs", "gauge", "Ejecuciones de la etapa en la última corrida", "count"),
+        ("bytes", "gauge", "Bytes procesados por la etapa en la última corrida", "bytes"),
+        ("errors", "gauge", "Ejecuciones con error en la última corrida", "errors"),
+        ("peak_rss_megabytes", "gauge", "Pico de RSS observado en la etapa (MB)", "peak_rss_mb"),
+    )
+    lines = []
+    for suffix, metric_type, help_text, field in metrics:
+        name = f"{prefix}_{suffix}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for (stage, kind), s in sorted(summary.items()):
+            value = f"{s[field]:.6g}" if isinstance(s[field], float) else str(s[field])
+            lines.append(f'{name}{{stage="{stage}",kind="{kind}"}} {value}')
+    lines.append(f"# HELP {prefix}_last_run_timestamp_seconds Fin de la última corrida")
+    lines.append(f"# TYPE {prefix}_last_run_timestamp_seconds gauge")
+    lines.append(f"{prefix}_last_run_timestamp_seconds {time.time():.0f}")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
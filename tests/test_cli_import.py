@@ -0,0 +1,25 @@
+# tests/test_cli_import.py
+
+import pytest
+
+from bench_cli_import import FORBIDDEN, LIGHT_COMMANDS, import_profile
+
+BUDGET_MS = 400.0  # mismo presupuesto que benchmarks/bench_cli_import.py
+
+
+def heavy_modules(modules) -> list:
+    return sorted({m.split(".")[0] for m in modules} & set(FORBIDDEN))
+
+
+def test_importing_main_does_not_load_satpy_or_dask():
+    total_us, modules = import_profile([], python_args=("-c", "import goes_processor.main"))
+    assert "goes_processor.main" in modules
+    assert heavy_modules(modules) == []
+    assert total_us / 1000 < BUDGET_MS
+
+
+@pytest.mark.parametrize("args", LIGHT_COMMANDS, ids=" ".join)
+def test_light_commands_stay_light(args):
+    total_us, modules = import_profile(args)
+    assert heavy_modules(modules) == []
+    assert total_us / 1000 < BUDGET_MS
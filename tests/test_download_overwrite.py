@@ -0,0 +1,34 @@
+# tests/test_download_overwrite.py
+
+from goes_processor.download.download import PART_SUFFIX, download_files
+
+PRODUCT = "ABI-L2-LSTF"
+NAME = f"OR_{PRODUCT}-M6_G19_s20260031200210_e20260031209410_c20260031210210.nc"
+KEY = f"noaa-goes19/{PRODUCT}/2026/003/12/{NAME}"
+REMOTE = bytes(range(256)) * 64
+
+
+class FakeFS:
+    """Un objeto en memoria: ls con detalle y lecturas por rango."""
+
+    def ls(self, prefix, detail=True):
+        if prefix.strip("/") != KEY.rsplit("/", 1)[0]:
+            raise FileNotFoundError(prefix)
+        return [{"name": KEY, "size": len(REMOTE), "type": "file", "ETag": '"v1"'}]
+
+    def cat_file(self, path, start=None, end=None):
+        return REMOTE[start:end]
+
+
+def test_overwrite_discards_a_stale_part_without_final_file(tmp_path):
+    local = tmp_path / KEY
+    local.parent.mkdir(parents=True)
+    # .part de una corrida vieja (otro contenido), sin el archivo final al lado
+    local.with_name(NAME + PART_SUFFIX).write_bytes(b"\xff" * 1000)
+
+    paths = download_files(PRODUCT, "2026", "003", "12", output_dir=str(tmp_path), fs=FakeFS(),
+                           overwrite=True, listing_cache=False)
+
+    assert paths == [local]
+    assert local.read_bytes() == REMOTE
+    assert not local.with_name(NAME + PART_SUFFIX).exists()
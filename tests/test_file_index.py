@@ -0,0 +1,86 @@
+# tests/test_file_index.py
+
+import os
+import shutil
+from datetime import datetime, timedelta
+
+from goes_processor.processing.logic_crawler.crawler import find_files
+from goes_processor.processing.logic_crawler.index import FileIndex
+
+PRODUCT = "ABI-L2-LSTF"
+# Como find_files: el subárbol del producto (la raíz cambia de mtime con el journal del índice)
+SUB = f"noaa-goes19/{PRODUCT}"
+
+
+def put(base, start: datetime):
+    d = base / "noaa-goes19" / PRODUCT / start.strftime("%Y/%j/%H")
+    d.mkdir(parents=True, exist_ok=True)
+    s = start.strftime("%Y%j%H%M%S") + "0"
+    path = d / f"OR_{PRODUCT}-M6_G19_s{s}_e{s}_c{s}.nc"
+    path.write_bytes(b"nc")
+    return path.resolve()
+
+
+def make_archive(base, hours=6):
+    t0 = datetime(2026, 1, 3)
+    return [put(base, t0 + timedelta(hours=h)) for h in range(hours)]
+
+
+def count_scandir(monkeypatch):
+    calls = []
+    real = os.scandir
+
+    def scandir(path):
+        calls.append(str(path))
+        return real(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    return calls
+
+
+def test_warm_refresh_lists_no_directories(tmp_path, monkeypatch):
+    files = make_archive(tmp_path)
+    with FileIndex(tmp_path) as idx:
+        # producto, año, día y una carpeta por hora
+        assert idx.refresh(SUB) == 3 + len(files)
+        assert idx.conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+    calls = count_scandir(monkeypatch)
+    with FileIndex(tmp_path) as idx:
+        assert idx.refresh(SUB) == 0
+        assert idx.query("19", PRODUCT) == files
+    assert calls == []
+
+
+def test_refresh_relists_only_changed_directories(tmp_path, monkeypatch):
+    files = make_archive(tmp_path)
+    with FileIndex(tmp_path) as idx:
+        idx.refresh(SUB)
+
+    new = put(tmp_path, datetime(2026, 1, 3, 2, 10))
+    calls = count_scandir(monkeypatch)
+    with FileIndex(tmp_path) as idx:
+        assert idx.refresh(SUB) == 1
+        assert calls == [str(new.parent)]
+        assert idx.query("19", PRODUCT, hour="02") == sorted([files[2], new])
+
+    # Una hora nueva cambia el mtime del día: se listan el día y la hora
+    later = put(tmp_path, datetime(2026, 1, 3, 9))
+    with FileIndex(tmp_path) as idx:
+        assert idx.refresh(SUB) == 2
+        assert later in idx.query("19", PRODUCT)
+
+        shutil.rmtree(files[0].parent)
+        idx.refresh(SUB)
+        assert files[0] not in idx.query("19", PRODUCT)
+        assert idx.conn.execute("SELECT COUNT(*) FROM dirs WHERE path = ?",
+                                (str(files[0].parent),)).fetchone()[0] == 0
+
+
+def test_find_files_matches_glob_fallback(tmp_path):
+    make_archive(tmp_path, hours=30)
+    for kwargs in ({"day": "003"}, {"day": "004", "hour": "03"}, {"day": "all"}):
+        args = {"year": "2026", "day": "all", "hour": "all", "minute": "all", **kwargs}
+        indexed = find_files(tmp_path, "19", PRODUCT, **args)
+        assert indexed == find_files(tmp_path, "19", PRODUCT, use_index=False, **args)
+        assert indexed == find_files(tmp_path, "19", PRODUCT, **args)  # en caliente
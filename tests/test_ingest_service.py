@@ -0,0 +1,56 @@
+# tests/test_ingest_service.py
+
+from pathlib import Path
+
+from goes_processor.ingest.daemon import INGEST_PRIORITY, IngestDaemon, IngestJob
+from goes_processor.processing.logic_how.registry import get_processor
+
+
+class StubService:
+    address = "unix:/nowhere.sock"
+
+    def __init__(self, state):
+        self.state = state
+        self.calls = []
+
+    def run(self, job, priority=0, timeout=None):
+        self.calls.append((priority, timeout))
+        res = {"state": self.state, "queue_seconds": 0.0}
+        if self.state == "done":
+            res.update(ok=True, output="/out/dir")
+        return res
+
+
+def _daemon(tmp_path, service):
+    daemon = IngestDaemon({"ABI-L2-LSTF": 60}, raw_dir=str(tmp_path), output_dir=str(tmp_path / "out"), fs=object(),
+                          service_timeout=5.0)
+    daemon.service = service
+    return daemon
+
+
+def _job(tmp_path):
+    return IngestJob("b/p/2026/003/12/f.nc", "ABI-L2-LSTF", 1, None, 0.0, 0.0, local_path=Path(tmp_path) / "f.nc")
+
+
+def test_service_result_is_used(tmp_path):
+    service = StubService("done")
+    daemon = _daemon(tmp_path, service)
+    assert daemon._process_remote(get_processor("lst"), _job(tmp_path)) == Path("/out/dir")
+    assert service.calls == [(INGEST_PRIORITY, 5.0)]
+
+
+def test_hung_service_falls_back_and_cools_down(tmp_path):
+    service = StubService("running")
+    daemon = _daemon(tmp_path, service)
+    assert daemon._process_remote(get_processor("lst"), _job(tmp_path)) is None
+    # Dentro del lapso de enfriamiento ni siquiera se intenta
+    assert daemon._process_remote(get_processor("lst"), _job(tmp_path)) is None
+    assert len(service.calls) == 1
+
+
+def test_finish_records_job(tmp_path):
+    daemon = _daemon(tmp_path, None)
+    job = _job(tmp_path)
+    job.downloaded = 1.0
+    daemon._finish(job)
+    assert daemon.completed == [job]
@@ -0,0 +1,40 @@
+# tests/test_ingest_stream.py
+
+import threading
+
+from goes_processor.download.download import ByteBudget
+from goes_processor.ingest import stream
+
+PRODUCT = "ABI-L2-LSTF"
+
+
+class FakeFS:
+    """Bucket en memoria con la interfaz mínima de list_prefix (ls con detalle)."""
+
+    def __init__(self, minutes):
+        prefix = f"noaa-goes19/{PRODUCT}/2026/003/12"
+        self.objects = {f"{prefix}/OR_{PRODUCT}-M6_G19_s2026003120{m}00_e2026003120{m}590_c2026003121{m}100.nc": 100
+                        for m in minutes}
+
+    def ls(self, prefix, detail=True):
+        return [{"name": k, "size": v, "type": "file"} for k, v in self.objects.items()
+                if k.rsplit("/", 1)[0] == prefix.strip("/")]
+
+
+def test_downloader_failure_outside_fetch_is_reported_and_does_not_hang(tmp_path, monkeypatch):
+    def broken_acquire(self, n):
+        raise OSError("spool lleno")
+
+    monkeypatch.setattr(ByteBudget, "acquire", broken_acquire)
+    fs = FakeFS(minutes=(0, 1, 2))
+    results = []
+    worker = threading.Thread(target=lambda: results.extend(stream.stream_process(
+        PRODUCT, "2026", "3", "12", fs=fs, spool_dir=str(tmp_path / "spool"),
+        output_dir=str(tmp_path / "out"), download_workers=2)), daemon=True)
+    worker.start()
+    worker.join(60)
+
+    assert not worker.is_alive()
+    assert len(results) == 3
+    assert all(not r["ok"] and r["error"] == "descarga: spool lleno" for r in results)
+    assert not list((tmp_path / "spool").iterdir())  # el spool de la corrida se borró
@@ -0,0 +1,86 @@
+# tests/test_ingest_watcher.py
+
+from datetime import datetime
+
+from goes_processor.ingest.daemon import IngestDaemon, IngestJob, PrefixWatcher
+from goes_processor.ingest.ingest_cli import DEFAULT_PRODUCTS
+
+PRODUCT = "ABI-L2-LSTF"
+
+
+class FakeFS:
+    """Bucket en memoria con la interfaz mínima de list_prefix (ls con detalle)."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def put(self, when: datetime, minute_key: str):
+        prefix = f"noaa-goes19/{PRODUCT}/{when:%Y}/{when:%j}/{when:%H}"
+        key = f"{prefix}/OR_{PRODUCT}-M6_G19_s{when:%Y%j%H}{minute_key}000_e0_c0.nc"
+        self.objects[key] = 100
+        return key
+
+    def ls(self, prefix, detail=True):
+        prefix = prefix.strip("/")
+        found = [{"name": k, "size": v, "type": "file"} for k, v in self.objects.items()
+                 if k.rsplit("/", 1)[0] == prefix]
+        if not found:
+            raise FileNotFoundError(prefix)
+        return found
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_failed_download_is_offered_again():
+    fs, clock = FakeFS(), Clock(datetime(2026, 1, 3, 12, 30))
+    watcher = PrefixWatcher(fs, "19", PRODUCT, clock)
+    key = fs.put(datetime(2026, 1, 3, 12), "00")
+
+    assert [n["key"] for n in watcher.poll()] == [key]
+    assert watcher.poll() == []
+    watcher.forget(key)
+    assert [n["key"] for n in watcher.poll()] == [key]
+
+
+def test_seen_is_trimmed_to_retained_hours():
+    fs, clock = FakeFS(), Clock(datetime(2026, 1, 3, 12, 30))
+    watcher = PrefixWatcher(fs, "19", PRODUCT, clock)
+    old = fs.put(datetime(2026, 1, 3, 12), "00")
+    watcher.poll()
+    assert old in watcher.seen
+
+    clock.now = datetime(2026, 1, 3, 14, 30)
+    new = fs.put(datetime(2026, 1, 3, 14), "00")
+    assert [n["key"] for n in watcher.poll()] == [new]
+    assert watcher.seen == {new}
+
+
+def test_download_error_releases_key(tmp_path):
+    fs, clock = FakeFS(), Clock(datetime(2026, 1, 3, 12, 30))
+    # raw_dir es un archivo: la descarga falla al crear la carpeta destino
+    raw = tmp_path / "raw"
+    raw.write_text("")
+    daemon = IngestDaemon({PRODUCT: 60}, raw_dir=str(raw), fs=fs, clock=clock, process=False)
+    daemon.download_workers = 1
+    key = fs.put(datetime(2026, 1, 3, 12), "00")
+    daemon.poll_once(PRODUCT)
+    job = daemon.download_queue.get()
+    assert job.key == key
+
+    # La clave tiene que volver a ofrecerse tras el error
+    daemon.download_queue.put(job)
+    daemon.download_queue.put(None)
+    daemon._download_loop()
+    assert isinstance(job, IngestJob) and job.error and job.error.startswith("descarga")
+    assert daemon.poll_once(PRODUCT) == 1
+
+
+def test_default_products_are_s3_prefixes():
+    assert "ABI-L2-FDCF" in DEFAULT_PRODUCTS
+    assert "ABI-L2-FDC" not in DEFAULT_PRODUCTS
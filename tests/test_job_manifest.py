@@ -0,0 +1,85 @@
+# tests/test_job_manifest.py
+
+import os
+
+from goes_processor.download.manifest import DirectoryManifest
+from goes_processor.processing.logic_output.job_manifest import JobSpec, invalidate, record, stale_reason
+
+
+def make_job(tmp_path, version="1", **params):
+    src = tmp_path / "raw" / "OR_ABI-L2-LSTF-M6_G19_s20260031200210_e0_c0.nc"
+    if not src.exists():
+        src.parent.mkdir(parents=True)
+        src.write_bytes(b"netcdf")
+    out = tmp_path / "out"
+    out.mkdir(exist_ok=True)
+    return JobSpec("lst", version, src, out, {"format": "png", "area": "full_disk", **params})
+
+
+def finish(spec):
+    png = spec.output_dir / "lst.png"
+    png.write_bytes(b"png")
+    record(spec, [png])
+    return png
+
+
+def test_up_to_date_after_record(tmp_path):
+    spec = make_job(tmp_path)
+    assert stale_reason(spec) == "sin manifiesto"
+    finish(spec)
+    assert stale_reason(spec) is None
+    assert stale_reason(make_job(tmp_path)) is None  # mismos parámetros en otra corrida
+
+
+def test_reports_why_an_output_is_stale(tmp_path):
+    spec = make_job(tmp_path)
+    png = finish(spec)
+
+    assert stale_reason(make_job(tmp_path, format="tiff")) == "parámetros cambiaron (format)"
+    assert stale_reason(make_job(tmp_path, version="2")) == "versión del pipeline 1 → 2"
+
+    png.unlink()
+    assert stale_reason(spec) == "faltan salidas (lst.png)"
+    finish(spec)
+
+    st = spec.input_file.stat()
+    os.utime(spec.input_file, (st.st_atime, st.st_mtime + 60))
+    assert stale_reason(spec) == "la entrada cambió"
+
+    spec.input_file.unlink()
+    assert stale_reason(spec) == "entrada inaccesible"
+
+
+def test_invalidate_and_unreadable_manifest(tmp_path):
+    spec = make_job(tmp_path)
+    finish(spec)
+    invalidate(spec)
+    assert stale_reason(spec) == "sin manifiesto"
+    invalidate(spec)  # sin manifiesto: no falla
+
+    spec.manifest_path.write_text("{corrupto", encoding="utf-8")
+    assert stale_reason(spec) == "sin manifiesto"
+
+
+def test_downloaded_input_is_identified_by_etag_across_spool_and_raw(tmp_path):
+    spool = tmp_path / "spool" / "noaa-goes19" / "OR_ABI-L2-LSTF-M6_G19_s20260031200210_e0_c0.nc"
+    spool.parent.mkdir(parents=True)
+    spool.write_bytes(b"netcdf")
+    DirectoryManifest(spool.parent).record(spool.name, 6, '"etag-1"')
+    out = tmp_path / "out"
+    out.mkdir()
+    spec = JobSpec("lst", "1", spool, out, {"format": "png"})
+    finish(spec)
+
+    # Otra corrida: el mismo objeto vuelve a bajar (mtime nuevo) y termina en data/raw
+    raw = tmp_path / "raw" / spool.name
+    raw.parent.mkdir()
+    raw.write_bytes(b"netcdf")
+    os.utime(raw, (1, 1))
+    DirectoryManifest(raw.parent).record(raw.name, 6, '"etag-1"')
+    assert stale_reason(JobSpec("lst", "1", raw, out, {"format": "png"})) is None
+
+    DirectoryManifest(raw.parent).record(raw.name, 6, '"etag-2"')
+    assert stale_reason(JobSpec("lst", "1", raw, out, {"format": "png"})) == "la entrada cambió"
+    os.utime(raw, (2, 2))  # tocado después de la descarga: vuelve a contar el mtime
+    assert spec.input_identity()["etag"] == '"etag-1"' and "etag" not in JobSpec("lst", "1", raw, out).input_identity()
@@ -0,0 +1,111 @@
+# tests/test_listing_cache.py
+
+from datetime import datetime, timedelta
+
+from goes_processor.download.listing import ListingCache, hour_prefixes
+
+PRODUCT = "ABI-L2-MCMIPF"
+
+
+def stamp(t: datetime) -> str:
+    return t.strftime("%Y%j%H%M%S") + "0"
+
+
+class FakeFS:
+    """Bucket en memoria; registra cada ls (un pedido a S3)."""
+
+    def __init__(self):
+        self.objects = {}
+        self.calls = []
+
+    def put(self, start: datetime, created: datetime = None) -> str:
+        end = start + timedelta(minutes=9, seconds=59)
+        created = created or end + timedelta(seconds=20)
+        key = (f"noaa-goes19/{PRODUCT}/{start:%Y/%j/%H}/"
+               f"OR_{PRODUCT}-M6_G19_s{stamp(start)}_e{stamp(end)}_c{stamp(created)}.nc")
+        self.objects[key] = 1000
+        return key
+
+    def ls(self, prefix, detail=True):
+        self.calls.append(prefix)
+        found = [{"name": k, "size": v, "type": "file"} for k, v in self.objects.items()
+                 if k.rsplit("/", 1)[0] == prefix]
+        if not found:
+            raise FileNotFoundError(prefix)
+        return found
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def fill_hour(fs, hour: datetime, minutes=(0, 10, 20, 30, 40, 50)):
+    return [fs.put(hour + timedelta(minutes=m)) for m in minutes]
+
+
+def test_closed_hours_are_listed_once_and_future_hours_never(tmp_path):
+    fs, clock = FakeFS(), Clock(datetime(2026, 1, 3, 14, 30))
+    day = datetime(2026, 1, 3)
+    keys = [k for h in range(14) for k in fill_hour(fs, day + timedelta(hours=h))]
+    db = tmp_path / ".goes_listing.sqlite"
+
+    with ListingCache(db, ttl_seconds=0, clock=clock) as cache:
+        assert sorted(cache.list(fs, "19", PRODUCT, "2026", "3")) == sorted(keys)
+        assert cache.stats["skipped_future"] == 9 and len(fs.calls) == 15
+        assert cache.conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+    fs.calls.clear()
+    with ListingCache(db, ttl_seconds=0, clock=clock) as cache:  # el cache persiste entre procesos
+        plans = cache.refresh(fs, hour_prefixes("19", PRODUCT, "2026", "3"))
+    # Las 13 cerró a las 14:15 (margen de tardíos): solo se re-lista la hora en curso
+    relisted = [p for p, action in plans.items() if action not in ("cached", "skip")]
+    assert relisted == fs.calls == [f"noaa-goes19/{PRODUCT}/2026/003/14"]
+
+
+def test_open_hour_is_relisted_incrementally_after_ttl():
+    hour = datetime(2026, 1, 3, 12)
+    fs, clock = FakeFS(), Clock(hour + timedelta(minutes=25))
+    first = fill_hour(fs, hour, (0, 10, 20))
+    prefix = hour_prefixes("19", PRODUCT, "2026", "3", "12")
+
+    cache = ListingCache(ttl_seconds=3600, clock=clock)
+    assert cache.refresh(fs, prefix) == {prefix[0]: "full"}
+    late = fs.put(hour + timedelta(minutes=30))
+    assert cache.refresh(fs, prefix) == {prefix[0]: "cached"}  # dentro del TTL
+    assert list(cache.query(prefix)) == first
+
+    cache.ttl = 0
+    assert cache.refresh(fs, prefix) == {prefix[0]: "incremental"}
+    assert list(cache.query(prefix)) == first + [late]
+    assert cache.stats == {"listed": 1, "incremental": 1, "cached": 1, "skipped_future": 0}
+
+
+def test_minute_filter_uses_scan_start_not_creation_stamp():
+    hour = datetime(2026, 1, 3, 12)
+    fs, clock = FakeFS(), Clock(hour + timedelta(hours=3))
+    at_10 = fs.put(hour + timedelta(minutes=10))
+    # Empieza en el minuto 20 pero se creó en el minuto 10 de la hora siguiente
+    fs.put(hour + timedelta(minutes=20), created=hour + timedelta(hours=1, minutes=10))
+
+    cache = ListingCache(clock=clock)
+    assert list(cache.list(fs, "19", PRODUCT, "2026", "3", "12", minute="10")) == [at_10]
+    found = cache.query(hour_prefixes("19", PRODUCT, "2026", "3", "12"),
+                        start_time=hour + timedelta(minutes=5), end_time=hour + timedelta(minutes=15))
+    assert list(found) == [at_10]
+
+
+def test_retain_forgets_other_prefixes():
+    fs, clock = FakeFS(), Clock(datetime(2026, 1, 3, 14, 30))
+    fill_hour(fs, datetime(2026, 1, 3, 12))
+    kept = fill_hour(fs, datetime(2026, 1, 3, 13))
+    prefixes = hour_prefixes("19", PRODUCT, "2026", "3")[12:14]
+
+    cache = ListingCache(clock=clock)
+    cache.refresh(fs, prefixes)
+    cache.retain(prefixes[1:])
+    assert list(cache.query(prefixes)) == kept
+    assert cache.refresh(fs, prefixes)[prefixes[0]] == "full"
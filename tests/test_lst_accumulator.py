@@ -0,0 +1,83 @@
+# tests/test_lst_accumulator.py
+
+import warnings
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from goes_processor.processing.logic_aggregate.accumulator import LSTAccumulator
+
+SHAPE = (16, 12)
+
+
+def make_fields(n=9, seed=0):
+    rng = np.random.default_rng(seed)
+    fields = rng.normal(290.0, 8.0, size=(n, *SHAPE)).astype(np.float32)
+    fields[rng.random(fields.shape) < 0.3] = np.nan
+    fields[:, 0, 0] = np.nan      # nunca hay dato
+    fields[1:, 0, 1] = np.nan     # un solo dato: sin desvío
+    return fields
+
+
+def fold(fields, welford=True, offset=0):
+    acc = LSTAccumulator(SHAPE, welford=welford)
+    t0 = datetime(2026, 1, 3)
+    for i, f in enumerate(fields, start=offset):
+        acc.update(f, source=f"f{i}.nc", start_time=t0 + timedelta(hours=i))
+    return acc
+
+
+def assert_matches_numpy(out, fields):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # píxel sin datos: all-NaN slice
+        np.testing.assert_allclose(out["mean"], np.nanmean(fields, axis=0), rtol=1e-6)
+        np.testing.assert_allclose(out["std"], np.nanstd(fields, axis=0, ddof=1), rtol=1e-4)
+        np.testing.assert_array_equal(out["min"], np.nanmin(fields, axis=0))
+        np.testing.assert_array_equal(out["max"], np.nanmax(fields, axis=0))
+    np.testing.assert_array_equal(out["count"], (~np.isnan(fields)).sum(axis=0))
+
+
+def test_welford_matches_numpy():
+    fields = make_fields()
+    out = fold(fields).finalize()
+    assert_matches_numpy(out, fields)
+    assert np.isnan(out["mean"][0, 0]) and np.isnan(out["std"][0, 1])
+
+
+def test_chan_merge_equals_single_pass():
+    fields = make_fields()
+    single = fold(fields).finalize()
+    parts = [fold(fields[i:i + 3], offset=i) for i in (0, 3, 6)] + [LSTAccumulator(SHAPE, welford=True)]
+    merged = LSTAccumulator.reduce(parts)
+
+    out = merged.finalize()
+    assert_matches_numpy(out, fields)
+    for key in ("mean", "std"):
+        np.testing.assert_allclose(out[key], single[key], rtol=1e-6)
+    assert merged.sources == [f"f{i}.nc" for i in range(9)]
+    assert (merged.start_time, merged.end_time) == (datetime(2026, 1, 3), datetime(2026, 1, 3, 8))
+
+
+def test_merge_rejects_incompatible_accumulators():
+    with pytest.raises(ValueError):
+        LSTAccumulator(SHAPE, welford=True).merge(LSTAccumulator(SHAPE, welford=False))
+    with pytest.raises(ValueError):
+        LSTAccumulator(SHAPE).update(np.zeros((2, 2)))
+
+
+def test_saved_state_resumes_incrementally(tmp_path):
+    fields = make_fields()
+    fold(fields[:5]).save(tmp_path / "state.npz")
+
+    acc = LSTAccumulator.load(tmp_path / "state.npz")
+    for i, f in enumerate(fields[5:], start=5):
+        acc.update(f, source=f"f{i}.nc", start_time=datetime(2026, 1, 3) + timedelta(hours=i))
+
+    out, single = acc.finalize(), fold(fields).finalize()
+    for key in ("min", "max", "count"):
+        np.testing.assert_array_equal(out[key], single[key])
+    for key in ("mean", "std"):
+        np.testing.assert_allclose(out[key], single[key], rtol=1e-6)
+    assert acc.sources == [f"f{i}.nc" for i in range(9)]
+    assert acc.end_time == datetime(2026, 1, 3, 8)
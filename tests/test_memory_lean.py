@@ -0,0 +1,63 @@
+# tests/test_memory_lean.py
+
+import json
+
+import dask
+import numpy as np
+import pytest
+import rasterio
+from synthetic_abi import make_archive
+
+from goes_processor import config_satpy
+from goes_processor.processing.logic_how import lst
+from goes_processor.processing.logic_parallel.profile import active_profile, resolve_profile, using_profile
+
+# El pico de RSS se mide con benchmarks/bench_memory_lean.py (ruidoso a tamaños chicos);
+# aquí se comprueban los efectos deterministas del modo lean.
+SIZE = 678
+REGION = "argentina"
+
+
+def test_memory_lean_caps_dask_chunks_without_profile(tmp_path, monkeypatch):
+    seen = []
+    monkeypatch.setattr(lst, "_process_file_single_pass",
+                        lambda *args: seen.append(dask.config.get("array.chunk-size")))
+    lst.process_file(tmp_path / "a.nc", tmp_path, tmp_path / "out", memory_lean=True)
+    lst.process_file(tmp_path / "a.nc", tmp_path, tmp_path / "out", memory_lean=False)
+    # Un perfil explícito o activo manda sobre el tope del modo lean
+    lst.process_file(tmp_path / "a.nc", tmp_path, tmp_path / "out", memory_lean=True,
+                     profile=resolve_profile("fast"))
+    with using_profile(resolve_profile("default")):
+        lst.process_file(tmp_path / "a.nc", tmp_path, tmp_path / "out", memory_lean=True)
+
+    default = dask.config.get("array.chunk-size")
+    assert seen == [f"{lst.LEAN_CHUNK_MB}MiB", default, "256MiB", default]
+    assert active_profile() is None
+
+
+def test_memory_lean_outputs(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_satpy, "CACHE_DIR", tmp_path / "cache")
+    input_file = make_archive(tmp_path / "raw", "LSTF", SIZE, 1)[0]
+    runs = {}
+    for lean in (False, True):
+        # Una región chica: la LUT hacia la grilla global domina el tiempo del test
+        out_dir = lst.process_file(input_file, input_file.parent, tmp_path / f"out_{lean}", format="both",
+                                   overwrite=True, region=REGION, memory_lean=lean)
+        _, _, paths = lst._output_paths(input_file, input_file.parent, tmp_path / f"out_{lean}",
+                                                REGION, mkdir=False)
+        runs[lean] = (json.loads(paths["json_meta"].read_text()), paths)
+        assert out_dir == paths["json_meta"].parent
+
+    (default, default_paths), (lean, lean_paths) = runs[False], runs[True]
+    # Chunks distintos: la media puede diferir en el último bit
+    assert lean["stats"] == pytest.approx(default["stats"])
+    assert lean["memory_lean"] is True and "memory_lean" not in default
+    # El color no cambia; el gris lean lleva °C sin realzar en float32
+    for key in ("png_orig_color", "png_wgs84_color", "tif_wgs84_color"):
+        assert lean_paths[key].read_bytes() == default_paths[key].read_bytes()
+    with rasterio.open(lean_paths["tif_wgs84_gray"]) as src:
+        gray = src.read(1)
+    assert gray.dtype == np.float32
+    valid = gray[np.isfinite(gray)]
+    assert valid.min() >= default["stats"]["min"] - 1e-3 and valid.max() <= default["stats"]["max"] + 1e-3
+    assert valid.max() > 1  # °C, no el realce 0-1 del modo por defecto
@@ -0,0 +1,20 @@
+# tests/test_references_subset.py
+
+import pytest
+
+from goes_processor.download.references import Subset, make_subset
+
+
+def test_processor_name_uses_its_declared_variables():
+    assert make_subset("truecolor").variables == ("CMI_C01", "CMI_C02", "CMI_C03", "DQF_C01", "DQF_C02", "DQF_C03")
+    assert make_subset(" lst ").variables == ("LST", "DQF")
+
+
+def test_unknown_name_is_a_variable_list():
+    assert make_subset("CMI_C13, DQF_C13,") == Subset(("CMI_C13", "DQF_C13"))
+    assert make_subset() == Subset()
+
+
+def test_processor_without_variables_is_rejected():
+    with pytest.raises(ValueError, match="glm"):
+        make_subset("glm")
@@ -0,0 +1,60 @@
+# tests/test_rolling_grid.py
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from goes_processor.processing.logic_gridding.binning import RollingGrid, SparseBins
+
+SHAPE = (20, 30)
+T0 = datetime(2026, 1, 3, 12)
+
+
+def _random_bins(rng, n=40):
+    index = np.unique(rng.integers(0, SHAPE[0] * SHAPE[1], n))
+    return SparseBins(index.astype(np.int64), rng.uniform(0.1, 3000.0, index.size).astype(np.float32))
+
+
+def test_evicting_everything_leaves_exact_zeros():
+    rng = np.random.default_rng(0)
+    grid = RollingGrid(SHAPE, ["frp_mw"], windows=(15,))
+    # 200 archivos de FRP dentro de la misma ventana de 15 min
+    for i in range(200):
+        assert grid.push(f"f{i}", T0 + timedelta(seconds=4 * i), {"frp_mw": _random_bins(rng)})
+    assert grid.field(15, "frp_mw").sum() > 0
+
+    # Uno vacío muy posterior desaloja a todos
+    grid.push("late", T0 + timedelta(hours=1), {"frp_mw": SparseBins(np.empty(0, np.int64), np.empty(0, np.float32))})
+    assert np.count_nonzero(grid.field(15, "frp_mw")) == 0
+    assert np.count_nonzero(grid.counts[15]["frp_mw"]) == 0
+
+
+def test_windows_match_direct_sum():
+    rng = np.random.default_rng(1)
+    grid = RollingGrid(SHAPE, ["flash_count"], windows=(1, 5))
+    pushed = []
+    for i in range(30):
+        t = T0 + timedelta(seconds=20 * i)
+        bins = _random_bins(rng)
+        grid.push(f"g{i}", t, {"flash_count": bins})
+        pushed.append((t, bins))
+
+    for w in (1, 5):
+        expected = np.zeros(SHAPE[0] * SHAPE[1], np.float64)
+        for t, bins in pushed:
+            if t > grid.newest - timedelta(minutes=w):
+                expected[bins.index] += bins.values
+        got = grid.field(w, "flash_count").ravel()
+        np.testing.assert_allclose(got, expected, rtol=1e-5)
+        # Celdas sin aportes vigentes: cero exacto
+        assert np.all(got[expected == 0] == 0)
+
+
+def test_duplicate_and_stale_sources_are_ignored():
+    grid = RollingGrid(SHAPE, ["flash_count"], windows=(1,))
+    bins = SparseBins(np.array([3], np.int64), np.array([2.0], np.float32))
+    assert grid.push("a", T0, {"flash_count": bins})
+    assert not grid.push("a", T0, {"flash_count": bins})
+    assert grid.push("b", T0 + timedelta(minutes=5), {"flash_count": bins})
+    assert not grid.push("c", T0, {"flash_count": bins})
+    assert grid.field(1, "flash_count").ravel()[3] == 2.0
@@ -0,0 +1,84 @@
+# tests/test_storage_holds.py
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from goes_processor.storage.holds import FileHold, evicting, hold
+from goes_processor.storage.quota import QuotaPolicy, StorageLedger
+
+HOLDER = """
+import sys
+from goes_processor.storage.holds import hold
+with hold(sys.argv[1]):
+    print("ok", flush=True)
+    sys.stdin.read()
+"""
+
+
+def make_file(path, size=1000, mtime=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_hold_arriving_during_eviction_waits_and_skips_deleted_file(tmp_path):
+    p = make_file(tmp_path / "a.nc")
+    h = FileHold([p])
+    with evicting(p) as free:
+        assert free
+        t = threading.Thread(target=h.acquire)
+        t.start()
+        time.sleep(0.2)
+        assert t.is_alive()  # espera el flock exclusivo
+        p.unlink()
+    t.join(5)
+    assert not t.is_alive()
+    assert h._fds == []  # no quedó marcado el archivo borrado
+    h.release()
+
+
+def test_evicting_refuses_held_files(tmp_path):
+    p = make_file(tmp_path / "a.nc")
+    with hold(p):
+        with evicting(p) as free:
+            assert not free
+    with evicting(p) as free:
+        assert free
+    with evicting(tmp_path / "missing.nc") as free:
+        assert free
+
+
+def test_evicting_refuses_files_locked_by_another_process(tmp_path):
+    p = make_file(tmp_path / "a.nc")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    proc = subprocess.Popen([sys.executable, "-c", HOLDER, str(p)], stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, text=True, env=env)
+    try:
+        assert proc.stdout.readline().strip() == "ok"
+        with evicting(p) as free:
+            assert not free
+    finally:
+        proc.communicate("", timeout=10)
+    with evicting(p) as free:
+        assert free
+
+
+def test_enforce_skips_in_use_and_evicts_lru(tmp_path):
+    now = 1_000_000.0
+    old, mid, new = (make_file(tmp_path / "raw" / n, mtime=now - age)
+                     for n, age in (("old.nc", 300), ("mid.nc", 200), ("new.nc", 100)))
+    with StorageLedger(tmp_path, clock=lambda: now) as ledger:
+        assert ledger.conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        ledger.set_policy(QuotaPolicy(max_bytes=2000, low_watermark=1.0, min_age_minutes=0))
+        assert ledger.record([old, mid, new], used=1.0) == 3
+        with hold(old):
+            report = ledger.enforce()
+        assert report.skipped["in_use"] == 1
+        assert [p for p, _ in report.evicted] == [str(mid)]
+        assert old.exists() and not mid.exists() and new.exists()
+        assert ledger.usage()[0] == 2000
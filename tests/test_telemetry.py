@@ -0,0 +1,64 @@
+# tests/test_telemetry.py
+
+import logging
+
+import dask
+import dask.array as da
+
+from goes_processor import telemetry
+from goes_processor.processing.logic_parallel import profile
+
+
+def test_profile_reports_dask_pool_tasks(tmp_path):
+    with telemetry.session(profile_dir=str(tmp_path)):
+        with telemetry.profiled("archivo"), dask.config.set(scheduler="threads", num_workers=4):
+            (da.ones((400, 400), chunks=100) * 2).sum().compute()
+
+    assert (tmp_path / "archivo.prof").exists() and (tmp_path / "archivo.txt").exists()
+    tasks = (tmp_path / "archivo.tasks.txt").read_text(encoding="utf-8")
+    assert "sum-aggregate" in tasks  # tareas de los hilos del pool, que cProfile no ve
+
+
+def test_profiled_is_a_no_op_without_session(tmp_path):
+    with telemetry.profiled("archivo"):
+        pass
+    assert not telemetry.enabled()
+
+
+def test_current_rss_mb_lives_in_telemetry():
+    assert profile.current_rss_mb is telemetry.current_rss_mb
+    assert telemetry.current_rss_mb() > 0
+
+
+def test_progress_goes_to_the_session_and_console_only_when_verbose(tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv("GOES_VERBOSE", "0")
+    log = logging.getLogger("goes_processor.processing.logic_how.lst")
+    jsonl = tmp_path / "spans.jsonl"
+    try:
+        for verbose in (False, True):
+            telemetry.console_logging(verbose)
+            with telemetry.session(str(jsonl), str(tmp_path / "goes.prom")):
+                with telemetry.span("process.file", file="a.nc"):
+                    log.info("  - Cargando datasets...")
+                    log.warning("  [!] Media > 100")
+            assert ("Cargando" in capsys.readouterr().err) == verbose
+    finally:
+        telemetry.console_logging(False)
+
+    events = [r for r in telemetry.read_spans(jsonl) if r.get("event") == "log"]
+    assert [(e["level"], e["file"], e["parent"]) for e in events] == [
+        ("info", "a.nc", "process.file"), ("warning", "a.nc", "process.file")] * 2
+    # Los eventos de log no cuentan como etapas
+    assert set(telemetry.summarize(telemetry.read_spans(jsonl))) == {("process.file", "wall")}
+
+
+def test_prometheus_exports_last_run_values_as_gauges(tmp_path):
+    prom = tmp_path / "goes.prom"
+    for _ in range(2):
+        with telemetry.session(prometheus=str(prom)):
+            with telemetry.span("download.transfer") as sp:
+                sp.add_bytes(10)
+
+    text = prom.read_text(encoding="utf-8")
+    assert "counter" not in text and "_total" not in text
+    assert 'goes_stage_bytes{stage="download.transfer",kind="wall"} 10' in text  # la última corrida, no 20
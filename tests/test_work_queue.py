@@ -0,0 +1,73 @@
+# tests/test_work_queue.py
+
+from goes_processor.processing.logic_queue.work_queue import SQLiteWorkQueue, file_job
+
+
+class Clock:
+    def __init__(self, t=1_000_000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def make_queue(tmp_path, clock, n=1, max_attempts=3):
+    q = SQLiteWorkQueue(tmp_path / "queue.sqlite", clock=clock)
+    jobs = [file_job("lst", tmp_path / f"f{i}.nc", {}, tmp_path / "out") for i in range(n)]
+    assert q.enqueue(jobs, max_attempts=max_attempts) == n
+    return q
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(tmp_path):
+    clock = Clock()
+    q = make_queue(tmp_path, clock)
+    job = q.lease("a", lease_seconds=60)
+    assert job is not None and job.attempts == 1
+    assert q.lease("b", lease_seconds=60) is None
+
+    clock.t += 30
+    assert q.heartbeat(job.id, "a", lease_seconds=60)
+    clock.t += 61
+    assert q.status()["expired_leases"] == 1
+    assert not q.drained()  # una lease vencida cuenta como pendiente
+
+    again = q.lease("b", lease_seconds=60)
+    assert again.id == job.id and again.attempts == 2
+    assert not q.heartbeat(job.id, "a", lease_seconds=60)  # "a" perdió la lease
+    assert q.fail(job.id, "a", "tarde") == "lost"
+    q.complete(again.id, "b", seconds=1.0)
+    assert q.drained()
+    assert q.status()["reclaims"] == 1
+    q.close()
+
+
+def test_enqueue_keys_each_file_and_ignores_duplicates(tmp_path):
+    clock = Clock()
+    q = make_queue(tmp_path, clock, n=3)
+    assert q.enqueue([file_job("lst", tmp_path / "f0.nc", {}, tmp_path / "out")]) == 0
+    assert q.status()["counts"]["pending"] == 3
+    q.close()
+
+
+def test_lease_expiring_on_last_attempt_fails_the_job(tmp_path):
+    clock = Clock()
+    q = make_queue(tmp_path, clock, max_attempts=1)
+    q.lease("a", lease_seconds=10)
+    clock.t += 11
+    assert q.reclaim() == 1
+    st = q.status()
+    assert st["counts"]["failed"] == 1
+    assert st["recent_failures"][0]["error"] == "lease vencida en el último intento"
+    assert q.drained()
+    q.close()
+
+
+def test_failed_job_retries_after_backoff(tmp_path):
+    clock = Clock()
+    q = make_queue(tmp_path, clock)
+    job = q.lease("a", lease_seconds=60)
+    assert q.fail(job.id, "a", "boom", retry_delay=30) == "pending"
+    assert q.lease("a", lease_seconds=60) is None
+    clock.t += 31
+    assert q.lease("a", lease_seconds=60).attempts == 2
+    q.close()
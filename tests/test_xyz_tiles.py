@@ -0,0 +1,59 @@
+# tests/test_xyz_tiles.py
+
+import json
+
+import numpy as np
+import xarray as xr
+from pyresample.geometry import AreaDefinition
+
+from goes_processor import config_satpy
+from goes_processor.processing.logic_output import xyz_tiles as tiles
+from goes_processor.processing.logic_resample.lut import resample_dataarray
+
+SIZE = 300
+GEOS_HALF = 5434894.885056
+
+
+def _disk_array():
+    area = AreaDefinition("goes_test", "GOES test", "goes_test",
+                          {"proj": "geos", "h": 35786023.0, "lon_0": -75.0, "sweep": "x", "units": "m"},
+                          SIZE, SIZE, [-GEOS_HALF, -GEOS_HALF, GEOS_HALF, GEOS_HALF])
+    rows, cols = np.mgrid[0:SIZE, 0:SIZE]
+    values = (cols - SIZE / 2) * 120.0 / SIZE + np.sin(rows / 7.0) * 5
+    return xr.DataArray(values.astype(np.float32), dims=("y", "x"),
+                        attrs={"area": area, "name": "lst_color", "sensor": "abi",
+                               "standard_name": "lstf_celsius_color01"})
+
+
+def _pngs(root):
+    return {p.relative_to(root).as_posix(): p.read_bytes() for p in sorted(root.rglob("*.png"))}
+
+
+def test_blocked_pyramid_matches_full_canvas(tmp_path, monkeypatch):
+    from satpy.writers import get_enhanced_image
+
+    # Realce del proyecto (paleta de rango fijo): el mismo en cada bloque
+    config_satpy.apply()
+    monkeypatch.setattr(config_satpy, "CACHE_DIR", tmp_path / "cache")
+    # Bloques de 2x2 tiles: a zoom 3 son 4x4 bloques, varios fuera del disco
+    monkeypatch.setattr(tiles, "BLOCK_TILES", 2)
+    data_arr = _disk_array()
+    max_zoom = 3
+
+    # Referencia: el lienzo Mercator entero remuestreado de una vez
+    img = get_enhanced_image(resample_dataarray(data_arr, tiles.mercator_area(max_zoom)))
+    finalized, _mode = img.finalize(fill_value=None, dtype=np.uint8)
+    expected = tiles.write_pyramid(finalized.transpose("bands", "y", "x").values, tmp_path / "full", max_zoom)
+
+    out_dir = tmp_path / "blocks"
+    stale = out_dir / "5" / "0" / "0.png"
+    stale.parent.mkdir(parents=True)
+    stale.write_bytes(b"viejo")
+    summary = tiles.xyz_tiles(data_arr, out_dir, max_zoom=max_zoom)
+
+    assert summary == expected
+    assert summary["tiles_written"] > 0 and summary["tiles_skipped_empty"] > 0
+    assert json.loads((out_dir / "tiles.json").read_text()) == summary
+    # Mismos tiles byte a byte y ninguno de una pirámide anterior
+    assert _pngs(out_dir) == _pngs(tmp_path / "full")
+    assert not stale.exists()